@@ -1,10 +1,36 @@
-cr = "\n"
+import importlib
+import os
 
-s = "####################################################################" + cr
-s += "#  FINANCEPY BETA Version " + str('0.360') + " - This build: 01 Oct 2024 at 10:42 #" + cr
-s += "#     This software is distributed FREE AND WITHOUT ANY WARRANTY   #" + cr
-s += "#  Report bugs as issues at https://github.com/domokane/FinancePy  #" + cr
-s += "####################################################################"
-s += cr
+# The subpackages are only imported when they are first used
+_subpackages = ["market", "models", "products", "utils"]
 
-print(s)
+
+def __getattr__(name):
+    if name in _subpackages:
+        return importlib.import_module("." + name, __name__)
+
+    if name == "warmup":
+        from .utils.warmup import warmup
+        return warmup
+
+    raise AttributeError("module " + __name__ + " has no attribute " + name)
+
+
+# Set the environment variable FINANCEPY_NUMBA_CACHE_DIR to choose the folder
+# where numba caches the compiled kernels. It must be set before numba loads.
+if os.environ.get("FINANCEPY_NUMBA_CACHE_DIR", "") != "":
+    os.environ["NUMBA_CACHE_DIR"] = os.environ["FINANCEPY_NUMBA_CACHE_DIR"]
+
+# Set the environment variable FINANCEPY_QUIET to 1 to hide the banner
+if os.environ.get("FINANCEPY_QUIET", "0") in ["0", ""]:
+
+    cr = "\n"
+
+    s = "####################################################################" + cr
+    s += "#  FINANCEPY BETA Version " + str('0.360') + " - This build: 01 Oct 2024 at 10:42 #" + cr
+    s += "#     This software is distributed FREE AND WITHOUT ANY WARRANTY   #" + cr
+    s += "#  Report bugs as issues at https://github.com/domokane/FinancePy  #" + cr
+    s += "####################################################################"
+    s += cr
+
+    print(s)
@@ -1,9 +1,16 @@
-from .interpolator import *
-from .discount_curve import *
-from .discount_curve_flat import *
-from .discount_curve_ns import *
-from .discount_curve_nss import *
-from .discount_curve_pwf import *
-from .discount_curve_pwl import *
-from .discount_curve_poly import *
-from .discount_curve_zeros import *
+from ...utils.lazy_import import lazy_package
+
+# Each module is only imported when one of its names is first used
+__getattr__, __dir__ = lazy_package(__name__, __file__, [
+    "interpolator",
+    "discount_curve",
+    "discount_curve_flat",
+    "discount_curve_ns",
+    "discount_curve_nss",
+    "discount_curve_pwf",
+    "discount_curve_pwl",
+    "discount_curve_poly",
+    "discount_curve_zeros",
+    "discount_curve_shifted",
+    "discount_curve_scenarios",
+])
@@ -7,7 +7,7 @@ import numpy as np
 
 from .interpolator import Interpolator, InterpTypes, interpolate
 
-from ...utils.date import Date
+from ...utils.date import Date, DateArray
 from ...utils.error import FinError
 from ...utils.global_vars import g_days_in_year, g_small
 from ...utils.frequency import annual_frequency, FrequencyTypes
@@ -126,7 +126,7 @@ class DiscountCurve:
     def _df_to_zero(
         self,
         dfs: (float, np.ndarray),
-        maturity_dts: (Date, list),
+        maturity_dts: (Date, list, DateArray),
         freq_type: FrequencyTypes,
         dc_type: DayCountTypes,
     ):
@@ -143,41 +143,30 @@ class DiscountCurve:
         else:
             date_list = maturity_dts
 
-        if isinstance(dfs, float):
-            df_list = [dfs]
-        else:
-            df_list = dfs
+        df_list = np.array(dfs, dtype=np.float64, ndmin=1)
 
-        if len(date_list) != len(df_list):
+        # The dates are on the last axis so a matrix of discount factors with
+        # a row per scenario is converted in one call
+        if len(date_list) != df_list.shape[-1]:
             raise FinError("Date list and df list do not have same length")
 
-        num_dates = len(date_list)
-        zero_rates = []
-
         times = times_from_dates(date_list, self.value_dt, dc_type)
+        t = np.maximum(times, g_small)
 
-        for i in range(0, num_dates):
-
-            df = df_list[i]
-
-            t = max(times[i], g_small)
-
-            if freq_type == FrequencyTypes.CONTINUOUS:
-                r = -np.log(df) / t
-            elif freq_type == FrequencyTypes.SIMPLE:
-                r = (1.0 / df - 1.0) / t
-            else:
-                r = (np.power(df, -1.0 / (t * f)) - 1.0) * f
-
-            zero_rates.append(r)
+        if freq_type == FrequencyTypes.CONTINUOUS:
+            zero_rates = -np.log(df_list) / t
+        elif freq_type == FrequencyTypes.SIMPLE:
+            zero_rates = (1.0 / df_list - 1.0) / t
+        else:
+            zero_rates = (np.power(df_list, -1.0 / (t * f)) - 1.0) * f
 
-        return np.array(zero_rates)
+        return zero_rates
 
     ###########################################################################
 
     def zero_rate(
         self,
-        dts: (list, Date),
+        dts: (list, Date, DateArray),
         freq_type: FrequencyTypes = FrequencyTypes.CONTINUOUS,
         dc_type: DayCountTypes = DayCountTypes.ACT_360,
     ):
@@ -205,7 +194,9 @@ class DiscountCurve:
     ###########################################################################
 
     def cc_rate(
-        self, dts: (list, Date), dc_type: DayCountTypes = DayCountTypes.SIMPLE
+        self,
+        dts: (list, Date, DateArray),
+        dc_type: DayCountTypes = DayCountTypes.SIMPLE,
     ):
         """Calculation of zero rates with continuous compounding. This
         function can return a vector of cc rates given a vector of
@@ -219,7 +210,7 @@ class DiscountCurve:
     def swap_rate(
         self,
         effective_dt: Date,
-        maturity_dt: (list, Date),
+        maturity_dt: (list, Date, DateArray),
         freq_type=FrequencyTypes.ANNUAL,
         dc_type: DayCountTypes = DayCountTypes.THIRTY_E_360,
     ):
@@ -262,16 +253,15 @@ class DiscountCurve:
             flow_dts = schedule.generate()
             flow_dts[0] = effective_dt
 
+            # All of the discount factors and accrual factors of the swap are
+            # calculated in one call. The cumulative sum adds the terms in the
+            # same order as a loop over the flows.
             day_counter = DayCount(dc_type)
-            prev_dt = flow_dts[0]
-            pv01 = 0.0
-            df = 1.0
-
-            for next_dt in flow_dts[1:]:
-                df = self.df(next_dt)
-                alpha = day_counter.year_frac(prev_dt, next_dt)[0]
-                pv01 += alpha * df
-                prev_dt = next_dt
+            alphas = day_counter.year_frac_array(flow_dts[:-1],
+                                                 flow_dts[1:])[0]
+            dfs = self.df(flow_dts[1:])
+            pv01 = np.cumsum(alphas * dfs)[-1]
+            df = dfs[-1]
 
             if abs(pv01) < g_small:
                 par_rate = 0.0
@@ -290,10 +280,12 @@ class DiscountCurve:
 
     ###########################################################################
 
-    def df(self, dt: (list, Date), day_count=DayCountTypes.ACT_ACT_ISDA):
-        """Function to calculate a discount factor from a date or a
-        vector of dates. The day count determines how dates get converted to
-        years. I allow this to default to ACT_ACT_ISDA unless specified."""
+    def df(self,
+           dt: (list, Date, DateArray),
+           day_count=DayCountTypes.ACT_ACT_ISDA):
+        """Function to calculate a discount factor from a date, a list of
+        dates or a DateArray. The day count determines how dates get converted
+        to years. I allow this to default to ACT_ACT_ISDA unless specified."""
 
         times = times_from_dates(dt, self.value_dt, day_count)
         dfs = self.df_t(times)
@@ -327,6 +319,30 @@ class DiscountCurve:
 
     ###########################################################################
 
+    def df_adjoint(self,
+                   dt: (list, Date, DateArray),
+                   df_bars: (float, np.ndarray),
+                   day_count=DayCountTypes.ACT_ACT_ISDA):
+        """Return the gradient of the sum of the discount factors at a date,
+        a list of dates or a DateArray weighted by df_bars with respect to the
+        discount factors at the curve knots. Given the derivative of a price
+        with respect to each discount factor it uses, this gives the
+        derivative of the price with respect to every knot in one pass. The
+        day count must be the one used to value the discount factors."""
+
+        if type(self).df_t is not DiscountCurve.df_t:
+            raise FinError("Curve discount factors are not set by its knots")
+
+        times = np.atleast_1d(times_from_dates(dt, self.value_dt, day_count))
+        df_bars = np.atleast_1d(np.asarray(df_bars, dtype=np.float64))
+
+        if len(df_bars) != len(times):
+            raise FinError("Dates and df_bars are not the same length")
+
+        return self._interpolator.df_knot_adjoint(times, df_bars)
+
+    ###########################################################################
+
     def survival_prob(self, dt: Date):
         """This returns a survival probability to a specified date based on
         the assumption that the continuously compounded rate is a default
@@ -338,7 +354,7 @@ class DiscountCurve:
 
     ###########################################################################
 
-    def fwd(self, dts: Date):
+    def fwd(self, dts: (Date, list, DateArray)):
         """Calculate the continuously compounded forward rate at the forward
         Date provided. This is done by perturbing the time by one day only
         and measuring the change in the log of the discount factor divided by
@@ -347,6 +363,8 @@ class DiscountCurve:
 
         if isinstance(dts, Date):
             dts_plus_one_days = [dts.add_days(1)]
+        elif isinstance(dts, DateArray):
+            dts_plus_one_days = dts.add_days(1)
         else:
             dts_plus_one_days = []
             for dt in dts:
@@ -384,67 +402,69 @@ class DiscountCurve:
     def bump(self, bump_size: float):
         """Adjust the continuously compounded forward rates by a perturbation
         upward equal to the bump size and return a curve objet with this bumped
-        curve. This is used for interest rate risk."""
-
-        times = self._times.copy()
-        values = self._dfs.copy()
+        curve. This is used for interest rate risk. The bumped curve is a view
+        that shares this curve rather than a copy of it."""
 
-        n = len(self._times)
-        for i in range(0, n):
-            t = times[i]
-            values[i] = values[i] * np.exp(-bump_size * t)
+        # Imported here as the shifted curve is a subclass of this one
+        from .discount_curve_shifted import DiscountCurveShifted
 
-        disc_curve = DiscountCurve(
-            self.value_dt, times, values, self._interp_type
-        )
-
-        return disc_curve
+        return DiscountCurveShifted(self, bump_size)
 
     ###########################################################################
 
     def fwd_rate(
         self,
-        start_dt: (list, Date),
-        date_or_tenor: (Date, str),
+        start_dt: (list, Date, DateArray),
+        date_or_tenor: (Date, str, list, DateArray),
         dc_type: DayCountTypes = DayCountTypes.ACT_360,
     ):
         """Calculate the forward rate between two forward dates according to
         the specified day count convention. This defaults to Actual 360. The
         first date is specified and the second is given as a date or as a tenor
-        which is added to the first date."""
-
-        if isinstance(start_dt, Date):
-            start_dts = []
-            start_dts.append(start_dt)
-        elif isinstance(start_dt, list):
-            start_dts = start_dt
-        else:
-            raise FinError("Start date and end date must be same types.")
+        which is added to the first date. A list of start dates or a DateArray
+        returns an array of forward rates which are all calculated at once."""
 
         day_count = DayCount(dc_type)
 
-        num_dates = len(start_dts)
-        fwd_rates = []
-        for i in range(0, num_dates):
-            dt1 = start_dts[i]
+        if isinstance(start_dt, Date):
 
             if isinstance(date_or_tenor, str):
-                dt2 = dt1.add_tenor(date_or_tenor)
-            elif isinstance(date_or_tenor, Date):
-                dt2 = date_or_tenor
-            elif isinstance(date_or_tenor, list):
-                dt2 = date_or_tenor[i]
-
-            year_frac = day_count.year_frac(dt1, dt2)[0]
-            df1 = self.df(dt1)
-            df2 = self.df(dt2)
+                end_dt = start_dt.add_tenor(date_or_tenor)
+            else:
+                end_dt = date_or_tenor
+
+            year_frac = day_count.year_frac(start_dt, end_dt)[0]
+            df1 = self.df(start_dt)
+            df2 = self.df(end_dt)
             fwd_rate = (df1 / df2 - 1.0) / year_frac
-            fwd_rates.append(fwd_rate)
+            return fwd_rate
+
+        elif isinstance(start_dt, DateArray):
+
+            if isinstance(date_or_tenor, str):
+                end_dts = start_dt.add_tenor(date_or_tenor)
+            else:
+                end_dts = date_or_tenor
+
+        elif isinstance(start_dt, list):
+
+            if isinstance(date_or_tenor, str):
+                end_dts = [dt.add_tenor(date_or_tenor) for dt in start_dt]
+            else:
+                end_dts = date_or_tenor
 
-        if isinstance(start_dt, Date):
-            return fwd_rates[0]
         else:
-            return np.array(fwd_rates)
+            raise FinError("Start date and end date must be same types.")
+
+        if isinstance(end_dts, (list, DateArray)):
+            if len(end_dts) != len(start_dt):
+                raise FinError("Start dates and end dates not same length.")
+
+        year_fracs = day_count.year_frac_array(start_dt, end_dts)[0]
+        df1 = self.df(start_dt)
+        df2 = self.df(end_dts)
+        fwd_rates = (df1 / df2 - 1.0) / year_fracs
+        return np.array(fwd_rates)
 
     ###########################################################################
 
@@ -7,7 +7,7 @@ import numpy as np
 
 ###############################################################################
 
-from ...utils.date import Date
+from ...utils.date import Date, DateArray
 from ...utils.day_count import DayCountTypes
 from ...utils.frequency import FrequencyTypes
 from ...utils.helpers import label_to_string
@@ -79,7 +79,7 @@ class DiscountCurveFlat(DiscountCurve):
 ###############################################################################
 
     def df(self,
-           dts: (Date, list)):
+           dts: (Date, list, DateArray)):
         """ Return discount factors given a single or vector of dts. The
         discount factor depends on the rate and this in turn depends on its
         compounding frequency, and it defaults to continuous compounding. It
@@ -4,7 +4,7 @@
 
 import numpy as np
 
-from ...utils.date import Date
+from ...utils.date import Date, DateArray
 from ...utils.frequency import FrequencyTypes
 from ...utils.global_vars import g_small
 from ...utils.error import FinError
@@ -54,7 +54,7 @@ class DiscountCurveNS(DiscountCurve):
     ###########################################################################
 
     def zero_rate(self,
-                  dates: (list, Date),
+                  dates: (list, Date, DateArray),
                   freq_type: FrequencyTypes = FrequencyTypes.CONTINUOUS,
                   dc_type: DayCountTypes = DayCountTypes.ACT_360):
         """ Calculation of zero rates with specified frequency according to
@@ -113,7 +113,7 @@ class DiscountCurveNS(DiscountCurve):
     ###########################################################################
 
     def df(self,
-           dates: (Date, list)):
+           dates: (Date, list, DateArray)):
         """ Return discount factors given a single or vector of dates. The
         discount factor depends on the rate and this in turn depends on its
         compounding frequency and it defaults to continuous compounding. It
@@ -4,7 +4,7 @@
 
 import numpy as np
 
-from ...utils.date import Date
+from ...utils.date import Date, DateArray
 from ...utils.frequency import FrequencyTypes
 from ...utils.global_vars import g_small
 from ...utils.helpers import label_to_string
@@ -61,7 +61,7 @@ class DiscountCurveNSS(DiscountCurve):
     ###########################################################################
 
     def zero_rate(self,
-                  dates: (list, Date),
+                  dates: (list, Date, DateArray),
                   freq_type: FrequencyTypes = FrequencyTypes.CONTINUOUS,
                   dc_type: DayCountTypes = DayCountTypes.ACT_360):
         """ Calculation of zero rates with specified frequency according to
@@ -127,7 +127,7 @@ class DiscountCurveNSS(DiscountCurve):
     ###########################################################################
 
     def df(self,
-           dates: (Date, list)):
+           dates: (Date, list, DateArray)):
         """ Return discount factors given a single or vector of dates. The
         discount factor depends on the rate and this in turn depends on its
         compounding frequency and it defaults to continuous compounding. It
@@ -4,7 +4,7 @@
 
 import numpy as np
 
-from ...utils.date import Date
+from ...utils.date import Date, DateArray
 from ...utils.error import FinError
 from ...utils.global_vars import g_small
 from ...utils.helpers import label_to_string
@@ -45,7 +45,7 @@ class DiscountCurvePoly(DiscountCurve):
     ###########################################################################
 
     def zero_rate(self,
-                  dts: (list, Date),
+                  dts: (list, Date, DateArray),
                   freq_type: FrequencyTypes = FrequencyTypes.CONTINUOUS,
                   dc_type: DayCountTypes = DayCountTypes.ACT_360):
         """ Calculation of zero rates with specified frequency according to
@@ -100,7 +100,7 @@ class DiscountCurvePoly(DiscountCurve):
     ###########################################################################
 
     def df(self,
-           dates: (list, Date)):
+           dates: (list, Date, DateArray)):
         """ Calculate the fwd rate to maturity date but with times as inputs.
         This function is used internally and should be discouraged for external
         use. The compounding frequency defaults to that specified in the
@@ -4,7 +4,7 @@
 
 import numpy as np
 
-from ...utils.date import Date
+from ...utils.date import Date, DateArray
 from ...utils.error import FinError
 from ...utils.global_vars import g_small
 from ...utils.math import test_monotonicity
@@ -118,7 +118,7 @@ class DiscountCurvePWF(DiscountCurve):
 
     ###########################################################################
 
-    def df(self, dates: (Date, list)):
+    def df(self, dates: (Date, list, DateArray)):
         """Return discount factors given a single or vector of dates. The
         discount factor depends on the rate and this in turn depends on its
         compounding frequency and it defaults to continuous compounding. It
@@ -4,7 +4,7 @@
 
 import numpy as np
 
-from ...utils.date import Date
+from ...utils.date import Date, DateArray
 from ...utils.error import FinError
 from ...utils.math import test_monotonicity
 from ...utils.frequency import FrequencyTypes
@@ -102,7 +102,7 @@ class DiscountCurvePWL(DiscountCurve):
     ###########################################################################
 
     def df(self,
-           dates: (Date, list)):
+           dates: (Date, list, DateArray)):
         """ Return discount factors given a single or vector of dates. The
         discount factor depends on the rate and this in turn depends on its
         compounding frequency and it defaults to continuous compounding. It
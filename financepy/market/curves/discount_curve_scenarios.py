@@ -0,0 +1,262 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+
+import numpy as np
+
+###############################################################################
+
+from ...utils.date import Date
+from ...utils.error import FinError
+from ...utils.global_vars import g_days_in_year, g_small
+from ...utils.frequency import FrequencyTypes
+from ...utils.day_count import DayCount, DayCountTypes
+from ...utils.schedule import Schedule
+from ...utils.math import test_monotonicity
+from ...utils.helpers import label_to_string
+from ...utils.helpers import check_argument_types
+from ...market.curves.discount_curve import DiscountCurve
+from ...market.curves.interpolator import Interpolator, InterpTypes
+from ...market.curves.interpolator import _minterpolate
+
+
+class DiscountCurveScenarios(DiscountCurve):
+    """A set of discount curve scenarios which share the same knot dates and
+    interpolation scheme. The discount factors at the knots are held as a
+    matrix with a row for each scenario. The discount factor functions return
+    a row of values for each scenario so a date gives an array with one value
+    per scenario and a list of dates gives an array of shape (number of
+    scenarios, number of dates). As the swap legs and the swap book only use
+    these functions to value their cashflows they can value all of the
+    scenarios in one call. The zero, forward and swap rates are returned in
+    the same shapes."""
+
+    ###########################################################################
+
+    def __init__(
+        self,
+        value_dt: Date,
+        df_dates: list,
+        df_values: np.ndarray,
+        interp_type: InterpTypes = InterpTypes.FLAT_FWD_RATES,
+    ):
+        """Create the scenario curves from a list of knot dates and a matrix
+        of discount factors with a row for each scenario and a column for
+        each knot date. The interpolation scheme is one of the InterpTypes
+        and is the same for every scenario."""
+
+        check_argument_types(self.__init__, locals())
+
+        df_values = np.array(df_values, dtype=np.float64)
+
+        if df_values.ndim != 2:
+            raise FinError("Discount factors must be a matrix of scenarios")
+
+        if len(df_dates) < 1:
+            raise FinError("Times has zero length")
+
+        if len(df_dates) != df_values.shape[1]:
+            raise FinError("Times and Values are not the same")
+
+        num_scenarios = df_values.shape[0]
+
+        # As for a DiscountCurve each scenario has a knot at time zero
+        start_index = 0
+        dfs = [np.ones(num_scenarios)]
+
+        if df_dates[0] == value_dt:
+            dfs[0] = df_values[:, 0]
+            start_index = 1
+
+        times = [0.0]
+        for i in range(start_index, len(df_dates)):
+            times.append((df_dates[i] - value_dt) / g_days_in_year)
+            dfs.append(df_values[:, i])
+
+        self._times = np.array(times)
+
+        if test_monotonicity(self._times) is False:
+            print(self._times)
+            raise FinError("Times are not sorted in increasing order")
+
+        self._dfs = np.ascontiguousarray(np.array(dfs).T)
+        self._df_dates = df_dates
+        self._df_values = df_values
+
+        self.value_dt = value_dt
+        self.freq_type = FrequencyTypes.CONTINUOUS
+        self.dc_type = DayCountTypes.ACT_ACT_ISDA
+        self._interp_type = interp_type
+
+        # The local schemes are evaluated for all scenarios in one call but
+        # the splines need to be fitted to each scenario
+        self._interpolators = None
+
+        if interp_type not in (InterpTypes.FLAT_FWD_RATES,
+                               InterpTypes.LINEAR_ZERO_RATES,
+                               InterpTypes.LINEAR_FWD_RATES):
+
+            self._interpolators = []
+            for row in self._dfs:
+                interpolator = Interpolator(interp_type)
+                interpolator.fit(self._times, row)
+                self._interpolators.append(interpolator)
+
+    ###########################################################################
+
+    @property
+    def num_scenarios(self):
+        """The number of scenarios."""
+        return self._dfs.shape[0]
+
+    ###########################################################################
+
+    def df_t(self, t: (float, np.ndarray)):
+        """Return the discount factor of each scenario at a time or a vector
+        of times. A time gives a vector with one value per scenario and a
+        vector of times gives a matrix with a row per scenario."""
+
+        ts = np.atleast_1d(np.asarray(t, dtype=np.float64))
+
+        if np.any(ts < 0.0):
+            print(ts)
+            raise FinError("Interpolate times must all be >= 0")
+
+        if self._interpolators is None:
+            dfs = _minterpolate(ts, self._times, self._dfs,
+                                self._interp_type.value)
+        else:
+            dfs = np.array([interpolator.interpolate(ts)
+                            for interpolator in self._interpolators])
+
+        if np.ndim(t) == 0:
+            return dfs[:, 0]
+
+        return dfs
+
+    ###########################################################################
+
+    def zero_rate(
+        self,
+        dts: (list, Date),
+        freq_type: FrequencyTypes = FrequencyTypes.CONTINUOUS,
+        dc_type: DayCountTypes = DayCountTypes.ACT_360,
+    ):
+        """Return the zero rate of each scenario with the specified frequency
+        and day count. A date gives a vector with one rate per scenario and a
+        list of dates gives a matrix with a row per scenario."""
+
+        if isinstance(freq_type, FrequencyTypes) is False:
+            raise FinError("Invalid Frequency type.")
+
+        if isinstance(dc_type, DayCountTypes) is False:
+            raise FinError("Invalid Day Count type.")
+
+        dfs = np.reshape(self.df(dts), (self.num_scenarios, -1))
+        zero_rates = self._df_to_zero(dfs, dts, freq_type, dc_type)
+
+        if isinstance(dts, Date):
+            return zero_rates[:, 0]
+
+        return zero_rates
+
+    ###########################################################################
+
+    def fwd(self, dts: (Date, list)):
+        """Return the continuously compounded one day forward rate of each
+        scenario. A date gives a vector with one rate per scenario and a list
+        of dates gives a matrix with a row per scenario."""
+
+        if isinstance(dts, Date):
+            return DiscountCurve.fwd(self, [dts])[:, 0]
+
+        return DiscountCurve.fwd(self, dts)
+
+    ###########################################################################
+
+    def swap_rate(
+        self,
+        effective_dt: Date,
+        maturity_dt: (list, Date),
+        freq_type=FrequencyTypes.ANNUAL,
+        dc_type: DayCountTypes = DayCountTypes.THIRTY_E_360,
+    ):
+        """Return the par swap rate of each scenario to a maturity date or a
+        list of maturity dates. The schedule and accrual factors are shared
+        by the scenarios so the rates of all of them are found with one call
+        to the discount factors per maturity. A date gives a vector with one
+        rate per scenario and a list gives a matrix with a row per
+        scenario."""
+
+        if effective_dt < self.value_dt:
+            raise FinError("Swap starts before the curve valuation date.")
+
+        if isinstance(freq_type, FrequencyTypes) is False:
+            raise FinError("Invalid Frequency type.")
+
+        if freq_type == FrequencyTypes.SIMPLE:
+            raise FinError("Cannot calculate par rate with simple yield freq.")
+        elif freq_type == FrequencyTypes.CONTINUOUS:
+            raise FinError("Cannot calculate par rate with continuous freq.")
+
+        if isinstance(maturity_dt, Date):
+            maturity_dts = [maturity_dt]
+        else:
+            maturity_dts = maturity_dt
+
+        day_counter = DayCount(dc_type)
+        df_start = self.df(effective_dt)
+        par_rates = np.zeros((self.num_scenarios, len(maturity_dts)))
+
+        for i_mat, mat_dt in enumerate(maturity_dts):
+
+            if mat_dt <= effective_dt:
+                raise FinError("Maturity date is before the swap start date.")
+
+            flow_dts = Schedule(effective_dt, mat_dt, freq_type).generate()
+            flow_dts[0] = effective_dt
+
+            alphas = day_counter.year_frac_array(flow_dts[:-1],
+                                                 flow_dts[1:])[0]
+            dfs = self.df(flow_dts[1:])
+            pv01 = np.cumsum(alphas * dfs, axis=1)[:, -1]
+
+            # As for a single curve a zero annuity gives a zero par rate
+            valid = np.abs(pv01) >= g_small
+            par_rates[valid, i_mat] = (df_start[valid] - dfs[valid, -1]) \
+                / pv01[valid]
+
+        if isinstance(maturity_dt, Date):
+            return par_rates[:, 0]
+
+        return par_rates
+
+    ###########################################################################
+
+    def scenario(self, i: int):
+        """Return scenario i as a DiscountCurve."""
+
+        return DiscountCurve(self.value_dt,
+                             self._df_dates,
+                             self._df_values[i],
+                             self._interp_type)
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("VALUATION DATE", self.value_dt)
+        s += label_to_string("INTERP TYPE", self._interp_type)
+        s += label_to_string("NUM SCENARIOS", self.num_scenarios)
+        s += label_to_string("NUM KNOTS", len(self._times), "")
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        """Simple print function for backward compatibility."""
+        print(self)
+
+
+###############################################################################
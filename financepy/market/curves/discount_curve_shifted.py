@@ -0,0 +1,120 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+
+import numpy as np
+from typing import Optional
+
+###############################################################################
+
+from ...utils.error import FinError
+from ...utils.frequency import FrequencyTypes
+from ...utils.helpers import label_to_string
+from ...utils.helpers import check_argument_types
+from ...market.curves.discount_curve import DiscountCurve
+
+
+class DiscountCurveShifted(DiscountCurve):
+    """A view of a discount curve with its continuously compounded zero rates
+    shifted up by a constant amount or by an amount which is linearly
+    interpolated between a set of shift times and is flat outside them. The
+    base curve is shared and not copied so creating a shifted curve for each
+    risk sensitivity only allocates the shifts and the shifted knot discount
+    factors. It can be used wherever a DiscountCurve is expected."""
+
+    ###########################################################################
+
+    def __init__(
+        self,
+        base_curve: DiscountCurve,
+        shift: (float, np.ndarray),
+        shift_times: Optional[np.ndarray] = None,
+    ):
+        """Create a view of the base curve with its zero rates shifted by a
+        single amount or, if shift times are supplied, by an amount at each
+        shift time. A shift of 0.0001 is a one basis point shift."""
+
+        check_argument_types(self.__init__, locals())
+
+        if shift_times is None:
+            if isinstance(shift, np.ndarray):
+                raise FinError("Shift times are needed for a vector of shifts")
+            self._shift = float(shift)
+            self._shift_times = None
+        else:
+            shift = np.asarray(shift, dtype=float)
+            if shift.shape != shift_times.shape:
+                raise FinError("Shifts and shift times are not the same size")
+            self._shift = shift
+            self._shift_times = shift_times
+
+        self._base_curve = base_curve
+
+        self.value_dt = base_curve.value_dt
+        self.freq_type = FrequencyTypes.CONTINUOUS
+        self.dc_type = base_curve.dc_type
+
+        # Some models read the curve knots directly so we share the knot
+        # times of the base curve and only hold the shifted discount factors
+        base_times = getattr(base_curve, "_times", None)
+
+        if base_times is not None:
+            self._times = base_times
+            self._dfs = self.df_t(base_times)
+            self._interp_type = base_curve._interp_type
+
+    ###########################################################################
+
+    def _shift_t(self, t: (float, np.ndarray)):
+        """Return the zero rate shift at a time or a vector of times."""
+
+        if self._shift_times is None:
+            return self._shift
+
+        return np.interp(t, self._shift_times, self._shift)
+
+    ###########################################################################
+
+    def df_t(self, t: (float, np.ndarray)):
+        """Return the discount factor at a time or a vector of times. This is
+        the base curve discount factor times exp(-shift * t)."""
+
+        dfs = self._base_curve.df_t(t)
+        return dfs * np.exp(-self._shift_t(t) * t)
+
+    ###########################################################################
+
+    def bump(self, bump_size: float):
+        """Return a view of the base curve with the shifts increased by the
+        bump size. The views are not nested however many times a curve is
+        bumped."""
+
+        if self._shift_times is None:
+            return DiscountCurveShifted(self._base_curve,
+                                        self._shift + bump_size)
+
+        return DiscountCurveShifted(self._base_curve,
+                                    self._shift + bump_size,
+                                    self._shift_times)
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("BASE CURVE", type(self._base_curve).__name__)
+        if self._shift_times is None:
+            s += label_to_string("SHIFT", self._shift, "")
+        else:
+            s += label_to_string("SHIFT TIMES", self._shift_times)
+            s += label_to_string("SHIFTS", self._shift, "")
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        """Simple print function for backward compatibility."""
+        print(self)
+
+
+###############################################################################
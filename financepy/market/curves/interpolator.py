@@ -7,7 +7,7 @@ from numba import njit, float64, int64
 import numpy as np
 from scipy.interpolate import PchipInterpolator
 from scipy.interpolate import CubicSpline
-from scipy.interpolate import InterpolatedUnivariateSpline
+from scipy.interpolate import PPoly
 from ...utils.error import FinError
 from ...utils.global_vars import g_small
 from ...utils.tension_spline import TensionSpline
@@ -193,6 +193,249 @@ def _vinterpolate(xValues,
     return yvalues
 
 
+###############################################################################
+
+@njit(float64[:, :](float64[:], float64[:], float64[:, :], int64),
+      fastmath=True, cache=True, nogil=True)
+def _minterpolate(xValues,
+                  xvector,
+                  dfs,
+                  method):
+    """ Return the interpolated values of y given x for several sets of y
+    values on the same x vector. Each row of dfs is a set of y values and
+    the output has a row of interpolated values for each of them. """
+
+    num_rows = dfs.shape[0]
+    n = xValues.size
+    yvalues = np.empty((num_rows, n))
+    for j in range(0, num_rows):
+        row = dfs[j]
+        for i in range(0, n):
+            yvalues[j, i] = _uinterpolate(xValues[i], xvector, row, method)
+
+    return yvalues
+
+
+###############################################################################
+
+@njit(float64(float64, float64[:], float64[:, :], int64, float64),
+      fastmath=True, cache=True, nogil=True)
+def _uinterpolate_spline(t, breaks, coeffs, method, sigma):
+    """ Return the discount factor at time t from a spline fitted by the
+    Interpolator. For the cubic splines and the linear overnight forward rate
+    scheme each column of coeffs holds a cubic in the time since the start of
+    an interval, highest power first as in scipy. This is either the log of
+    the discount factor or the zero rate. For the tension spline with tension
+    sigma the rows of coeffs are the zero rates and their second derivatives
+    at the breaks. The interval is found using a binary search. """
+
+    if method == InterpTypes.TENSION_ZERO_RATES.value:
+
+        num_points = breaks.size
+        i = np.searchsorted(breaks, t, side="left")
+
+        # The zero rate is flat outside the breaks
+        if i == 0:
+            return np.exp(-t * coeffs[0, 0])
+        elif i == num_points:
+            return np.exp(-t * coeffs[0, num_points - 1])
+
+        xl = breaks[i - 1]
+        xr = breaks[i]
+        h = xr - xl
+        sh = np.sinh(sigma * h)
+        sigma2 = sigma * sigma
+
+        v1 = (np.sinh(sigma * (xr - t)) / sh - (xr - t) / h) * \
+            coeffs[1, i - 1] / sigma2
+        v2 = (np.sinh(sigma * (t - xl)) / sh - (t - xl) / h) * \
+            coeffs[1, i] / sigma2
+        v3 = coeffs[0, i - 1] * (xr - t) / h
+        v4 = coeffs[0, i] * (t - xl) / h
+        zero_rate = v1 + v2 + v3 + v4
+
+        return np.exp(-t * zero_rate)
+
+    # Times before the first or after the last break use the end intervals
+    num_intervals = breaks.size - 1
+    i = np.searchsorted(breaks, t, side="right") - 1
+    i = min(max(i, 0), num_intervals - 1)
+
+    s = t - breaks[i]
+    p = ((coeffs[0, i] * s + coeffs[1, i]) * s + coeffs[2, i]) * s \
+        + coeffs[3, i]
+
+    if method == InterpTypes.PCHIP_LOG_DISCOUNT.value or \
+            method == InterpTypes.NATCUBIC_LOG_DISCOUNT.value or \
+            method == InterpTypes.LINEAR_ONFWD_RATES.value:
+        return np.exp(p)
+    else:
+        return np.exp(-t * p)
+
+
+###############################################################################
+
+@njit(float64[:](float64[:], float64[:], float64[:, :], int64, float64),
+      fastmath=True, cache=True, nogil=True)
+def _vinterpolate_spline(ts, breaks, coeffs, method, sigma):
+    """ Return the discount factors at a vector of times from a spline fitted
+    by the Interpolator. See _uinterpolate_spline for the arguments. """
+
+    n = ts.size
+    dfs = np.empty(n)
+    for i in range(0, n):
+        dfs[i] = _uinterpolate_spline(ts[i], breaks, coeffs, method, sigma)
+
+    return dfs
+
+
+###############################################################################
+
+@njit(float64[:](float64[:], float64[:], int64),
+      fastmath=True, cache=True, nogil=True)
+def _vlast_knot_log_sensitivity(ts, times, method):
+    """ Return the derivative of the log of the discount factor at each time
+    in ts with respect to the log of the discount factor at the last knot.
+    This is only defined for the local schemes. In each of these the log of
+    an interpolated discount factor is linear in the log of the last knot
+    discount factor, so the derivative does not depend on the knot values.
+    The times before the previous knot do not depend on the last knot. """
+
+    n = ts.size
+    sens = np.zeros(n)
+    num_points = times.size
+
+    if num_points < 2:
+        return sens
+
+    t_prev = times[num_points - 2]
+    t_last = times[num_points - 1]
+    first = t_prev == 0.0
+
+    for k in range(0, n):
+
+        t = ts[k]
+
+        if t <= t_prev:
+            continue
+
+        lam = (t - t_prev) / (t_last - t_prev)
+
+        if method == InterpTypes.FLAT_FWD_RATES.value:
+            sens[k] = lam
+        elif method == InterpTypes.LINEAR_ZERO_RATES.value:
+            if first or t > t_last:
+                sens[k] = t / t_last
+            else:
+                sens[k] = lam * t / t_last
+        elif method == InterpTypes.LINEAR_FWD_RATES.value:
+            if first or t > t_last:
+                sens[k] = lam
+            else:
+                sens[k] = lam * lam
+        elif method == InterpTypes.LINEAR_ONFWD_RATES.value:
+            if first:
+                sens[k] = lam
+            elif t > t_last:
+                sens[k] = 2.0 * lam - 1.0
+            else:
+                sens[k] = lam * lam
+        else:
+            raise FinError("Interpolation scheme is not local.")
+
+    return sens
+
+
+###############################################################################
+
+@njit(float64[:](float64[:], float64[:], float64[:], int64, float64[:]),
+      fastmath=True, cache=True, nogil=True)
+def _vinterpolate_adjoint(ts, times, dfs, method, df_bars):
+    """ Return the derivative of the sum of the interpolated discount factors
+    at the times in ts weighted by df_bars with respect to each knot discount
+    factor. This is the reverse mode derivative of _vinterpolate. Each of the
+    local schemes makes the log of an interpolated discount factor a linear
+    combination of the logs of at most three knot discount factors so the
+    weights of this combination are all that is needed. """
+
+    small = 1e-10
+    num_points = times.size
+    grad = np.zeros(num_points)
+
+    for k in range(0, ts.size):
+
+        t = ts[k]
+        bar = df_bars[k]
+
+        if t == times[0]:
+            grad[0] += bar
+            continue
+
+        i = 0
+        while times[i] < t and i < num_points - 1:
+            i = i + 1
+
+        if t > times[i]:
+            i = num_points
+
+        y = _uinterpolate(t, times, dfs, method)
+
+        if method == InterpTypes.LINEAR_ZERO_RATES.value:
+
+            if i == 1:
+                grad[1] += bar * y * (t / times[1]) / dfs[1]
+            elif i < num_points:
+                dt = times[i] - times[i - 1]
+                w1 = t * (times[i] - t) / (dt * times[i - 1])
+                w2 = t * (t - times[i - 1]) / (dt * times[i])
+                grad[i - 1] += bar * y * w1 / dfs[i - 1]
+                grad[i] += bar * y * w2 / dfs[i]
+            else:
+                w = t / times[i - 1]
+                grad[i - 1] += bar * y * w / dfs[i - 1]
+
+        elif method == InterpTypes.FLAT_FWD_RATES.value:
+
+            if i < num_points:
+                i1 = i - 1
+                i2 = i
+            else:
+                i1 = i - 2
+                i2 = i - 1
+
+            dt = times[i2] - times[i1]
+            w1 = (times[i2] - t) / dt
+            w2 = (t - times[i1]) / dt
+            grad[i1] += bar * y * w1 / dfs[i1]
+            grad[i2] += bar * y * w2 / dfs[i2]
+
+        elif method == InterpTypes.LINEAR_FWD_RATES.value:
+
+            if i == 1:
+                w = t / (times[1] + small)
+                grad[1] += bar * y * w / (dfs[1] + small)
+            elif i < num_points:
+                h1 = times[i - 1] - times[i - 2]
+                h2 = times[i] - times[i - 1]
+                a = (times[i] - t) / h2
+                b = (t - times[i - 1]) / h2
+                s = t - times[i - 1]
+                grad[i - 2] += bar * y * (-s * a / h1) / dfs[i - 2]
+                grad[i - 1] += bar * y * (1.0 + s * a / h1 - s * b / h2) \
+                    / dfs[i - 1]
+                grad[i] += bar * y * (s * b / h2) / dfs[i]
+            else:
+                h = times[i - 1] - times[i - 2]
+                s = t - times[i - 1]
+                grad[i - 2] += bar * y * (-s / h) / dfs[i - 2]
+                grad[i - 1] += bar * y * (1.0 + s / h) / dfs[i - 1]
+
+        else:
+            raise FinError("Invalid interpolation scheme.")
+
+    return grad
+
+
 ###############################################################################
 
 
@@ -209,6 +452,19 @@ class Interpolator():
         self._refit_curve = False
         self._optional_interp_params = kwargs
 
+        # The fitted spline is evaluated by _uinterpolate_spline
+        self._breaks = None
+        self._coeffs = None
+        self._sigma = 0.0
+
+        # The overnight forward rates of the last fit of the LINEAR_ONFWD_RATES
+        # scheme with the number of rates and the last discount factor after
+        # each knot. These are reused when a fit only changes later knots.
+        self._onf_knots = None
+        self._onf_times = []
+        self._onf_rates = []
+        self._onf_state = []
+
     ###########################################################################
 
     def fit(self,
@@ -217,6 +473,9 @@ class Interpolator():
 
         self.times = times
         self._dfs = dfs
+        self._interp_fn = None
+        self._breaks = None
+        self._coeffs = None
 
         if len(times) == 1:
             return
@@ -283,11 +542,24 @@ class Interpolator():
     #                                      fill_value="extrapolate")
 
         elif self._interp_type == InterpTypes.LINEAR_ONFWD_RATES:
-            onf_times = []
-            onf_rates = []
-            prev_df = 1.0
-            for t, df in zip(self.times, self._dfs):
+
+            # A bootstrap adds one knot at a time so only the rates from the
+            # first knot that has changed since the last fit are calculated
+            num_reused = self._num_unchanged_knots()
+
+            if num_reused > 0:
+                (num_rates, prev_df) = self._onf_state[num_reused - 1]
+            else:
+                (num_rates, prev_df) = (0, 1.0)
+
+            onf_times = self._onf_times[0:num_rates]
+            onf_rates = self._onf_rates[0:num_rates]
+            del self._onf_state[num_reused:]
+
+            for t, df in zip(self.times[num_reused:],
+                             self._dfs[num_reused:]):
                 if t == 0.0:
+                    self._onf_state.append((len(onf_times), prev_df))
                     continue
                 if len(onf_times) == 0:
                     onfr = -np.log(df)/t
@@ -304,13 +576,33 @@ class Interpolator():
                     onf_rates.append(r)
 
                 prev_df = df
+                self._onf_state.append((len(onf_times), prev_df))
+
+            self._onf_knots = (np.array(self.times, dtype=np.float64),
+                               np.array(self._dfs, dtype=np.float64))
+            self._onf_times = onf_times
+            self._onf_rates = onf_rates
 
             if len(onf_times) == 0:
-                self._interp_fn = InterpolatedUnivariateSpline(
-                    [0.0, 0.1], [0.0, 0.0], k=1, ext=3)
-            else:
-                self._interp_fn = InterpolatedUnivariateSpline(
-                    onf_times, onf_rates, k=1, ext=3)
+                onf_times = [0.0, 0.1]
+                onf_rates = [0.0, 0.0]
+
+            # The log discount factor is minus the integral of the overnight
+            # forward rate. This is quadratic between the times and linear
+            # after the last time where the rate is held flat.
+            onf_times = np.array(onf_times)
+            onf_rates = np.array(onf_rates)
+            h = np.diff(onf_times)
+            slopes = np.diff(onf_rates) / h
+            integrals = np.zeros(len(onf_times))
+            integrals[1:] = np.cumsum(0.5 * h * (onf_rates[:-1] +
+                                                 onf_rates[1:]))
+
+            self._breaks = np.append(onf_times, onf_times[-1] + 1.0)
+            self._coeffs = np.zeros((4, len(onf_times)))
+            self._coeffs[1, :-1] = -0.5 * slopes
+            self._coeffs[2, :] = -onf_rates
+            self._coeffs[3, :] = -integrals
 
         elif self._interp_type == InterpTypes.TENSION_ZERO_RATES:
             tension_sigma = self._optional_interp_params.get('sigma', 1.0)
@@ -322,13 +614,45 @@ class Interpolator():
 
             self._interp_fn = TensionSpline(self.times, zero_rates, sigma=tension_sigma)
 
+            self._breaks = self._interp_fn._x
+            self._coeffs = np.vstack((self._interp_fn._y,
+                                      self._interp_fn._ypp))
+            self._sigma = self._interp_fn._sigma
+
+        # Store the piecewise cubic coefficients of the scipy splines
+        if isinstance(self._interp_fn, PPoly):
+            self._breaks = np.ascontiguousarray(self._interp_fn.x)
+            self._coeffs = np.ascontiguousarray(self._interp_fn.c)
+
+    ###########################################################################
+
+    def _num_unchanged_knots(self):
+        """ Return the number of knots at the start of the curve which have
+        the same times and discount factors as in the last fit of the
+        overnight forward rates. """
+
+        if self._onf_knots is None:
+            return 0
+
+        (old_times, old_dfs) = self._onf_knots
+        n = min(len(old_times), len(self.times))
+
+        same = (old_times[0:n] == np.asarray(self.times[0:n])) & \
+            (old_dfs[0:n] == np.asarray(self._dfs[0:n]))
+
+        if np.all(same):
+            return n
+
+        return int(np.argmin(same))
+
     ###########################################################################
 
     def interpolate(self,
-                    t: float):
+                    t: (float, np.ndarray)):
         """ Interpolation of discount factors at time x given discount factors
         at times provided using one of the methods in the enum InterpTypes.
-        The value of x can be an array so that the function is vectorised. """
+        The value of x can be an array so that the function is vectorised.
+        All of the schemes are evaluated by compiled functions. """
 
         if self._dfs is None:
             raise FinError("Dfs have not been set.")
@@ -342,6 +666,11 @@ class Interpolator():
             if np.abs(t) < g_small:
                 return 1.0
 
+            if self._coeffs is not None:
+                return _uinterpolate_spline(t, self._breaks, self._coeffs,
+                                            self._interp_type.value,
+                                            self._sigma)
+
             tvec = np.array([t])
 
         elif isinstance(t, np.ndarray):
@@ -355,40 +684,22 @@ class Interpolator():
         else:
             raise FinError("t is not a recognized type")
 
-        if self._interp_type in [InterpTypes.PCHIP_LOG_DISCOUNT,
-                                 InterpTypes.NATCUBIC_LOG_DISCOUNT]:
+        if self._coeffs is not None:
 
-            out = np.exp(self._interp_fn(tvec))
-
-        elif self._interp_type in [InterpTypes.PCHIP_ZERO_RATES,
-                                   InterpTypes.FINCUBIC_ZERO_RATES,
-                                   InterpTypes.NATCUBIC_ZERO_RATES,
-                                   InterpTypes.TENSION_ZERO_RATES, ]:
-
-            out = np.exp(-tvec * self._interp_fn(tvec))
+            out = _vinterpolate_spline(tvec.astype(np.float64), self._breaks,
+                                       self._coeffs, self._interp_type.value,
+                                       self._sigma)
 
         elif self._interp_type == InterpTypes.LINEAR_ONFWD_RATES:
-            if self._interp_fn is None:
-                # not enough data was used to fit the curve -- never reached the fitting stage
-                # (not sure why we have if len(times) == 1: return in the fit(...) function but reluctant to change that)
-                # so work around this. already tested that _dfs is not None
-                if len(self._dfs) == 0 or self.times[0] == 0.0:
-                    out = [1.0]*len(tvec)
-                else:
-                    onf_rate = -np.log(self._dfs[0])/self.times[0]
-                    out = np.exp(-onf_rate * tvec)
+            # not enough data was used to fit the curve -- never reached the fitting stage
+            # (not sure why we have if len(times) == 1: return in the fit(...) function but reluctant to change that)
+            # so work around this. already tested that _dfs is not None
+            if len(self._dfs) == 0 or self.times[0] == 0.0:
+                out = [1.0]*len(tvec)
             else:
-                # apparently UnivariateSpline.integral assumes the function is zero outside the data limits (WHY??????)
-                # so work around that. Note that we always have t=0 in the data so only need to worry about the right tail
-                # Here we assume constant extrapolation, consistent with how we set up our interpolator
-                def true_integral(spline, t):
-                    last_t = spline.get_knots()[-1]
-                    i1 = spline.integral(0.0, min(t, last_t))
-                    i2 = (t - min(t, last_t)) * spline(last_t)
-                    return i1 + i2
-
-                log_dfs = [-true_integral(self._interp_fn, t) for t in tvec]
-                out = np.exp(log_dfs)
+                onf_rate = -np.log(self._dfs[0])/self.times[0]
+                out = np.exp(-onf_rate * tvec)
+
         else:
 
             out = _vinterpolate(tvec, self.times, self._dfs,
@@ -399,6 +710,92 @@ class Interpolator():
         else:
             return out
 
+    ###########################################################################
+
+    def last_knot_log_sensitivity(self,
+                                  t: np.ndarray):
+        """ Return the derivative of the log of the discount factor at each
+        time in the vector t with respect to the log of the discount factor at
+        the last knot. This is analytic and only exists for the local schemes
+        which are suitable for a bootstrap. """
+
+        if Interpolator.suitable_for_bootstrap(self._interp_type) is False:
+            raise FinError("Interpolation scheme is not local.")
+
+        return _vlast_knot_log_sensitivity(np.asarray(t, dtype=np.float64),
+                                           np.asarray(self.times,
+                                                      dtype=np.float64),
+                                           self._interp_type.value)
+
+    ###########################################################################
+
+    def log_df_jacobian(self,
+                        t: np.ndarray,
+                        bump: float = 1e-6):
+        """ Return the matrix of derivatives of the log of the discount factor
+        at each time in the vector t with respect to the log of the discount
+        factor at each knot after the first. It is calculated by refitting to
+        bumped knots so it applies to every scheme. The interpolator is left
+        fitted to its original knots. """
+
+        times = np.array(self.times, dtype=np.float64)
+        dfs = np.array(self._dfs, dtype=np.float64)
+        t = np.asarray(t, dtype=np.float64)
+
+        log_dfs = np.log(self.interpolate(t))
+        jac = np.zeros((len(t), len(times) - 1))
+
+        for j in range(1, len(times)):
+            bumped_dfs = dfs.copy()
+            bumped_dfs[j] *= np.exp(bump)
+            self.fit(times, bumped_dfs)
+            jac[:, j - 1] = (np.log(self.interpolate(t)) - log_dfs) / bump
+
+        self.fit(times, dfs)
+        return jac
+
+    ###########################################################################
+
+    def df_knot_adjoint(self,
+                        t: np.ndarray,
+                        df_bars: np.ndarray):
+        """ Return the derivative of the sum of the discount factors at each
+        time in the vector t weighted by df_bars with respect to each knot
+        discount factor. This is the reverse mode derivative of interpolate so
+        the gradient of a price with respect to the knots only needs the
+        derivatives of the price with respect to the discount factors it uses.
+        It is analytic for the schemes that interpolate knots directly. The
+        others use the bumped log_df_jacobian with the first knot held fixed.
+        """
+
+        if self._dfs is None:
+            raise FinError("Dfs have not been set.")
+
+        t = np.asarray(t, dtype=np.float64)
+        df_bars = np.asarray(df_bars, dtype=np.float64)
+
+        if np.any(t < 0.0):
+            raise FinError("Interpolate times must all be >= 0")
+
+        times = np.asarray(self.times, dtype=np.float64)
+        dfs = np.asarray(self._dfs, dtype=np.float64)
+
+        if self._interp_type in (InterpTypes.FLAT_FWD_RATES,
+                                 InterpTypes.LINEAR_ZERO_RATES,
+                                 InterpTypes.LINEAR_FWD_RATES):
+            return _vinterpolate_adjoint(t, times, dfs,
+                                         self._interp_type.value, df_bars)
+
+        grad = np.zeros(len(times))
+
+        if len(times) > 1:
+            log_df_bars = df_bars * self.interpolate(t)
+            grad[1:] = (log_df_bars @ self.log_df_jacobian(t)) / dfs[1:]
+
+        return grad
+
+    ###########################################################################
+
     @classmethod
     def suitable_for_bootstrap(cls, interpType):
 
@@ -1,5 +1,10 @@
-from .equity_vol_curve import *
-from .equity_vol_surface import *
-# from .fx_vol_surface import *
-from .fx_vol_surface_plus import *
-from .ibor_cap_vol_curve import *
+from ...utils.lazy_import import lazy_package
+
+# Each module is only imported when one of its names is first used
+__getattr__, __dir__ = lazy_package(__name__, __file__, [
+    "equity_vol_curve",
+    "equity_vol_surface",
+    # "fx_vol_surface",
+    "fx_vol_surface_plus",
+    "ibor_cap_vol_curve",
+])
@@ -673,11 +673,25 @@ class BDTTree():
         self.discount_curve = None
         self.dt = None
 
+        # The parameters, curve and maturity that the tree was built for
+        self._tree_key = None
+        self._tree_mat = None
+
+
+###############################################################################
+
+    def _tree_is_built(self, tree_key, tree_mat):
+        """ Return True if the tree has already been built for the curve and
+        parameters in the key and for the same maturity. """
+
+        return tree_key == self._tree_key and tree_mat == self._tree_mat
 
 ###############################################################################
 
 
     def build_tree(self, tree_mat, df_times, df_values):
+        """ Build the binomial tree. This is skipped if the tree has already
+        been built for the same curve and parameters out to tree_mat. """
 
         if isinstance(df_times, np.ndarray) is False:
             raise FinError("DF TIMES must be a numpy vector")
@@ -685,6 +699,12 @@ class BDTTree():
         if isinstance(df_values, np.ndarray) is False:
             raise FinError("DF VALUES must be a numpy vector")
 
+        tree_key = (self.sigma, self.num_time_steps,
+                    df_times.tobytes(), df_values.tobytes())
+
+        if self._tree_is_built(tree_key, tree_mat):
+            return
+
         interp = InterpTypes.FLAT_FWD_RATES.value
 
         tree_maturity = tree_mat * \
@@ -706,6 +726,9 @@ class BDTTree():
             = build_tree_fast(self.sigma,
                               tree_times, self.num_time_steps, df_tree)
 
+        self._tree_key = tree_key
+        self._tree_mat = tree_mat
+
         return
 
 ###############################################################################
@@ -363,6 +363,174 @@ def bermudan_swaption_tree_fast(t_exp, t_mat,
 ###############################################################################
 
 
+@njit(fastmath=True, cache=True)
+def bermudan_swaption_tree_flows(t_exp, t_mat, strike_price, face_amount,
+                                 cpn_times, cpn_flows,
+                                 exercise_type_int,
+                                 _df_times, _df_values,
+                                 _tree_times, _dt, num_time_steps):
+    """ Map the fixed leg flows, floating leg values and accrued interest of
+    a Bermudan swaption onto the tree steps in the same way as the function
+    bermudan_swaption_tree_fast and flag the steps on which it can be
+    exercised. These are the inputs of one trade to the batched rollback. """
+
+    expiry_step = int(t_exp/_dt + 0.50)
+    maturity_step = int(t_mat/_dt + 0.50)
+
+    fixed_leg_flows = np.zeros(num_time_steps)
+    float_leg_values = np.ones(num_time_steps)
+    num_cpns = len(cpn_times)
+
+    for i in range(0, num_cpns):
+        t_cpn = cpn_times[i]
+        n = int(t_cpn/_dt + 0.50)
+        ttree = _tree_times[n]
+        df_flow = _uinterpolate(t_cpn, _df_times, _df_values, interp)
+        df_tree = _uinterpolate(ttree, _df_times, _df_values, interp)
+        fixed_leg_flows[n] += cpn_flows[i] * 1.0 * df_flow / df_tree
+        float_leg_values[n] = strike_price
+
+    mapped_times = np.array([0.0])
+    mapped_amounts = np.array([0.0])
+
+    for n in range(1, len(_tree_times)):
+
+        accd_at_expiry = 0.0
+        if _tree_times[n-1] < t_exp and _tree_times[n] >= t_exp:
+            mapped_times = np.append(mapped_times, t_exp)
+            mapped_amounts = np.append(mapped_amounts, accd_at_expiry)
+
+        if fixed_leg_flows[n] > 0.0:
+            mapped_times = np.append(mapped_times, _tree_times[n])
+            mapped_amounts = np.append(mapped_amounts, fixed_leg_flows[n])
+
+    accrued = np.zeros(num_time_steps)
+    for m in range(0, maturity_step+1):
+        ttree = _tree_times[m]
+        accrued[m] = accrued_interpolator(ttree, mapped_times, mapped_amounts)
+        accrued[m] *= face_amount
+
+        if fixed_leg_flows[m] > g_small:
+            accrued[m] = fixed_leg_flows[m] * face_amount
+
+    # The swaption can be exercised at expiry and on the later coupon steps
+    exercise = np.zeros(num_time_steps, dtype=np.bool_)
+    for m in range(0, maturity_step):
+        flow = fixed_leg_flows[m] * face_amount
+
+        if m == expiry_step:
+            exercise[m] = True
+        elif exercise_type_int == 2 and flow > g_small and m > expiry_step:
+            exercise[m] = True
+        elif exercise_type_int == 3 and m > expiry_step:
+            raise FinError("American optionality not allowed.")
+
+    return fixed_leg_flows, float_leg_values, accrued, exercise, \
+        maturity_step
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def bermudan_swaption_batch_tree_fast(maturity_steps, face_amounts,
+                                      fixed_leg_flows,
+                                      float_leg_values, accrued, exercise,
+                                      _Q, _pu, _pm, _pd, _rt, _dt, _a):
+    """ Roll back a batch of Bermudan swaptions together on the same tree.
+    The fixed leg flows, floating leg values, accrued interest and exercise
+    flags are matrices with a row for each tree step and a column for each
+    trade. The probabilities and the discount factor of each node are found
+    once for all of the trades and only the values at two time steps are
+    held, with the trades at a node next to each other in memory. """
+
+    num_time_steps, num_nodes = _Q.shape
+    num_trades = len(maturity_steps)
+    j_max = ceil(0.1835/(_a * _dt))
+    N = j_max
+
+    # The values of the fixed leg and of the options at the current step
+    fixed_leg_values = np.zeros(shape=(num_nodes, num_trades))
+    pay_values = np.zeros(shape=(num_nodes, num_trades))
+    rec_values = np.zeros(shape=(num_nodes, num_trades))
+
+    # The values at the step after it
+    next_fixed_leg_values = np.zeros(shape=(num_nodes, num_trades))
+    next_pay_values = np.zeros(shape=(num_nodes, num_trades))
+    next_rec_values = np.zeros(shape=(num_nodes, num_trades))
+
+    for m in range(np.max(maturity_steps), -1, -1):
+
+        next_fixed_leg_values, fixed_leg_values = \
+            fixed_leg_values, next_fixed_leg_values
+        next_pay_values, pay_values = pay_values, next_pay_values
+        next_rec_values, rec_values = rec_values, next_rec_values
+
+        nm = min(m, j_max)
+
+        for k in range(-nm, nm+1):
+            kN = k + N
+            rt = _rt[m, kN]
+            df = np.exp(-rt * _dt)
+            pu = _pu[kN]
+            pm = _pm[kN]
+            pd = _pd[kN]
+
+            if k == j_max:
+                ku, km, kd = kN, kN-1, kN-2
+            elif k == -j_max:
+                ku, km, kd = kN+2, kN+1, kN
+            else:
+                ku, km, kd = kN+1, kN, kN-1
+
+            for p in range(0, num_trades):
+
+                if m > maturity_steps[p]:
+                    continue
+
+                if m == maturity_steps[p]:
+                    flow = 1.0 + fixed_leg_flows[m, p]
+                    fixed_leg_values[kN, p] = flow * face_amounts[p]
+                    pay_values[kN, p] = 0.0
+                    rec_values[kN, p] = 0.0
+                    continue
+
+                flow = fixed_leg_flows[m, p] * face_amounts[p]
+
+                vu = next_fixed_leg_values[ku, p]
+                vm = next_fixed_leg_values[km, p]
+                vd = next_fixed_leg_values[kd, p]
+                v = (pu*vu + pm*vm + pd*vd) * df
+                fixed_leg_values[kN, p] = v + flow
+
+                vu = next_pay_values[ku, p]
+                vm = next_pay_values[km, p]
+                vd = next_pay_values[kd, p]
+                vpay = (pu*vu + pm*vm + pd*vd) * df
+
+                vu = next_rec_values[ku, p]
+                vm = next_rec_values[km, p]
+                vd = next_rec_values[kd, p]
+                vrec = (pu*vu + pm*vm + pd*vd) * df
+
+                if exercise[m, p]:
+                    # The floating value is clean and so must be the fixed
+                    fixed_leg_value = fixed_leg_values[kN, p] - accrued[m, p]
+                    float_leg_value = float_leg_values[m, p]
+
+                    pay_exercise = max(float_leg_value - fixed_leg_value, 0.0)
+                    rec_exercise = max(fixed_leg_value - float_leg_value, 0.0)
+
+                    vpay = max(pay_exercise, vpay)
+                    vrec = max(rec_exercise, vrec)
+
+                pay_values[kN, p] = vpay
+                rec_values[kN, p] = vrec
+
+    return pay_values[j_max].copy(), rec_values[j_max].copy()
+
+###############################################################################
+
+
 @njit(fastmath=True, cache=True)
 def american_bond_option_tree_fast(t_exp, t_mat,
                                    strike_price, face_amount,
@@ -758,6 +926,156 @@ def callable_puttable_bond_tree_fast(cpn_times, cpn_flows,
 ###############################################################################
 
 
+@njit(fastmath=True, cache=True)
+def callable_puttable_bond_tree_flows(cpn_times, cpn_flows,
+                                      call_times, call_prices,
+                                      put_times, put_prices, face_amount,
+                                      _tree_times, _dt, _df_times, _df_values,
+                                      num_time_steps):
+    """ Map the coupons, accrued interest, call prices and put prices of a
+    bond with embedded options onto the tree steps in the same way as the
+    function callable_puttable_bond_tree_fast and flag the steps on which it
+    can be called or put. These are the inputs of one trade to the batched
+    rollback. """
+
+    t_mat = cpn_times[-1]
+    maturity_step = int(t_mat/_dt + 0.50)
+
+    tree_flows = np.zeros(num_time_steps)
+
+    num_cpns = len(cpn_times)
+    for i in range(0, num_cpns):
+        t_cpn = cpn_times[i]
+        n = int(t_cpn/_dt + 0.50)
+        ttree = _tree_times[n]
+        df_flow = _uinterpolate(t_cpn, _df_times, _df_values, interp)
+        df_tree = _uinterpolate(ttree, _df_times, _df_values, interp)
+        tree_flows[n] += cpn_flows[i] * 1.0 * df_flow / df_tree
+
+    mapped_times = np.array([0.0])
+    mapped_amounts = np.array([0.0])
+    for n in range(1, len(_tree_times)):
+        if tree_flows[n] > 0.0:
+            mapped_times = np.append(mapped_times, _tree_times[n])
+            mapped_amounts = np.append(mapped_amounts, tree_flows[n])
+
+    accrued = np.zeros(num_time_steps)
+    for m in range(0, num_time_steps):
+        ttree = _tree_times[m]
+        accrued[m] = accrued_interpolator(ttree, mapped_times, mapped_amounts)
+        accrued[m] *= face_amount
+
+        if tree_flows[m] > 0.0:
+            accrued[m] = tree_flows[m] * face_amount
+
+    call_values = np.zeros(num_time_steps)
+    call_mask = np.zeros(num_time_steps, dtype=np.bool_)
+    for i in range(0, len(call_times)):
+        n = int(call_times[i]/_dt + 0.50)
+        call_values[n] = call_prices[i]
+        call_mask[n] = True
+
+    put_values = np.zeros(num_time_steps)
+    put_mask = np.zeros(num_time_steps, dtype=np.bool_)
+    for i in range(0, len(put_times)):
+        n = int(put_times[i]/_dt + 0.50)
+        put_values[n] = put_prices[i]
+        put_mask[n] = True
+
+    return tree_flows, accrued, call_values, call_mask, put_values, \
+        put_mask, maturity_step
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def callable_puttable_bond_batch_tree_fast(maturity_steps, face_amounts,
+                                           tree_flows, accrued,
+                                           call_values, call_mask,
+                                           put_values, put_mask,
+                                           _Q, _pu, _pm, _pd, _rt, _dt, _a):
+    """ Roll back a batch of bonds with embedded calls and puts together on
+    the same tree. The coupons, accrued interest, call and put prices and the
+    masks of the steps on which each bond can be called or put are matrices
+    with a row for each tree step and a column for each trade. Only the
+    values at two time steps are held, with the trades at a node next to
+    each other in memory. """
+
+    num_time_steps, num_nodes = _Q.shape
+    num_trades = len(maturity_steps)
+    j_max = ceil(0.1835/(_a * _dt))
+    N = j_max
+
+    # The values of the pure bond and of the bond with options at this step
+    bond_values = np.zeros(shape=(num_nodes, num_trades))
+    call_put_bond_values = np.zeros(shape=(num_nodes, num_trades))
+
+    # The values at the step after it
+    next_bond_values = np.zeros(shape=(num_nodes, num_trades))
+    next_call_put_bond_values = np.zeros(shape=(num_nodes, num_trades))
+
+    for m in range(np.max(maturity_steps), -1, -1):
+
+        next_bond_values, bond_values = bond_values, next_bond_values
+        next_call_put_bond_values, call_put_bond_values = \
+            call_put_bond_values, next_call_put_bond_values
+
+        nm = min(m, j_max)
+
+        for k in range(-nm, nm+1):
+            kN = k + N
+            rt = _rt[m, kN]
+            df = np.exp(-rt * _dt)
+            pu = _pu[kN]
+            pm = _pm[kN]
+            pd = _pd[kN]
+
+            if k == j_max:
+                ku, km, kd = kN, kN-1, kN-2
+            elif k == -j_max:
+                ku, km, kd = kN+2, kN+1, kN
+            else:
+                ku, km, kd = kN+1, kN, kN-1
+
+            for p in range(0, num_trades):
+
+                if m > maturity_steps[p]:
+                    continue
+
+                if m == maturity_steps[p]:
+                    vhold = (1.0 + tree_flows[m, p]) \
+                        * face_amounts[p]
+                    bond_values[kN, p] = vhold
+                else:
+                    flow = tree_flows[m, p] * face_amounts[p]
+
+                    vu = next_bond_values[ku, p]
+                    vm = next_bond_values[km, p]
+                    vd = next_bond_values[kd, p]
+                    v = (pu*vu + pm*vm + pd*vd) * df
+                    bond_values[kN, p] = v + flow
+
+                    vu = next_call_put_bond_values[ku, p]
+                    vm = next_call_put_bond_values[km, p]
+                    vd = next_call_put_bond_values[kd, p]
+                    vhold = (pu*vu + pm*vm + pd*vd) * df + flow
+
+                # The call and put prices are clean prices
+                value = vhold - accrued[m, p]
+
+                if put_mask[m, p]:
+                    value = max(value, put_values[m, p])
+
+                if call_mask[m, p]:
+                    value = min(value, call_values[m, p])
+
+                call_put_bond_values[kN, p] = value + accrued[m, p]
+
+    return call_put_bond_values[j_max].copy(), bond_values[j_max].copy()
+
+###############################################################################
+
+
 @njit(fastmath=True, cache=True)
 def build_tree_fast(a, sigma, tree_times, num_time_steps, discount_factors):
     """ Calibrate the tree to a term structure of interest rates. """
@@ -898,9 +1216,23 @@ class BKTree():
         self.dfs = None
         self.dt = None
 
+        # The parameters, curve and maturity that the tree was built for
+        self._tree_key = None
+        self._tree_mat = None
+
+###############################################################################
+
+    def _tree_is_built(self, tree_key, tree_mat):
+        """ Return True if the tree has already been built for the curve and
+        parameters in the key and for the same maturity. """
+
+        return tree_key == self._tree_key and tree_mat == self._tree_mat
+
 ###############################################################################
 
     def build_tree(self, t_mat, df_times, df_values):
+        """ Build the trinomial tree. This is skipped if the tree has already
+        been built for the same curve and parameters out to t_mat. """
 
         if isinstance(df_times, np.ndarray) is False:
             raise FinError("DF TIMES must be a numpy vector")
@@ -908,6 +1240,12 @@ class BKTree():
         if isinstance(df_values, np.ndarray) is False:
             raise FinError("DF VALUES must be a numpy vector")
 
+        tree_key = (self.sigma, self.a, self.num_time_steps,
+                    df_times.tobytes(), df_values.tobytes())
+
+        if self._tree_is_built(tree_key, t_mat):
+            return
+
         interp = InterpTypes.FLAT_FWD_RATES.value
 
         tree_maturity = t_mat * (self.num_time_steps+1)/self.num_time_steps
@@ -928,6 +1266,9 @@ class BKTree():
             = build_tree_fast(self.a, self.sigma,
                               tree_times, self.num_time_steps, df_tree)
 
+        self._tree_key = tree_key
+        self._tree_mat = t_mat
+
         return
 
 ###############################################################################
@@ -995,6 +1336,65 @@ class BKTree():
 
         return {'pay': pay_value, 'rec': rec_value}
 
+###############################################################################
+
+    def bermudan_swaption_batch(self, t_exps, strikes, faces,
+                                cpn_times_list, cpn_flows_list,
+                                exercise_types):
+        """ Value a batch of swaptions that can be exercised on specific dates
+        over their exercise periods by rolling them back together on the tree
+        which must extend out to the last swap maturity. Each argument has an
+        entry for each swaption and the pay and receive values are returned
+        as arrays. """
+
+        num_trades = len(t_exps)
+        num_time_steps = self.Q.shape[0]
+
+        maturity_steps = np.zeros(num_trades, dtype=np.int64)
+        fixed_leg_flows = np.zeros(shape=(num_time_steps, num_trades))
+        float_leg_values = np.zeros(shape=(num_time_steps, num_trades))
+        accrued = np.zeros(shape=(num_time_steps, num_trades))
+        exercise = np.zeros(shape=(num_time_steps, num_trades),
+                            dtype=np.bool_)
+
+        for p in range(0, num_trades):
+
+            t_exp = t_exps[p]
+            cpn_times = cpn_times_list[p]
+            t_mat = cpn_times[-1]
+
+            if t_exp > t_mat:
+                raise FinError("Option expiry after bond matures.")
+
+            if t_exp < 0.0:
+                raise FinError("Option expiry time negative.")
+
+            if int(t_mat/self.dt + 0.50) >= num_time_steps:
+                raise FinError("Tree does not extend out to swap maturity.")
+
+            exercise_type_int = option_exercise_types_to_int(exercise_types[p])
+
+            fixed_leg_flows[:, p], float_leg_values[:, p], accrued[:, p], \
+                exercise[:, p], maturity_steps[p] \
+                = bermudan_swaption_tree_flows(t_exp, t_mat, strikes[p],
+                                               faces[p], cpn_times,
+                                               cpn_flows_list[p],
+                                               exercise_type_int,
+                                               self.df_times, self.dfs,
+                                               self.tree_times, self.dt,
+                                               num_time_steps)
+
+        pay_values, rec_values \
+            = bermudan_swaption_batch_tree_fast(maturity_steps,
+                                                np.array(faces, dtype=float),
+                                                fixed_leg_flows,
+                                                float_leg_values, accrued,
+                                                exercise, self.Q, self.pu,
+                                                self.pm, self.pd, self.rt,
+                                                self.dt, self.a)
+
+        return {'pay': pay_values, 'rec': rec_values}
+
 ###############################################################################
 
     def callable_puttable_bond_tree(self,
@@ -1025,6 +1425,60 @@ class BKTree():
         return {'bondwithoption': v['bondwithoption'],
                 'bondpure': v['bondpure']}
 
+###############################################################################
+
+    def callable_puttable_bond_batch(self, cpn_times_list, cpn_flows_list,
+                                     call_times_list, call_prices_list,
+                                     put_times_list, put_prices_list,
+                                     faces):
+        """ Value a batch of bonds with embedded calls and puts by rolling
+        them back together on the tree which must extend out to the last bond
+        maturity. Each argument has an entry for each bond and the values of
+        the bonds with and without their options are returned as arrays. """
+
+        num_trades = len(cpn_times_list)
+        num_time_steps = self.Q.shape[0]
+
+        maturity_steps = np.zeros(num_trades, dtype=np.int64)
+        tree_flows = np.zeros(shape=(num_time_steps, num_trades))
+        accrued = np.zeros(shape=(num_time_steps, num_trades))
+        call_values = np.zeros(shape=(num_time_steps, num_trades))
+        call_mask = np.zeros(shape=(num_time_steps, num_trades),
+                             dtype=np.bool_)
+        put_values = np.zeros(shape=(num_time_steps, num_trades))
+        put_mask = np.zeros(shape=(num_time_steps, num_trades),
+                            dtype=np.bool_)
+
+        for p in range(0, num_trades):
+
+            cpn_times = np.array(cpn_times_list[p], dtype=float)
+
+            if int(cpn_times[-1]/self.dt + 0.50) >= num_time_steps:
+                raise FinError("Tree does not extend out to bond maturity.")
+
+            tree_flows[:, p], accrued[:, p], call_values[:, p], \
+                call_mask[:, p], put_values[:, p], put_mask[:, p], \
+                maturity_steps[p] \
+                = callable_puttable_bond_tree_flows(
+                    cpn_times,
+                    np.array(cpn_flows_list[p], dtype=float),
+                    np.array(call_times_list[p], dtype=float),
+                    np.array(call_prices_list[p], dtype=float),
+                    np.array(put_times_list[p], dtype=float),
+                    np.array(put_prices_list[p], dtype=float),
+                    float(faces[p]), self.tree_times, self.dt,
+                    self.df_times, self.dfs, num_time_steps)
+
+        bond_with_option_values, bond_values \
+            = callable_puttable_bond_batch_tree_fast(
+                maturity_steps, np.array(faces, dtype=float),
+                tree_flows, accrued, call_values, call_mask, put_values,
+                put_mask, self.Q, self.pu, self.pm, self.pd, self.rt,
+                self.dt, self.a)
+
+        return {'bondwithoption': bond_with_option_values,
+                'bondpure': bond_values}
+
 ###############################################################################
 
     def __repr__(self):
@@ -467,7 +467,7 @@ def baw_value(s, t, k, r, q, v, phi):
 ###############################################################################
 
 
-@njit(fastmath=True)
+@njit(fastmath=True, cache=True)
 def bjerksund_stensland_value(s, t, k, r, q, v, option_type_value):
     """Price American Option using the Bjerksund-Stensland
      approximation (1993) for the Black Scholes Model"""
@@ -134,7 +134,7 @@ def draw(rt, a, b, sigma, dt):
         float64,
         float64,
         int64,
-        int64))
+        int64), cache=True)
 def rate_path_mc(r0, a, b, sigma, t, dt, seed, scheme):
     """ Generate a path of CIR rates using a number of numerical schemes. """
 
@@ -234,7 +234,7 @@ def rate_path_mc(r0, a, b, sigma, t, dt, seed, scheme):
         float64,
         int64,
         int64,
-        int64))
+        int64), cache=True)
 def zero_price_mc(r0, a, b, sigma, t, dt, num_paths, seed, scheme):
     """ Determine the CIR zero price using Monte Carlo. """
 
@@ -98,7 +98,7 @@ def value_barrier(t, k, h, s, r, q, v, option_type, nobs):
     elif option_type == EquityBarrierTypes.DOWN_AND_IN_PUT.value:
         h_adj = h * np.exp(-0.5826 * v * np.sqrt(t))
     else:
-        raise FinError("Unknown barrier option type." + str(option_type))
+        raise FinError("Unknown barrier option type.")
 
     h = h_adj
 
@@ -195,7 +195,7 @@ def value_barrier(t, k, h, s, r, q, v, option_type, nobs):
                 (N(y - sigma_rt_t) - N(y1 - sigma_rt_t))
             price = p_di
     else:
-        raise FinError("Unknown barrier option type." + str(option_type))
+        raise FinError("Unknown barrier option type.")
 
     return price
 
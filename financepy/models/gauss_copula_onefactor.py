@@ -132,7 +132,7 @@ def homog_basket_loss_dbn(survival_probs,
 
 
 @njit(float64(float64, float64, int64, float64[:], float64[:], float64[:],
-              int64), fastmath=True)
+              int64), fastmath=True, cache=True)
 def tranche_surv_prob_recursion(k1,
                                 k2,
                                 num_credits,
@@ -13,7 +13,7 @@ from ..utils.error import FinError
 ###############################################################################
 
 
-@njit
+@njit(cache=True)
 def get_paths_times(num_paths, num_time_steps, t, mu, stock_price, volatility, seed):
     """Get the simulated GBM process for a single asset with even num paths and
     time steps. Inputs include the number of time steps, paths, the drift mu,
@@ -47,7 +47,7 @@ def get_paths_times(num_paths, num_time_steps, t, mu, stock_price, volatility, s
 ###############################################################################
 
 
-@njit
+@njit(cache=True)
 def get_assets_paths_times(
     num_assets,
     num_paths,
@@ -121,7 +121,7 @@ def get_assets_paths_times(
 ###############################################################################
 
 
-@njit
+@njit(cache=True)
 def get_assets_paths(
     num_assets,
     num_paths,
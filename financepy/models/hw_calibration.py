@@ -0,0 +1,262 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+import numpy as np
+from scipy.optimize import least_squares
+from scipy.stats import norm
+
+from ..utils.error import FinError
+from ..utils.date import Date
+from ..utils.global_vars import g_days_in_year
+from ..utils.global_types import SwapTypes
+from ..utils.helpers import label_to_string
+from ..market.curves.discount_curve import DiscountCurve
+from ..market.volatility.swaption_vol_surface import SwaptionVolSurface
+from ..models.black import Black
+from ..models.hw_tree import _b_fn, hw_variance_weights
+
+SMALL = 1e-8
+
+###############################################################################
+# The swaptions are priced in the Hull-White model with a constant mean
+# reversion a and a volatility which is piecewise constant between the
+# sigma times and flat after the last one. At the expiry time t_exp the zero
+# coupon bond to time t is a lognormal function of one Gaussian factor with
+# variance V(t_exp) and loading B(t - t_exp) so Jamshidian's decomposition
+# gives the swaption as a strip of zero coupon bond options.
+###############################################################################
+
+
+class HWSwaptionCalibrator():
+    """ Calibrates the Hull-White model with a constant mean reversion and a
+    piecewise constant volatility to the Black prices of a set of European
+    swaptions, such as the co-terminal swaptions of a Bermudan or a grid of
+    expiries and tenors. The swaptions are priced together with Jamshidian's
+    decomposition on padded matrices of their coupons and the gradients with
+    respect to the volatilities and the mean reversion are analytic, so the
+    least squares fit takes only a few milliseconds. """
+
+    def __init__(self,
+                 value_dt: Date,
+                 discount_curve: DiscountCurve,
+                 swaptions: list,
+                 black_vols):
+        """ Create the calibrator from a list of IborSwaptions and either a
+        Black volatility for each swaption, which can be a grid that is read
+        in the same order as the list, or a SwaptionVolSurface from which
+        the volatility at the strike and expiry of each swaption is taken. """
+
+        num_swaptions = len(swaptions)
+
+        if num_swaptions == 0:
+            raise FinError("No swaptions to calibrate to.")
+
+        if isinstance(black_vols, SwaptionVolSurface):
+            vols = [black_vols.vol_from_strike_dt(swaption.fixed_cpn,
+                                                  swaption.exercise_dt)
+                    for swaption in swaptions]
+        else:
+            vols = np.ravel(black_vols)
+
+        if len(vols) != num_swaptions:
+            raise FinError("Need one Black volatility for each swaption.")
+
+        self.value_dt = value_dt
+        self.swaptions = swaptions
+        self.black_vols = np.array(vols, dtype=float)
+
+        num_cpns = [len(s.underlying_swap.fixed_leg.payment_dts)
+                    for s in swaptions]
+        max_cpns = max(num_cpns)
+
+        self._t_exp = np.zeros(num_swaptions)
+        self._df_exp = np.zeros(num_swaptions)
+        self._scale = np.zeros(num_swaptions)
+        self._is_payer = np.zeros(num_swaptions, dtype=bool)
+
+        # The coupons of each swap after expiry with the principal added to
+        # the last one, padded with zeros to the longest swap
+        self._tau = np.zeros((num_swaptions, max_cpns))
+        self._cpn_pvs = np.zeros((num_swaptions, max_cpns))
+
+        self.market_values = np.zeros(num_swaptions)
+        self._vegas = np.zeros(num_swaptions)
+
+        for j, swaption in enumerate(swaptions):
+
+            t_exp = (swaption.exercise_dt - value_dt) / g_days_in_year
+
+            if t_exp <= 0.0:
+                raise FinError("Swaption expiry must be after value date.")
+
+            fixed_leg = swaption.underlying_swap.fixed_leg
+            num_flows = len(fixed_leg.payment_dts)
+
+            # These are the same coupons and discount factors as are used in
+            # the Jamshidian valuation of the IborSwaption with a HWTree
+            k = 0
+            for i_flow in range(0, num_flows):
+                flow_dt = fixed_leg.payment_dts[i_flow]
+                if flow_dt > swaption.exercise_dt:
+                    t_cpn = (flow_dt - value_dt) / g_days_in_year
+                    cpn = fixed_leg.payments[i_flow] / swaption.notional
+                    self._tau[j, k] = t_cpn - t_exp
+                    self._cpn_pvs[j, k] = cpn * discount_curve.df_t(t_cpn)
+                    k += 1
+
+            if k == 0:
+                raise FinError("Swaption has no coupons after expiry.")
+
+            self._cpn_pvs[j, k - 1] += discount_curve.df_t(t_cpn)
+
+            self._t_exp[j] = t_exp
+            self._df_exp[j] = discount_curve.df_t(t_exp)
+            self._scale[j] = swaption.notional \
+                / discount_curve.df(swaption.settle_dt)
+            self._is_payer[j] = swaption.fixed_leg_type == SwapTypes.PAY
+
+            vol = self.black_vols[j]
+            details = swaption.valuation_details(value_dt, discount_curve,
+                                                 Black(vol))
+            self.market_values[j] = details["value"]
+
+            # The Black vega is used to turn price errors into vol errors
+            f = details["fwd_swap_rate"]
+            t = (swaption.exercise_dt - swaption.settle_dt) / g_days_in_year
+            d1 = (np.log(f / swaption.fixed_cpn) + vol * vol * t / 2.0) \
+                / (vol * np.sqrt(t))
+            self._vegas[j] = details["pv01"] * self._scale[j] * f \
+                * np.sqrt(t) * norm.pdf(d1)
+
+        self._vegas = np.maximum(self._vegas, SMALL * self._scale)
+
+    ###########################################################################
+
+    def values(self, sigmas, a, sigma_times):
+        """ Return the Hull-White value of each swaption for a piecewise
+        constant volatility with values sigmas up to each of the sigma times
+        and a mean reversion a, together with the matrix of derivatives of
+        the values with respect to the sigmas and then a. """
+
+        sigmas = np.asarray(sigmas, dtype=float)
+        sigma_times = np.asarray(sigma_times, dtype=float)
+
+        if len(sigmas) != len(sigma_times):
+            raise FinError("Need one volatility for each sigma time.")
+
+        w, dw = hw_variance_weights(self._t_exp, sigma_times, a)
+
+        v = w @ sigmas**2
+        s = np.sqrt(np.maximum(v, SMALL**2))
+        ds_dsigmas = w * sigmas / s[:, np.newaxis]
+        ds_da = (dw @ sigmas**2) / (2.0 * s)
+
+        b, db = _b_fn(a, self._tau)
+        beta = b * s[:, np.newaxis]
+
+        # The bond prices at expiry per unit forward are exp(-beta z - beta^2
+        # / 2) with z a standard normal. Find the z that makes the coupon
+        # bond worth par by Newton's method on the log which is convex.
+        wts = self._cpn_pvs / self._df_exp[:, np.newaxis] \
+            * np.exp(-0.5 * beta**2)
+        z = np.zeros(len(s))
+
+        for _ in range(0, 50):
+            terms = wts * np.exp(-beta * z[:, np.newaxis])
+            pv = terms.sum(axis=1)
+            g = np.log(pv)
+            if np.max(np.abs(g)) < 1e-14:
+                break
+            z = z + g / ((terms * beta).sum(axis=1) / pv)
+
+        # Jamshidian's strip of zero coupon bond call options is the receiver
+        # and the payer follows from put-call parity.
+        nd = norm.cdf(z[:, np.newaxis] + beta)
+        receiver = (self._cpn_pvs * nd).sum(axis=1) \
+            - self._df_exp * norm.cdf(z)
+        payer = receiver + self._df_exp - self._cpn_pvs.sum(axis=1)
+        values = np.where(self._is_payer, payer, receiver) * self._scale
+
+        # The payoff is zero at z so only the bond volatilities move it
+        dv_dbeta = self._cpn_pvs * norm.pdf(z[:, np.newaxis] + beta) \
+            * self._scale[:, np.newaxis]
+        dv_ds = (dv_dbeta * b).sum(axis=1)
+        dv_db = dv_dbeta * s[:, np.newaxis]
+
+        jac = np.zeros((len(s), len(sigmas) + 1))
+        jac[:, :-1] = dv_ds[:, np.newaxis] * ds_dsigmas
+        jac[:, -1] = dv_ds * ds_da + (dv_db * db).sum(axis=1)
+
+        return values, jac
+
+    ###########################################################################
+
+    def calibrate(self,
+                  sigma_times: np.ndarray = None,
+                  a: float = None,
+                  sigma_guess: float = 0.01,
+                  a_guess: float = 0.05):
+        """ Fit the volatilities and, unless a is given, the mean reversion to
+        the swaption prices by least squares on the price errors divided by
+        the Black vegas, which are close to the Black volatility errors. The
+        volatility is constant up to each sigma time and these default to
+        the distinct expiry times, which for co-terminal swaptions gives one
+        volatility per swaption. Returns a dictionary with the parameters,
+        the model and market values and the volatility errors. The sigmas,
+        sigma_times and a can be passed straight to a HWTree. """
+
+        if sigma_times is None:
+            sigma_times = np.unique(self._t_exp)
+
+        sigma_times = np.asarray(sigma_times, dtype=float)
+        num_sigmas = len(sigma_times)
+        fit_a = a is None
+
+        def residuals(x):
+            values, _ = self.values(x[:num_sigmas], x[-1], sigma_times)
+            return (values - self.market_values) / self._vegas
+
+        def jacobian(x):
+            _, jac = self.values(x[:num_sigmas], x[-1], sigma_times)
+            jac = jac / self._vegas[:, np.newaxis]
+            if not fit_a:
+                jac[:, -1] = 0.0
+            return jac
+
+        x0 = np.full(num_sigmas + 1, sigma_guess)
+        x0[-1] = a_guess if fit_a else a
+        lower = np.full(num_sigmas + 1, 1e-6)
+        upper = np.full(num_sigmas + 1, np.inf)
+        lower[-1] = 0.0 if fit_a else a - SMALL
+        upper[-1] = 2.0 if fit_a else a + SMALL
+
+        result = least_squares(residuals, x0, jac=jacobian,
+                               bounds=(lower, upper), method="trf",
+                               x_scale=np.abs(x0) + SMALL)
+
+        sigmas = result.x[:num_sigmas]
+        a = result.x[-1] if fit_a else a
+        values, _ = self.values(sigmas, a, sigma_times)
+
+        return {"sigma_times": sigma_times,
+                "sigmas": sigmas,
+                "a": a,
+                "values": values,
+                "market_values": self.market_values,
+                "vol_errors": (values - self.market_values) / self._vegas}
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("VALUE DATE", self.value_dt)
+        s += label_to_string("NUM SWAPTIONS", len(self.swaptions), "")
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        print(self)
+
+###############################################################################
@@ -79,6 +79,70 @@ def p_fast(t, T, r_t, delta, pt, ptd, pT, _sigma, _a):
 ###############################################################################
 
 
+def _b_fn(a, tau):
+    """ Return B(tau) = (1 - exp(-a tau)) / a and its derivative with respect
+    to a, using a series expansion when a is close to zero. """
+
+    if a < SMALL:
+        b = tau - a * tau**2 / 2.0
+        db = -tau**2 / 2.0 + a * tau**3 / 3.0
+    else:
+        b = -np.expm1(-a * tau) / a
+        db = (tau * np.exp(-a * tau) - b) / a
+
+    return b, db
+
+###############################################################################
+
+
+def hw_variance_weights(t_exp, sigma_times, a):
+    """ Return the matrix W with a row for each expiry time and a column for
+    each volatility bucket such that the variance of the Hull-White factor at
+    each expiry is W @ sigmas**2, together with the derivative of W with
+    respect to the mean reversion a. The first bucket starts at time zero
+    and the last one has no end. """
+
+    t_exp = np.asarray(t_exp, dtype=float)[:, np.newaxis]
+    sigma_times = np.asarray(sigma_times, dtype=float)
+
+    lo = np.concatenate(([0.0], sigma_times[:-1]))[np.newaxis, :]
+    hi = np.concatenate((sigma_times[:-1], [np.inf]))[np.newaxis, :]
+
+    hi = np.minimum(hi, t_exp)
+    delta = np.maximum(hi - lo, 0.0)
+    h = np.maximum(t_exp - hi, 0.0)
+
+    g, dg = _b_fn(2.0 * a, delta)
+    decay = np.exp(-2.0 * a * h)
+
+    w = decay * g
+    dw = -2.0 * h * w + 2.0 * decay * dg
+
+    return w, dw
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def _time_step(t, _tree_times):
+    """ Return the index of the tree time that is closest to time t. """
+
+    n = np.searchsorted(_tree_times, t)
+
+    if n == 0:
+        return 0
+
+    if n == len(_tree_times):
+        return n - 1
+
+    if t - _tree_times[n-1] < _tree_times[n] - t:
+        return n - 1
+
+    return n
+
+###############################################################################
+
+
 @njit(fastmath=True, cache=True)
 def build_tree_fast(a, sigma, tree_times, num_time_steps, discount_factors):
     """ Fast tree construction using Numba. """
@@ -88,9 +152,12 @@ def build_tree_fast(a, sigma, tree_times, num_time_steps, discount_factors):
     j_max = ceil(0.1835/(a * dt))
     N = j_max
 
-    pu = np.zeros(shape=2*j_max+1)
-    pm = np.zeros(shape=2*j_max+1)
-    pd = np.zeros(shape=2*j_max+1)
+    # The probabilities and the index of the middle node that each node
+    # branches to are held for each time step as in build_general_tree_fast
+    pu = np.zeros(shape=(num_time_steps+2, 2*j_max+1))
+    pm = np.zeros(shape=(num_time_steps+2, 2*j_max+1))
+    pd = np.zeros(shape=(num_time_steps+2, 2*j_max+1))
+    centre = np.zeros(shape=(num_time_steps+2, 2*j_max+1), dtype=np.int64)
 
     # The short rate goes out one step extra to have the final short rate
     r_t = np.zeros(shape=(num_time_steps+2, 2*j_max+1))
@@ -104,17 +171,28 @@ def build_tree_fast(a, sigma, tree_times, num_time_steps, discount_factors):
         ajdt = a*j*dt
         jN = j + N
         if j == j_max:
-            pu[jN] = 7.0/6.0 + 0.50*(ajdt*ajdt - 3.0*ajdt)
-            pm[jN] = -1.0/3.0 - ajdt*ajdt + 2.0*ajdt
-            pd[jN] = 1.0/6.0 + 0.50*(ajdt*ajdt - ajdt)
+            pu[:, jN] = 7.0/6.0 + 0.50*(ajdt*ajdt - 3.0*ajdt)
+            pm[:, jN] = -1.0/3.0 - ajdt*ajdt + 2.0*ajdt
+            pd[:, jN] = 1.0/6.0 + 0.50*(ajdt*ajdt - ajdt)
+            centre[:, jN] = jN - 1
         elif j == -j_max:
-            pu[jN] = 1.0/6.0 + 0.50*(ajdt*ajdt + ajdt)
-            pm[jN] = -1.0/3.0 - ajdt*ajdt - 2.0*ajdt
-            pd[jN] = 7.0/6.0 + 0.50*(ajdt*ajdt + 3.0*ajdt)
+            pu[:, jN] = 1.0/6.0 + 0.50*(ajdt*ajdt + ajdt)
+            pm[:, jN] = -1.0/3.0 - ajdt*ajdt - 2.0*ajdt
+            pd[:, jN] = 7.0/6.0 + 0.50*(ajdt*ajdt + 3.0*ajdt)
+            centre[:, jN] = jN + 1
         else:
-            pu[jN] = 1.0/6.0 + 0.50*(ajdt*ajdt - ajdt)
-            pm[jN] = 2.0/3.0 - ajdt*ajdt
-            pd[jN] = 1.0/6.0 + 0.50*(ajdt*ajdt + ajdt)
+            pu[:, jN] = 1.0/6.0 + 0.50*(ajdt*ajdt - ajdt)
+            pm[:, jN] = 2.0/3.0 - ajdt*ajdt
+            pd[:, jN] = 1.0/6.0 + 0.50*(ajdt*ajdt + ajdt)
+            centre[:, jN] = jN
+
+    # The number of nodes above the middle node and the time step sizes
+    nm = np.zeros(num_time_steps+2, dtype=np.int64)
+    dts = np.zeros(num_time_steps+2)
+
+    for m in range(0, num_time_steps+2):
+        nm[m] = min(m, j_max)
+        dts[m] = dt
 
     # Arrow-Debreu array
     Q = np.zeros(shape=(num_time_steps+2, 2*N+1))
@@ -128,37 +206,110 @@ def build_tree_fast(a, sigma, tree_times, num_time_steps, discount_factors):
     # Big loop over time steps
     for m in range(0, num_time_steps + 1):
 
-        nm = min(m, j_max)
         sum_qz = 0.0
-        for j in range(-nm, nm+1):
+        for j in range(-nm[m], nm[m]+1):
             rdt = j*dR*dt
             sum_qz += Q[m, j+N] * np.exp(-rdt)
         alpha[m] = np.log(sum_qz/discount_factors[m+1]) / dt
 
-        for j in range(-nm, nm+1):
+        for j in range(-nm[m], nm[m]+1):
             jN = j + N
             r_t[m, jN] = alpha[m] + j*dR
 
         # Loop over all nodes at time m to calculate next values of Q
-        for j in range(-nm, nm+1):
+        for j in range(-nm[m], nm[m]+1):
             jN = j + N
             rdt = r_t[m, jN] * dt
             z = np.exp(-rdt)
+            c = centre[m, jN]
+            Q[m+1, c+1] += Q[m, jN] * pu[m, jN] * z
+            Q[m+1, c] += Q[m, jN] * pm[m, jN] * z
+            Q[m+1, c-1] += Q[m, jN] * pd[m, jN] * z
+
+    return (Q, pu, pm, pd, centre, nm, r_t, dts)
+
+###############################################################################
 
-            if j == j_max:
-                Q[m+1, jN] += Q[m, jN] * pu[jN] * z
-                Q[m+1, jN-1] += Q[m, jN] * pm[jN] * z
-                Q[m+1, jN-2] += Q[m, jN] * pd[jN] * z
-            elif j == -j_max:
-                Q[m+1, jN] += Q[m, jN] * pd[jN] * z
-                Q[m+1, jN+1] += Q[m, jN] * pm[jN] * z
-                Q[m+1, jN+2] += Q[m, jN] * pu[jN] * z
-            else:
-                Q[m+1, jN+1] += Q[m, jN] * pu[jN] * z
-                Q[m+1, jN] += Q[m, jN] * pm[jN] * z
-                Q[m+1, jN-1] += Q[m, jN] * pd[jN] * z
 
-    return (Q, pu, pm, pd, r_t, dt)
+@njit(fastmath=True, cache=True)
+def build_general_tree_fast(a, step_variances, tree_times, discount_factors):
+    """ Fast construction of a trinomial tree whose time steps can have any
+    size and where the variance of the short rate over a step can change
+    from one step to the next, as it does for a piecewise constant
+    volatility. The node spacing at each time is set by the variance over
+    the step that ends there and each node branches to the three nodes
+    closest to its expected value at the next time. The probabilities are
+    then always positive and the tree stops growing where mean reversion
+    pulls the top node back by a whole node spacing. """
+
+    num_times = len(tree_times)
+
+    dts = np.zeros(num_times)
+    for m in range(0, num_times-1):
+        dts[m] = tree_times[m+1] - tree_times[m]
+    dts[-1] = dts[-2]
+
+    # The node spacing at each time is found from the variance of the short
+    # rate over the step before it so the probabilities match its variance
+    dx = np.zeros(num_times)
+    for m in range(0, num_times-1):
+        dx[m+1] = np.sqrt(3.0 * step_variances[m])
+
+    # The expected value of the top node at the next time fixes the number
+    # of nodes above the middle node at that time
+    nm = np.zeros(num_times, dtype=np.int64)
+    for m in range(0, num_times-1):
+        x = nm[m] * dx[m] * np.exp(-a * dts[m]) / dx[m+1]
+        nm[m+1] = int(np.round(x)) + 1
+
+    N = np.max(nm)
+
+    pu = np.zeros(shape=(num_times, 2*N+1))
+    pm = np.zeros(shape=(num_times, 2*N+1))
+    pd = np.zeros(shape=(num_times, 2*N+1))
+    centre = np.zeros(shape=(num_times, 2*N+1), dtype=np.int64)
+
+    for m in range(0, num_times-1):
+        decay = np.exp(-a * dts[m])
+        for j in range(-nm[m], nm[m]+1):
+            jN = j + N
+            x = j * dx[m] * decay / dx[m+1]
+            k = int(np.round(x))
+            eta = x - k
+            pu[m, jN] = 1.0/6.0 + 0.50*(eta*eta + eta)
+            pm[m, jN] = 2.0/3.0 - eta*eta
+            pd[m, jN] = 1.0/6.0 + 0.50*(eta*eta - eta)
+            centre[m, jN] = k + N
+
+    # The short rate goes out one step extra to have the final short rate
+    r_t = np.zeros(shape=(num_times, 2*N+1))
+
+    # Arrow-Debreu array
+    Q = np.zeros(shape=(num_times, 2*N+1))
+    Q[0, N] = 1.0
+
+    for m in range(0, num_times-1):
+
+        dt = dts[m]
+        sum_qz = 0.0
+        for j in range(-nm[m], nm[m]+1):
+            rdt = j*dx[m]*dt
+            sum_qz += Q[m, j+N] * np.exp(-rdt)
+        alpha = np.log(sum_qz/discount_factors[m+1]) / dt
+
+        for j in range(-nm[m], nm[m]+1):
+            jN = j + N
+            r_t[m, jN] = alpha + j*dx[m]
+
+        for j in range(-nm[m], nm[m]+1):
+            jN = j + N
+            z = np.exp(-r_t[m, jN] * dt)
+            c = centre[m, jN]
+            Q[m+1, c+1] += Q[m, jN] * pu[m, jN] * z
+            Q[m+1, c] += Q[m, jN] * pm[m, jN] * z
+            Q[m+1, c-1] += Q[m, jN] * pd[m, jN] * z
+
+    return (Q, pu, pm, pd, centre, nm, r_t, dts)
 
 ###############################################################################
 
@@ -174,8 +325,9 @@ def american_bond_option_tree_fast(t_exp,
                                    _a,
                                    _Q,
                                    _pu, _pm, _pd,
+                                   _centre, _nm,
                                    _r_t,
-                                   _dt,
+                                   _dts,
                                    _tree_times,
                                    _df_times, _df_values):
     """ Value an option on a bond with cpns that can have European or
@@ -189,9 +341,9 @@ def american_bond_option_tree_fast(t_exp,
         print("Coupon Amounts", cpn_amounts)
 
     num_time_steps, num_nodes = _Q.shape
-    dt = _dt
-    j_max = ceil(0.1835/(_a * dt))
-    expiry_step = int(t_exp/dt + 0.50)
+    N = (num_nodes - 1) // 2
+    expiry_step = _time_step(t_exp, _tree_times)
+    dt = _dts[expiry_step]
 
     ###########################################################################
 
@@ -205,7 +357,7 @@ def american_bond_option_tree_fast(t_exp,
     for i in range(0, num_cpns):
         t_cpn = cpn_times[i]
         if t_cpn <= t_exp:
-            n = int(t_cpn/dt + 0.50)
+            n = _time_step(t_cpn, _tree_times)
             ttree = _tree_times[n]
             df_flow = _uinterpolate(t_cpn, _df_times, _df_values, INTERP)
             df_tree = _uinterpolate(ttree, _df_times, _df_values, INTERP)
@@ -270,9 +422,9 @@ def american_bond_option_tree_fast(t_exp,
     # this fact to calculate the bond price at expiry on the tree nodes
     ###########################################################################
 
-    nm = min(expiry_step, j_max)
+    nm = _nm[expiry_step]
     for k in range(-nm, nm+1):
-        kN = k + j_max
+        kN = k + N
         r_t = _r_t[expiry_step, kN]
         bond_price = 0.0
         for i in range(0, num_cpns):
@@ -290,9 +442,8 @@ def american_bond_option_tree_fast(t_exp,
         bond_values[expiry_step, kN] = bond_price
 
     # Now consider exercise of the option on the expiry date
-    nm = min(expiry_step, j_max)
     for k in range(-nm, nm+1):
-        kN = k + j_max
+        kN = k + N
         dirty_price = bond_values[expiry_step, kN]
         clean_price = dirty_price - accrued[expiry_step]
         call_exercise = max(clean_price - strike_price, 0.0)
@@ -312,75 +463,40 @@ def american_bond_option_tree_fast(t_exp,
 
     # Now step back to today considering exercise at expiry and before
     for m in range(expiry_step-1, -1, -1):
-        nm = min(m, j_max)
+        nm = _nm[m]
         flow = tree_flows[m] * face_amount
 
         for k in range(-nm, nm+1):
-            kN = k + j_max
+            kN = k + N
             r = _r_t[m, kN]
-            df = np.exp(-r*dt)
+            df = np.exp(-r*_dts[m])
 
-            pu = _pu[kN]
-            pm = _pm[kN]
-            pd = _pd[kN]
+            pu = _pu[m, kN]
+            pm = _pm[m, kN]
+            pd = _pd[m, kN]
 
-            if k == j_max:
-                vu = bond_values[m+1, kN]
-                vm = bond_values[m+1, kN-1]
-                vd = bond_values[m+1, kN-2]
-                v = (pu*vu + pm*vm + pd*vd) * df
-                bond_values[m, kN] = v
-            elif k == -j_max:
-                vu = bond_values[m+1, kN+2]
-                vm = bond_values[m+1, kN+1]
-                vd = bond_values[m+1, kN]
-                v = (pu*vu + pm*vm + pd*vd) * df
-                bond_values[m, kN] = v
-            else:
-                vu = bond_values[m+1, kN+1]
-                vm = bond_values[m+1, kN]
-                vd = bond_values[m+1, kN-1]
-                v = (pu*vu + pm*vm + pd*vd) * df
-                bond_values[m, kN] = v
+            # The index of the middle node of the three at the next step
+            c = _centre[m, kN]
+
+            vu = bond_values[m+1, c+1]
+            vm = bond_values[m+1, c]
+            vd = bond_values[m+1, c-1]
+            v = (pu*vu + pm*vm + pd*vd) * df
+            bond_values[m, kN] = v
 
             bond_values[m, kN] += flow
 
-            vcall = 0.0
-            vput = 0.0
-
-            if k == j_max:
-                vu = call_option_values[m+1, kN]
-                vm = call_option_values[m+1, kN-1]
-                vd = call_option_values[m+1, kN-2]
-                vcall = (pu*vu + pm*vm + pd*vd) * df
-            elif k == -j_max:
-                vu = call_option_values[m+1, kN+2]
-                vm = call_option_values[m+1, kN+1]
-                vd = call_option_values[m+1, kN]
-                vcall = (pu*vu + pm*vm + pd*vd) * df
-            else:
-                vu = call_option_values[m+1, kN+1]
-                vm = call_option_values[m+1, kN]
-                vd = call_option_values[m+1, kN-1]
-                vcall = (pu*vu + pm*vm + pd*vd) * df
+            vu = call_option_values[m+1, c+1]
+            vm = call_option_values[m+1, c]
+            vd = call_option_values[m+1, c-1]
+            vcall = (pu*vu + pm*vm + pd*vd) * df
 
             call_option_values[m, kN] = vcall
 
-            if k == j_max:
-                vu = put_option_values[m+1, kN]
-                vm = put_option_values[m+1, kN-1]
-                vd = put_option_values[m+1, kN-2]
-                vput = (pu*vu + pm*vm + pd*vd) * df
-            elif k == -j_max:
-                vu = put_option_values[m+1, kN+2]
-                vm = put_option_values[m+1, kN+1]
-                vd = put_option_values[m+1, kN]
-                vput = (pu*vu + pm*vm + pd*vd) * df
-            else:
-                vu = put_option_values[m+1, kN+1]
-                vm = put_option_values[m+1, kN]
-                vd = put_option_values[m+1, kN-1]
-                vput = (pu*vu + pm*vm + pd*vd) * df
+            vu = put_option_values[m+1, c+1]
+            vm = put_option_values[m+1, c]
+            vd = put_option_values[m+1, c-1]
+            vput = (pu*vu + pm*vm + pd*vd) * df
 
             put_option_values[m, kN] = vput
 
@@ -406,7 +522,7 @@ def american_bond_option_tree_fast(t_exp,
             print(m, _tree_times[m], accrued[m], dirty_price, clean_price,
                   call_exercise, put_exercise)
 
-    return call_option_values[0, j_max], put_option_values[0, j_max]
+    return call_option_values[0, N], put_option_values[0, N]
 
 ###############################################################################
 
@@ -416,16 +532,17 @@ def bermudan_swaption_tree_fast(t_exp, t_mat, strike_price, face_amount,
                                 cpn_times, cpn_flows,
                                 exercise_typeInt,
                                 _df_times, _df_values,
-                                _tree_times, _Q, _pu, _pm, _pd, _r_t, _dt, _a):
+                                _tree_times, _Q, _pu, _pm, _pd, _centre, _nm,
+                                _r_t, _dts):
     """ Option to enter into a swap that can be exercised on cpn payment
     dates after the star_t of the exercise period. Due to multiple exercise
     times we need to extend tree out to bond maturity and take into account
     cash flows through time. """
 
     num_time_steps, num_nodes = _Q.shape
-    j_max = ceil(0.1835/(_a * _dt))
-    expiry_step = int(t_exp/_dt + 0.50)
-    maturity_step = int(t_mat/_dt + 0.50)
+    N = (num_nodes - 1) // 2
+    expiry_step = _time_step(t_exp, _tree_times)
+    maturity_step = _time_step(t_mat, _tree_times)
 
     ###########################################################################
 
@@ -436,7 +553,7 @@ def bermudan_swaption_tree_fast(t_exp, t_mat, strike_price, face_amount,
     # Tree flows go all the way out to the bond maturity date
     for i in range(0, num_cpns):
         t_cpn = cpn_times[i]
-        n = int(round(t_cpn/_dt, 0))
+        n = _time_step(t_cpn, _tree_times)
         ttree = _tree_times[n]
         df_flow = _uinterpolate(t_cpn, _df_times, _df_values, INTERP)
         df_tree = _uinterpolate(ttree, _df_times, _df_values, INTERP)
@@ -490,77 +607,39 @@ def bermudan_swaption_tree_fast(t_exp, t_mat, strike_price, face_amount,
         flow = 1.0 + fixed_leg_flows[maturity_step]
         fixed_leg_values[maturity_step, k] = flow * face_amount
 
-    N = j_max
-
     # Now step back to today considering early exercise
     for m in range(maturity_step-1, -1, -1):
-        nm = min(m, j_max)
+        nm = _nm[m]
         flow = fixed_leg_flows[m] * face_amount
 
         for k in range(-nm, nm+1):
             kN = k + N
             r_t = _r_t[m, kN]
-            df = np.exp(-r_t * _dt)
-            pu = _pu[kN]
-            pm = _pm[kN]
-            pd = _pd[kN]
-
-            if k == j_max:
-                vu = fixed_leg_values[m+1, kN]
-                vm = fixed_leg_values[m+1, kN-1]
-                vd = fixed_leg_values[m+1, kN-2]
-                v = (pu*vu + pm*vm + pd*vd) * df
-                fixed_leg_values[m, kN] = v
-            elif k == -j_max:
-                vu = fixed_leg_values[m+1, kN+2]
-                vm = fixed_leg_values[m+1, kN+1]
-                vd = fixed_leg_values[m+1, kN]
-                v = (pu*vu + pm*vm + pd*vd) * df
-                fixed_leg_values[m, kN] = v
-            else:
-                vu = fixed_leg_values[m+1, kN+1]
-                vm = fixed_leg_values[m+1, kN]
-                vd = fixed_leg_values[m+1, kN-1]
-                v = (pu*vu + pm*vm + pd*vd) * df
-                fixed_leg_values[m, kN] = v
+            df = np.exp(-r_t * _dts[m])
+            pu = _pu[m, kN]
+            pm = _pm[m, kN]
+            pd = _pd[m, kN]
+            c = _centre[m, kN]
+
+            vu = fixed_leg_values[m+1, c+1]
+            vm = fixed_leg_values[m+1, c]
+            vd = fixed_leg_values[m+1, c-1]
+            v = (pu*vu + pm*vm + pd*vd) * df
+            fixed_leg_values[m, kN] = v
 
             fixed_leg_values[m, kN] += flow
-            vpay = 0.0
-            vrec = 0.0
 
-            if k == j_max:
-                vu = pay_values[m+1, kN]
-                vm = pay_values[m+1, kN-1]
-                vd = pay_values[m+1, kN-2]
-                vpay = (pu*vu + pm*vm + pd*vd) * df
-            elif k == -j_max:
-                vu = pay_values[m+1, kN+2]
-                vm = pay_values[m+1, kN+1]
-                vd = pay_values[m+1, kN]
-                vpay = (pu*vu + pm*vm + pd*vd) * df
-            else:
-                vu = pay_values[m+1, kN+1]
-                vm = pay_values[m+1, kN]
-                vd = pay_values[m+1, kN-1]
-                vpay = (pu*vu + pm*vm + pd*vd) * df
+            vu = pay_values[m+1, c+1]
+            vm = pay_values[m+1, c]
+            vd = pay_values[m+1, c-1]
+            vpay = (pu*vu + pm*vm + pd*vd) * df
 
             pay_values[m, kN] = vpay
 
-            if k == j_max:
-                vu = rec_values[m+1, kN]
-                vm = rec_values[m+1, kN-1]
-                vd = rec_values[m+1, kN-2]
-                vrec = (pu*vu + pm*vm + pd*vd) * df
-            elif k == -j_max:
-                vu = rec_values[m+1, kN+2]
-                vm = rec_values[m+1, kN+1]
-                vd = rec_values[m+1, kN]
-                vrec = (pu*vu + pm*vm + pd*vd) * df
-            else:
-                vu = rec_values[m+1, kN+1]
-                vm = rec_values[m+1, kN]
-                vd = rec_values[m+1, kN-1]
-                vrec = (pu*vu + pm*vm + pd*vd) * df
+            vu = rec_values[m+1, c+1]
+            vm = rec_values[m+1, c]
+            vd = rec_values[m+1, c-1]
+            vrec = (pu*vu + pm*vm + pd*vd) * df
 
             rec_values[m, kN] = vrec
 
@@ -593,7 +672,171 @@ def bermudan_swaption_tree_fast(t_exp, t_mat, strike_price, face_amount,
 
                 raise FinError("American optionality not tested.")
 
-    return pay_values[0, j_max], rec_values[0, j_max]
+    return pay_values[0, N], rec_values[0, N]
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def bermudan_swaption_tree_flows(t_exp, t_mat, strike_price, face_amount,
+                                 cpn_times, cpn_flows,
+                                 exercise_typeInt,
+                                 _df_times, _df_values,
+                                 _tree_times, num_time_steps):
+    """ Map the fixed leg flows, floating leg values and accrued interest of
+    a Bermudan swaption onto the tree steps in the same way as the function
+    bermudan_swaption_tree_fast and flag the steps on which it can be
+    exercised. These are the inputs of one trade to the batched rollback. """
+
+    expiry_step = _time_step(t_exp, _tree_times)
+    maturity_step = _time_step(t_mat, _tree_times)
+
+    fixed_leg_flows = np.zeros(num_time_steps)
+    float_leg_values = np.zeros(num_time_steps)
+    num_cpns = len(cpn_times)
+
+    for i in range(0, num_cpns):
+        t_cpn = cpn_times[i]
+        n = _time_step(t_cpn, _tree_times)
+        ttree = _tree_times[n]
+        df_flow = _uinterpolate(t_cpn, _df_times, _df_values, INTERP)
+        df_tree = _uinterpolate(ttree, _df_times, _df_values, INTERP)
+        fixed_leg_flows[n] += cpn_flows[i] * 1.0 * df_flow / df_tree
+        float_leg_values[n] = strike_price * df_flow / df_tree
+
+    mapped_times = np.array([0.0])
+    mapped_amounts = np.array([0.0])
+
+    for n in range(1, len(_tree_times)):
+
+        accd_at_expiry = 0.0
+        if _tree_times[n-1] < t_exp and _tree_times[n] >= t_exp:
+            mapped_times = np.append(mapped_times, t_exp)
+            mapped_amounts = np.append(mapped_amounts, accd_at_expiry)
+
+        if fixed_leg_flows[n] > 0.0:
+            mapped_times = np.append(mapped_times, _tree_times[n])
+            mapped_amounts = np.append(mapped_amounts, fixed_leg_flows[n])
+
+    accrued = np.zeros(num_time_steps)
+    for m in range(0, maturity_step+1):
+        ttree = _tree_times[m]
+        accrued[m] = accrued_interpolator(ttree, mapped_times, mapped_amounts)
+        accrued[m] *= face_amount
+
+        if fixed_leg_flows[m] > g_small:
+            accrued[m] = fixed_leg_flows[m] * face_amount
+
+    # The swaption can be exercised at expiry and on the later coupon steps
+    exercise = np.zeros(num_time_steps, dtype=np.bool_)
+    for m in range(0, maturity_step):
+        flow = fixed_leg_flows[m] * face_amount
+
+        if m == expiry_step:
+            exercise[m] = True
+        elif exercise_typeInt == 2 and flow > g_small and m >= expiry_step:
+            exercise[m] = True
+        elif exercise_typeInt == 3 and m >= expiry_step:
+            raise FinError("American optionality not tested.")
+
+    return fixed_leg_flows, float_leg_values, accrued, exercise, \
+        maturity_step
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def bermudan_swaption_batch_tree_fast(maturity_steps, face_amounts,
+                                      fixed_leg_flows,
+                                      float_leg_values, accrued, exercise,
+                                      _Q, _pu, _pm, _pd, _centre, _nm,
+                                      _r_t, _dts):
+    """ Roll back a batch of Bermudan swaptions together on the same tree.
+    The fixed leg flows, floating leg values, accrued interest and exercise
+    flags are matrices with a row for each tree step and a column for each
+    trade. The probabilities and the discount factor of each node are found
+    once for all of the trades and only the values at two time steps are
+    held, with the trades at a node next to each other in memory. """
+
+    num_time_steps, num_nodes = _Q.shape
+    num_trades = len(maturity_steps)
+    N = (num_nodes - 1) // 2
+
+    # The values of the fixed leg and of the options at the current step
+    fixed_leg_values = np.zeros(shape=(num_nodes, num_trades))
+    pay_values = np.zeros(shape=(num_nodes, num_trades))
+    rec_values = np.zeros(shape=(num_nodes, num_trades))
+
+    # The values at the step after it
+    next_fixed_leg_values = np.zeros(shape=(num_nodes, num_trades))
+    next_pay_values = np.zeros(shape=(num_nodes, num_trades))
+    next_rec_values = np.zeros(shape=(num_nodes, num_trades))
+
+    for m in range(np.max(maturity_steps), -1, -1):
+
+        next_fixed_leg_values, fixed_leg_values = \
+            fixed_leg_values, next_fixed_leg_values
+        next_pay_values, pay_values = pay_values, next_pay_values
+        next_rec_values, rec_values = rec_values, next_rec_values
+
+        nm = _nm[m]
+
+        for k in range(-nm, nm+1):
+            kN = k + N
+            r_t = _r_t[m, kN]
+            df = np.exp(-r_t * _dts[m])
+            pu = _pu[m, kN]
+            pm = _pm[m, kN]
+            pd = _pd[m, kN]
+
+            km = _centre[m, kN]
+            ku, kd = km+1, km-1
+
+            for p in range(0, num_trades):
+
+                if m > maturity_steps[p]:
+                    continue
+
+                if m == maturity_steps[p]:
+                    flow = 1.0 + fixed_leg_flows[m, p]
+                    fixed_leg_values[kN, p] = flow * face_amounts[p]
+                    pay_values[kN, p] = 0.0
+                    rec_values[kN, p] = 0.0
+                    continue
+
+                flow = fixed_leg_flows[m, p] * face_amounts[p]
+
+                vu = next_fixed_leg_values[ku, p]
+                vm = next_fixed_leg_values[km, p]
+                vd = next_fixed_leg_values[kd, p]
+                v = (pu*vu + pm*vm + pd*vd) * df
+                fixed_leg_values[kN, p] = v + flow
+
+                vu = next_pay_values[ku, p]
+                vm = next_pay_values[km, p]
+                vd = next_pay_values[kd, p]
+                vpay = (pu*vu + pm*vm + pd*vd) * df
+
+                vu = next_rec_values[ku, p]
+                vm = next_rec_values[km, p]
+                vd = next_rec_values[kd, p]
+                vrec = (pu*vu + pm*vm + pd*vd) * df
+
+                if exercise[m, p]:
+                    # The floating value is clean and so must be the fixed
+                    fixed_leg_value = fixed_leg_values[kN, p] - accrued[m, p]
+                    float_leg_value = float_leg_values[m, p]
+
+                    pay_exercise = max(float_leg_value - fixed_leg_value, 0.0)
+                    rec_exercise = max(fixed_leg_value - float_leg_value, 0.0)
+
+                    vpay = max(pay_exercise, vpay)
+                    vrec = max(rec_exercise, vrec)
+
+                pay_values[kN, p] = vpay
+                rec_values[kN, p] = vrec
+
+    return pay_values[N].copy(), rec_values[N].copy()
 
 ###############################################################################
 # TODO: CHECK ACCRUED AND COUPONS TO SEE IF IT WORKS FOR LOW TREE STEPS
@@ -605,7 +848,8 @@ def callable_puttable_bond_tree_fast(cpn_times, cpn_flows,
                                      call_times, call_prices,
                                      put_times, put_prices, face,
                                      _sigma, _a, _Q,  # IS SIGMA USED ?
-                                     _pu, _pm, _pd, _r_t, _dt, _tree_times,
+                                     _pu, _pm, _pd, _centre, _nm,
+                                     _r_t, _dts, _tree_times,
                                      _df_times, _df_values):
     """ Value an option on a bond with cpns that can have European or
     American exercise. Some minor issues to do with handling cpns on
@@ -621,10 +865,9 @@ def callable_puttable_bond_tree_fast(cpn_times, cpn_flows,
         raise FinError("No cpn times can be before the value date.")
 
     num_time_steps, num_nodes = _Q.shape
-    dt = _dt
-    j_max = ceil(0.1835/(_a * dt))
+    N = (num_nodes - 1) // 2
     t_mat = cpn_times[-1]
-    maturity_step = int(t_mat/dt + 0.50)
+    maturity_step = _time_step(t_mat, _tree_times)
 
     ###########################################################################
     # Map cpns onto tree while preserving their present value
@@ -635,7 +878,7 @@ def callable_puttable_bond_tree_fast(cpn_times, cpn_flows,
     num_cpns = len(cpn_times)
     for i in range(0, num_cpns):
         t_cpn = cpn_times[i]
-        n = int(round(t_cpn/dt, 0))
+        n = _time_step(t_cpn, _tree_times)
         ttree = _tree_times[n]
         df_flow = _uinterpolate(t_cpn, _df_times, _df_values, INTERP)
         df_tree = _uinterpolate(ttree, _df_times, _df_values, INTERP)
@@ -676,7 +919,7 @@ def callable_puttable_bond_tree_fast(cpn_times, cpn_flows,
     num_calls = len(call_times)
     for i in range(0, num_calls):
         call_time = call_times[i]
-        n = int(round(call_time/dt, 0))
+        n = _time_step(call_time, _tree_times)
         tree_call_value[n] = call_prices[i]
 
     # map puts onto tree
@@ -684,7 +927,7 @@ def callable_puttable_bond_tree_fast(cpn_times, cpn_flows,
     num_puts = len(put_times)
     for i in range(0, num_puts):
         put_time = put_times[i]
-        n = int(round(put_time/dt, 0))
+        n = _time_step(put_time, _tree_times)
         tree_put_value[n] = put_prices[i]
 
     ###########################################################################
@@ -714,7 +957,7 @@ def callable_puttable_bond_tree_fast(cpn_times, cpn_flows,
     ###########################################################################
 
     m = maturity_step
-    nm = min(maturity_step, j_max)
+    nm = _nm[maturity_step]
     vcall = tree_call_value[m]
     vput = tree_put_value[m]
     vhold = (1.0 + tree_flows[m]) * face
@@ -722,54 +965,37 @@ def callable_puttable_bond_tree_fast(cpn_times, cpn_flows,
     value = min(max(vclean, vput), vcall) + accrued[m]
 
     for k in range(-nm, nm+1):
-        kN = k + j_max
+        kN = k + N
         bond_values[m, kN] = (1.0 + tree_flows[m]) * face
         call_put_bond_values[m, kN] = value
 
     # Now step back to today considering early put and call
     for m in range(maturity_step-1, -1, -1):
-        nm = min(m, j_max)
+        nm = _nm[m]
         flow = tree_flows[m] * face
         vcall = tree_call_value[m]
         vput = tree_put_value[m]
 
         for k in range(-nm, nm+1):
-            kN = k + j_max
+            kN = k + N
             r_t = _r_t[m, kN]
-            df = np.exp(-r_t*dt)
-            pu = _pu[kN]
-            pm = _pm[kN]
-            pd = _pd[kN]
-
-            if k == j_max:
-                vu = bond_values[m+1, kN]
-                vm = bond_values[m+1, kN-1]
-                vd = bond_values[m+1, kN-2]
-            elif k == -j_max:
-                vu = bond_values[m+1, kN+2]
-                vm = bond_values[m+1, kN+1]
-                vd = bond_values[m+1, kN]
-            else:
-                vu = bond_values[m+1, kN+1]
-                vm = bond_values[m+1, kN]
-                vd = bond_values[m+1, kN-1]
+            df = np.exp(-r_t*_dts[m])
+            pu = _pu[m, kN]
+            pm = _pm[m, kN]
+            pd = _pd[m, kN]
+            c = _centre[m, kN]
+
+            vu = bond_values[m+1, c+1]
+            vm = bond_values[m+1, c]
+            vd = bond_values[m+1, c-1]
 
             v = (pu*vu + pm*vm + pd*vd) * df
             bond_values[m, kN] = v
             bond_values[m, kN] += flow
 
-            if k == j_max:
-                vu = call_put_bond_values[m+1, kN]
-                vm = call_put_bond_values[m+1, kN-1]
-                vd = call_put_bond_values[m+1, kN-2]
-            elif k == -j_max:
-                vu = call_put_bond_values[m+1, kN+2]
-                vm = call_put_bond_values[m+1, kN+1]
-                vd = call_put_bond_values[m+1, kN]
-            else:
-                vu = call_put_bond_values[m+1, kN+1]
-                vm = call_put_bond_values[m+1, kN]
-                vd = call_put_bond_values[m+1, kN-1]
+            vu = call_put_bond_values[m+1, c+1]
+            vm = call_put_bond_values[m+1, c]
+            vd = call_put_bond_values[m+1, c-1]
 
             vhold = (pu*vu + pm*vm + pd*vd) * df
             # Need to make add on cpns paid if we hold
@@ -777,8 +1003,158 @@ def callable_puttable_bond_tree_fast(cpn_times, cpn_flows,
             value = min(max(vhold - accrued[m], vput), vcall) + accrued[m]
             call_put_bond_values[m, kN] = value
 
-    return {'bondwithoption': call_put_bond_values[0, j_max],
-            'bondpure': bond_values[0, j_max]}
+    return {'bondwithoption': call_put_bond_values[0, N],
+            'bondpure': bond_values[0, N]}
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def callable_puttable_bond_tree_flows(cpn_times, cpn_flows,
+                                      call_times, call_prices,
+                                      put_times, put_prices, face,
+                                      _tree_times, _df_times, _df_values,
+                                      num_time_steps):
+    """ Map the coupons, accrued interest, call prices and put prices of a
+    bond with embedded options onto the tree steps in the same way as the
+    function callable_puttable_bond_tree_fast and flag the steps on which it
+    can be called or put. These are the inputs of one trade to the batched
+    rollback. """
+
+    if np.any(cpn_times < 0.0):
+        raise FinError("No cpn times can be before the value date.")
+
+    t_mat = cpn_times[-1]
+    maturity_step = _time_step(t_mat, _tree_times)
+
+    tree_flows = np.zeros(num_time_steps)
+
+    num_cpns = len(cpn_times)
+    for i in range(0, num_cpns):
+        t_cpn = cpn_times[i]
+        n = _time_step(t_cpn, _tree_times)
+        ttree = _tree_times[n]
+        df_flow = _uinterpolate(t_cpn, _df_times, _df_values, INTERP)
+        df_tree = _uinterpolate(ttree, _df_times, _df_values, INTERP)
+        tree_flows[n] += cpn_flows[i] * 1.0 * df_flow / df_tree
+
+    mapped_times = np.array([0.0])
+    mapped_amounts = np.array([0.0])
+
+    for n in range(1, len(_tree_times)):
+        if tree_flows[n] > 0.0:
+            mapped_times = np.append(mapped_times, _tree_times[n])
+            mapped_amounts = np.append(mapped_amounts, tree_flows[n])
+
+    accrued = np.zeros(num_time_steps)
+    for m in range(0, num_time_steps):
+        ttree = _tree_times[m]
+        accrued[m] = accrued_interpolator(ttree, mapped_times, mapped_amounts)
+        accrued[m] *= face
+
+        if tree_flows[m] > 0.0:
+            accrued[m] = tree_flows[m] * face
+
+    call_values = np.zeros(num_time_steps)
+    call_mask = np.zeros(num_time_steps, dtype=np.bool_)
+    for i in range(0, len(call_times)):
+        n = _time_step(call_times[i], _tree_times)
+        call_values[n] = call_prices[i]
+        call_mask[n] = True
+
+    put_values = np.zeros(num_time_steps)
+    put_mask = np.zeros(num_time_steps, dtype=np.bool_)
+    for i in range(0, len(put_times)):
+        n = _time_step(put_times[i], _tree_times)
+        put_values[n] = put_prices[i]
+        put_mask[n] = True
+
+    return tree_flows, accrued, call_values, call_mask, put_values, \
+        put_mask, maturity_step
+
+###############################################################################
+
+
+@njit(fastmath=True, cache=True)
+def callable_puttable_bond_batch_tree_fast(maturity_steps, face_amounts,
+                                           tree_flows, accrued,
+                                           call_values, call_mask,
+                                           put_values, put_mask,
+                                           _Q, _pu, _pm, _pd, _centre, _nm,
+                                           _r_t, _dts):
+    """ Roll back a batch of bonds with embedded calls and puts together on
+    the same tree. The coupons, accrued interest, call and put prices and the
+    masks of the steps on which each bond can be called or put are matrices
+    with a row for each tree step and a column for each trade. Only the
+    values at two time steps are held, with the trades at a node next to
+    each other in memory. """
+
+    num_time_steps, num_nodes = _Q.shape
+    num_trades = len(maturity_steps)
+    N = (num_nodes - 1) // 2
+
+    # The values of the pure bond and of the bond with options at this step
+    bond_values = np.zeros(shape=(num_nodes, num_trades))
+    call_put_bond_values = np.zeros(shape=(num_nodes, num_trades))
+
+    # The values at the step after it
+    next_bond_values = np.zeros(shape=(num_nodes, num_trades))
+    next_call_put_bond_values = np.zeros(shape=(num_nodes, num_trades))
+
+    for m in range(np.max(maturity_steps), -1, -1):
+
+        next_bond_values, bond_values = bond_values, next_bond_values
+        next_call_put_bond_values, call_put_bond_values = \
+            call_put_bond_values, next_call_put_bond_values
+
+        nm = _nm[m]
+
+        for k in range(-nm, nm+1):
+            kN = k + N
+            r_t = _r_t[m, kN]
+            df = np.exp(-r_t * _dts[m])
+            pu = _pu[m, kN]
+            pm = _pm[m, kN]
+            pd = _pd[m, kN]
+
+            km = _centre[m, kN]
+            ku, kd = km+1, km-1
+
+            for p in range(0, num_trades):
+
+                if m > maturity_steps[p]:
+                    continue
+
+                if m == maturity_steps[p]:
+                    vhold = (1.0 + tree_flows[m, p]) \
+                        * face_amounts[p]
+                    bond_values[kN, p] = vhold
+                else:
+                    flow = tree_flows[m, p] * face_amounts[p]
+
+                    vu = next_bond_values[ku, p]
+                    vm = next_bond_values[km, p]
+                    vd = next_bond_values[kd, p]
+                    v = (pu*vu + pm*vm + pd*vd) * df
+                    bond_values[kN, p] = v + flow
+
+                    vu = next_call_put_bond_values[ku, p]
+                    vm = next_call_put_bond_values[km, p]
+                    vd = next_call_put_bond_values[kd, p]
+                    vhold = (pu*vu + pm*vm + pd*vd) * df + flow
+
+                # The call and put prices are clean prices
+                value = vhold - accrued[m, p]
+
+                if put_mask[m, p]:
+                    value = max(value, put_values[m, p])
+
+                if call_mask[m, p]:
+                    value = min(value, call_values[m, p])
+
+                call_put_bond_values[kN, p] = value + accrued[m, p]
+
+    return call_put_bond_values[N].copy(), bond_values[N].copy()
 
 ###############################################################################
 
@@ -817,7 +1193,7 @@ def fwd_dirty_bond_price(r_t, *args):
         if t_cpn > t_exp:
             pt_cpn = _uinterpolate(t_cpn, df_times, df_values, INTERP)
             zcb = p_fast(t_exp, t_cpn, r_t, dt, pt_exp, ptdelta, pt_cpn,
-                         self.sigma, self.a)
+                         self._flat_sigma(t_exp), self.a)
             pv = pv + zcb * cpn
 #            print("TCPN", t_cpn, "ZCB", zcb, "CPN", cpn, "PV", pv)
 
@@ -841,26 +1217,81 @@ def fwd_dirty_bond_price(r_t, *args):
 ###############################################################################
 
 
+def _event_tree_times(tree_mat, num_time_steps, event_times):
+    """ Return the tree times out to one step beyond tree_mat with
+    num_time_steps steps up to tree_mat, or one step between each event
+    time if there are more of them, such that the event times before
+    tree_mat are all tree times. The steps between two event times are
+    equal and their number is in proportion to the gap between them. """
+
+    event_times = np.asarray(event_times, dtype=float)
+    event_times = event_times[(event_times > 0.0) & (event_times < tree_mat)]
+
+    knots = np.unique(np.append(event_times, tree_mat))
+
+    # Event times that almost coincide would leave a tiny time step
+    gaps = np.diff(np.append(0.0, knots))
+    knots = knots[gaps > 1e-6 * tree_mat]
+    knots[-1] = tree_mat
+
+    gaps = np.diff(np.append(0.0, knots))
+    num_steps = np.maximum(np.floor(num_time_steps * gaps / tree_mat), 1)
+    num_steps = num_steps.astype(int)
+
+    # The steps lost by rounding down go to the gaps with the longest steps
+    while num_steps.sum() < num_time_steps:
+        num_steps[np.argmax(gaps / num_steps)] += 1
+
+    tree_times = [0.0]
+    for knot, gap, n in zip(knots, gaps, num_steps):
+        steps = knot - gap + gap * np.arange(1, n + 1) / n
+        tree_times.extend(steps[:-1])
+        tree_times.append(knot)
+
+    # The tree goes out one step beyond tree_mat as in the uniform tree
+    tree_times.append(tree_mat + gaps[-1] / num_steps[-1])
+
+    return np.array(tree_times)
+
+###############################################################################
+
+
 class HWTree():
 
     def __init__(self,
                  sigma,
                  a,
                  num_time_steps=100,
-                 european_calc_type=FinHWEuropeanCalcType.EXPIRY_TREE):
+                 european_calc_type=FinHWEuropeanCalcType.EXPIRY_TREE,
+                 sigma_times=None):
         """ Constructs the Hull-White rate model. The speed of mean reversion
         a and volatility are passed in. The short rate process is given by
         dr = (theta(t) - ar) * dt  + sigma * dW. The model will switch to use
         Jamshidian's approach where possible unless the useJamshidian flag is
-        set to false in which case it uses the trinomial Tree. """
+        set to false in which case it uses the trinomial Tree. The volatility
+        can be piecewise constant by passing an array of sigmas and the
+        sigma_times at which each of them ends. The last sigma applies after
+        the last time, as for HWSwaptionCalibrator. """
+
+        if sigma_times is not None:
+
+            sigma = np.array(sigma, dtype=float)
+            sigma_times = np.array(sigma_times, dtype=float)
+
+            if len(sigma) != len(sigma_times):
+                raise FinError("Need one sigma for each sigma time.")
 
-        if sigma < 0.0:
+            if np.any(np.diff(sigma_times) <= 0.0):
+                raise FinError("Sigma times must be increasing.")
+
+        if np.any(np.asarray(sigma) < 0.0):
             raise FinError("Negative volatility not allowed.")
 
         if a < 0.0:
             raise FinError("Mean reversion speed parameter should be >= 0.")
 
         self.sigma = sigma
+        self.sigma_times = sigma_times
         self.a = a
         self.num_time_steps = num_time_steps
         self.european_calc_type = european_calc_type
@@ -877,6 +1308,46 @@ class HWTree():
         self.dfs = None
         self.r_t = None
         self.dt = None
+        self.dts = None
+        self.centre = None
+        self.nm = None
+
+        # The parameters, curve, maturity and event times that the tree was
+        # built for
+        self._tree_key = None
+        self._tree_mat = None
+        self._tree_events = None
+
+###############################################################################
+
+    def _factor_variance(self, t):
+        """ Variance at the times t of the Gaussian factor of the short rate,
+        which is its integrated volatility discounted by mean reversion. """
+
+        t = np.asarray(t, dtype=float)
+
+        if self.sigma_times is None:
+            return self.sigma**2 * _b_fn(2.0 * self.a, t)[0]
+
+        w, _ = hw_variance_weights(np.atleast_1d(t), self.sigma_times, self.a)
+        return np.reshape(w @ self.sigma**2, t.shape)
+
+###############################################################################
+
+    def _flat_sigma(self, t):
+        """ The constant volatility that gives the same factor variance at
+        time t as the piecewise constant volatility. The analytical bond
+        prices and bond options at t only depend on this variance. """
+
+        if self.sigma_times is None:
+            return self.sigma
+
+        g = _b_fn(2.0 * self.a, t)[0]
+
+        if g < SMALL:
+            return self.sigma[0]
+
+        return np.sqrt(self._factor_variance(t) / g)
 
 ###############################################################################
 
@@ -897,7 +1368,7 @@ class HWTree():
         pt_exp = _uinterpolate(t_exp, df_times, df_values, INTERP)
         pt_mat = _uinterpolate(t_mat, df_times, df_values, INTERP)
 
-        sigma = self.sigma
+        sigma = self._flat_sigma(t_exp)
         a = self.a
 
         if abs(a) < SMALL:
@@ -967,7 +1438,7 @@ class HWTree():
                 pt_cpn = _uinterpolate(t_cpn, df_times, df_values, INTERP)
 
                 strike = p_fast(t_exp, t_cpn, rstar, dt, pt_exp, ptdelta,
-                                pt_cpn, self.sigma, self.a)
+                                pt_cpn, self._flat_sigma(t_exp), self.a)
 
                 v = self.option_on_zcb(t_exp, t_cpn, strike, 1.0,
                                        df_times, df_values)
@@ -997,14 +1468,15 @@ class HWTree():
         corresponding bond price. User provides bond object and option details.
         """
 
-        dt = self.dt
+        expiry_step = _time_step(t_exp, self.tree_times)
+        dt = self.dts[expiry_step]
         tdelta = t_exp + dt
+        sigma = self._flat_sigma(t_exp)
 
         pt_exp = _uinterpolate(t_exp, self.df_times, self.dfs, INTERP)
         ptdelta = _uinterpolate(tdelta, self.df_times, self.dfs, INTERP)
 
         _, num_nodes = self.Q.shape
-        expiry_step = int(t_exp/dt+0.50)
 
         call_value = 0.0
         put_value = 0.0
@@ -1030,7 +1502,7 @@ class HWTree():
                                           INTERP)
 
                     zcb = p_fast(t_exp, t_cpn, r_t, dt, pt_exp, ptdelta, pt_cpn,
-                                 self.sigma, self.a)
+                                 sigma, self.a)
 
                     pv += cpn * zcb
 
@@ -1077,15 +1549,16 @@ class HWTree():
         if self.tree_times[-1] < t_exp:
             raise FinError("Tree expiry must be >= option expiry date.")
 
-        dt = self.dt
+        expiry_step = _time_step(t_exp, self.tree_times)
+        dt = self.dts[expiry_step]
         tdelta = t_exp + dt
+        sigma = self._flat_sigma(t_exp)
 
         pt_exp = _uinterpolate(t_exp, self.df_times, self.dfs, INTERP)
         ptdelta = _uinterpolate(tdelta, self.df_times, self.dfs, INTERP)
         pt_mat = _uinterpolate(t_mat, self.df_times, self.dfs, INTERP)
 
         _, num_nodes = self.Q.shape
-        expiry_step = int(t_exp/dt+0.50)
 
         call_value = 0.0
         put_value = 0.0
@@ -1097,7 +1570,7 @@ class HWTree():
 
             zcb = p_fast(t_exp, t_mat,
                          r_t, dt, pt_exp, ptdelta, pt_mat,
-                         self.sigma, self.a)
+                         sigma, self.a)
 
             put_payoff = max(strike_price - zcb * face_amount, 0.0)
             call_payoff = max(zcb * face_amount - strike_price, 0.0)
@@ -1133,11 +1606,70 @@ class HWTree():
                                           self.df_times, self.dfs,
                                           self.tree_times, self.Q,
                                           self.pu, self.pm, self.pd,
-                                          self.r_t,
-                                          self.dt, self.a)
+                                          self.centre, self.nm,
+                                          self.r_t, self.dts)
 
         return {'pay': pay_value, 'rec': rec_value}
 
+###############################################################################
+
+    def bermudan_swaption_batch(self, t_exps, strikes, faces,
+                                cpn_times_list, cpn_flows_list,
+                                exercise_types):
+        """ Value a batch of swaptions that can be exercised on specific dates
+        over their exercise periods by rolling them back together on the tree
+        which must extend out to the last swap maturity. Each argument has an
+        entry for each swaption and the pay and receive values are returned
+        as arrays. """
+
+        num_trades = len(t_exps)
+        num_time_steps = self.Q.shape[0]
+
+        maturity_steps = np.zeros(num_trades, dtype=np.int64)
+        fixed_leg_flows = np.zeros(shape=(num_time_steps, num_trades))
+        float_leg_values = np.zeros(shape=(num_time_steps, num_trades))
+        accrued = np.zeros(shape=(num_time_steps, num_trades))
+        exercise = np.zeros(shape=(num_time_steps, num_trades),
+                            dtype=np.bool_)
+
+        for p in range(0, num_trades):
+
+            t_exp = t_exps[p]
+            cpn_times = cpn_times_list[p]
+            t_mat = cpn_times[-1]
+
+            if t_exp > t_mat:
+                raise FinError("Option expiry after bond matures.")
+
+            if t_exp < 0.0:
+                raise FinError("Option expiry time negative.")
+
+            if t_mat > self.tree_times[-1]:
+                raise FinError("Tree does not extend out to swap maturity.")
+
+            exercise_typeInt = option_exercise_types_to_int(exercise_types[p])
+
+            fixed_leg_flows[:, p], float_leg_values[:, p], accrued[:, p], \
+                exercise[:, p], maturity_steps[p] \
+                = bermudan_swaption_tree_flows(t_exp, t_mat, strikes[p],
+                                               faces[p], cpn_times,
+                                               cpn_flows_list[p],
+                                               exercise_typeInt,
+                                               self.df_times, self.dfs,
+                                               self.tree_times,
+                                               num_time_steps)
+
+        pay_values, rec_values \
+            = bermudan_swaption_batch_tree_fast(maturity_steps,
+                                                np.array(faces, dtype=float),
+                                                fixed_leg_flows,
+                                                float_leg_values, accrued,
+                                                exercise, self.Q, self.pu,
+                                                self.pm, self.pd, self.centre,
+                                                self.nm, self.r_t, self.dts)
+
+        return {'pay': pay_values, 'rec': rec_values}
+
 ###############################################################################
 
     def bond_option(self, t_exp, strike_price, face_amount,
@@ -1182,10 +1714,11 @@ class HWTree():
                                                      strike_price, face_amount,
                                                      cpn_times, cpn_flows,
                                                      exercise_typeInt,
-                                                     self.sigma, self.a,
-                                                     self.Q,
+                                                     self._flat_sigma(t_exp),
+                                                     self.a, self.Q,
                                                      self.pu, self.pm, self.pd,
-                                                     self.r_t, self.dt,
+                                                     self.centre, self.nm,
+                                                     self.r_t, self.dts,
                                                      self.tree_times,
                                                      self.df_times, self.dfs)
 
@@ -1199,10 +1732,11 @@ class HWTree():
                                                  strike_price, face_amount,
                                                  cpn_times, cpn_flows,
                                                  exercise_typeInt,
-                                                 self.sigma, self.a,
-                                                 self.Q,
+                                                 self._flat_sigma(t_exp),
+                                                 self.a, self.Q,
                                                  self.pu, self.pm, self.pd,
-                                                 self.r_t, self.dt,
+                                                 self.centre, self.nm,
+                                                 self.r_t, self.dts,
                                                  self.tree_times,
                                                  self.df_times, self.dfs)
 
@@ -1236,16 +1770,72 @@ class HWTree():
                                              call_times, call_prices,
                                              put_times, put_prices,
                                              face_amount,
-                                             self.sigma, self.a,
-                                             self.Q,
+                                             self._flat_sigma(cpn_times[-1]),
+                                             self.a, self.Q,
                                              self.pu, self.pm, self.pd,
-                                             self.r_t, self.dt,
+                                             self.centre, self.nm,
+                                             self.r_t, self.dts,
                                              self.tree_times,
                                              self.df_times, self.dfs)
 
         return {'bondwithoption': v['bondwithoption'],
                 'bondpure': v['bondpure']}
 
+###############################################################################
+
+    def callable_puttable_bond_batch(self, cpn_times_list, cpn_flows_list,
+                                     call_times_list, call_prices_list,
+                                     put_times_list, put_prices_list,
+                                     faces):
+        """ Value a batch of bonds with embedded calls and puts by rolling
+        them back together on the tree which must extend out to the last bond
+        maturity. Each argument has an entry for each bond and the values of
+        the bonds with and without their options are returned as arrays. """
+
+        num_trades = len(cpn_times_list)
+        num_time_steps = self.Q.shape[0]
+
+        maturity_steps = np.zeros(num_trades, dtype=np.int64)
+        tree_flows = np.zeros(shape=(num_time_steps, num_trades))
+        accrued = np.zeros(shape=(num_time_steps, num_trades))
+        call_values = np.zeros(shape=(num_time_steps, num_trades))
+        call_mask = np.zeros(shape=(num_time_steps, num_trades),
+                             dtype=np.bool_)
+        put_values = np.zeros(shape=(num_time_steps, num_trades))
+        put_mask = np.zeros(shape=(num_time_steps, num_trades),
+                            dtype=np.bool_)
+
+        for p in range(0, num_trades):
+
+            cpn_times = np.array(cpn_times_list[p], dtype=float)
+
+            if cpn_times[-1] > self.tree_times[-1]:
+                raise FinError("Tree does not extend out to bond maturity.")
+
+            tree_flows[:, p], accrued[:, p], call_values[:, p], \
+                call_mask[:, p], put_values[:, p], put_mask[:, p], \
+                maturity_steps[p] \
+                = callable_puttable_bond_tree_flows(
+                    cpn_times,
+                    np.array(cpn_flows_list[p], dtype=float),
+                    np.array(call_times_list[p], dtype=float),
+                    np.array(call_prices_list[p], dtype=float),
+                    np.array(put_times_list[p], dtype=float),
+                    np.array(put_prices_list[p], dtype=float),
+                    float(faces[p]), self.tree_times, self.df_times,
+                    self.dfs,
+                    num_time_steps)
+
+        bond_with_option_values, bond_values \
+            = callable_puttable_bond_batch_tree_fast(
+                maturity_steps, np.array(faces, dtype=float),
+                tree_flows, accrued, call_values, call_mask, put_values,
+                put_mask, self.Q, self.pu, self.pm, self.pd, self.centre,
+                self.nm, self.r_t, self.dts)
+
+        return {'bondwithoption': bond_with_option_values,
+                'bondpure': bond_values}
+
 ###############################################################################
 
     def df_tree(self, t_mat):
@@ -1256,12 +1846,11 @@ class HWTree():
             return 1.0
 
         _, num_nodes = self.Q.shape
-        fn1 = t_mat/self.dt
-        fn2 = float(int(t_mat/self.dt))
-        if abs(fn1 - fn2) > 1e-6:
+        n = _time_step(t_mat, self.tree_times)
+        if abs(t_mat - self.tree_times[n]) > 1e-6 * self.dts[n]:
             raise FinError("Time not on tree time grid")
 
-        time_step = int(t_mat / self.dt) + 1
+        time_step = n + 1
 
         p = 0.0
         for i in range(0, num_nodes):
@@ -1272,8 +1861,23 @@ class HWTree():
 
 ###############################################################################
 
-    def build_tree(self, tree_mat, df_times, df_values):
-        """ Build the trinomial tree. """
+    def _tree_is_built(self, tree_key, tree_mat, tree_events):
+        """ Return True if the tree has already been built for the curve and
+        parameters in the key and for the same maturity and event times. """
+
+        return tree_key == self._tree_key and tree_mat == self._tree_mat \
+            and tree_events == self._tree_events
+
+###############################################################################
+
+    def build_tree(self, tree_mat, df_times, df_values, event_times=None):
+        """ Build the trinomial tree. This is skipped if the tree has already
+        been built for the same curve and parameters out to tree_mat with the
+        same event times. If event times such as exercise and coupon times
+        are passed then the time steps are made to land on them, so a trade
+        needs fewer steps than on a uniform grid where its dates fall between
+        steps. The tree then has time steps of
+        different sizes, as it does for a piecewise constant volatility. """
 
         if isinstance(df_times, np.ndarray) is False:
             raise FinError("DF TIMES must be a numpy vector")
@@ -1281,28 +1885,73 @@ class HWTree():
         if isinstance(df_values, np.ndarray) is False:
             raise FinError("DF VALUES must be a numpy vector")
 
-        # I wish to add on an additional time to the tree so that the second
-        # last time corresponds to a maturity tree_mat. For this reason I scale
-        # up the maturity date of the tree as follows
-        tree_maturity = tree_mat * (self.num_time_steps + 1) / self.num_time_steps
+        sigma_times = self.sigma_times
+
+        tree_key = (np.asarray(self.sigma, dtype=float).tobytes(),
+                    None if sigma_times is None else sigma_times.tobytes(),
+                    self.a, self.num_time_steps,
+                    df_times.tobytes(), df_values.tobytes())
+
+        tree_events = None
+        if event_times is not None:
+            tree_events = np.asarray(event_times, dtype=float).tobytes()
+
+        if self._tree_is_built(tree_key, tree_mat, tree_events):
+            return
+
+        if event_times is None:
+            # I wish to add on an additional time to the tree so that the
+            # second last time corresponds to a maturity tree_mat. For this
+            # reason I scale up the maturity date of the tree as follows
+            num_time_steps = self.num_time_steps
+            tree_maturity = tree_mat * (num_time_steps + 1) / num_time_steps
+
+            # The vector of times goes out to this maturity
+            tree_times = np.linspace(0.0, tree_maturity, num_time_steps + 2)
+        else:
+            tree_times = _event_tree_times(tree_mat, self.num_time_steps,
+                                           event_times)
 
-        # The vector of times goes out to this maturity
-        tree_times = np.linspace(0.0, tree_maturity, self.num_time_steps + 2)
         self.tree_times = tree_times
+        num_times = len(tree_times)
 
-        df_tree = np.zeros(shape=self.num_time_steps+2)
+        df_tree = np.zeros(shape=num_times)
         df_tree[0] = 1.0
 
-        for i in range(1, self.num_time_steps+2):
+        for i in range(1, num_times):
             t = tree_times[i]
             df_tree[i] = _uinterpolate(t, df_times, df_values, INTERP)
 
         self.df_times = df_times
         self.dfs = df_values
 
-        self.Q, self.pu, self.pm, self.pd, self.r_t, self.dt \
-            = build_tree_fast(self.a, self.sigma,
-                              tree_times, self.num_time_steps, df_tree)
+        if event_times is None and sigma_times is None:
+
+            self.Q, self.pu, self.pm, self.pd, self.centre, self.nm, \
+                self.r_t, self.dts \
+                = build_tree_fast(self.a, self.sigma,
+                                  tree_times, self.num_time_steps, df_tree)
+
+        else:
+
+            # The variance of the factor over each step. A zero volatility
+            # would put all of the nodes at a time on top of each other
+            v = self._factor_variance(tree_times)
+            step_variances = v[1:] - np.exp(-2.0 * self.a
+                                            * np.diff(tree_times)) * v[:-1]
+            step_variances = np.maximum(step_variances, SMALL**2)
+
+            self.Q, self.pu, self.pm, self.pd, self.centre, self.nm, \
+                self.r_t, self.dts \
+                = build_general_tree_fast(self.a, step_variances,
+                                          tree_times, df_tree)
+
+        # This is the average time step when the steps are not all the same
+        self.dt = tree_times[-1] / (num_times - 1)
+
+        self._tree_key = tree_key
+        self._tree_mat = tree_mat
+        self._tree_events = tree_events
 
         return
 
@@ -1311,8 +1960,10 @@ class HWTree():
     def __repr__(self):
         """ Return string with class details. """
 
-        s = label_to_string("OBJECT TYPE", type(self)._name__)
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
         s += label_to_string("Sigma", self.sigma)
+        if self.sigma_times is not None:
+            s += label_to_string("Sigma Times", self.sigma_times)
         s += label_to_string("a", self.a)
         s += label_to_string("num_time_steps", self.num_time_steps)
         s += label_to_string("european_calc_types", self.european_calc_type)
@@ -2,9 +2,10 @@
 # Copyright (C) 2018, 2019, 2020 Dominic O'Kane
 ##############################################################################
 
+import os
 from enum import Enum
 import numpy as np
-from numba import njit, float64, int64  # , prange DOES NOT WORK ON GITHUB
+from numba import njit, prange, float64, int64
 
 from ..utils.error import FinError
 from ..utils.math import N
@@ -15,7 +16,21 @@ from ..models.sobol import get_uniform_sobol
 # TO DO: TERMINAL MEASURE
 # TO DO:: CALIBRATION
 
-USE_PARALLEL = False
+# Set the environment variable FINANCEPY_PARALLEL to 1 before import to run
+# the path loops on all cores. Each path only writes its own forwards and
+# draws its own random numbers so results do not depend on the number of
+# threads. The parallel kernels start the numba threading layer when this
+# module is imported and that is not safe in a process that is later forked,
+# for example by a ProcessPoolExecutor, so the loops are serial by default.
+# The numba cache does not tell the two builds apart so only the serial build
+# is cached.
+USE_PARALLEL = os.environ.get("FINANCEPY_PARALLEL", "0") not in ["0", ""]
+CACHE_KERNELS = not USE_PARALLEL
+
+# Constants of the SplitMix64 counter-based random number generator
+SPLITMIX_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+SPLITMIX_MUL1 = np.uint64(0xBF58476D1CE4E5B9)
+SPLITMIX_MUL2 = np.uint64(0x94D049BB133111EB)
 
 ###############################################################################
 
@@ -24,7 +39,10 @@ USE_PARALLEL = False
     x (num_fwds-1)/2 elements. This is a lognormal model although a shifted
     Lognormal rate is also allowed. Implementations include 1 factor, M factor
     where the volatility curve per factor is provided and a full N-factor corr-
-    elation matrix where a Cholesky is done to decompose the N factors. """
+    elation matrix where a Cholesky is done to decompose the N factors. The
+    path loops run on a single core unless the environment variable
+    FINANCEPY_PARALLEL is set to 1 before the module is first imported, in
+    which case they use all of the cores. """
 
 ###############################################################################
 
@@ -138,7 +156,7 @@ def lmm_swaption_vol_approx(a, b, fwd0, taus, zetas, rho):
 
 
 @njit(float64(int64, int64, float64[:], float64[:, :, :], float64[:]),
-      cache=True, fastmath=True)
+      cache=CACHE_KERNELS, fastmath=True, parallel=USE_PARALLEL)
 def lmm_sim_swaption_vol(a, b, fwd0, fwds, taus):
     """ Calculates the swap rate volatility using the forwards generated in the
     simulation to see how it compares to Rebonatto estimate. """
@@ -152,10 +170,10 @@ def lmm_sim_swaption_vol(a, b, fwd0, fwds, taus):
     if a >= b:
         raise FinError("Swap maturity is before expiry date")
 
-    fwd_swap_rate_mean = 0.0
-    fwd_swap_rate_var = 0.0
+    # The swap rates are summed after the parallel loop in path order
+    fwd_swap_rates = np.zeros(num_paths)
 
-    for i_path in range(0, num_paths):  # changed from prange
+    for i_path in prange(0, num_paths):
 
         numeraire = 1.0
 
@@ -172,8 +190,13 @@ def lmm_sim_swaption_vol(a, b, fwd0, fwds, taus):
             df = df / (1.0 + tau * f)
             pv01 = pv01 + tau * df
 
-        fwd_swap_rate = (1.0 - df) / pv01
+        fwd_swap_rates[i_path] = (1.0 - df) / pv01
+
+    fwd_swap_rate_mean = 0.0
+    fwd_swap_rate_var = 0.0
 
+    for i_path in range(0, num_paths):
+        fwd_swap_rate = fwd_swap_rates[i_path]
         fwd_swap_rate_mean += fwd_swap_rate
         fwd_swap_rate_var += fwd_swap_rate**2
 
@@ -191,7 +214,7 @@ def lmm_sim_swaption_vol(a, b, fwd0, fwds, taus):
 
 
 @njit(float64[:, :](int64, int64, int64, float64[:, :, :]),
-      cache=True, fastmath=True)
+      cache=CACHE_KERNELS, fastmath=True, parallel=USE_PARALLEL)
 def lmm_fwd_fwd_correlation(num_fwds, num_paths, i_time, fwds):
     """ Extract forward forward correlation matrix at some future time index
     from the simulated forward rates and return the matrix. """
@@ -199,7 +222,8 @@ def lmm_fwd_fwd_correlation(num_fwds, num_paths, i_time, fwds):
     size = num_fwds - i_time
     fwd_corr = np.zeros((size, size))
 
-    for i_fwd in range(i_time, num_fwds):
+    # Each pair of forwards is summed over the paths by a single thread
+    for i_fwd in prange(i_time, num_fwds):
         for j_fwd in range(i_fwd, num_fwds):
 
             sumfwdi = 0.0
@@ -208,7 +232,7 @@ def lmm_fwd_fwd_correlation(num_fwds, num_paths, i_time, fwds):
             sumfwdifwdj = 0.0
             sumfwdjfwdj = 0.0
 
-            for p in range(0, num_paths):  # changed from prange
+            for p in range(0, num_paths):
                 dfwdi = fwds[p, i_time, i_fwd] - fwds[p, i_time-1, i_fwd]
                 dfwdj = fwds[p, i_time, j_fwd] - fwds[p, i_time-1, j_fwd]
                 sumfwdi += dfwdi
@@ -407,7 +431,8 @@ def lmm_simulate_fwds_nf(num_fwds, num_paths, fwd0, zetas, correl, taus, seed):
 
 
 @njit(float64[:, :, :](int64, int64, int64, float64[:], float64[:], float64[:],
-                       int64, int64), cache=True, fastmath=True)
+                       int64, int64), cache=CACHE_KERNELS, fastmath=True,
+      parallel=USE_PARALLEL)
 def lmm_simulate_fwds_1f(num_fwds, num_paths, numeraire_index, fwd0, gammas,
                          taus, use_sobol, seed):
     """ One factor Arbitrage-free simulation of forward Ibor discount in the
@@ -443,7 +468,6 @@ def lmm_simulate_fwds_1f(num_fwds, num_paths, numeraire_index, fwd0, gammas,
     num_paths = 2 * int(num_paths/2)
     half_num_paths = int(num_paths/2)
     fwd = np.empty((num_paths, num_fwds, num_fwds))
-    fwdB = np.zeros(num_fwds)
 
     num_times = num_fwds
 
@@ -467,7 +491,8 @@ def lmm_simulate_fwds_1f(num_fwds, num_paths, numeraire_index, fwd0, gammas,
     else:
         raise FinError("Use Sobol must be 0 or 1")
 
-    for i_path in range(0, num_paths):  # changed from prange
+    # The random numbers have all been drawn so the paths are independent
+    for i_path in prange(0, num_paths):
         # Initial value of forward curve at time 0
         for i_fwd in range(0, num_fwds):
             fwd[i_path, 0, i_fwd] = fwd0[i_fwd]
@@ -489,11 +514,11 @@ def lmm_simulate_fwds_1f(num_fwds, num_paths, numeraire_index, fwd0, gammas,
 
                 # predictor corrector
                 x = np.exp(muA * dtj - 0.5*(zkj**2) * dtj + zkj * w * sqrt_dtj)
-                fwdB[k] = fwd[i_path, j, k] * x
+                fwdB = fwd[i_path, j, k] * x
 
                 muB = 0.0
                 for i in range(j+1, k+1):
-                    fi = fwdB[k]
+                    fi = fwdB
                     zij = gammas[i-j]
                     ti = taus[i]
                     muB += zkj * fi * ti * zij / (1.0 + fi * ti)
@@ -508,8 +533,71 @@ def lmm_simulate_fwds_1f(num_fwds, num_paths, numeraire_index, fwd0, gammas,
 ###############################################################################
 
 
+@njit(cache=True, fastmath=True)
+def _lmm_evolve_path_mf(fwd, g, fwd0, lambdas, taus):
+    """ Evolve the forward curve of one path of the multi-factor model in the
+    spot measure using the Gaussian draws g of each time step and factor.
+    The forwards at each time are written into the rows of fwd. """
+
+    num_factors = len(lambdas)
+    num_fwds = len(fwd0)
+
+    # Initial value of forward curve at time 0
+    for i_fwd in range(0, num_fwds):
+        fwd[0, i_fwd] = fwd0[i_fwd]
+
+    for j in range(0, num_fwds-1):  # TIME LOOP
+        dtj = taus[j]
+        sqrt_dtj = np.sqrt(dtj)
+
+        for k in range(j, num_fwds):  # FORWARDS LOOP
+
+            muA = 0.0
+            for i in range(j+1, k+1):
+                fi = fwd[j, i]
+                ti = taus[i]
+                zz = 0.0
+                for q in range(0, num_factors):
+                    zij = lambdas[q][i-j]
+                    zkj = lambdas[q][k-j]
+                    zz += zij * zkj
+                muA += fi * ti * zz / (1.0 + fi * ti)
+
+            itoTerm = 0.0
+            for q in range(0, num_factors):
+                itoTerm += lambdas[q][k-j] * lambdas[q][k-j]
+
+            random_term = 0.0
+            for q in range(0, num_factors):
+                wq = g[j, q]
+                random_term += lambdas[q][k-j] * wq
+            random_term *= sqrt_dtj
+
+            x = np.exp(muA * dtj - 0.5 * itoTerm * dtj + random_term)
+            fwdB = fwd[j, k] * x
+
+            muB = 0.0
+            for i in range(j+1, k+1):
+                fi = fwdB
+                ti = taus[i]
+                zz = 0.0
+                for q in range(0, num_factors):
+                    zij = lambdas[q][i-j]
+                    zkj = lambdas[q][k-j]
+                    zz += zij * zkj
+                muB += fi * ti * zz / (1.0 + fi * ti)
+
+            muC = 0.5 * (muA + muB)
+
+            x = np.exp(muC * dtj - 0.5 * itoTerm * dtj + random_term)
+            fwd[j+1, k] = fwd[j, k] * x
+
+###############################################################################
+
+
 @njit(float64[:, :, :](int64, int64, int64, int64, float64[:], float64[:, :],
-                       float64[:], int64, int64), cache=True, fastmath=True)
+                       float64[:], int64, int64), cache=CACHE_KERNELS,
+      fastmath=True, parallel=USE_PARALLEL)
 def lmm_simulate_fwds_mf(num_fwds, num_factors, num_paths, numeraire_index,
                          fwd0, lambdas, taus, use_sobol, seed):
     """ Multi-Factor Arbitrage-free simulation of forward Ibor discount in the
@@ -525,11 +613,11 @@ def lmm_simulate_fwds_mf(num_fwds, num_factors, num_paths, numeraire_index,
     if len(lambdas[0]) != num_fwds:
         raise FinError("Lambda does not have the right number of forwards")
 
-    # Even number of paths for antithetics
+    # Even number of paths for antithetics. The forwards that have already
+    # reset at a time are not simulated and are left as zero
     num_paths = 2 * int(num_paths/2)
     half_num_paths = int(num_paths/2)
-    fwd = np.empty((num_paths, num_fwds, num_fwds))
-    fwdB = np.zeros(num_fwds)
+    fwd = np.zeros((num_paths, num_fwds, num_fwds))
 
     num_times = num_fwds
 
@@ -556,56 +644,226 @@ def lmm_simulate_fwds_mf(num_fwds, num_factors, num_paths, numeraire_index,
     else:
         raise FinError("Use Sobol must be 0 or 1.")
 
-    for i_path in range(0, num_paths):
-        # Initial value of forward curve at time 0
-        for i_fwd in range(0, num_fwds):
-            fwd[i_path, 0, i_fwd] = fwd0[i_fwd]
+    # The random numbers have all been drawn so the paths are independent
+    for i_path in prange(0, num_paths):
+        _lmm_evolve_path_mf(fwd[i_path], g_matrix[i_path], fwd0, lambdas,
+                            taus)
 
-        for j in range(0, num_fwds-1):  # TIME LOOP
-            dtj = taus[j]
-            sqrt_dtj = np.sqrt(dtj)
+    return fwd
 
-            for k in range(j, num_fwds):  # FORWARDS LOOP
+###############################################################################
 
-                muA = 0.0
-                for i in range(j+1, k+1):
-                    fi = fwd[i_path, j, i]
-                    ti = taus[i]
-                    zz = 0.0
-                    for q in range(0, num_factors):
-                        zij = lambdas[q][i-j]
-                        zkj = lambdas[q][k-j]
-                        zz += zij * zkj
-                    muA += fi * ti * zz / (1.0 + fi * ti)
-
-                itoTerm = 0.0
-                for q in range(0, num_factors):
-                    itoTerm += lambdas[q][k-j] * lambdas[q][k-j]
 
-                random_term = 0.0
-                for q in range(0, num_factors):
-                    wq = g_matrix[i_path, j, q]
-                    random_term += lambdas[q][k-j] * wq
-                random_term *= sqrt_dtj
+@njit(cache=True, fastmath=True)
+def _splitmix64(x):
+    """ SplitMix64 mixing function which maps a 64-bit unsigned integer to a
+    random looking one. """
 
-                x = np.exp(muA * dtj - 0.5 * itoTerm * dtj + random_term)
-                fwdB[k] = fwd[i_path, j, k] * x
+    x = x + SPLITMIX_GAMMA
+    x = (x ^ (x >> np.uint64(30))) * SPLITMIX_MUL1
+    x = (x ^ (x >> np.uint64(27))) * SPLITMIX_MUL2
+    return x ^ (x >> np.uint64(31))
 
-                muB = 0.0
-                for i in range(j+1, k+1):
-                    fi = fwdB[k]
-                    ti = taus[i]
-                    zz = 0.0
-                    for q in range(0, num_factors):
-                        zij = lambdas[q][i-j]
-                        zkj = lambdas[q][k-j]
-                        zz += zij * zkj
-                    muB += fi * ti * zz / (1.0 + fi * ti)
+###############################################################################
 
-                muC = 0.5 * (muA + muB)
 
-                x = np.exp(muC * dtj - 0.5 * itoTerm * dtj + random_term)
-                fwd[i_path, j+1, k] = fwd[i_path, j, k] * x
+@njit(cache=True, fastmath=True)
+def counter_uniform(key, counter):
+    """ Counter-based uniform random number in (0, 1). It depends only on the
+    key, which is found from the seed, and on the counter so the numbers of
+    a stream can be drawn in any order and by any thread. """
+
+    x = _splitmix64(key + np.uint64(counter) * SPLITMIX_GAMMA)
+    return (float(x >> np.uint64(11)) + 0.5) / 9007199254740992.0
+
+###############################################################################
+
+
+@njit(cache=True, fastmath=True)
+def brownian_bridge_setup(times):
+    """ Order in which a Brownian bridge fills in the points of a Brownian
+    motion at the given increasing times. The first point filled in is the
+    last time and each later point is the middle of a gap between two points
+    that are already known. Returns the index of each point in the order of
+    construction, the indices of its left and right neighbours, their
+    weights and the standard deviation of the point given its neighbours. """
+
+    n = len(times)
+    known = np.zeros(n, dtype=np.int64)
+    bridge_index = np.zeros(n, dtype=np.int64)
+    left_index = np.zeros(n, dtype=np.int64)
+    right_index = np.zeros(n, dtype=np.int64)
+    left_weight = np.zeros(n)
+    right_weight = np.zeros(n)
+    std_dev = np.zeros(n)
+
+    if n == 0:
+        return bridge_index, left_index, right_index, left_weight, \
+            right_weight, std_dev
+
+    known[n-1] = 1
+    bridge_index[0] = n - 1
+    std_dev[0] = np.sqrt(times[n-1])
+
+    j = 0
+    for i in range(1, n):
+
+        # Find the next gap of unknown points starting at j
+        while known[j] == 1:
+            j += 1
+
+        k = j
+        while known[k] == 0:
+            k += 1
+
+        # The point l in the middle of the gap lies between j-1 and k
+        l = j + ((k - 1 - j) >> 1)
+        known[l] = 1
+        bridge_index[i] = l
+        left_index[i] = j
+        right_index[i] = k
+
+        t_left = 0.0
+        if j > 0:
+            t_left = times[j-1]
+
+        gap = times[k] - t_left
+        left_weight[i] = (times[k] - times[l]) / gap
+        right_weight[i] = (times[l] - t_left) / gap
+        std_dev[i] = np.sqrt((times[l] - t_left) * (times[k] - times[l]) / gap)
+
+        j = k + 1
+        if j >= n:
+            j = 0
+
+    return bridge_index, left_index, right_index, left_weight, \
+        right_weight, std_dev
+
+###############################################################################
+
+
+@njit(cache=True, fastmath=True)
+def brownian_bridge(z, bridge_index, left_index, right_index, left_weight,
+                    right_weight, std_dev, w):
+    """ Fill w with a Brownian motion at the times given to the function
+    brownian_bridge_setup from the independent Gaussians z. The first
+    Gaussian sets the last point so the first dimensions of a Sobol sequence
+    drive the largest moves of the path. """
+
+    n = len(z)
+    w[n-1] = std_dev[0] * z[0]
+
+    for i in range(1, n):
+        j = left_index[i]
+        k = right_index[i]
+        l = bridge_index[i]
+
+        w_left = 0.0
+        if j > 0:
+            w_left = w[j-1]
+
+        w[l] = left_weight[i] * w_left + right_weight[i] * w[k] \
+            + std_dev[i] * z[i]
+
+###############################################################################
+
+
+@njit(float64[:, :, :](int64, int64, int64, int64, float64[:], float64[:, :],
+                       float64[:], int64, int64, int64),
+      cache=CACHE_KERNELS, fastmath=True, parallel=USE_PARALLEL)
+def lmm_simulate_fwds_mf_parallel(num_fwds, num_factors, num_paths,
+                                  numeraire_index, fwd0, lambdas, taus,
+                                  use_sobol, seed, use_bridge):
+    """ Multi-factor simulation of the forwards as in lmm_simulate_fwds_mf
+    where the paths are spread over all of the threads and each path draws
+    its own Gaussians. No matrix of Gaussians for all of the paths is held.
+    If use_sobol is 0 the uniforms come from a counter-based generator that
+    is indexed by the seed, the path and the dimension, so the forwards are
+    the same whatever the number of threads. If use_sobol is 1 they are
+    taken from a Sobol sequence. If use_bridge is 1 the Brownian motion of
+    each factor is built with a Brownian bridge over the reset times and
+    otherwise the Gaussians are used as the time step increments in the
+    same order as lmm_simulate_fwds_mf, which it then matches. The one
+    factor model is simulated by passing the gammas as a single lambda. """
+
+    if len(lambdas) != num_factors:
+        raise FinError("Lambda does not have the right number of factors")
+
+    if len(lambdas[0]) != num_fwds:
+        raise FinError("Lambda does not have the right number of forwards")
+
+    if use_sobol != 0 and use_sobol != 1:
+        raise FinError("Use Sobol must be 0 or 1.")
+
+    if use_bridge != 0 and use_bridge != 1:
+        raise FinError("Use bridge must be 0 or 1.")
+
+    # Even number of paths for antithetics. The forwards that have already
+    # reset at a time are not simulated and are left as zero
+    num_paths = 2 * int(num_paths/2)
+    half_num_paths = int(num_paths/2)
+    fwd = np.zeros((num_paths, num_fwds, num_fwds))
+
+    num_times = num_fwds
+    num_steps = num_fwds - 1
+    num_dimensions = num_times * num_factors
+
+    if use_sobol == 1:
+        rands = get_uniform_sobol(half_num_paths, num_dimensions)
+    else:
+        rands = np.zeros((0, 0))
+
+    # The bridge is built on the reset times at the end of each time step
+    step_times = np.zeros(num_steps)
+    t = 0.0
+    for j in range(0, num_steps):
+        t += taus[j]
+        step_times[j] = t
+
+    bridge_index, left_index, right_index, left_weight, right_weight, \
+        std_dev = brownian_bridge_setup(step_times)
+
+    key = _splitmix64(np.uint64(seed))
+
+    for i_path in prange(0, num_paths):
+
+        # Antithetic paths use the draws of the first half of the paths
+        i_draw = i_path
+        sign = 1.0
+        if i_path >= half_num_paths:
+            i_draw = i_path - half_num_paths
+            sign = -1.0
+
+        z = np.empty(num_dimensions)
+        for d in range(0, num_dimensions):
+            if use_sobol == 1:
+                u = rands[i_draw, d]
+            else:
+                u = counter_uniform(key, i_draw * num_dimensions + d)
+            z[d] = sign * norminvcdf(u)
+
+        g = np.zeros((num_times, num_factors))
+
+        if use_bridge == 1:
+            zq = np.empty(num_steps)
+            w = np.empty(num_steps)
+            for q in range(0, num_factors):
+                for i in range(0, num_steps):
+                    zq[i] = z[i*num_factors + q]
+
+                brownian_bridge(zq, bridge_index, left_index, right_index,
+                                left_weight, right_weight, std_dev, w)
+
+                w_prev = 0.0
+                for j in range(0, num_steps):
+                    g[j, q] = (w[j] - w_prev) / np.sqrt(taus[j])
+                    w_prev = w[j]
+        else:
+            for j in range(0, num_times):
+                for q in range(0, num_factors):
+                    g[j, q] = z[j*num_factors + q]
+
+        _lmm_evolve_path_mf(fwd[i_path], g, fwd0, lambdas, taus)
 
     return fwd
 
@@ -15,7 +15,7 @@ from ..utils.helpers import label_to_string
 ###############################################################################
 
 
-@njit
+@njit(cache=True)
 def _x(rho, z):
     """ Return function x used in Hagan's 2002 SABR lognormal vol expansion."""
     a = (1.0 - 2.0*rho*z + z**2)**.5 + z - rho
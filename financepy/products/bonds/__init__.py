@@ -1,13 +1,19 @@
-from .bond import *
-from .bond_zero import *
-from .bond_annuity import *
-from .bond_zero_curve import *
-from .bond_convertible import *
-from .bond_callable import *
-from .bond_frn import *
-from .bond_future import *
-from .bond_market import *
-from .bond_option import *
-from .bond_yield_curve import *
-from .curve_fits import *
-from .bond_mortgage import *
+from ...utils.lazy_import import lazy_package
+
+# Each module is only imported when one of its names is first used
+__getattr__, __dir__ = lazy_package(__name__, __file__, [
+    "bond",
+    "bond_zero",
+    "bond_annuity",
+    "bond_zero_curve",
+    "bond_convertible",
+    "bond_callable",
+    "bond_callable_book",
+    "bond_frn",
+    "bond_future",
+    "bond_market",
+    "bond_option",
+    "bond_yield_curve",
+    "curve_fits",
+    "bond_mortgage",
+])
@@ -31,7 +31,7 @@ from ...utils.global_vars import g_days_in_year, g_small
 from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.schedule import Schedule
 from ...utils.calendar import Calendar
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes
 from ...utils.calendar import DateGenRuleTypes
 from ...utils.helpers import label_to_string, check_argument_types
@@ -105,7 +105,7 @@ class Bond:
         freq_type: FrequencyTypes,
         dc_type: DayCountTypes,
         ex_div_days: int = 0,
-        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
         bd_type=BusDayAdjustTypes.FOLLOWING,
         dg_type=DateGenRuleTypes.BACKWARD,
     ):
@@ -125,10 +125,10 @@ class BondEmbeddedOption:
 
     ###############################################################################
 
-    def value(self, settle_dt: Date, discount_curve: DiscountCurve, model):
-        """Value the bond that settles on the specified date that can have
-        both embedded call and put options. This is done using the specified
-        model and a discount curve."""
+    def _tree_cashflows(self, settle_dt: Date):
+        """Return the times and amounts of the coupons and the times and
+        prices of the calls and puts after the settlement date as used by the
+        tree models."""
 
         # Generate bond coupon flow schedule
         cpn = self.bond.cpn / self.bond.freq
@@ -163,6 +163,19 @@ class BondEmbeddedOption:
         put_times = np.array(put_times)
         put_prices = np.array(self.put_prices)
 
+        return (cpn_times, cpn_amounts, call_times, call_prices,
+                put_times, put_prices)
+
+    ###############################################################################
+
+    def value(self, settle_dt: Date, discount_curve: DiscountCurve, model):
+        """Value the bond that settles on the specified date that can have
+        both embedded call and put options. This is done using the specified
+        model and a discount curve."""
+
+        (cpn_times, cpn_amounts, call_times, call_prices,
+         put_times, put_prices) = self._tree_cashflows(settle_dt)
+
         maturity_dt = self.bond.maturity_dt
         t_mat = (maturity_dt - settle_dt) / g_days_in_year
         df_times = discount_curve._times
@@ -0,0 +1,103 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+import numpy as np
+
+from ...utils.error import FinError
+from ...utils.date import Date
+from ...utils.global_vars import g_days_in_year
+from ...utils.helpers import label_to_string
+from ...market.curves.discount_curve import DiscountCurve
+from ...models.bk_tree import BKTree
+from ...models.hw_tree import HWTree
+from .bond_callable import BondEmbeddedOption
+
+###############################################################################
+
+
+class BondEmbeddedOptionBook:
+    """ A book of bonds with embedded call and put options which are valued
+    together on one short rate tree. The tree is built once out to the last
+    bond maturity and the coupons, calls and puts of all of the bonds are
+    rolled back together so that the probabilities and discounting at each
+    node are shared by the whole book. As for a single bond the values are
+    the average of those on trees with num_time_steps and num_time_steps + 1
+    steps. The shorter bonds are valued on trees whose time step is set by
+    the longest one so their values differ from those on their own trees by
+    the discretisation error of the tree. """
+
+    def __init__(self,
+                 bonds: list):
+        """ Create the book from a list of BondEmbeddedOptions. """
+
+        if len(bonds) == 0:
+            raise FinError("Bond book has no bonds")
+
+        for bond in bonds:
+            if isinstance(bond, BondEmbeddedOption) is False:
+                raise FinError("Bond book only holds BondEmbeddedOptions")
+
+        self.bonds = list(bonds)
+        self.num_trades = len(bonds)
+
+    ###########################################################################
+
+    def value(self,
+              settle_dt: Date,
+              discount_curve: DiscountCurve,
+              model):
+        """ Value every bond in the book that settles on the specified date
+        given a discount curve and a HWTree or BKTree model. Returns a
+        dictionary with NumPy arrays of the values of the bonds with and
+        without their embedded options. """
+
+        if not isinstance(model, (HWTree, BKTree)):
+            raise FinError("Unknown model type")
+
+        cashflows = [bond._tree_cashflows(settle_dt) for bond in self.bonds]
+
+        t_mat = max((bond.bond.maturity_dt - settle_dt) / g_days_in_year
+                    for bond in self.bonds)
+
+        df_times = discount_curve._times
+        df_values = discount_curve._dfs
+        faces = [bond.par for bond in self.bonds]
+
+        v = []
+
+        for extra_steps in [0, 1]:
+
+            model.num_time_steps += extra_steps
+            model.build_tree(t_mat, df_times, df_values)
+
+            v.append(model.callable_puttable_bond_batch(
+                [flows[0] for flows in cashflows],
+                [flows[1] for flows in cashflows],
+                [flows[2] for flows in cashflows],
+                [flows[3] for flows in cashflows],
+                [flows[4] for flows in cashflows],
+                [flows[5] for flows in cashflows],
+                faces))
+
+            model.num_time_steps -= extra_steps
+
+        return {
+            "bondwithoption": (v[0]["bondwithoption"]
+                               + v[1]["bondwithoption"]) / 2,
+            "bondpure": (v[0]["bondpure"] + v[1]["bondpure"]) / 2,
+        }
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("NUM TRADES", self.num_trades, "")
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        print(self)
+
+###############################################################################
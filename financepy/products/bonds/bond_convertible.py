@@ -19,7 +19,7 @@ from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.helpers import label_to_string, check_argument_types
 
 from ...utils.schedule import Schedule
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes
 from ...utils.calendar import DateGenRuleTypes
 
@@ -289,7 +289,7 @@ class BondConvertible:
         put_dts: List[Date],  # list of put dates
         put_prices: List[float],  # list of put prices
         dc_type: DayCountTypes,  # day count type for accrued
-        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
     ):
         """Create BondConvertible object by providing the bond Maturity
         date, coupon, frequency type, accrual convention type and then all
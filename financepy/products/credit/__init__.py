@@ -1,7 +1,12 @@
-from .cds import *
-from .cds_curve import *
-from .cds_basket import *
-from .cds_index_option import *
-from .cds_index_portfolio import *
-from .cds_option import *
-from .cds_tranche import *
+from ...utils.lazy_import import lazy_package
+
+# Each module is only imported when one of its names is first used
+__getattr__, __dir__ = lazy_package(__name__, __file__, [
+    "cds",
+    "cds_curve",
+    "cds_basket",
+    "cds_index_option",
+    "cds_index_portfolio",
+    "cds_option",
+    "cds_tranche",
+])
@@ -2,7 +2,7 @@
 # Copyright (C) 2018, 2019, 2020 Dominic O'Kane
 ##############################################################################
 
-from copy import deepcopy
+from copy import copy
 from math import exp, log
 
 import numpy as np
@@ -10,7 +10,7 @@ from numba import njit, float64, int64
 
 from ...utils.date import Date
 from ...utils.error import FinError
-from ...utils.calendar import Calendar, CalendarTypes
+from ...utils.calendar import Calendar, CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes, DateGenRuleTypes
 from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.frequency import annual_frequency, FrequencyTypes
@@ -246,7 +246,7 @@ class CDS:
         long_protect: bool = True,
         freq_type: FrequencyTypes = FrequencyTypes.QUARTERLY,
         dc_type: DayCountTypes = DayCountTypes.ACT_360,
-        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
         bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
         dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
     ):
@@ -462,10 +462,14 @@ class CDS:
 
         bump = 0.0001  # 1 basis point
 
-        # we create a deep copy to avoid state issues
-        bumpedIssuerCurve = deepcopy(issuer_curve)
-        for cds in bumpedIssuerCurve.cds_contracts:
-            cds.running_cpn += bump
+        # we only copy the parts of the curve that the bump changes
+        bumpedIssuerCurve = copy(issuer_curve)
+        bumpedIssuerCurve.cds_contracts = []
+
+        for cds in issuer_curve.cds_contracts:
+            bumped_cds = copy(cds)
+            bumped_cds.running_cpn += bump
+            bumpedIssuerCurve.cds_contracts.append(bumped_cds)
 
         bumpedIssuerCurve._build_curve()
 
@@ -504,20 +508,38 @@ class CDS:
             num_steps_per_year,
         )
 
-        # we create a deep copy to avoid state issues
-        new_issuer_curve = deepcopy(issuer_curve)
+        # we only copy the parts of the curves that the bump changes. The
+        # schedules of the benchmarks are shared with the original curve.
+        new_issuer_curve = copy(issuer_curve)
+        new_libor_curve = copy(issuer_curve.libor_curve)
+        new_issuer_curve.libor_curve = new_libor_curve
 
         bump = 0.0001  # 1 basis point
 
-        for depo in new_issuer_curve.libor_curve.used_deposits:
+        new_libor_curve.used_deposits = []
+
+        for depo in issuer_curve.libor_curve.used_deposits:
 
+            depo = copy(depo)
             depo.deposit_rate += bump
+            new_libor_curve.used_deposits.append(depo)
+
+        new_libor_curve.used_fras = []
 
-        for fra in new_issuer_curve.libor_curve.used_fras:
+        for fra in issuer_curve.libor_curve.used_fras:
 
+            fra = copy(fra)
             fra.fra_rate += bump
+            new_libor_curve.used_fras.append(fra)
+
+        new_libor_curve.used_swaps = []
+
+        for swap in issuer_curve.libor_curve.used_swaps:
 
-        for swap in new_issuer_curve.libor_curve.used_swaps:
+            swap = copy(swap)
+            swap.fixed_leg = copy(swap.fixed_leg)
+            swap.fixed_leg.payments = list(swap.fixed_leg.payments)
+            new_libor_curve.used_swaps.append(swap)
 
             cpn = swap.fixed_leg.cpn
             swap.fixed_leg.cpn = cpn + bump
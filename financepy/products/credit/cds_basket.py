@@ -10,7 +10,7 @@ import numpy as np
 from ...utils.error import FinError
 from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.frequency import FrequencyTypes
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes, DateGenRuleTypes
 from ...utils.global_vars import g_days_in_year
 from ...utils.math import ONE_MILLION
@@ -44,7 +44,7 @@ class CDSBasket:
         long_protect: bool = True,
         freq_type: FrequencyTypes = FrequencyTypes.QUARTERLY,
         dc_type: DayCountTypes = DayCountTypes.ACT_360,
-        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
         bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
         dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
     ):
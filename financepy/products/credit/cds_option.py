@@ -5,7 +5,7 @@
 from math import sqrt, log
 from scipy import optimize
 
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes, DateGenRuleTypes
 from ...utils.day_count import DayCountTypes
 from ...utils.frequency import FrequencyTypes
@@ -53,7 +53,8 @@ class CDSOption:
                  knockout_flag: bool = True,
                  freq_type: FrequencyTypes = FrequencyTypes.QUARTERLY,
                  dc_type: DayCountTypes = DayCountTypes.ACT_360,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes,
+                            JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                  dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD):
         """ Create a FinCDSOption object with the option expiry date, the
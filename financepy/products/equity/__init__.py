@@ -1,22 +1,27 @@
-from .equity_asian_option import *
-from .equity_american_option import *
-from .equity_barrier_option import *
-from .equity_basket_option import *
-from .equity_binomial_tree import *
-from .equity_chooser_option import *
-from .equity_cliquet_option import *
-from .equity_compound_option import *
-from .equity_digital_option import *
-from .equity_fixed_lookback_option import *
-from .equity_float_lookback_option import *
-from .equity_model_types import *
-from .equity_option import *
-from .equity_rainbow_option import *
-from .equity_vanilla_option import *
-from .equity_variance_swap import *
-from .equity_one_touch_option import *
-from .equity_forward import *
-from .equity_swap_leg import *
-from .equity_swap import *
+from ...utils.lazy_import import lazy_package
+
+# Each module is only imported when one of its names is first used
+__getattr__, __dir__ = lazy_package(__name__, __file__, [
+    "equity_asian_option",
+    "equity_american_option",
+    "equity_barrier_option",
+    "equity_basket_option",
+    "equity_binomial_tree",
+    "equity_chooser_option",
+    "equity_cliquet_option",
+    "equity_compound_option",
+    "equity_digital_option",
+    "equity_fixed_lookback_option",
+    "equity_float_lookback_option",
+    "equity_model_types",
+    "equity_option",
+    "equity_rainbow_option",
+    "equity_vanilla_option",
+    "equity_variance_swap",
+    "equity_one_touch_option",
+    "equity_forward",
+    "equity_swap_leg",
+    "equity_swap",
+])
 
 # dividend_curve = FinDiscountCurveFlat(value_dt, dividend_yield)
@@ -46,7 +46,6 @@ class EquityIndexOption:
         self.expiry_dt = expiry_dt
         self.strike_price = strike_price
         self.num_options = num_options
-        self.t_exp = None
 
     ###########################################################################
 
@@ -79,8 +78,6 @@ class EquityIndexOption:
         else:
             raise FinError("Valuation date must be Date or list of Date")
 
-        self.t_exp = t_exp
-
         if np.any(forward_price <= 0.0):
             raise FinError("Forward price must be greater than zero.")
 
@@ -116,7 +113,6 @@ class EquityIndexOption:
             t_exp = (self.expiry_dt - value_dt) / g_days_in_year
         else:
             t_exp = value_dt
-        self.t_exp = t_exp
         if np.any(forward_price <= 0.0):
             raise FinError("Forward price must be greater than zero.")
         if np.any(t_exp < 0.0):
@@ -6,7 +6,7 @@ from ...utils.error import FinError
 from ...utils.date import Date
 from ...utils.day_count import DayCountTypes
 from ...utils.frequency import FrequencyTypes, annual_frequency
-from ...utils.calendar import CalendarTypes, DateGenRuleTypes
+from ...utils.calendar import CalendarTypes, JointCalendar, DateGenRuleTypes
 from ...utils.calendar import Calendar, BusDayAdjustTypes
 from ...utils.helpers import check_argument_types
 from ...utils.global_types import SwapTypes, ReturnTypes
@@ -48,7 +48,7 @@ class EquitySwap:
         rate_dc_type: DayCountTypes = DayCountTypes.ACT_360,
         rate_spread: float = 0.0,
         rate_payment_lag: int = 0,
-        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
         bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
         dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
         end_of_month: bool = False,
@@ -6,7 +6,7 @@ from ...utils.error import FinError
 from ...utils.date import Date
 from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.frequency import FrequencyTypes
-from ...utils.calendar import CalendarTypes, DateGenRuleTypes
+from ...utils.calendar import CalendarTypes, JointCalendar, DateGenRuleTypes
 from ...utils.calendar import Calendar, BusDayAdjustTypes
 from ...utils.schedule import Schedule
 from ...utils.helpers import (
@@ -38,7 +38,7 @@ class EquitySwapLeg:
         quantity: float = 1.0,  # Quantity at effective date
         payment_lag: int = 0,
         return_type: ReturnTypes = ReturnTypes.TOTAL_RETURN,
-        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
         bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
         dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
         end_of_month: bool = False,
@@ -99,7 +99,6 @@ class EquityVanillaOption:
         self.strike_price = strike_price
         self.option_type = option_type
         self.num_options = num_options
-        self.t_exp = None
 
     ###########################################################################
 
@@ -126,8 +125,6 @@ class EquityVanillaOption:
         else:
             t_exp = value_dt
 
-        self.t_exp = t_exp
-
         s0 = stock_price
         t_exp = np.maximum(t_exp, 1e-10)
 
@@ -188,8 +185,6 @@ class EquityVanillaOption:
         else:
             t_exp = value_dt
 
-        self.t_exp = t_exp
-
         if np.any(stock_price <= 0.0):
             raise FinError("Stock price must be greater than zero.")
 
@@ -240,8 +235,6 @@ class EquityVanillaOption:
         else:
             t_exp = value_dt
 
-        self.t_exp = t_exp
-
         if np.any(stock_price <= 0.0):
             raise FinError("Stock price must be greater than zero.")
 
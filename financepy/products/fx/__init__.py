@@ -1,12 +1,17 @@
-from .fx_barrier_option import *
-from .fx_digital_option import *
-from .fx_double_digital_option import *
-from .fx_fixed_lookback_option import *
-from .fx_float_lookback_option import *
-from .fx_forward import *
-from .fx_mkt_conventions import *
-from .fx_option import *
-from .fx_rainbow_option import *
-from .fx_vanilla_option import *
-from .fx_variance_swap import *
-from .fx_one_touch_option import *
+from ...utils.lazy_import import lazy_package
+
+# Each module is only imported when one of its names is first used
+__getattr__, __dir__ = lazy_package(__name__, __file__, [
+    "fx_barrier_option",
+    "fx_digital_option",
+    "fx_double_digital_option",
+    "fx_fixed_lookback_option",
+    "fx_float_lookback_option",
+    "fx_forward",
+    "fx_mkt_conventions",
+    "fx_option",
+    "fx_rainbow_option",
+    "fx_vanilla_option",
+    "fx_variance_swap",
+    "fx_one_touch_option",
+])
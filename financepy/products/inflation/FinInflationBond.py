@@ -11,7 +11,7 @@
 from ...utils.date import Date
 from ...utils.error import FinError
 from ...utils.frequency import annual_frequency, FrequencyTypes
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.day_count import DayCountTypes
 from ...utils.helpers import label_to_string, check_argument_types
 from ..bonds.bond import Bond, YTMCalcType
@@ -34,7 +34,7 @@ class FinInflationBond(Bond):
         ex_div_days: int,  # Value of CPI index at bond issue date
         base_cpi_value: float,  # CPI value at issue
         num_ex_dividend_days: int = 0,
-        cal_type: CalendarTypes = CalendarTypes.NONE,
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.NONE,
     ):
         """Create FinInflationBond object by providing Maturity, Frequency,
         coupon, frequency and the accrual convention type. You must also supply
@@ -6,7 +6,7 @@
 from ...utils.error import FinError
 from ...utils.date import Date
 from ...utils.calendar import Calendar
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes
 from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.helpers import label_to_string, check_argument_types
@@ -48,7 +48,7 @@ class FinInflationSwap:
         day_count_type: DayCountTypes,  # For interest period
         notional: float = 100.0,
         pay_fixed_rate: bool = True,  # True if the FRA rate is being paid
-        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
         bd_type: BusDayAdjustTypes = BusDayAdjustTypes.MODIFIED_FOLLOWING,
     ):
         """Create a Forward Rate Agreeement object."""
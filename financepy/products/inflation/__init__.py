@@ -1 +1,6 @@
-from .FinInflationBond import *
+from ...utils.lazy_import import lazy_package
+
+# Each module is only imported when one of its names is first used
+__getattr__, __dir__ = lazy_package(__name__, __file__, [
+    "FinInflationBond",
+])
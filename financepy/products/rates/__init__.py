@@ -1,19 +1,26 @@
-from .callable_swap import *
-from .ibor_bermudan_swaption import *
-from .ibor_benchmarks_report import *
-from .ibor_cap_floor import *
-from .ibor_deposit import *
-from .ibor_fra import *
-from .ibor_future import *
-from .ibor_conventions import *
-from .ibor_swap import *
-from .ibor_swaption import *
-from .ois_basis_swap import *
-from .ois_curve import *
-from .ois import *
-from .ibor_single_curve import *
-from .ibor_single_curve_par_shocker import *
-from .ibor_single_curve_smoothing_calibrator import *
-from .dual_curve import *
-from .swap_fixed_leg import *
-from .swap_float_leg import *
+from ...utils.lazy_import import lazy_package
+
+# Each module is only imported when one of its names is first used
+__getattr__, __dir__ = lazy_package(__name__, __file__, [
+    "callable_swap",
+    "ibor_bermudan_swaption",
+    "ibor_benchmarks_report",
+    "ibor_cap_floor",
+    "ibor_deposit",
+    "ibor_fra",
+    "ibor_future",
+    "ibor_conventions",
+    "ibor_swap",
+    "ibor_swaption",
+    "ois_basis_swap",
+    "ois_curve",
+    "ois",
+    "ibor_single_curve",
+    "ibor_single_curve_par_shocker",
+    "ibor_single_curve_smoothing_calibrator",
+    "dual_curve",
+    "swap_fixed_leg",
+    "swap_float_leg",
+    "swap_book",
+    "bermudan_swaption_book",
+])
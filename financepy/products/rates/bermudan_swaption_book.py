@@ -0,0 +1,117 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+import numpy as np
+
+from ...utils.error import FinError
+from ...utils.date import Date
+from ...utils.global_types import SwapTypes
+from ...utils.helpers import label_to_string
+from ...market.curves.discount_curve import DiscountCurve
+from ...models.bdt_tree import BDTTree
+from ...models.bk_tree import BKTree
+from ...models.hw_tree import HWTree
+from .ibor_bermudan_swaption import IborBermudanSwaption
+
+###############################################################################
+
+
+class BermudanSwaptionBook:
+    """ A book of Bermudan swaptions which are valued together on one short
+    rate tree. For the Hull-White and Black-Karasinski trees, the tree is
+    built once out to the last swap maturity and the coupon schedules and the
+    exercise dates of all of the swaptions are rolled back together so that
+    the probabilities and discounting at each node are shared by the whole
+    book. As the shorter swaptions are valued on a tree whose time step is set
+    by the longest one, their values differ from those on their own trees by
+    the discretisation error of the tree. There is no batched rollback on the
+    BDT tree so each swaption is valued on its own tree. """
+
+    def __init__(self,
+                 swaptions: list):
+        """ Create the book from a list of IborBermudanSwaptions. """
+
+        if len(swaptions) == 0:
+            raise FinError("Swaption book has no swaptions")
+
+        for swaption in swaptions:
+            if isinstance(swaption, IborBermudanSwaption) is False:
+                raise FinError("Swaption book only holds "
+                               "IborBermudanSwaptions")
+
+        self.swaptions = list(swaptions)
+        self.num_trades = len(swaptions)
+
+    ###########################################################################
+
+    def value(self,
+              value_dt: Date,
+              discount_curve: DiscountCurve,
+              model):
+        """ Value every swaption in the book on a value date given a discount
+        curve and a HWTree, BKTree or BDTTree model. Returns a NumPy array
+        with the value of each swaption. """
+
+        if not isinstance(model, (HWTree, BKTree, BDTTree)):
+            raise FinError("Invalid model choice for Bermudan Swaption")
+
+        if isinstance(model, BDTTree):
+            return np.array([swaption.value(value_dt, discount_curve, model)
+                             for swaption in self.swaptions])
+
+        cashflows = [swaption._tree_cashflows(value_dt)
+                     for swaption in self.swaptions]
+
+        # The tree must reach the maturity and the last coupon of every swap
+        t_mat = max(max(t_mat, cpn_times[-1])
+                    for _, t_mat, cpn_times, _ in cashflows)
+
+        if isinstance(model, HWTree):
+            # The time steps land on the expiry and coupon dates of all trades
+            event_times = np.concatenate([cpn_times
+                                          for _, _, cpn_times, _ in cashflows])
+            model.build_tree(t_mat,
+                             discount_curve._times,
+                             discount_curve._dfs,
+                             event_times)
+        else:
+            model.build_tree(t_mat,
+                             discount_curve._times,
+                             discount_curve._dfs)
+
+        # The floating leg is assumed to price at par on a unit face amount
+        strikes = np.ones(self.num_trades)
+        faces = np.ones(self.num_trades)
+
+        v = model.bermudan_swaption_batch(
+            [t_exp for t_exp, _, _, _ in cashflows],
+            strikes,
+            faces,
+            [cpn_times for _, _, cpn_times, _ in cashflows],
+            [cpn_flows for _, _, _, cpn_flows in cashflows],
+            [swaption.exercise_type for swaption in self.swaptions])
+
+        values = np.zeros(self.num_trades)
+
+        for i, swaption in enumerate(self.swaptions):
+            if swaption.fixed_leg_type == SwapTypes.RECEIVE:
+                values[i] = swaption.notional * v["rec"][i]
+            elif swaption.fixed_leg_type == SwapTypes.PAY:
+                values[i] = swaption.notional * v["pay"][i]
+
+        return values
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("NUM TRADES", self.num_trades, "")
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        print(self)
+
+###############################################################################
@@ -0,0 +1,521 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+import numpy as np
+from numba import njit, float64, int64
+from scipy import optimize
+
+from ...utils.error import FinError
+from ...utils.day_count import DayCount, DayCountTypes
+from ...utils.global_types import SwapTypes
+from ...utils.helpers import times_from_dates
+from ...market.curves.interpolator import Interpolator
+from ...products.rates.ibor_deposit import IborDeposit
+from ...products.rates.ibor_fra import IborFRA
+from ...products.rates.ibor_swap import IborSwap
+from ...products.rates.ois import OIS
+
+SWAP_TOL = 1e-10
+
+###############################################################################
+# The bootstrap of a discount curve solves for one knot discount factor at a
+# time so that a benchmark reprices. Each benchmark is written as a sum of
+# terms c * df(a)^e_a * df(b)^e_b * df(q)^e_q on the curve being solved. For
+# the local interpolation schemes the log of each discount factor is linear
+# in the log of the last knot discount factor. The value of the benchmark is
+# then a sum of powers of the knot discount factor and its derivative is
+# known analytically so the knot is found by a compiled Newton solver.
+###############################################################################
+
+
+def _f(df, *args):
+    """Root search objective function for deposits, FRAs and swaps. Only the
+    tail of the benchmark after the previous knot is revalued."""
+
+    curve = args[0]
+    tail = args[1]
+    num_points = len(curve._times)
+    curve._dfs[num_points - 1] = df
+
+    # For discount that need a fit function, we fit it now
+    curve._interpolator.fit(curve._times, curve._dfs)
+    return tail.value(curve)
+
+
+###############################################################################
+
+
+@njit(float64(float64, float64[:], float64[:], float64, int64),
+      fastmath=True, cache=True, nogil=True)
+def _solve_log_linear(known, g, beta, tol, max_iter):
+    """Return the change y in the log of the knot discount factor at which
+    known + sum g * exp(beta * y) is zero. Each Newton step uses the analytic
+    derivative of the sum."""
+
+    y = 0.0
+
+    for _ in range(0, max_iter):
+
+        v = known
+        dv = 0.0
+
+        for k in range(0, g.size):
+            term = g[k] * np.exp(beta[k] * y)
+            v += term
+            dv += beta[k] * term
+
+        if dv == 0.0:
+            raise FinError("Benchmark does not depend on the knot.")
+
+        dy = v / dv
+        y -= dy
+
+        if abs(dy) < tol:
+            return y
+
+    raise FinError("Knot solver did not converge.")
+
+
+###############################################################################
+
+
+class _BenchmarkTail:
+    """The value per unit notional of a deposit, FRA or swap written as a sum
+    of terms c * df(a)^e_a * df(b)^e_b * df(q)^e_q divided by the discount
+    factor to the valuation date. The date q is the payment date and terms
+    paid on or before the valuation date are dropped. If a separate discount
+    curve is given, the payment discount factors are taken from it and only
+    the other dates are on the curve being solved. During the bootstrap the
+    terms with all dates on or before the last solved knot do not depend on
+    the knot being solved for and are valued once. Only the other terms, which
+    form the tail of the benchmark, are valued on each solver iteration.
+    The derivative of each coefficient with respect to the market quote of
+    the benchmark is also kept. If whole is True no terms are treated as
+    known so that the whole benchmark can be revalued as every knot moves."""
+
+    def __init__(
+        self,
+        curve,
+        dts: list,  # Lists of the dates a, b and q of each term
+        exps: np.ndarray,  # Exponents of the dates of each term
+        coeffs: np.ndarray,
+        disc_curve=None,
+        dcoeffs: np.ndarray = None,  # Derivatives of coeffs to the quote
+        whole: bool = False,
+    ):
+        """Split the terms of a benchmark into those known from the knots of
+        the curve solved so far and those in its tail."""
+
+        num_terms = len(coeffs)
+
+        # The curve converts dates to times using this day count
+        times = times_from_dates(
+            dts[0] + dts[1] + dts[2], curve.value_dt, DayCountTypes.ACT_ACT_ISDA
+        )
+
+        times = times.reshape((3, num_terms)).T
+        exps = np.array(exps, dtype=np.float64)
+        coeffs = np.array(coeffs, dtype=np.float64)
+
+        if dcoeffs is None:
+            dcoeffs = np.zeros(num_terms)
+        else:
+            dcoeffs = np.array(dcoeffs, dtype=np.float64)
+
+        if disc_curve is None:
+            self._df_value = 1.0
+        else:
+            self._df_value = disc_curve.df(curve.value_dt)
+            disc_dfs = disc_curve.df(dts[2]) ** exps[:, 2]
+            coeffs *= disc_dfs
+            dcoeffs *= disc_dfs
+            exps[:, 2] = 0.0
+
+        paid = times[:, 2] > 0.0
+        times = times[paid]
+        exps = exps[paid]
+        coeffs = coeffs[paid]
+        dcoeffs = dcoeffs[paid]
+
+        # Dates with a zero exponent do not need a discount factor
+        times[exps == 0.0] = 0.0
+
+        # A non-local interpolation changes the whole curve at each step
+        if whole is False and \
+                Interpolator.suitable_for_bootstrap(curve._interp_type):
+            t_known = curve._times[-1]
+        else:
+            t_known = 0.0
+
+        known = np.max(times, axis=1) <= t_known
+
+        known_dfs = np.asarray(curve.df_t(times[known].ravel()))
+        known_dfs = known_dfs.reshape((-1, 3))
+        known_prods = np.prod(known_dfs ** exps[known], axis=1)
+        self._known_pv = np.sum(coeffs[known] * known_prods)
+        self._known_dpv = np.sum(dcoeffs[known] * known_prods)
+
+        self._times = times[~known]
+        self._exps = exps[~known]
+        self._coeffs = coeffs[~known]
+        self._dcoeffs = dcoeffs[~known]
+
+    ###########################################################################
+
+    def _terms(self, curve):
+        """Return the value of each term of the tail of the benchmark divided
+        by the discount factor to the valuation date."""
+
+        dfs = np.asarray(curve.df_t(self._times.ravel()))
+        dfs = dfs.reshape(self._times.shape)
+        return self._coeffs * np.prod(dfs ** self._exps, axis=1) / \
+            self._df_value
+
+    ###########################################################################
+
+    def value(self, curve):
+        """Value the benchmark per unit notional using the tail discount
+        factors of the curve being solved."""
+
+        return self._known_pv / self._df_value + np.sum(self._terms(curve))
+
+    ###########################################################################
+
+    def log_linear_terms(self, curve):
+        """Return the known value and the value g and power beta of each term
+        of the tail so that the benchmark value is known + sum g * x^beta
+        where x is the ratio of the last knot discount factor to its current
+        value. This requires a local interpolation scheme."""
+
+        sens = curve._interpolator.last_knot_log_sensitivity(
+            self._times.ravel())
+
+        beta = np.sum(self._exps * sens.reshape(self._times.shape), axis=1)
+        return self._known_pv / self._df_value, self._terms(curve), beta
+
+    ###########################################################################
+
+    def gradient(self, curve):
+        """Return the value of the benchmark and its derivative with respect
+        to the log of the discount factor at each of its tail times."""
+
+        terms = self._terms(curve)
+        grad = self._exps * terms[:, np.newaxis]
+        return self._known_pv / self._df_value + np.sum(terms), grad.ravel()
+
+    ###########################################################################
+
+    def quote_derivative(self, curve):
+        """Return the derivative of the value of the benchmark with respect
+        to its market quote with the curve held fixed."""
+
+        dfs = np.asarray(curve.df_t(self._times.ravel()))
+        dfs = dfs.reshape(self._times.shape)
+        prods = np.prod(dfs ** self._exps, axis=1)
+        return (self._known_dpv + np.sum(self._dcoeffs * prods)) / \
+            self._df_value
+
+    ###########################################################################
+
+    @property
+    def tail_times(self):
+        """The times of the discount factors in the tail of the benchmark."""
+        return self._times.ravel()
+
+    ###########################################################################
+
+    @classmethod
+    def from_deposit(cls, curve, depo, whole=False):
+        """The value of a deposit is (1 + acc * r) * df(m) / df(s) times the
+        notional where s is the start date and m the maturity date. One unit
+        is taken away so that the deposit reprices when this is zero."""
+
+        dc = DayCount(depo.dc_type)
+        acc_factor = dc.year_frac(depo.start_dt, depo.maturity_dt)[0]
+        value_dt = curve.value_dt
+
+        dts = [[depo.maturity_dt, value_dt],
+               [depo.start_dt, value_dt],
+               [depo.maturity_dt, depo.maturity_dt]]
+
+        exps = np.array([[1.0, -1.0, 0.0], [0.0, 0.0, 0.0]])
+        coeffs = np.array([1.0 + acc_factor * depo.deposit_rate, -1.0])
+        dcoeffs = np.array([acc_factor, 0.0])
+
+        return cls(curve, dts, exps, coeffs, None, dcoeffs, whole)
+
+    ###########################################################################
+
+    @classmethod
+    def from_fra(cls, curve, fra, disc_curve=None, whole=False):
+        """The value of a FRA is (df(s) / df(m) - 1 - acc * K) * df(m) times
+        the notional divided by df(value date) where s is the start date and
+        m the maturity date."""
+
+        dc = DayCount(fra.dc_type)
+        acc_factor = dc.year_frac(fra.start_dt, fra.maturity_dt)[0]
+        value_dt = curve.value_dt
+
+        sign = 1.0
+        if fra.pay_fixed_rate is True:
+            sign = -1.0
+
+        dts = [[fra.start_dt, value_dt],
+               [fra.maturity_dt, value_dt],
+               [fra.maturity_dt, fra.maturity_dt]]
+
+        exps = np.array([[1.0, -1.0, 1.0], [0.0, 0.0, 1.0]])
+        coeffs = np.array([sign, -sign * (1.0 + acc_factor * fra.fra_rate)])
+        dcoeffs = np.array([0.0, -sign * acc_factor])
+
+        return cls(curve, dts, exps, coeffs, disc_curve, dcoeffs, whole)
+
+    ###########################################################################
+
+    @classmethod
+    def from_swap(cls, curve, swap, disc_curve=None, whole=False):
+        """The fixed leg pays fixed amounts and each floating payment is
+        (df(s) / df(e) - 1) / index alpha plus the spread times the payment
+        alpha and notional where s and e are the accrual start and end dates.
+        The value is expressed per unit of the fixed leg notional and the
+        market quote is the fixed coupon. This applies to both Ibor swaps and
+        OIS."""
+
+        fixed_leg = swap.fixed_leg
+        float_leg = swap.float_leg
+        notional = fixed_leg.notional
+        value_dt = curve.value_dt
+
+        fixed_sign = 1.0
+        if fixed_leg.leg_type == SwapTypes.PAY:
+            fixed_sign = -1.0
+
+        float_sign = 1.0
+        if float_leg.leg_type == SwapTypes.PAY:
+            float_sign = -1.0
+
+        float_notionals = float_leg.notional_array
+        if len(float_notionals) == 0:
+            float_notionals = [float_leg.notional] * len(float_leg.payment_dts)
+
+        float_notionals = np.array(float_notionals)
+
+        index_alphas = DayCount(curve.dc_type).year_frac_array(
+            float_leg.start_accrued_dts, float_leg.end_accrued_dts)[0]
+
+        amounts = float_sign * np.array(float_leg.year_fracs)
+        amounts *= float_notionals / notional
+
+        # The principal of each leg is paid on its last payment date
+        pay_dts = fixed_leg.payment_dts + [fixed_leg.payment_dts[-1]]
+        pay_dts += float_leg.payment_dts + [float_leg.payment_dts[-1]]
+
+        num_fixed = len(pay_dts)
+
+        dts = [float_leg.start_accrued_dts + [value_dt] * num_fixed,
+               float_leg.end_accrued_dts + [value_dt] * num_fixed,
+               float_leg.payment_dts + pay_dts]
+
+        num_fwd = len(float_leg.payment_dts)
+        exps = np.zeros((num_fwd + num_fixed, 3))
+        exps[0:num_fwd] = [1.0, -1.0, 1.0]
+        exps[num_fwd:, 2] = 1.0
+
+        coeffs = np.concatenate((
+            amounts / index_alphas,
+            fixed_sign * np.array(fixed_leg.payments) / notional,
+            [fixed_sign * fixed_leg.principal],
+            amounts * (float_leg.spread - 1.0 / index_alphas),
+            [float_sign * float_leg.principal * float_notionals[-1] /
+             notional]))
+
+        dcoeffs = np.zeros(len(coeffs))
+        dcoeffs[num_fwd:num_fwd + len(fixed_leg.payments)] = \
+            fixed_sign * np.array(fixed_leg.year_fracs)
+
+        return cls(curve, dts, exps, coeffs, disc_curve, dcoeffs, whole)
+
+
+###############################################################################
+
+
+def _add_knot(curve, times, dfs, i_knot, t_mat, df_mat):
+    """Set a knot in the preallocated arrays and fit the curve to the knots up
+    to and including it."""
+
+    times[i_knot] = t_mat
+    dfs[i_knot] = df_mat
+    curve._times = times[0:i_knot + 1]
+    curve._dfs = dfs[0:i_knot + 1]
+    curve._interpolator.fit(curve._times, curve._dfs)
+
+
+###############################################################################
+
+
+def _solve_knot(curve, times, dfs, i_knot, t_mat, df_guess, tail,
+                max_iter=10):
+    """Solve for the discount factor of a knot that reprices the tail of a
+    benchmark and return it. For a local interpolation scheme the benchmark
+    is exactly a sum of powers of the knot discount factor so the compiled
+    Newton solver finds the root at once and one more pass confirms it.
+    Otherwise a secant search is used. The curve is left fitted to the
+    solved knot."""
+
+    _add_knot(curve, times, dfs, i_knot, t_mat, df_guess)
+
+    if Interpolator.suitable_for_bootstrap(curve._interp_type) is False:
+
+        argtuple = (curve, tail)
+
+        df_mat = optimize.newton(
+            _f,
+            x0=df_guess,
+            fprime=None,
+            args=argtuple,
+            tol=SWAP_TOL,
+            maxiter=50,
+            fprime2=None,
+            full_output=False,
+        )
+
+        return df_mat
+
+    df_mat = df_guess
+
+    for _ in range(0, max_iter):
+
+        (known, g, beta) = tail.log_linear_terms(curve)
+        y = _solve_log_linear(known, g, beta, SWAP_TOL, 50)
+        df_mat = df_mat * np.exp(y)
+        _add_knot(curve, times, dfs, i_knot, t_mat, df_mat)
+
+        if abs(y) < SWAP_TOL:
+            return df_mat
+
+    raise FinError("Knot solver did not converge.")
+
+
+###############################################################################
+
+
+def _solve_knots_globally(curve, tails, tol=SWAP_TOL, max_iter=20):
+    """Solve for all of the knot discount factors after the first at once so
+    that every benchmark reprices. This is needed for a non-local
+    interpolation scheme where each knot moves the whole curve. There must be
+    one benchmark tail per knot, each built with no known terms. Each
+    Newton step uses the analytic derivatives of the benchmarks with respect
+    to the discount factors at their dates times the Jacobian of these with
+    respect to the knots. That Jacobian comes from refitting the interpolator
+    so it is reused while the residuals keep falling quickly. The steps are
+    least-squares solutions so a singular Jacobian does not fail."""
+
+    num_tails = [len(tail.tail_times) for tail in tails]
+    ends = np.cumsum(num_tails)
+    all_times = np.concatenate([tail.tail_times for tail in tails])
+
+    jac = None
+    prev_norm = np.inf
+
+    for _ in range(0, max_iter):
+
+        results = [tail.gradient(curve) for tail in tails]
+        residuals = np.array([r[0] for r in results])
+        norm = np.max(np.abs(residuals))
+
+        if jac is None or norm > 0.1 * prev_norm:
+            knot_jac = curve._interpolator.log_df_jacobian(all_times)
+            jac = np.zeros((len(tails), len(curve._times) - 1))
+            for i in range(0, len(tails)):
+                rows = knot_jac[ends[i] - num_tails[i]:ends[i]]
+                jac[i] = results[i][1] @ rows
+
+        step = np.linalg.lstsq(jac, -residuals, rcond=None)[0]
+        curve._dfs[1:] *= np.exp(step)
+        curve._interpolator.fit(curve._times, curve._dfs)
+        prev_norm = norm
+
+        if np.max(np.abs(step)) < tol:
+            return
+
+    raise FinError("Global knot solver did not converge.")
+
+###############################################################################
+
+
+def _trade_tail(curve, trade, disc_curve=None):
+    """Return the whole benchmark tail of a deposit, FRA, Ibor swap or OIS
+    with the notional that converts its value per unit notional to a PV."""
+
+    if isinstance(trade, IborDeposit):
+        return _BenchmarkTail.from_deposit(curve, trade, True), trade.notional
+    elif isinstance(trade, IborFRA):
+        tail = _BenchmarkTail.from_fra(curve, trade, disc_curve, True)
+        return tail, trade.notional
+    elif isinstance(trade, (IborSwap, OIS)):
+        tail = _BenchmarkTail.from_swap(curve, trade, disc_curve, True)
+        return tail, trade.fixed_leg.notional
+    else:
+        raise FinError("Trade must be a deposit, FRA or swap.")
+
+
+###############################################################################
+
+
+def _df_quote_jacobian(curve, benchmarks, disc_curve=None):
+    """Return the matrix of derivatives of each knot discount factor after
+    the first with respect to the market quote of each benchmark. Since the
+    benchmarks reprice on the built curve, moving a quote moves the knots so
+    that the benchmark residuals stay at zero. The matrix is therefore
+    minus the inverse of the derivatives of the residuals to the knots times
+    the derivatives of the residuals to the quotes. The inverse is found by
+    least squares in case the curve is not an exact fit."""
+
+    tails = [_trade_tail(curve, b, disc_curve)[0] for b in benchmarks]
+
+    num_tails = [len(tail.tail_times) for tail in tails]
+    ends = np.cumsum(num_tails)
+    all_times = np.concatenate([tail.tail_times for tail in tails])
+    knot_jac = curve._interpolator.log_df_jacobian(all_times)
+
+    dr_dlogx = np.zeros((len(tails), len(curve._times) - 1))
+    for i in range(0, len(tails)):
+        rows = knot_jac[ends[i] - num_tails[i]:ends[i]]
+        dr_dlogx[i] = tails[i].gradient(curve)[1] @ rows
+
+    dr_dq = np.diag([tail.quote_derivative(curve) for tail in tails])
+    dlogx_dq = -np.linalg.lstsq(dr_dlogx, dr_dq, rcond=None)[0]
+
+    return np.asarray(curve._dfs[1:])[:, np.newaxis] * dlogx_dq
+
+
+###############################################################################
+
+
+def _trade_df_gradients(curve, trades, disc_curve=None):
+    """Return the matrix of derivatives of the PV of each trade with respect
+    to each knot discount factor after the first. All of the trades share one
+    Jacobian of the interpolated discount factors to the knots."""
+
+    tails = []
+    notionals = []
+    for trade in trades:
+        (tail, notional) = _trade_tail(curve, trade, disc_curve)
+        tails.append(tail)
+        notionals.append(notional)
+
+    num_tails = [len(tail.tail_times) for tail in tails]
+    ends = np.cumsum(num_tails)
+    all_times = np.concatenate([tail.tail_times for tail in tails])
+    knot_jac = curve._interpolator.log_df_jacobian(all_times)
+
+    grads = np.zeros((len(tails), len(curve._times) - 1))
+    for i in range(0, len(tails)):
+        rows = knot_jac[ends[i] - num_tails[i]:ends[i]]
+        grads[i] = notionals[i] * (tails[i].gradient(curve)[1] @ rows)
+
+    return grads / np.asarray(curve._dfs[1:])
+
+
+###############################################################################
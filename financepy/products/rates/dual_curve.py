@@ -17,6 +17,9 @@ from ...market.curves.discount_curve import DiscountCurve
 from ...products.rates.ibor_deposit import IborDeposit
 from ...products.rates.ibor_fra import IborFRA
 from ...products.rates.ibor_swap import IborSwap
+from ...products.rates.curve_bootstrap import _BenchmarkTail
+from ...products.rates.curve_bootstrap import _add_knot, _solve_knot
+from ...products.rates.curve_bootstrap import _solve_knots_globally
 
 SWAP_TOL = 1e-10
 
@@ -25,28 +28,6 @@ SWAP_TOL = 1e-10
 ###############################################################################
 
 
-def _f(df, *args):
-    """Root search objective function for swaps"""
-    discount_curve = args[0]
-    index_curve = args[1]
-    value_dt = args[2]
-    swap = args[3]
-
-    num_points = len(index_curve._times)
-    index_curve._dfs[num_points - 1] = df
-
-    # For discount that need a fit function, we fit it now
-    index_curve._interpolator.fit(index_curve._times, index_curve._dfs)
-    v_swap = swap.value(value_dt, discount_curve, index_curve, None)
-
-    notional = swap.fixed_leg.notional
-    v_swap /= notional
-    return v_swap
-
-
-###############################################################################
-
-
 def _g(df, *args):
     """Root search objective function for swaps"""
 
@@ -293,19 +274,25 @@ class IborDualCurve(DiscountCurve):
         """Construct the discount curve using a bootstrap approach. This is
         the non-linear slower method that allows the user to choose a number
         of interpolation approaches between the swap rates and other rates. It
-        involves the use of a solver."""
+        involves the use of a solver. For a local interpolation scheme each
+        knot is found by a compiled Newton solver using the analytic
+        derivative of the benchmark value. Otherwise the knots of the
+        bootstrap are the starting point of a global Newton solve which
+        reprices all of the benchmarks at once."""
 
         self._interpolator = Interpolator(self._interp_type)
 
-        self._times = np.array([])
-        self._dfs = np.array([])
+        num_knots = 1 + len(self.used_deposits) + len(self.used_fras)
+        num_knots += len(self.used_swaps)
+
+        times = np.zeros(num_knots)
+        dfs = np.zeros(num_knots)
 
         # time zero is now.
         t_mat = 0.0
         df_mat = 1.0
-        self._times = np.append(self._times, 0.0)
-        self._dfs = np.append(self._dfs, df_mat)
-        self._interpolator.fit(self._times, self._dfs)
+        _add_knot(self, times, dfs, 0, t_mat, df_mat)
+        num_solved = 1
 
         # A deposit is not margined and not indexed to Libor so should
         # probably not be used to build an indexed Libor curve from
@@ -314,9 +301,8 @@ class IborDualCurve(DiscountCurve):
             df_settle = self.df(depo.start_dt)
             df_mat = depo._maturity_df() * df_settle
             t_mat = (depo.maturity_dt - self.value_dt) / g_days_in_year
-            self._times = np.append(self._times, t_mat)
-            self._dfs = np.append(self._dfs, df_mat)
-            self._interpolator.fit(self._times, self._dfs)
+            _add_knot(self, times, dfs, num_solved, t_mat, df_mat)
+            num_solved += 1
 
         oldt_mat = t_mat
 
@@ -330,21 +316,13 @@ class IborDualCurve(DiscountCurve):
 
             if t_set < oldt_mat and t_mat > oldt_mat:
                 df_mat = fra.maturity_df(self)
-                self._times = np.append(self._times, t_mat)
-                self._dfs = np.append(self._dfs, df_mat)
+                _add_knot(self, times, dfs, num_solved, t_mat, df_mat)
             else:
-                self._times = np.append(self._times, t_mat)
-                self._dfs = np.append(self._dfs, df_mat)
-                argtuple = (self.discount_curve, self, self.value_dt, fra)
-                df_mat = optimize.newton(
-                    _g,
-                    x0=df_mat,
-                    fprime=None,
-                    args=argtuple,
-                    tol=SWAP_TOL,
-                    maxiter=50,
-                    fprime2=None,
-                )
+                tail = _BenchmarkTail.from_fra(self, fra, self.discount_curve)
+                df_mat = _solve_knot(self, times, dfs, num_solved, t_mat,
+                                     df_mat, tail)
+
+            num_solved += 1
 
         for swap in self.used_swaps:
             # I use the lastPaymentDate in case a date has been adjusted fwd
@@ -352,21 +330,21 @@ class IborDualCurve(DiscountCurve):
             maturity_dt = swap.fixed_leg.payment_dts[-1]
             t_mat = (maturity_dt - self.value_dt) / g_days_in_year
 
-            self._times = np.append(self._times, t_mat)
-            self._dfs = np.append(self._dfs, df_mat)
+            tail = _BenchmarkTail.from_swap(self, swap, self.discount_curve)
+            df_mat = _solve_knot(self, times, dfs, num_solved, t_mat,
+                                 df_mat, tail)
+            num_solved += 1
 
-            argtuple = (self.discount_curve, self, self.value_dt, swap)
+        if Interpolator.suitable_for_bootstrap(self._interp_type) is False:
 
-            df_mat = optimize.newton(
-                _f,
-                x0=df_mat,
-                fprime=None,
-                args=argtuple,
-                tol=SWAP_TOL,
-                maxiter=50,
-                fprime2=None,
-                full_output=False,
-            )
+            tails = [_BenchmarkTail.from_deposit(self, depo)
+                     for depo in self.used_deposits]
+            tails += [_BenchmarkTail.from_fra(self, fra, self.discount_curve)
+                      for fra in self.used_fras]
+            tails += [_BenchmarkTail.from_swap(self, swap, self.discount_curve)
+                      for swap in self.used_swaps]
+
+            _solve_knots_globally(self, tails)
 
         if self.check_refit is True:
             self._check_refits(1e-10, SWAP_TOL, 1e-5)
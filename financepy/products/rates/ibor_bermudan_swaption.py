@@ -83,24 +83,10 @@ class IborBermudanSwaption:
         self.bd_type = bd_type
         self.dg_type = dg_type
 
-        self.pv01 = None
-        self.fwd_swap_rate = None
-        self.forward_df = None
-        self.underlying_swap = None
-        self.cpn_times = None
-        self.cpn_flows = None
-        self.call_times = None
-
-    ###########################################################################
-
-    def value(self, value_dt, discount_curve, model):
-        """Value the Bermudan swaption using the specified model and a
-        discount curve. The choices of model are the Hull-White model, the
-        Black-Karasinski model and the Black-Derman-Toy model."""
-
         float_spread = 0.0
 
-        # The underlying is a swap in which we pay the fixed amount
+        # The underlying is a swap in which we pay the fixed amount. It only
+        # depends on the contract terms so it is built once here.
         self.underlying_swap = IborSwap(
             self.exercise_dt,
             self.maturity_dt,
@@ -117,42 +103,30 @@ class IborBermudanSwaption:
             self.dg_type,
         )
 
-        #  I need to do this to generate the fixed leg flows
-        self.pv01 = self.underlying_swap.pv01(value_dt, discount_curve)
-
-        t_exp = (self.exercise_dt - value_dt) / g_days_in_year
-        t_mat = (self.maturity_dt - value_dt) / g_days_in_year
-
-        #######################################################################
-        # For the tree models we need to generate a vector of the coupons
-        #######################################################################
-
-        cpn_times = [t_exp]
-        cpn_flows = [0.0]
-
-        # The first flow is the expiry date
-        num_flows = len(self.underlying_swap.fixed_leg.payment_dts)
+    ###########################################################################
 
-        swap = self.underlying_swap
+    def value(self, value_dt, discount_curve, model):
+        """Value the Bermudan swaption using the specified model and a
+        discount curve. The choices of model are the Hull-White model, the
+        Black-Karasinski model and the Black-Derman-Toy model."""
 
-        for i_flow in range(0, num_flows):
+        return self.valuation_details(value_dt, discount_curve, model)["value"]
 
-            flow_dt = self.underlying_swap.fixed_leg.payment_dts[i_flow]
+    ###########################################################################
 
-            if flow_dt > self.exercise_dt:
-                cpn_time = (flow_dt - value_dt) / g_days_in_year
-                cpn_flow = swap.fixed_leg.payments[i_flow - 1] / self.notional
-                cpn_times.append(cpn_time)
-                cpn_flows.append(cpn_flow)
+    def valuation_details(self, value_dt, discount_curve, model):
+        """Value the Bermudan swaption and return the value in a dictionary
+        together with the swap PV01 and the coupon and call times used in the
+        tree. Nothing is stored on the swaption so one object can be valued
+        on several threads at once. The tree model is rebuilt by each call and
+        so should not be shared between threads."""
 
-        cpn_times = np.array(cpn_times)
-        cpn_flows = np.array(cpn_flows)
+        pv01 = self.underlying_swap.pv01(value_dt, discount_curve)
 
-        self.cpn_times = cpn_times
-        self.cpn_flows = cpn_flows
+        t_exp, t_mat, cpn_times, cpn_flows = self._tree_cashflows(value_dt)
 
         # Allow exercise on coupon dates but control this later for europeans
-        self.call_times = cpn_times
+        call_times = cpn_times
 
         df_times = discount_curve._times
         df_values = discount_curve._dfs
@@ -171,7 +145,11 @@ class IborBermudanSwaption:
             or isinstance(model, HWTree)
         ):
 
-            model.build_tree(t_mat, df_times, df_values)
+            if isinstance(model, HWTree):
+                # The time steps land on the expiry and the coupon dates
+                model.build_tree(t_mat, df_times, df_values, cpn_times)
+            else:
+                model.build_tree(t_mat, df_times, df_values)
 
             v = model.bermudan_swaption(
                 t_exp,
@@ -191,23 +169,73 @@ class IborBermudanSwaption:
         elif self.fixed_leg_type == SwapTypes.PAY:
             v = self.notional * v["pay"]
 
-        return v
+        out = {
+            "value": v,
+            "pv01": pv01,
+            "cpn_times": cpn_times,
+            "cpn_flows": cpn_flows,
+            "call_times": call_times,
+        }
+
+        return out
+
+    ###########################################################################
+
+    def _tree_cashflows(self, value_dt):
+        """Return the expiry and maturity times and the times and amounts
+        per unit notional of the fixed coupons that are rolled back on the
+        tree. The first coupon is a zero flow on the expiry date."""
+
+        swap = self.underlying_swap
+
+        t_exp = (self.exercise_dt - value_dt) / g_days_in_year
+        t_mat = (self.maturity_dt - value_dt) / g_days_in_year
+
+        #######################################################################
+        # For the tree models we need to generate a vector of the coupons
+        #######################################################################
+
+        cpn_times = [t_exp]
+        cpn_flows = [0.0]
+
+        # The first flow is the expiry date
+        num_flows = len(swap.fixed_leg.payment_dts)
+
+        for i_flow in range(0, num_flows):
+
+            flow_dt = swap.fixed_leg.payment_dts[i_flow]
+
+            if flow_dt > self.exercise_dt:
+                cpn_time = (flow_dt - value_dt) / g_days_in_year
+                cpn_flow = swap.fixed_leg.payments[i_flow - 1] / self.notional
+                cpn_times.append(cpn_time)
+                cpn_flows.append(cpn_flow)
+
+        cpn_times = np.array(cpn_times)
+        cpn_flows = np.array(cpn_flows)
+
+        return t_exp, t_mat, cpn_times, cpn_flows
 
     ###########################################################################
 
-    def print_swaption_value(self):
+    def print_swaption_value(self, details):
+        """Print the PV01 and the coupon and call times in the dictionary
+        returned by valuation_details."""
 
-        print("SWAP PV01:", self.pv01)
+        print("SWAP PV01:", details["pv01"])
 
-        n = len(self.cpn_times)
+        cpn_times = details["cpn_times"]
+        cpn_flows = details["cpn_flows"]
+        n = len(cpn_times)
 
         for i in range(0, n):
-            print("CPN TIME: ", self.cpn_times[i], "FLOW", self.cpn_flows[i])
+            print("CPN TIME: ", cpn_times[i], "FLOW", cpn_flows[i])
 
-        n = len(self.call_times)
+        call_times = details["call_times"]
+        n = len(call_times)
 
         for i in range(0, n):
-            print("CALL TIME: ", self.call_times[i])
+            print("CALL TIME: ", call_times[i])
 
     ###########################################################################
 
@@ -10,7 +10,7 @@ from typing import Optional
 
 from ...utils.date import Date
 from ...utils.calendar import Calendar
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.calendar import DateGenRuleTypes
 from ...utils.calendar import BusDayAdjustTypes
 from ...utils.day_count import DayCount, DayCountTypes
@@ -60,7 +60,7 @@ class IborCapFloor:
         freq_type: FrequencyTypes = FrequencyTypes.QUARTERLY,
         dc_type: DayCountTypes = DayCountTypes.THIRTY_E_360_ISDA,
         notional: float = ONE_MILLION,
-        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
         bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
         dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
     ):
@@ -91,15 +91,9 @@ class IborCapFloor:
         self.notional = notional
         self.dg_type = dg_type
 
-        self.cap_floor_let_values = []
-        self.cap_floor_let_alphas = []
-        self.cap_floor_let_fwd_rates = []
-        self.cap_floor_let_intrinsic = []
-        self.cap_floor_let_dfs = []
-        self.cap_floor_pv = []
-
-        self.value_dt = None
-        self.day_counter = None
+        # The caplet dates and day counter only depend on the contract terms
+        self.day_counter = DayCount(self.dc_type)
+        self._generate_dts()
 
     ###########################################################################
 
@@ -122,10 +116,17 @@ class IborCapFloor:
         """Value the cap or floor using the chosen model which specifies
         the volatility of the Ibor rate to the cap start date."""
 
-        self.value_dt = value_dt
-        self._generate_dts()
+        return self.valuation_details(value_dt, libor_curve, model)["value"]
+
+    ###########################################################################
+
+    def valuation_details(self, value_dt, libor_curve, model):
+        """Value the cap or floor as in value and return the value in a
+        dictionary together with the year fraction, forward rate, intrinsic
+        value, discount factor, value and cumulative value of each caplet or
+        floorlet. Nothing is stored on the cap or floor so one object can be
+        valued on several threads at once."""
 
-        self.day_counter = DayCount(self.dc_type)
         num_options = len(self.capFloorLetDates)
         strike_rate = self.strike_rate
 
@@ -135,17 +136,22 @@ class IborCapFloor:
         if num_options <= 1:
             raise FinError("Number of options in capfloor equals 1")
 
-        self.cap_floor_let_values = [0]
-        self.cap_floor_let_alphas = [0]
-        self.cap_floor_let_fwd_rates = [0]
-        self.cap_floor_let_intrinsic = [0]
-        self.cap_floor_let_dfs = [1.00]
-        self.cap_floor_pv = [0.0]
+        cap_floor_let_values = [0]
+        cap_floor_let_alphas = [0]
+        cap_floor_let_fwd_rates = [0]
+        cap_floor_let_intrinsic = [0]
+        cap_floor_let_dfs = [1.00]
+        cap_floor_pv = [0.0]
 
         cap_floor_value = 0.0
         cap_floor_let_value = 0.0
         # Value the first caplet or floorlet with known payoff
 
+        # The accrual factors of all caplets are calculated in one call
+        alphas = self.day_counter.year_frac_array(
+            [self.start_dt] + self.capFloorLetDates[1:-1],
+            self.capFloorLetDates[1:])[0].tolist()
+
         start_dt = self.start_dt
         end_dt = self.capFloorLetDates[1]
 
@@ -154,7 +160,7 @@ class IborCapFloor:
         else:
             fwd_rate = self.last_fixing
 
-        alpha = self.day_counter.year_frac(start_dt, end_dt)[0]
+        alpha = alphas[0]
         df = libor_curve.df(end_dt)
 
         if self.option_type == FinCapFloorTypes.CAP:
@@ -165,18 +171,18 @@ class IborCapFloor:
         cap_floor_let_value *= self.notional
         cap_floor_value += cap_floor_let_value
 
-        self.cap_floor_let_fwd_rates.append(fwd_rate)
-        self.cap_floor_let_values.append(cap_floor_let_value)
-        self.cap_floor_let_alphas.append(alpha)
-        self.cap_floor_let_intrinsic.append(cap_floor_let_value)
-        self.cap_floor_let_dfs.append(df)
-        self.cap_floor_pv.append(cap_floor_value)
+        cap_floor_let_fwd_rates.append(fwd_rate)
+        cap_floor_let_values.append(cap_floor_let_value)
+        cap_floor_let_alphas.append(alpha)
+        cap_floor_let_intrinsic.append(cap_floor_let_value)
+        cap_floor_let_dfs.append(df)
+        cap_floor_pv.append(cap_floor_value)
 
         for i in range(2, num_options):
 
             start_dt = self.capFloorLetDates[i - 1]
             end_dt = self.capFloorLetDates[i]
-            alpha = self.day_counter.year_frac(start_dt, end_dt)[0]
+            alpha = alphas[i - 1]
 
             df = libor_curve.df(end_dt)
             fwd_rate = libor_curve.fwd_rate(start_dt, end_dt, self.dc_type)
@@ -194,14 +200,26 @@ class IborCapFloor:
 
             cap_floor_value += cap_floor_let_value
 
-            self.cap_floor_let_fwd_rates.append(fwd_rate)
-            self.cap_floor_let_values.append(cap_floor_let_value)
-            self.cap_floor_let_alphas.append(alpha)
-            self.cap_floor_let_intrinsic.append(intrinsic_value)
-            self.cap_floor_let_dfs.append(df)
-            self.cap_floor_pv.append(cap_floor_value)
-
-        return cap_floor_value
+            cap_floor_let_fwd_rates.append(fwd_rate)
+            cap_floor_let_values.append(cap_floor_let_value)
+            cap_floor_let_alphas.append(alpha)
+            cap_floor_let_intrinsic.append(intrinsic_value)
+            cap_floor_let_dfs.append(df)
+            cap_floor_pv.append(cap_floor_value)
+
+        out = {
+            "value": cap_floor_value,
+            "value_dt": value_dt,
+            "payment_dts": self.capFloorLetDates,
+            "alphas": cap_floor_let_alphas,
+            "fwd_rates": cap_floor_let_fwd_rates,
+            "intrinsic": cap_floor_let_intrinsic,
+            "dfs": cap_floor_let_dfs,
+            "values": cap_floor_let_values,
+            "cum_pvs": cap_floor_pv,
+        }
+
+        return out
 
     ###########################################################################
 
@@ -308,8 +326,9 @@ class IborCapFloor:
 
     ###########################################################################
 
-    def print_leg(self):
-        """Prints the cap floor payment amounts."""
+    def print_leg(self, details):
+        """Prints the cap floor payment amounts in the dictionary returned
+        by valuation_details."""
 
         print("START DATE:", self.start_dt)
         print("MATURITY DATE:", self.maturity_dt)
@@ -317,11 +336,7 @@ class IborCapFloor:
         print("STRIKE (%):", self.strike_rate * 100)
         print("FREQUENCY:", str(self.freq_type))
         print("DAY COUNT:", str(self.dc_type))
-        print("VALUATION DATE", self.value_dt)
-
-        if len(self.cap_floor_let_values) == 0:
-            print("Caplets not calculated.")
-            return
+        print("VALUATION DATE", details["value_dt"])
 
         if self.option_type == FinCapFloorTypes.CAP:
             header = "PAYMENT_dt     YEAR_FRAC   FWD_RATE    INTRINSIC      "
@@ -334,7 +349,7 @@ class IborCapFloor:
 
         i_flow = 0
 
-        for payment_dt in self.capFloorLetDates[i_flow:]:
+        for payment_dt in details["payment_dts"][i_flow:]:
             if i_flow == 0:
                 print(
                     "%15s %10s %9s %12s %12.6f %12s %12s"
@@ -343,7 +358,7 @@ class IborCapFloor:
                         "-",
                         "-",
                         "-",
-                        self.cap_floor_let_dfs[i_flow],
+                        details["dfs"][i_flow],
                         "-",
                         "-",
                     )
@@ -353,12 +368,12 @@ class IborCapFloor:
                     "%15s %10.7f %9.5f %12.2f %12.6f %12.2f %12.2f"
                     % (
                         payment_dt,
-                        self.cap_floor_let_alphas[i_flow],
-                        self.cap_floor_let_fwd_rates[i_flow] * 100,
-                        self.cap_floor_let_intrinsic[i_flow],
-                        self.cap_floor_let_dfs[i_flow],
-                        self.cap_floor_let_values[i_flow],
-                        self.cap_floor_pv[i_flow],
+                        details["alphas"][i_flow],
+                        details["fwd_rates"][i_flow] * 100,
+                        details["intrinsic"][i_flow],
+                        details["dfs"][i_flow],
+                        details["values"][i_flow],
+                        details["cum_pvs"][i_flow],
                     )
                 )
 
@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+from functools import partial
 from typing import List, Union
 
 
@@ -26,11 +27,15 @@ def par_rate_risk_report(
     trades: list,
     trade_labels: list = None,
     bump_size=1.0 * g_basis_point,
+    use_jacobian=False,
+    executor=None,
 ):
     """Calculate deltas (change in value to 1bp bump) of the trades to all
     benchmarks in the base curve. Supported trades are depos, fras, swaps.
     trade_labels are used to identify trades in the output, if not provided
-    simple ones are generated
+    simple ones are generated. If use_jacobian is True the deltas are the
+    gradients of the trades to the curve knots times the derivatives of the
+    knots to the benchmark rates, so the curve is not rebuilt per benchmark
 
     Args:
         base_curve (IborSingleCurve): Base curve to be bumped
@@ -40,6 +45,11 @@ def par_rate_risk_report(
         bump_size (float, optional): How big of a bump to apply to bechmarks.
         Output always expressed as change in value per 1 bp.
         Defaults to 1.0*g_basis_point.
+        use_jacobian (bool, optional): Calculate the deltas analytically
+        from the curve Jacobian instead of bumping. Defaults to False.
+        executor (Executor, optional): a concurrent.futures executor, for
+        example a ProcessPoolExecutor, whose map spreads the bumped curves
+        over its workers. Defaults to None in which case they run serially.
 
     Returns:
         (base_values, risk_report):
@@ -64,17 +74,27 @@ def par_rate_risk_report(
     for trade, trade_label in zip(trades, trade_labels):
         base_values[trade_label] = trade.value(base_curve.value_dt, base_curve)
 
-    for benchmark_idx in range(n_benchmarks):
-        bumped_curve = curve_shocker.apply_bump_to_benchmark(
-            benchmark_idx, bump_size
-        )
+    if use_jacobian is True:
+        par_deltas = base_curve.trade_df_gradients(trades) @ \
+            base_curve.df_quote_jacobian() * g_basis_point
+        risk_report = pd.concat(
+            [risk_report, pd.DataFrame(par_deltas.T, columns=trade_labels,
+                                       index=risk_report.index)], axis=1)
+        risk_report["total"] = risk_report[trade_labels].sum(axis=1)
+        return base_values, risk_report
+
+    bumped_values = _scenario_values(
+        partial(_par_bumped_values, curve_shocker, trades, bump_size),
+        range(n_benchmarks),
+        n_trades,
+        executor,
+    )
 
-        for trade_idx, trade in enumerate(trades):
-            trade_label = trade_labels[trade_idx]
-            base_value = base_values[trade_label]
-            bumped_value = trade.value(bumped_curve.value_dt, bumped_curve)
-            par_delta = (bumped_value - base_value) / bump_size * g_basis_point
-            risk_report.loc[benchmark_idx, trade_label] = par_delta
+    base = np.array([base_values[label] for label in trade_labels])
+    par_deltas = (bumped_values - base) / bump_size * g_basis_point
+    risk_report = pd.concat(
+        [risk_report, pd.DataFrame(par_deltas, columns=trade_labels,
+                                   index=risk_report.index)], axis=1)
 
     risk_report["total"] = risk_report[trade_labels].sum(axis=1)
     return base_values, risk_report
@@ -87,6 +107,7 @@ def forward_rate_risk_report(
     trades: list,
     trade_labels: list = None,
     bump_size=1.0 * g_basis_point,
+    executor=None,
 ):
     """Generate forward rate deltas (forward delta ladder) risk report, which
     is the sensitivity of trades to bucketed shocks of the instantaneous (ON)
@@ -104,6 +125,9 @@ def forward_rate_risk_report(
         bump_size (float, optional): How big of a bump to apply to bechmarks.
         Output always expressed as change in value per 1 bp.
         Defaults to 1.0*g_basis_point.
+        executor (Executor, optional): a concurrent.futures executor whose
+        map spreads the bumped curves over its workers. Defaults to None in
+        which case they run serially.
 
     Returns:
         (dict, Dataframe): (base_values, risk_report)
@@ -119,7 +143,8 @@ def forward_rate_risk_report(
     )
 
     base_values, risk_report, *_ = forward_rate_risk_report_custom_grid(
-        base_curve, grid, trades, grid_labels, trade_labels, bump_size
+        base_curve, grid, trades, grid_labels, trade_labels, bump_size,
+        executor
     )
     return base_values, risk_report
 
@@ -131,6 +156,7 @@ def forward_rate_risk_report_custom_grid(
     grid_labels: list = None,
     trade_labels: list = None,
     bump_size=1.0 * g_basis_point,
+    executor=None,
 ):
     """Generate forward rate deltas risk report, which is the sensitivity of
     trades to bucketed shocks of the instantaneous (ON) forward rates. Here
@@ -147,6 +173,9 @@ def forward_rate_risk_report_custom_grid(
         bump_size (float, optional): How big of a bump to apply to bechmarks.
         Output always expressed as change in value per 1 bp.
         Defaults to 1.0*g_basis_point.
+        executor (Executor, optional): a concurrent.futures executor whose
+        map spreads the bumped curves over its workers. Defaults to None in
+        which case they run serially.
 
     Returns:
         (dict, Dataframe): (base_values, risk_report)
@@ -194,25 +223,26 @@ def forward_rate_risk_report_custom_grid(
             "payment_pv"
         ].sum()
 
-    for fwdrate_idx in range(len(risk_report)):
-        start_date = risk_report.loc[fwdrate_idx, "start_date"]
-        maturity_date = risk_report.loc[fwdrate_idx, "maturity_date"]
-        base_rate = base_curve.fwd_rate(
-            start_date, maturity_date, DayCountTypes.SIMPLE
-        )
-        risk_report.loc[fwdrate_idx, "market_rate"] = base_rate
-
-        fwd_rate_shock = DiscountCurvePWFONF.brick_wall_curve(
-            base_curve.value_dt, start_date, maturity_date, bump_size
-        )
-        bumped_curve = CompositeDiscountCurve([base_curve, fwd_rate_shock])
+    periods = list(zip(grid[:-1], grid[1:]))
+    risk_report["market_rate"] = [
+        base_curve.fwd_rate(start_date, maturity_date, DayCountTypes.SIMPLE)
+        for start_date, maturity_date in periods
+    ]
+
+    bumped_values = _scenario_values(
+        partial(_fwd_bumped_values, base_curve, trades, bump_size),
+        periods,
+        n_trades,
+        executor,
+    )
 
-        for trade_idx, trade in enumerate(trades):
-            trade_label = trade_labels[trade_idx]
-            base_value = base_values[trade_label]
-            bumped_value = trade.value(bumped_curve.value_dt, bumped_curve)
-            par_delta = (bumped_value - base_value) / bump_size * g_basis_point
-            risk_report.loc[fwdrate_idx, DV01_PREFIX + trade_label] = par_delta
+    base = np.array([base_values[label] for label in trade_labels])
+    fwd_deltas = (bumped_values - base) / bump_size * g_basis_point
+    risk_report = pd.concat(
+        [risk_report, pd.DataFrame(fwd_deltas,
+                                   columns=[DV01_PREFIX + l
+                                            for l in trade_labels],
+                                   index=risk_report.index)], axis=1)
 
     risk_report[DV01_PREFIX + "total"] = risk_report[
         [DV01_PREFIX + l for l in trade_labels]
@@ -227,6 +257,7 @@ def carry_rolldown_report(
     trades: list,
     trade_labels: list = None,
     bump_size=1.0 * g_basis_point,
+    executor=None,
 ):
     """Generate carry and rolldown risk report based on the sensitivity of
     trades to bucketed shocks of the instantaneous (ON) forward rates. Here
@@ -244,6 +275,9 @@ def carry_rolldown_report(
         bump_size (float, optional): How big of a bump to apply to bechmarks.
         Output always expressed as change in value per 1 bp.
         Defaults to 1.0*g_basis_point.
+        executor (Executor, optional): a concurrent.futures executor whose
+        map spreads the bumped curves over its workers. Defaults to None in
+        which case they run serially.
 
     Returns:
         (dict, Dataframe): (base_values, risk_report)
@@ -263,20 +297,28 @@ def carry_rolldown_report(
 
     base_values, risk_report, first_period_carry = (
         forward_rate_risk_report_custom_grid(
-            base_curve, grid, trades, grid_labels, trade_labels, bump_size
+            base_curve, grid, trades, grid_labels, trade_labels, bump_size,
+            executor
         )
     )
 
     trade_labels = list(base_values.keys())
-    for label in trade_labels:
-        risk_report.loc[0, ROLL_PREFIX + label] = first_period_carry[label]
-        rate_change = -risk_report["market_rate"].diff()
-        risk_report.loc[1:, ROLL_PREFIX + label] = (
-            risk_report.loc[1:, DV01_PREFIX + label]
+    rate_change = -risk_report["market_rate"].diff().to_numpy()
+    roll = np.zeros((len(risk_report), len(trade_labels)))
+    for trade_idx, label in enumerate(trade_labels):
+        roll[0, trade_idx] = first_period_carry[label]
+        roll[1:, trade_idx] = (
+            risk_report[DV01_PREFIX + label].to_numpy()[1:]
             * rate_change[1:]
             / g_basis_point
         )
 
+    risk_report = pd.concat(
+        [risk_report, pd.DataFrame(roll,
+                                   columns=[ROLL_PREFIX + l
+                                            for l in trade_labels],
+                                   index=risk_report.index)], axis=1)
+
     risk_report[ROLL_PREFIX + "total"] = risk_report[
         [ROLL_PREFIX + l for l in trade_labels]
     ].sum(axis=1)
@@ -289,7 +331,12 @@ def parallel_shift_ladder_report(
     curve_shifts: np.ndarray,
     trades: list,
     trade_labels: list = None,
+    executor=None,
 ):
+    """Revalue the trades on the base curve with each parallel shift of the
+    ON forward rates in curve_shifts added. If an executor is given the
+    shifted curves are spread over its workers with its map.
+    """
 
     curve_shift_labels = [f"SHIFT:{s/g_basis_point:.1f}" for s in curve_shifts]
     risk_report = pd.DataFrame(
@@ -308,16 +355,18 @@ def parallel_shift_ladder_report(
     for trade, trade_label in zip(trades, trade_labels):
         base_values[trade_label] = trade.value(base_curve.value_dt, base_curve)
 
-    for shift_idx, shift in enumerate(curve_shifts):
-        fwd_rate_shock = DiscountCurvePWFONF.flat_curve(
-            base_curve.value_dt, shift
-        )
-        bumped_curve = CompositeDiscountCurve([base_curve, fwd_rate_shock])
+    shifted_values = _scenario_values(
+        partial(_shifted_values, base_curve, trades),
+        list(curve_shifts),
+        n_trades,
+        executor,
+    )
 
-        for trade_idx, trade in enumerate(trades):
-            trade_label = trade_labels[trade_idx]
-            bumped_value = trade.value(bumped_curve.value_dt, bumped_curve)
-            risk_report.loc[shift_idx, PV_PREFIX + trade_label] = bumped_value
+    risk_report = pd.concat(
+        [risk_report, pd.DataFrame(shifted_values,
+                                   columns=[PV_PREFIX + t
+                                            for t in trade_labels],
+                                   index=risk_report.index)], axis=1)
 
     risk_report[PV_PREFIX + "total"] = risk_report[
         [PV_PREFIX + t for t in trade_labels]
@@ -325,6 +374,48 @@ def parallel_shift_ladder_report(
     return base_values, risk_report
 
 
+def _scenario_values(scenario_fn, scenarios, n_trades, executor=None):
+    """Return the matrix of trade values with a row per scenario. Each row
+    is the array returned by scenario_fn for that scenario. These are run
+    serially or by the map of the executor so scenario_fn must be picklable
+    to use a process pool."""
+
+    values = np.zeros((len(scenarios), n_trades))
+    mapper = map if executor is None else executor.map
+
+    for scenario_idx, row in enumerate(mapper(scenario_fn, scenarios)):
+        values[scenario_idx] = row
+
+    return values
+
+
+def _trade_values(trades, curve):
+    # Some trades return their value as an array with one element
+    return np.hstack([trade.value(curve.value_dt, curve) for trade in trades])
+
+
+def _par_bumped_values(curve_shocker, trades, bump_size, benchmark_idx):
+    bumped_curve = curve_shocker.apply_bump_to_benchmark(
+        benchmark_idx, bump_size
+    )
+    return _trade_values(trades, bumped_curve)
+
+
+def _fwd_bumped_values(base_curve, trades, bump_size, period):
+    (start_date, maturity_date) = period
+    fwd_rate_shock = DiscountCurvePWFONF.brick_wall_curve(
+        base_curve.value_dt, start_date, maturity_date, bump_size
+    )
+    bumped_curve = CompositeDiscountCurve([base_curve, fwd_rate_shock])
+    return _trade_values(trades, bumped_curve)
+
+
+def _shifted_values(base_curve, trades, shift):
+    fwd_rate_shock = DiscountCurvePWFONF.flat_curve(base_curve.value_dt, shift)
+    bumped_curve = CompositeDiscountCurve([base_curve, fwd_rate_shock])
+    return _trade_values(trades, bumped_curve)
+
+
 def _grid_from_dates_tenor(
     grid_last_date, grid_bucket_tenor: Union[str, Tenor], valuation_date
 ):
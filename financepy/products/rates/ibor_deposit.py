@@ -5,7 +5,7 @@
 from ...utils.date import Date
 from ...utils.error import FinError
 from ...utils.calendar import Calendar
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes
 from ...utils.day_count import DayCount
 from ...utils.day_count import DayCountTypes
@@ -43,7 +43,8 @@ class IborDeposit:
         deposit_rate: float,  # MM rate using simple interest
         dc_type: DayCountTypes,  # How year fraction is calculated
         notional: float = 100.0,  # Amount borrowed
-        cal_type: CalendarTypes = CalendarTypes.WEEKEND,  # Maturity date
+        # Calendar used to adjust the maturity date
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
         bd_type: BusDayAdjustTypes = BusDayAdjustTypes.MODIFIED_FOLLOWING,
     ):
         """Create a Libor deposit object which takes the start date when
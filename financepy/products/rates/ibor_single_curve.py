@@ -18,6 +18,10 @@ from ...market.curves.discount_curve import DiscountCurve
 from ...products.rates.ibor_deposit import IborDeposit
 from ...products.rates.ibor_fra import IborFRA
 from ...products.rates.ibor_swap import IborSwap
+from ...products.rates.curve_bootstrap import _BenchmarkTail, _f
+from ...products.rates.curve_bootstrap import _add_knot, _solve_knot
+from ...products.rates.curve_bootstrap import _df_quote_jacobian
+from ...products.rates.curve_bootstrap import _trade_df_gradients
 
 SWAP_TOL = 1e-10
 
@@ -26,47 +30,6 @@ SWAP_TOL = 1e-10
 ##############################################################################
 
 
-def _f(
-    df,
-    *args,
-):
-    """Root search objective function for IRS"""
-
-    curve = args[0]
-    value_dt = args[1]
-    swap = args[2]
-    num_points = len(curve._times)
-    curve._dfs[num_points - 1] = df
-
-    # For discount that need a fit function, we fit it now
-    curve._interpolator.fit(curve._times, curve._dfs)
-    v_swap = swap.value(value_dt, curve, curve, None)
-    notional = swap.fixed_leg.notional
-    v_swap /= notional
-    return v_swap
-
-
-###############################################################################
-
-
-def _g(df, *args):
-    """Root search objective function for FRAs"""
-    curve = args[0]
-    value_dt = args[1]
-    fra = args[2]
-    num_points = len(curve._times)
-    curve._dfs[num_points - 1] = df
-
-    # For discount that need a fit function, we fit it now
-    curve._interpolator.fit(curve._times, curve._dfs)
-    v_fra = fra.value(value_dt, curve)
-    v_fra /= fra.notional
-    return v_fra
-
-
-###############################################################################
-
-
 def _cost_function(dfs, *args):
     """Objective function for fitting all knot dfs at once to the benchmark securities  -- suitable for non-local interpolators"""
 
@@ -402,27 +365,32 @@ class IborSingleCurve(DiscountCurve):
         """Construct the discount curve using a bootstrap approach. This is
         the non-linear slower method that allows the user to choose a number
         of interpolation approaches between the swap rates and other rates. It
-        involves the use of a solver."""
+        involves the use of a solver. The knots are held in preallocated
+        arrays and the curve is given a view of the knots solved so far. Each
+        iteration of the solver only revalues the tail of the benchmark after
+        the previous knot."""
 
         self._interpolator = Interpolator(self._interp_type, **kwargs)
-        self._times = np.array([])
-        self._dfs = np.array([])
         self._is_built = True
 
+        num_knots = 1 + len(self.used_deposits) + len(self.used_fras)
+        num_knots += len(self.used_swaps)
+
+        times = np.zeros(num_knots)
+        dfs = np.zeros(num_knots)
+
         # time zero is now.
         t_mat = 0.0
         df_mat = 1.0
-        self._times = np.append(self._times, 0.0)
-        self._dfs = np.append(self._dfs, df_mat)
-        self._interpolator.fit(self._times, self._dfs)
+        _add_knot(self, times, dfs, 0, t_mat, df_mat)
+        num_solved = 1
 
         for depo in self.used_deposits:
             df_settle_dt = self.df(depo.start_dt)
             df_mat = depo._maturity_df() * df_settle_dt
             t_mat = (depo.maturity_dt - self.value_dt) / g_days_in_year
-            self._times = np.append(self._times, t_mat)
-            self._dfs = np.append(self._dfs, df_mat)
-            self._interpolator.fit(self._times, self._dfs)
+            _add_knot(self, times, dfs, num_solved, t_mat, df_mat)
+            num_solved += 1
 
         oldt_mat = t_mat
 
@@ -436,21 +404,13 @@ class IborSingleCurve(DiscountCurve):
 
             if t_set < oldt_mat and t_mat > oldt_mat:
                 df_mat = fra.maturity_df(self)
-                self._times = np.append(self._times, t_mat)
-                self._dfs = np.append(self._dfs, df_mat)
+                _add_knot(self, times, dfs, num_solved, t_mat, df_mat)
             else:
-                self._times = np.append(self._times, t_mat)
-                self._dfs = np.append(self._dfs, df_mat)
-                argtuple = (self, self.value_dt, fra)
-                df_mat = optimize.newton(
-                    _g,
-                    x0=df_mat,
-                    fprime=None,
-                    args=argtuple,
-                    tol=SWAP_TOL,
-                    maxiter=50,
-                    fprime2=None,
-                )
+                tail = _BenchmarkTail.from_fra(self, fra)
+                df_mat = _solve_knot(self, times, dfs, num_solved, t_mat,
+                                     df_mat, tail)
+
+            num_solved += 1
 
         for swap in self.used_swaps:
             # I use the lastPaymentDate in case a date has been adjusted fwd
@@ -458,21 +418,10 @@ class IborSingleCurve(DiscountCurve):
             maturity_dt = swap.fixed_leg.payment_dts[-1]
             t_mat = (maturity_dt - self.value_dt) / g_days_in_year
 
-            self._times = np.append(self._times, t_mat)
-            self._dfs = np.append(self._dfs, df_mat)
-
-            argtuple = (self, self.value_dt, swap)
-
-            df_mat = optimize.newton(
-                _f,
-                x0=df_mat,
-                fprime=None,
-                args=argtuple,
-                tol=SWAP_TOL,
-                maxiter=50,
-                fprime2=None,
-                full_output=False,
-            )
+            tail = _BenchmarkTail.from_swap(self, swap)
+            df_mat = _solve_knot(self, times, dfs, num_solved, t_mat,
+                                 df_mat, tail)
+            num_solved += 1
 
         if self._check_refit is True:
             # self._check_refits(1e-10, swaptol, 1e-5)
@@ -636,14 +585,16 @@ class IborSingleCurve(DiscountCurve):
 
             else:
 
+                tail = _BenchmarkTail.from_fra(self, fra)
+
                 self._times = np.append(self._times, t_mat)
                 self._dfs = np.append(self._dfs, df_mat)
                 self._interpolator.fit(self._times, self._dfs)
 
-                argtuple = (self, self.value_dt, fra)
+                argtuple = (self, tail)
 
                 df_mat = optimize.newton(
-                    _g,
+                    _f,
                     x0=df_mat,
                     fprime=None,
                     args=argtuple,
@@ -746,6 +697,28 @@ class IborSingleCurve(DiscountCurve):
 
     ###############################################################################
 
+    def df_quote_jacobian(self):
+        """Return the matrix of derivatives of the knot discount factors
+        after the first with respect to the market rates of the deposits,
+        FRAs and swaps used to build the curve, in that order. The par rate
+        risk of trades is their gradient to the knot discount factors from
+        trade_df_gradients times this matrix, so the curve is not rebuilt
+        for each bumped benchmark."""
+
+        benchmarks = self.used_deposits + self.used_fras + self.used_swaps
+        return _df_quote_jacobian(self, benchmarks)
+
+    ###############################################################################
+
+    def trade_df_gradients(self, trades: list):
+        """Return the matrix of derivatives of the PV of each trade at the
+        curve valuation date with respect to each knot discount factor after
+        the first. The trades can be deposits, FRAs and swaps."""
+
+        return _trade_df_gradients(self, trades)
+
+    ###############################################################################
+
     def _check_refits(self, depo_tol, fra_tol, swap_tol):
         """Ensure that the Ibor curve refits the calibration instruments."""
         for depo in self.used_deposits:
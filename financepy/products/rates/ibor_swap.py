@@ -10,7 +10,7 @@ from ...utils.date import Date
 from ...utils.global_vars import g_small
 from ...utils.day_count import DayCountTypes
 from ...utils.frequency import FrequencyTypes, annual_frequency
-from ...utils.calendar import CalendarTypes, DateGenRuleTypes
+from ...utils.calendar import CalendarTypes, JointCalendar, DateGenRuleTypes
 from ...utils.calendar import Calendar, BusDayAdjustTypes
 from ...utils.helpers import check_argument_types, label_to_string
 from ...utils.math import ONE_MILLION
@@ -50,7 +50,7 @@ class IborSwap:
         float_spread: float = 0.0,
         float_freq_type: FrequencyTypes = FrequencyTypes.QUARTERLY,
         float_dc_type: DayCountTypes = DayCountTypes.THIRTY_E_360,
-        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
         bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
         dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
     ):
@@ -191,6 +191,37 @@ class IborSwap:
 
     ###########################################################################
 
+    def value_gradient(
+        self,
+        value_dt: Date,
+        discount_curve: DiscountCurve,
+        index_curve: DiscountCurve = None,
+        first_fixing_rate=None,
+    ):
+        """Value the interest rate swap and return the value with its
+        gradients with respect to the discount factors at the knots of the
+        discount curve and of the index curve. These are found in reverse mode
+        at a cost close to that of one valuation. If no index curve is given
+        the discount curve is used for both and the full gradient with respect
+        to its knots is the sum of the two gradients."""
+
+        if index_curve is None:
+            index_curve = discount_curve
+
+        (fixed_leg_pv, fixed_leg_grad) = self.fixed_leg.value_gradient(
+            value_dt, discount_curve)
+
+        (float_leg_pv, float_disc_grad, index_grad) = \
+            self.float_leg.value_gradient(value_dt,
+                                          discount_curve,
+                                          index_curve,
+                                          first_fixing_rate)
+
+        value = fixed_leg_pv + float_leg_pv
+        return value, fixed_leg_grad + float_disc_grad, index_grad
+
+    ###########################################################################
+
     def valuation_details(
         self,
         valuation_date: Date,
@@ -291,7 +322,8 @@ class IborSwap:
 
         pv01 = self.pv01(value_dt, discount_curve)
 
-        if abs(pv01) < g_small:
+        # Curve scenarios give a PV01 per scenario
+        if np.any(np.abs(pv01) < g_small):
             raise FinError("PV01 is zero. Cannot compute swap rate.")
 
         # VP: I commented out this shortcut below because it is inconsistent with value(...) function
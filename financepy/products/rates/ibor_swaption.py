@@ -12,7 +12,7 @@
 
 import numpy as np
 
-from ...utils.calendar import CalendarTypes
+from ...utils.calendar import CalendarTypes, JointCalendar
 from ...utils.calendar import BusDayAdjustTypes
 from ...utils.calendar import DateGenRuleTypes
 from ...utils.day_count import DayCountTypes
@@ -24,6 +24,9 @@ from ...utils.helpers import label_to_string, check_argument_types
 from ...utils.date import Date
 
 from ...products.rates.ibor_swap import IborSwap
+from ...market.curves.discount_curve_scenarios import (
+    DiscountCurveScenarios,
+)
 
 from ...models.black import Black
 from ...models.black_shifted import BlackShifted
@@ -57,7 +60,7 @@ class IborSwaption:
         notional: float = ONE_MILLION,
         float_freq_type: FrequencyTypes = FrequencyTypes.QUARTERLY,
         float_dc_type: DayCountTypes = DayCountTypes.THIRTY_E_360,
-        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
         bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
         dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
     ):
@@ -92,25 +95,11 @@ class IborSwaption:
         self.bd_type = bd_type
         self.dg_type = dg_type
 
-        self.pv01 = None
-        self.fwd_swap_rate = None
-        self.forward_df = None
-        self.underlying_swap = None
-        self.swap_type = None
-
-    ###########################################################################
-
-    def value(self, value_dt, discount_curve, model):
-        """Valuation of a Ibor European-style swaption using a choice of
-        models on a specified valuation date. Models include FinModelBlack,
-        FinModelBlackShifted, SABR, SABRShifted, FinModelHW,
-        FinModelBK and FinModelBDT. The last two involved a tree-based
-        valuation."""
-
         float_spread = 0.0
 
-        # We create a swap that starts on the exercise date.
-        swap = IborSwap(
+        # We create a swap that starts on the exercise date. It only depends
+        # on the contract terms so it is built once here.
+        self.underlying_swap = IborSwap(
             self.exercise_dt,
             self.maturity_dt,
             self.fixed_leg_type,
@@ -126,6 +115,32 @@ class IborSwaption:
             self.dg_type,
         )
 
+    ###########################################################################
+
+    def value(self, value_dt, discount_curve, model):
+        """Valuation of a Ibor European-style swaption using a choice of
+        models on a specified valuation date. Models include FinModelBlack,
+        FinModelBlackShifted, SABR, SABRShifted, FinModelHW,
+        FinModelBK and FinModelBDT. The last two involved a tree-based
+        valuation."""
+
+        return self.valuation_details(value_dt, discount_curve, model)["value"]
+
+    ###########################################################################
+
+    def valuation_details(self, value_dt, discount_curve, model):
+        """Value the swaption as in value and return the value in a
+        dictionary together with the PV01 of the underlying swap, the forward
+        swap rate and the discount factor to expiry. Nothing is stored on the
+        swaption so one object can be valued on several threads at once. The
+        tree models are rebuilt by each call and so should not be shared
+        between threads."""
+
+        if isinstance(discount_curve, DiscountCurveScenarios):
+            raise FinError("Swaptions are valued on a single curve. Value "
+                           "each scenario of the curve scenarios.")
+
+        swap = self.underlying_swap
         k = self.fixed_cpn
 
         # The pv01 is the value of the swap cash flows as of the curve date
@@ -240,7 +255,7 @@ class IborSwaption:
                 swaption_price = swaption_px["call"]
             else:
                 raise FinError(
-                    "Unknown swaption option type" + str(self.swap_type)
+                    "Unknown swaption option type" + str(self.fixed_leg_type)
                 )
 
             # Cancel the multiplication at the end below
@@ -288,17 +303,20 @@ class IborSwaption:
         else:
             raise FinError("Unknown swaption model " + str(model))
 
-        self.pv01 = pv01
-        self.fwd_swap_rate = s
-        self.forward_df = discount_curve.df(self.exercise_dt)
-        self.underlying_swap = swap
-
         # The exchange of cash occurs on the settlement date. However the
         # actual value is that on the specified valuation date which could
         # be the swaption settlement date.
         df_settle = discount_curve.df(self.settle_dt)
         swaption_price = swaption_price * pv01 * self.notional / df_settle
-        return swaption_price
+
+        out = {
+            "value": swaption_price,
+            "pv01": pv01,
+            "fwd_swap_rate": s,
+            "forward_df": discount_curve.df(self.exercise_dt),
+        }
+
+        return out
 
     ###########################################################################
 
@@ -311,24 +329,7 @@ class IborSwaption:
         Black volatility for this valuation should in general not equal the
         Black volatility for the standard arbitrage-free valuation."""
 
-        float_spread = 0.0
-
-        swap = IborSwap(
-            self.exercise_dt,
-            self.maturity_dt,
-            self.fixed_leg_type,
-            self.fixed_cpn,
-            self.fixed_freq_type,
-            self.fixed_dc_type,
-            self.notional,
-            float_spread,
-            self.float_freq_type,
-            self.float_dc_type,
-            self.cal_type,
-            self.bd_type,
-            self.dg_type,
-        )
-
+        swap = self.underlying_swap
         k = self.fixed_cpn
         s = swap_rate
 
@@ -357,36 +358,32 @@ class IborSwaption:
                 + " Black's model."
             )
 
-        self.fwd_swap_rate = swap_rate
-        self.forward_df = discount_curve.df(self.exercise_dt)
-        self.underlying_swap = swap
         # The annuity needs to be discounted to today using the correct df
-        self.pv01 = pv01 * self.forward_df
+        forward_df = discount_curve.df(self.exercise_dt)
+        pv01 = pv01 * forward_df
 
         # The exchange of cash occurs on the settlement date but we need to
         # value the swaption on the provided valuation date - which could be
         # the settlement date or may be a different date.
         df_value_dt = discount_curve.df(value_dt)
         swaption_price = (
-            swaption_price * self.pv01 * self.notional / df_value_dt
+            swaption_price * pv01 * self.notional / df_value_dt
         )
         return swaption_price
 
     ###########################################################################
 
     def print_swap_fixed_leg(self):
-
-        if self.underlying_swap is None:
-            raise FinError("Underlying swap has not been set. Do a valuation.")
+        """Print the fixed leg of the underlying swap as of its last
+        valuation."""
 
         self.underlying_swap.print_fixed_leg_pv()
 
     ###########################################################################
 
     def print_swap_float_leg(self):
-
-        if self.underlying_swap is None:
-            raise FinError("Underlying swap has not been set. Do a valuation.")
+        """Print the floating leg of the underlying swap as of its last
+        valuation."""
 
         self.underlying_swap.print_float_leg_pv()
 
@@ -405,13 +402,7 @@ class IborSwaption:
         s += label_to_string("FIXED FREQUENCY", str(self.fixed_freq_type))
         s += label_to_string("FIXED DAY COUNT", str(self.fixed_dc_type))
         s += label_to_string("FLOAT FREQUENCY", str(self.float_freq_type))
-        s += label_to_string("FLOAT DAY COUNT", str(self.float_dc_type))
-
-        if self.pv01 is not None:
-            s += label_to_string("PV01", self.pv01)
-            s += label_to_string("FWD SWAP RATE", self.fwd_swap_rate * 100)
-            s += label_to_string("FWD DF TO EXPIRY", self.forward_df, "")
-
+        s += label_to_string("FLOAT DAY COUNT", str(self.float_dc_type), "")
         return s
 
     ###########################################################################
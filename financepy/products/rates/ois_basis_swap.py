@@ -6,7 +6,7 @@ from ...utils.error import FinError
 from ...utils.date import Date
 from ...utils.day_count import DayCountTypes
 from ...utils.frequency import FrequencyTypes
-from ...utils.calendar import CalendarTypes, DateGenRuleTypes
+from ...utils.calendar import CalendarTypes, JointCalendar, DateGenRuleTypes
 from ...utils.calendar import Calendar, BusDayAdjustTypes
 from ...utils.helpers import check_argument_types, label_to_string
 from ...utils.math import ONE_MILLION
@@ -41,7 +41,8 @@ class OISBasisSwap:
                  ois_spread: float = 0.0,
                  ois_payment_lag: int = 0,
                  notional: float = ONE_MILLION,
-                 cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+                 cal_type: (CalendarTypes,
+                            JointCalendar) = CalendarTypes.WEEKEND,
                  bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
                  dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD):
         """ Create a Ibor basis swap contract giving the contract start
@@ -16,6 +16,11 @@ from ...market.curves.discount_curve import DiscountCurve
 
 from ...products.rates.ibor_deposit import IborDeposit
 from ...products.rates.ois import OIS
+from ...products.rates.curve_bootstrap import _BenchmarkTail
+from ...products.rates.curve_bootstrap import _add_knot, _solve_knot
+from ...products.rates.curve_bootstrap import _df_quote_jacobian
+from ...products.rates.curve_bootstrap import _trade_df_gradients
+from ...products.rates.curve_bootstrap import _solve_knots_globally
 
 SWAP_TOL = 1e-10
 
@@ -51,26 +56,6 @@ def _fois(oir, *args):
 ###############################################################################
 
 
-def _f(df, *args):
-    """Root search objective function for OIS"""
-
-    curve = args[0]
-    value_dt = args[1]
-    swap = args[2]
-    num_points = len(curve._times)
-    curve._dfs[num_points - 1] = df
-
-    # For discount that need a fit function, we fit it now
-    curve._interpolator.fit(curve._times, curve._dfs)
-    v_swap = swap.value(value_dt, curve, None)
-    notional = swap.fixed_leg.notional
-    v_swap /= notional
-    return v_swap
-
-
-###############################################################################
-
-
 def _g(df, *args):
     """Root search objective function for swaps"""
     curve = args[0]
@@ -316,26 +301,32 @@ class OISCurve(DiscountCurve):
         """Construct the discount curve using a bootstrap approach. This is
         the non-linear slower method that allows the user to choose a number
         of interpolation approaches between the swap rates and other rates. It
-        involves the use of a solver."""
+        involves the use of a solver. For a local interpolation scheme each
+        knot is found by a compiled Newton solver using the analytic
+        derivative of the benchmark value. Otherwise the knots of the
+        bootstrap are the starting point of a global Newton solve which
+        reprices all of the benchmarks at once."""
 
         self._interpolator = Interpolator(self._interp_type)
-        self._times = np.array([])
-        self._dfs = np.array([])
+
+        num_knots = 1 + len(self.used_deposits) + len(self.used_fras)
+        num_knots += len(self.used_swaps)
+
+        times = np.zeros(num_knots)
+        dfs = np.zeros(num_knots)
 
         # time zero is now.
         t_mat = 0.0
         df_mat = 1.0
-        self._times = np.append(self._times, 0.0)
-        self._dfs = np.append(self._dfs, df_mat)
-        self._interpolator.fit(self._times, self._dfs)
+        _add_knot(self, times, dfs, 0, t_mat, df_mat)
+        num_solved = 1
 
         for depo in self.used_deposits:
             df_settle = self.df(depo.start_dt)
             df_mat = depo._maturity_df() * df_settle
             t_mat = (depo.maturity_dt - self.value_dt) / g_days_in_year
-            self._times = np.append(self._times, t_mat)
-            self._dfs = np.append(self._dfs, df_mat)
-            self._interpolator.fit(self._times, self._dfs)
+            _add_knot(self, times, dfs, num_solved, t_mat, df_mat)
+            num_solved += 1
 
         old_t_mat = t_mat
 
@@ -349,21 +340,13 @@ class OISCurve(DiscountCurve):
 
             if t_set < old_t_mat and t_mat > old_t_mat:
                 df_mat = fra.maturity_df(self)
-                self._times = np.append(self._times, t_mat)
-                self._dfs = np.append(self._dfs, df_mat)
+                _add_knot(self, times, dfs, num_solved, t_mat, df_mat)
             else:
-                self._times = np.append(self._times, t_mat)
-                self._dfs = np.append(self._dfs, df_mat)
-                argtuple = (self, self.value_dt, fra)
-                df_mat = optimize.newton(
-                    _g,
-                    x0=df_mat,
-                    fprime=None,
-                    args=argtuple,
-                    tol=SWAP_TOL,
-                    maxiter=50,
-                    fprime2=None,
-                )
+                tail = _BenchmarkTail.from_fra(self, fra)
+                df_mat = _solve_knot(self, times, dfs, num_solved, t_mat,
+                                     df_mat, tail)
+
+            num_solved += 1
 
         for swap in self.used_swaps:
             # I use the lastPaymentDate in case a date has been adjusted fwd
@@ -371,21 +354,21 @@ class OISCurve(DiscountCurve):
             maturity_dt = swap.fixed_leg.payment_dts[-1]
             t_mat = (maturity_dt - self.value_dt) / g_days_in_year
 
-            self._times = np.append(self._times, t_mat)
-            self._dfs = np.append(self._dfs, df_mat)
+            tail = _BenchmarkTail.from_swap(self, swap)
+            df_mat = _solve_knot(self, times, dfs, num_solved, t_mat,
+                                 df_mat, tail)
+            num_solved += 1
 
-            argtuple = (self, self.value_dt, swap)
-
-            df_mat = optimize.newton(
-                _f,
-                x0=df_mat,
-                fprime=None,
-                args=argtuple,
-                tol=SWAP_TOL,
-                maxiter=50,
-                fprime2=None,
-                full_output=False,
-            )
+        if Interpolator.suitable_for_bootstrap(self._interp_type) is False:
+
+            tails = [_BenchmarkTail.from_deposit(self, depo)
+                     for depo in self.used_deposits]
+            tails += [_BenchmarkTail.from_fra(self, fra)
+                      for fra in self.used_fras]
+            tails += [_BenchmarkTail.from_swap(self, swap)
+                      for swap in self.used_swaps]
+
+            _solve_knots_globally(self, tails)
 
         if self.check_refit is True:
             self.check_refits(1e-10, SWAP_TOL, 1e-5)
@@ -539,6 +522,28 @@ class OISCurve(DiscountCurve):
 
     ###############################################################################
 
+    def df_quote_jacobian(self):
+        """Return the matrix of derivatives of the knot discount factors
+        after the first with respect to the market rates of the deposits,
+        FRAs and swaps used to build the curve, in that order. The par rate
+        risk of trades is their gradient to the knot discount factors from
+        trade_df_gradients times this matrix, so the curve is not rebuilt
+        for each bumped benchmark."""
+
+        benchmarks = self.used_deposits + self.used_fras + self.used_swaps
+        return _df_quote_jacobian(self, benchmarks)
+
+    ###############################################################################
+
+    def trade_df_gradients(self, trades: list):
+        """Return the matrix of derivatives of the PV of each trade at the
+        curve valuation date with respect to each knot discount factor after
+        the first. The trades can be deposits, FRAs and swaps."""
+
+        return _trade_df_gradients(self, trades)
+
+    ###############################################################################
+
     def _check_refits(self, depo_tol, fra_tol, swap_tol):
         """Ensure that the Libor curve refits the calibration instruments."""
 
@@ -0,0 +1,282 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+import numpy as np
+from numba import njit, float64, int64
+
+from ...utils.error import FinError
+from ...utils.date import Date, DateArray
+from ...utils.day_count import DayCount
+from ...utils.global_types import SwapTypes
+from ...utils.helpers import label_to_string
+from ...market.curves.discount_curve import DiscountCurve
+from .ibor_swap import IborSwap
+
+###############################################################################
+
+
+@njit(float64[:](int64, float64,
+                 int64[:], float64[:], float64[:], int64[:],
+                 int64[:], float64[:], int64[:], int64[:], int64[:],
+                 float64[:], float64[:], float64[:], float64[:],
+                 float64[:], float64[:], float64[:]),
+      cache=True, nogil=True)
+def _value_book(num_trades, value_dt,
+                fix_trades, fix_pay_dts, fix_amounts, fix_df_idx,
+                flt_trades, flt_pay_dts, flt_df_idx, flt_start_idx,
+                flt_end_idx, flt_pay_notionals, flt_spreads, flt_principals,
+                flt_index_alphas, pay_dfs, index_dfs, first_fixings):
+    """ Value every swap in a book in one pass over its flattened fixed and
+    floating cashflows. The payment discount factors are already divided by
+    the discount factor to the valuation date. The first live floating
+    coupon of a trade is set by its first fixing unless this is NaN. This
+    is not compiled with fastmath as that assumes there are no NaNs. """
+
+    pvs = np.zeros(num_trades)
+
+    for k in range(0, fix_trades.size):
+        if fix_pay_dts[k] > value_dt:
+            pvs[fix_trades[k]] += fix_amounts[k] * pay_dfs[fix_df_idx[k]]
+
+    last_trade = -1
+
+    for k in range(0, flt_trades.size):
+
+        if flt_pay_dts[k] <= value_dt:
+            continue
+
+        trade = flt_trades[k]
+
+        if trade != last_trade and not np.isnan(first_fixings[trade]):
+            fwd_rate = first_fixings[trade]
+        else:
+            df_start = index_dfs[flt_start_idx[k]]
+            df_end = index_dfs[flt_end_idx[k]]
+            fwd_rate = (df_start / df_end - 1.0) / flt_index_alphas[k]
+
+        last_trade = trade
+
+        amount = (fwd_rate + flt_spreads[k]) * flt_pay_notionals[k] \
+            + flt_principals[k]
+        pvs[trade] += amount * pay_dfs[flt_df_idx[k]]
+
+    return pvs
+
+###############################################################################
+
+
+class SwapBook:
+    """ A book of interest rate swaps whose fixed and floating leg cashflows
+    are flattened into contiguous arrays of payment dates, amounts, accrual
+    factors, notionals, fixing dates and the index of the trade they belong
+    to. The discount and index curves are evaluated once on the unique dates
+    of the whole book and a single compiled pass then values every swap. This
+    does not build any of the cashflow reports of the legs, so it is suited
+    to revaluing many swaps in many scenarios. """
+
+    def __init__(self,
+                 swaps: list):
+        """ Create the book from a list of IborSwaps. The cashflows of each
+        swap are copied so later changes to the swaps are not seen. """
+
+        if len(swaps) == 0:
+            raise FinError("Swap book has no swaps")
+
+        fix_trades = []
+        fix_pay_dts = []
+        fix_amounts = []
+
+        flt_trades = []
+        flt_pay_dts = []
+        flt_start_dts = []
+        flt_end_dts = []
+        flt_pay_notionals = []
+        flt_spreads = []
+        flt_principals = []
+
+        for trade, swap in enumerate(swaps):
+
+            if isinstance(swap, IborSwap) is False:
+                raise FinError("Swap book only holds IborSwaps")
+
+            fixed_leg = swap.fixed_leg
+            sign = -1.0 if fixed_leg.leg_type == SwapTypes.PAY else 1.0
+            num_payments = len(fixed_leg.payment_dts)
+
+            amounts = sign * np.array(fixed_leg.payments, dtype=np.float64)
+            amounts[-1] += sign * fixed_leg.principal * fixed_leg.notional
+
+            fix_trades.append(np.full(num_payments, trade))
+            fix_pay_dts.append([dt.excel_dt for dt in fixed_leg.payment_dts])
+            fix_amounts.append(amounts)
+
+            float_leg = swap.float_leg
+            sign = -1.0 if float_leg.leg_type == SwapTypes.PAY else 1.0
+            num_payments = len(float_leg.payment_dts)
+
+            notionals = float_leg.notional_array
+            if not len(notionals):
+                notionals = [float_leg.notional] * num_payments
+
+            principals = np.zeros(num_payments)
+            principals[-1] = sign * float_leg.principal * notionals[-1]
+
+            flt_trades.append(np.full(num_payments, trade))
+            flt_pay_dts.append([dt.excel_dt for dt in float_leg.payment_dts])
+            flt_start_dts.append([dt.excel_dt
+                                  for dt in float_leg.start_accrued_dts])
+            flt_end_dts.append([dt.excel_dt
+                                for dt in float_leg.end_accrued_dts])
+            flt_pay_notionals.append(sign * np.array(float_leg.year_fracs) *
+                                     np.array(notionals))
+            flt_spreads.append(np.full(num_payments, float_leg.spread))
+            flt_principals.append(principals)
+
+        self.num_trades = len(swaps)
+
+        self.fix_trades = np.concatenate(fix_trades).astype(np.int64)
+        self.fix_pay_dts = np.concatenate(fix_pay_dts).astype(np.float64)
+        self.fix_amounts = np.concatenate(fix_amounts)
+
+        self.flt_trades = np.concatenate(flt_trades).astype(np.int64)
+        self.flt_pay_dts = np.concatenate(flt_pay_dts).astype(np.float64)
+        self.flt_start_dts = np.concatenate(flt_start_dts).astype(np.float64)
+        self.flt_end_dts = np.concatenate(flt_end_dts).astype(np.float64)
+        self.flt_pay_notionals = np.concatenate(flt_pay_notionals)
+        self.flt_spreads = np.concatenate(flt_spreads)
+        self.flt_principals = np.concatenate(flt_principals)
+
+        # The curves are only evaluated at the unique dates of the book
+        (self._pay_dts, pay_idx) = np.unique(
+            np.concatenate((self.fix_pay_dts, self.flt_pay_dts)),
+            return_inverse=True)
+        num_fix = len(self.fix_pay_dts)
+        self._fix_df_idx = pay_idx[:num_fix].astype(np.int64)
+        self._flt_df_idx = pay_idx[num_fix:].astype(np.int64)
+
+        (self._index_dts, index_idx) = np.unique(
+            np.concatenate((self.flt_start_dts, self.flt_end_dts)),
+            return_inverse=True)
+        num_flt = len(self.flt_start_dts)
+        self._flt_start_idx = index_idx[:num_flt].astype(np.int64)
+        self._flt_end_idx = index_idx[num_flt:].astype(np.int64)
+
+        # The accrual factors of the index depend on the index curve basis
+        self._index_alphas = {}
+
+    ###########################################################################
+
+    def _index_year_fracs(self, dc_type):
+        """ Return the accrual factors of the floating periods in the basis
+        of the index curve. These are calculated once for each basis. """
+
+        if dc_type not in self._index_alphas:
+            day_counter = DayCount(dc_type)
+            self._index_alphas[dc_type] = day_counter.year_frac_array(
+                self.flt_start_dts, self.flt_end_dts)[0]
+
+        return self._index_alphas[dc_type]
+
+    ###########################################################################
+
+    def value(self,
+              value_dt: Date,
+              discount_curve: DiscountCurve,
+              index_curve: DiscountCurve = None,
+              first_fixing_rates: np.ndarray = None):
+        """ Value every swap in the book on a value date given a discount
+        curve and an index curve which defaults to the discount curve. The
+        first live floating coupon of each swap is projected from the index
+        curve unless its rate is given in first_fixing_rates, which has one
+        entry per swap with NaN where there is no fixing. Returns a NumPy
+        array with the value of each swap. If either curve holds scenarios,
+        such as a DiscountCurveScenarios, the result has a row of swap values
+        for each scenario. """
+
+        if index_curve is None:
+            index_curve = discount_curve
+
+        if first_fixing_rates is None:
+            first_fixings = np.full(self.num_trades, np.nan)
+        else:
+            first_fixings = np.array(first_fixing_rates, dtype=np.float64)
+            if len(first_fixings) != self.num_trades:
+                raise FinError("Need one first fixing rate per swap")
+
+        value_xl = float(value_dt.excel_dt)
+
+        # Only dates from the valuation date of each curve can be valued.
+        # The dates are on the last axis of the discount factors and a curve
+        # of scenarios adds a leading axis with a row for each scenario.
+        pay_dfs = np.zeros(len(self._pay_dts))
+        live = self._pay_dts > value_xl
+        if np.any(live):
+            pay_dts = DateArray(self._pay_dts[live])
+            df_value = np.asarray(discount_curve.df(value_dt))
+            live_dfs = discount_curve.df(pay_dts) / df_value[..., np.newaxis]
+            pay_dfs = np.zeros(live_dfs.shape[:-1] + pay_dfs.shape)
+            pay_dfs[..., live] = live_dfs
+
+        index_dfs = np.full(len(self._index_dts), np.nan)
+        live = self._index_dts >= index_curve.value_dt.excel_dt
+        if np.any(live):
+            live_dfs = index_curve.df(DateArray(self._index_dts[live]))
+            index_dfs = np.full(live_dfs.shape[:-1] + index_dfs.shape, np.nan)
+            index_dfs[..., live] = live_dfs
+
+        index_alphas = self._index_year_fracs(index_curve.dc_type)
+
+        def value_scenario(pay_dfs, index_dfs):
+            return _value_book(self.num_trades, value_xl,
+                               self.fix_trades, self.fix_pay_dts,
+                               self.fix_amounts, self._fix_df_idx,
+                               self.flt_trades, self.flt_pay_dts,
+                               self._flt_df_idx, self._flt_start_idx,
+                               self._flt_end_idx, self.flt_pay_notionals,
+                               self.flt_spreads, self.flt_principals,
+                               index_alphas, pay_dfs, index_dfs,
+                               first_fixings)
+
+        if pay_dfs.ndim == 1 and index_dfs.ndim == 1:
+            pvs = value_scenario(pay_dfs, index_dfs)
+        else:
+            num_scenarios = max(len(np.atleast_2d(pay_dfs)),
+                                len(np.atleast_2d(index_dfs)))
+
+            if pay_dfs.ndim == 1:
+                pay_dfs = [pay_dfs] * num_scenarios
+
+            if index_dfs.ndim == 1:
+                index_dfs = [index_dfs] * num_scenarios
+
+            if len(pay_dfs) != len(index_dfs):
+                raise FinError("Discount and index curves do not have the "
+                               "same number of scenarios")
+
+            pvs = np.array([value_scenario(pay_dfs[j], index_dfs[j])
+                            for j in range(0, num_scenarios)])
+
+        if np.any(np.isnan(pvs)):
+            raise FinError("A swap needs a fixing before the index curve "
+                           "valuation date")
+
+        return pvs
+
+    ###########################################################################
+
+    def __repr__(self):
+
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("NUM TRADES", self.num_trades)
+        s += label_to_string("NUM FIXED CASHFLOWS", len(self.fix_trades))
+        s += label_to_string("NUM FLOAT CASHFLOWS", len(self.flt_trades),
+                             "")
+        return s
+
+    ###########################################################################
+
+    def _print(self):
+        print(self)
+
+###############################################################################
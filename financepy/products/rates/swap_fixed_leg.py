@@ -9,7 +9,7 @@ from ...utils.date import Date
 from ...utils.math import ONE_MILLION
 from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.frequency import FrequencyTypes
-from ...utils.calendar import CalendarTypes, DateGenRuleTypes
+from ...utils.calendar import CalendarTypes, JointCalendar, DateGenRuleTypes
 from ...utils.calendar import Calendar, BusDayAdjustTypes
 from ...utils.schedule import Schedule
 from ...utils.helpers import (
@@ -19,6 +19,9 @@ from ...utils.helpers import (
 )
 from ...utils.global_types import SwapTypes
 from ...market.curves.discount_curve import DiscountCurve
+from ...market.curves.discount_curve_scenarios import (
+    DiscountCurveScenarios,
+)
 
 ##########################################################################
 
@@ -39,7 +42,7 @@ class SwapFixedLeg:
         notional: float = ONE_MILLION,
         principal: float = 0.0,
         payment_lag: int = 0,
-        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
         bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
         dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
         end_of_month: bool = False,
@@ -85,6 +88,10 @@ class SwapFixedLeg:
         self.accrued_days = []
         self.rates = []
 
+        # A valuation with pv_only keeps the discount factors of its payments
+        # so the cashflows can be calculated if a report of them is asked for
+        self._last_valuation = None
+
         self.generate_payments()
 
     ###########################################################################
@@ -125,7 +132,13 @@ class SwapFixedLeg:
         day_counter = DayCount(self.dc_type)
         calendar = Calendar(self.cal_type)
 
-        for next_dt in schedule_dts[1:]:
+        # The accrual factors for all periods are calculated in one call
+        (year_fracs, nums, _) = day_counter.year_frac_array(
+            schedule_dts[:-1], schedule_dts[1:])
+        year_fracs = year_fracs.tolist()
+        nums = nums.tolist()
+
+        for i_flow, next_dt in enumerate(schedule_dts[1:]):
 
             self.start_accrued_dts.append(prev_dt)
             self.end_accrued_dts.append(next_dt)
@@ -139,7 +152,8 @@ class SwapFixedLeg:
 
             self.payment_dts.append(payment_dt)
 
-            (year_frac, num, den) = day_counter.year_frac(prev_dt, next_dt)
+            year_frac = year_fracs[i_flow]
+            num = nums[i_flow]
 
             self.rates.append(self.cpn)
 
@@ -156,15 +170,96 @@ class SwapFixedLeg:
     def value(
         self, value_dt: Date, discount_curve: DiscountCurve, pv_only=True
     ):
+        """Value the fixed leg on a value date given a discount curve. If
+        pv_only is True the PV is found with vectorised curve calls and the
+        cashflows are not stored, so the leg can be valued from several
+        threads at once. They are calculated when the cashflow report or
+        print_valuation asks for them. Otherwise the PV is returned with a
+        dataframe of the cashflows."""
+
+        if pv_only is False:
+            leg_pv = self._value_cashflows(value_dt, discount_curve)
+            return leg_pv, self._cashflow_report_from_cached_values()
+
+        (payment_dts, amounts) = self._live_cashflows(value_dt)
+
+        if len(payment_dts) == 0:
+            self._last_valuation = (value_dt, np.zeros(0))
+            return 0.0
+
+        # The sum is over the last axis so that a curve with a row of
+        # discount factors per scenario gives a PV per scenario
+        df_value = discount_curve.df(value_dt)
+        payment_dfs = discount_curve.df(payment_dts)
+        self._last_valuation = (value_dt,
+                                payment_dfs / np.expand_dims(df_value, -1))
+
+        leg_pv = np.sum(amounts * payment_dfs, axis=-1)
+        return leg_pv / df_value
+
+    ###########################################################################
+
+    def _live_cashflows(self, value_dt: Date):
+        """Return the payment dates after the value date with the amounts paid
+        on them including the principal and signed by the leg type."""
+
+        sign = -1.0 if self.leg_type == SwapTypes.PAY else 1.0
+
+        payment_dts = []
+        amounts = []
+
+        for payment_dt, pmnt_amount in zip(self.payment_dts, self.payments):
+            if payment_dt > value_dt:
+                payment_dts.append(payment_dt)
+                amounts.append(pmnt_amount)
+
+        if len(payment_dts) > 0:
+            amounts[-1] += self.principal * self.notional
+
+        # The payments are arrays of one element if the coupon was an array
+        amounts = np.ravel(np.array(amounts, dtype=np.float64))
+
+        return payment_dts, sign * amounts
+
+    ###########################################################################
+
+    def _value_cashflows(self, value_dt: Date, discount_curve: DiscountCurve):
+        """Value the fixed leg payment by payment and store the discount
+        factor, PV and cumulative PV of each payment. Returns the leg PV."""
+
+        if isinstance(discount_curve, DiscountCurveScenarios):
+            raise FinError("Cashflows cannot be reported for curve scenarios."
+                           " Use pv_only or report a single scenario.")
+
+        df_value = discount_curve.df(value_dt)
+
+        live_dfs = [discount_curve.df(payment_dt) / df_value
+                    for payment_dt in self.payment_dts
+                    if payment_dt > value_dt]
+
+        return self._store_cashflows(value_dt, live_dfs)
+
+    ###########################################################################
+
+    def _store_cashflows(self, value_dt: Date, live_dfs):
+        """Store the discount factor, PV and cumulative PV of each payment
+        given the discount factors of the payments after the value date
+        relative to the value date. Returns the leg PV."""
+
+        if np.ndim(live_dfs) > 1:
+            raise FinError("Cashflows cannot be reported for curve scenarios."
+                           " Use pv_only or report a single scenario.")
+
+        self._last_valuation = None
 
         self.payment_dfs = []
         self.payment_pvs = []
         self.cumulative_pvs = []
 
         notional = self.notional
-        df_value = discount_curve.df(value_dt)
         leg_pv = 0.0
         num_payments = len(self.payment_dts)
+        i_live = 0
 
         df_payment = 0.0
 
@@ -175,7 +270,8 @@ class SwapFixedLeg:
 
             if payment_dt > value_dt:
 
-                df_payment = discount_curve.df(payment_dt) / df_value
+                df_payment = live_dfs[i_live]
+                i_live += 1
                 payment_pv = pmnt_amount * df_payment
                 leg_pv += payment_pv
 
@@ -198,10 +294,47 @@ class SwapFixedLeg:
         if self.leg_type == SwapTypes.PAY:
             leg_pv = leg_pv * (-1.0)
 
-        if pv_only:
-            return leg_pv
+        return leg_pv
+
+    ###########################################################################
+
+    def _update_cashflows(self):
+        """Calculate the cashflows of the last valuation if it was done with
+        pv_only. They use the discount factors of that valuation so they sum
+        to the PV it returned even if the curve has changed since."""
+
+        if self._last_valuation is None:
+            if not hasattr(self, "payment_dfs"):
+                raise FinError("No cashflows to report. Value the leg with "
+                               "pv_only=False first.")
+            return
+
+        (value_dt, live_dfs) = self._last_valuation
+        self._store_cashflows(value_dt, live_dfs)
+
+    ###########################################################################
+
+    def value_gradient(self, value_dt: Date, discount_curve: DiscountCurve):
+        """Value the fixed leg and return the PV with its gradient with respect
+        to the discount factors at the knots of the discount curve. The
+        gradient is propagated back from the derivatives of the PV with respect
+        to the payment discount factors so its cost does not grow with the
+        number of knots. Unlike value this does not cache any cashflows."""
+
+        (payment_dts, amounts) = self._live_cashflows(value_dt)
+        df_value = discount_curve.df(value_dt)
+
+        if len(payment_dts) > 0:
+            payment_dfs = discount_curve.df(payment_dts)
         else:
-            return leg_pv, self._cashflow_report_from_cached_values()
+            payment_dfs = np.zeros(0)
+
+        leg_pv = np.sum(amounts * payment_dfs) / df_value
+
+        df_bars = np.concatenate(([-leg_pv / df_value], amounts / df_value))
+        grad = discount_curve.df_adjoint([value_dt] + payment_dts, df_bars)
+
+        return leg_pv, grad
 
     ###########################################################################
 
@@ -214,6 +347,8 @@ class SwapFixedLeg:
             pd.DataFrame: cashflow values and related data
         """
 
+        self._update_cashflows()
+
         leg_type_sign = -1 if self.leg_type == SwapTypes.PAY else 1
         df = pd.DataFrame()
         df["payment_date"] = self.payment_dts
@@ -283,6 +418,8 @@ class SwapFixedLeg:
         cash amounts, their present value and their cumulative PV using the
         last valuation performed."""
 
+        self._update_cashflows()
+
         print("START DATE:", self.effective_dt)
         print("MATURITY DATE:", self.maturity_dt)
         print("COUPON (%):", self.cpn * 100)
@@ -9,7 +9,7 @@ from ...utils.date import Date
 from ...utils.math import ONE_MILLION
 from ...utils.day_count import DayCount, DayCountTypes
 from ...utils.frequency import FrequencyTypes
-from ...utils.calendar import CalendarTypes, DateGenRuleTypes
+from ...utils.calendar import CalendarTypes, JointCalendar, DateGenRuleTypes
 from ...utils.calendar import Calendar, BusDayAdjustTypes
 from ...utils.schedule import Schedule
 from ...utils.helpers import (
@@ -19,6 +19,9 @@ from ...utils.helpers import (
 )
 from ...utils.global_types import SwapTypes
 from ...market.curves.discount_curve import DiscountCurve
+from ...market.curves.discount_curve_scenarios import (
+    DiscountCurveScenarios,
+)
 
 ###############################################################################
 
@@ -39,7 +42,7 @@ class SwapFloatLeg:
         notional: float = ONE_MILLION,
         principal: float = 0.0,
         payment_lag: int = 0,
-        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
         bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
         dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
         end_of_month: bool = False,
@@ -85,6 +88,11 @@ class SwapFloatLeg:
         self.year_fracs = []
         self.accrued_days = []
 
+        # A valuation with pv_only keeps the rates and discount factors of its
+        # payments so the cashflows can be calculated if a report of them is
+        # asked for
+        self._last_valuation = None
+
         self.generate_payment_dts()
 
     ###########################################################################
@@ -119,6 +127,10 @@ class SwapFloatLeg:
         day_counter = DayCount(self.dc_type)
         calendar = Calendar(self.cal_type)
 
+        # The accrual factors for all periods are calculated in one call
+        (year_fracs, nums, _) = day_counter.year_frac_array(
+            schedule_dts[:-1], schedule_dts[1:])
+
         # All of the lists end up with the same length
         for next_dt in schedule_dts[1:]:
 
@@ -134,13 +146,11 @@ class SwapFloatLeg:
 
             self.payment_dts.append(payment_dt)
 
-            (year_frac, num, _) = day_counter.year_frac(prev_dt, next_dt)
-
-            self.year_fracs.append(year_frac)
-            self.accrued_days.append(num)
-
             prev_dt = next_dt
 
+        self.year_fracs = year_fracs.tolist()
+        self.accrued_days = nums.tolist()
+
     ###########################################################################
 
     def value(
@@ -154,7 +164,11 @@ class SwapFloatLeg:
         """Value the floating leg with payments from an index curve and
         discounting based on a supplied discount curve as of the valuation date
         supplied. For an existing swap, the user must enter the next fixing
-        coupon."""
+        coupon. If pv_only is True the PV is found with vectorised curve calls
+        and the cashflows are not stored, so the leg can be valued from
+        several threads at once. They are calculated when the cashflow report
+        or print_valuation asks for them. Otherwise the PV is returned with a
+        dataframe of the cashflows."""
 
         if discount_curve is None:
             raise FinError("Discount curve is None")
@@ -162,14 +176,110 @@ class SwapFloatLeg:
         if index_curve is None:
             index_curve = discount_curve
 
-        self.rates = []
-        self.payments = []
-        self.payment_dfs = []
-        self.payment_pvs = []
-        self.cumulative_pvs = []
+        if pv_only is False:
+            leg_pv = self._value_cashflows(value_dt, discount_curve,
+                                           index_curve, first_fixing_rate)
+            return leg_pv, self._cashflow_report_from_cached_values()
+
+        flows = self._live_cashflows(value_dt, index_curve, first_fixing_rate)
+        (payment_dts, amounts, fwd_rates) = (flows[0], flows[1], flows[-1])
+
+        if len(payment_dts) == 0:
+            self._last_valuation = (value_dt, fwd_rates, np.zeros(0))
+            return 0.0
+
+        # The sum is over the last axis so that a curve with a row of
+        # discount factors per scenario gives a PV per scenario
+        df_value = discount_curve.df(value_dt)
+        payment_dfs = discount_curve.df(payment_dts)
+        self._last_valuation = (value_dt, fwd_rates,
+                                payment_dfs / np.expand_dims(df_value, -1))
+
+        leg_pv = np.sum(amounts * payment_dfs, axis=-1)
+        return leg_pv / df_value
+
+    ###########################################################################
+
+    def _live_cashflows(
+        self,
+        value_dt: Date,
+        index_curve: DiscountCurve,
+        first_fixing_rate: float = None,
+    ):
+        """Project the payments after the value date from the index curve.
+        Returns their payment dates and amounts signed by the leg type with
+        the principal, their accrual factors times notionals, and the start
+        and end dates, index accrual factors and index discount factors of
+        the projected periods, and the rates of the payments. The first of the
+        payments has the first fixing rate if one is given and then it is not
+        a projected period."""
+
+        sign = -1.0 if self.leg_type == SwapTypes.PAY else 1.0
+        num_payments = len(self.payment_dts)
+
+        notional_array = self.notional_array
+        if not len(notional_array):
+            notional_array = [self.notional] * num_payments
+
+        index_day_counter = DayCount(index_curve.dc_type)
+        index_alphas = index_day_counter.year_frac_array(
+            self.start_accrued_dts, self.end_accrued_dts)[0]
+
+        live = [i for i in range(0, num_payments)
+                if self.payment_dts[i] > value_dt]
+
+        payment_dts = [self.payment_dts[i] for i in live]
+        pay_notionals = np.array([self.year_fracs[i] * notional_array[i]
+                                  for i in live])
+
+        fixed_first = first_fixing_rate is not None and len(live) > 0
+        projected = live[1:] if fixed_first else live
+
+        start_dts = [self.start_accrued_dts[i] for i in projected]
+        end_dts = [self.end_accrued_dts[i] for i in projected]
+        alphas = index_alphas[projected]
+
+        if len(projected) > 0:
+            df_starts = index_curve.df(start_dts)
+            df_ends = index_curve.df(end_dts)
+            fwd_rates = (df_starts / df_ends - 1.0) / alphas
+        else:
+            df_starts = df_ends = fwd_rates = np.zeros(0)
+
+        # The payment dates are on the last axis as an index curve of
+        # scenarios gives a row of forward rates for each scenario
+        if fixed_first:
+            first_rates = np.full(fwd_rates.shape[:-1] + (1,),
+                                  first_fixing_rate)
+            fwd_rates = np.concatenate((first_rates, fwd_rates), axis=-1)
+
+        amounts = (fwd_rates + self.spread) * pay_notionals
+
+        if len(live) > 0:
+            amounts[..., -1] += self.principal * notional_array[-1]
+
+        return (payment_dts, sign * amounts, pay_notionals,
+                start_dts, end_dts, alphas, df_starts, df_ends, fwd_rates)
+
+    ###########################################################################
+
+    def _value_cashflows(
+        self,
+        value_dt: Date,
+        discount_curve: DiscountCurve,
+        index_curve: DiscountCurve,
+        first_fixing_rate: float = None,
+    ):
+        """Value the floating leg payment by payment and store the rate,
+        payment, discount factor, PV and cumulative PV of each payment.
+        Returns the leg PV."""
+
+        if isinstance(discount_curve, DiscountCurveScenarios) or \
+                isinstance(index_curve, DiscountCurveScenarios):
+            raise FinError("Cashflows cannot be reported for curve scenarios."
+                           " Use pv_only or report a single scenario.")
 
         df_value = discount_curve.df(value_dt)
-        leg_pv = 0.0
         num_payments = len(self.payment_dts)
         first_payment = False
 
@@ -178,6 +288,11 @@ class SwapFloatLeg:
 
         index_basis = index_curve.dc_type
         index_day_counter = DayCount(index_basis)
+        index_alphas = index_day_counter.year_frac_array(
+            self.start_accrued_dts, self.end_accrued_dts)[0].tolist()
+
+        live_rates = []
+        live_dfs = []
 
         for i_pmnt in range(0, num_payments):
 
@@ -187,11 +302,7 @@ class SwapFloatLeg:
 
                 start_accrued_dt = self.start_accrued_dts[i_pmnt]
                 end_accrued_dt = self.end_accrued_dts[i_pmnt]
-                pay_alpha = self.year_fracs[i_pmnt]
-
-                (index_alpha, num, _) = index_day_counter.year_frac(
-                    start_accrued_dt, end_accrued_dt
-                )
+                index_alpha = index_alphas[i_pmnt]
 
                 if first_payment is False and first_fixing_rate is not None:
 
@@ -204,13 +315,55 @@ class SwapFloatLeg:
                     df_end = index_curve.df(end_accrued_dt)
                     fwd_rate = (df_start / df_end - 1.0) / index_alpha
 
+                live_rates.append(fwd_rate)
+                live_dfs.append(discount_curve.df(payment_dt) / df_value)
+
+        return self._store_cashflows(value_dt, live_rates, live_dfs)
+
+    ###########################################################################
+
+    def _store_cashflows(self, value_dt: Date, live_rates, live_dfs):
+        """Store the rate, payment, discount factor, PV and cumulative PV of
+        each payment given the rates and the discount factors relative to the
+        value date of the payments after the value date. Returns the leg
+        PV."""
+
+        if np.ndim(live_rates) > 1 or np.ndim(live_dfs) > 1:
+            raise FinError("Cashflows cannot be reported for curve scenarios."
+                           " Use pv_only or report a single scenario.")
+
+        self._last_valuation = None
+
+        self.rates = []
+        self.payments = []
+        self.payment_dfs = []
+        self.payment_pvs = []
+        self.cumulative_pvs = []
+
+        leg_pv = 0.0
+        num_payments = len(self.payment_dts)
+        i_live = 0
+
+        if not len(self.notional_array):
+            self.notional_array = [self.notional] * num_payments
+
+        for i_pmnt in range(0, num_payments):
+
+            payment_dt = self.payment_dts[i_pmnt]
+
+            if payment_dt > value_dt:
+
+                pay_alpha = self.year_fracs[i_pmnt]
+                fwd_rate = live_rates[i_live]
+                df_payment = live_dfs[i_live]
+                i_live += 1
+
                 payment_amount = (
                     (fwd_rate + self.spread)
                     * pay_alpha
                     * self.notional_array[i_pmnt]
                 )
 
-                df_payment = discount_curve.df(payment_dt) / df_value
                 payment_pv = payment_amount * df_payment
                 leg_pv += payment_pv
 
@@ -237,10 +390,78 @@ class SwapFloatLeg:
         if self.leg_type == SwapTypes.PAY:
             leg_pv = leg_pv * (-1.0)
 
-        if pv_only:
-            return leg_pv
+        return leg_pv
+
+    ###########################################################################
+
+    def _update_cashflows(self):
+        """Calculate the cashflows of the last valuation if it was done with
+        pv_only. They use the rates and discount factors of that valuation so
+        they sum to the PV it returned even if the curves have changed
+        since."""
+
+        if self._last_valuation is None:
+            if not hasattr(self, "payment_dfs"):
+                raise FinError("No cashflows to report. Value the leg with "
+                               "pv_only=False first.")
+            return
+
+        (value_dt, live_rates, live_dfs) = self._last_valuation
+        self._store_cashflows(value_dt, live_rates, live_dfs)
+
+    ###########################################################################
+
+    def value_gradient(
+        self,
+        value_dt: Date,
+        discount_curve: DiscountCurve,
+        index_curve: DiscountCurve,
+        first_fixing_rate: float = None,
+    ):
+        """Value the floating leg and return the PV with its gradients with
+        respect to the discount factors at the knots of the discount curve and
+        of the index curve. These are propagated back from the derivatives of
+        the PV with respect to the payment and fixing discount factors so their
+        cost does not grow with the number of knots. If the same curve is used
+        for discounting and the index its full gradient is the sum of the two.
+        Unlike value this does not cache any cashflows."""
+
+        if discount_curve is None:
+            raise FinError("Discount curve is None")
+
+        if index_curve is None:
+            index_curve = discount_curve
+
+        sign = -1.0 if self.leg_type == SwapTypes.PAY else 1.0
+
+        (payment_dts, amounts, pay_notionals, start_dts, end_dts, alphas,
+         df_starts, df_ends, _) = self._live_cashflows(value_dt, index_curve,
+                                                    first_fixing_rate)
+
+        if len(payment_dts) > 0:
+            payment_dfs = discount_curve.df(payment_dts)
         else:
-            return leg_pv, self._cashflow_report_from_cached_values()
+            payment_dfs = np.zeros(0)
+
+        df_value = discount_curve.df(value_dt)
+        leg_pv = np.sum(amounts * payment_dfs) / df_value
+
+        df_bars = np.concatenate(([-leg_pv / df_value], amounts / df_value))
+        disc_grad = discount_curve.df_adjoint([value_dt] + payment_dts,
+                                              df_bars)
+
+        # Only the projected periods at the end have index discount factors
+        fwd_bars = sign * pay_notionals * payment_dfs / df_value
+        fwd_bars = fwd_bars[len(fwd_bars) - len(start_dts):]
+
+        start_bars = fwd_bars / (alphas * df_ends)
+        end_bars = -fwd_bars * df_starts / (alphas * df_ends * df_ends)
+
+        index_bars = np.concatenate(([0.0], start_bars, end_bars))
+        index_grad = index_curve.df_adjoint([value_dt] + start_dts + end_dts,
+                                            index_bars)
+
+        return leg_pv, disc_grad, index_grad
 
     ###########################################################################
 
@@ -253,6 +474,8 @@ class SwapFloatLeg:
             pd.DataFrame: cashflow values and related data
         """
 
+        self._update_cashflows()
+
         leg_type_sign = -1 if self.leg_type == SwapTypes.PAY else 1
         df = pd.DataFrame()
         df["payment_date"] = self.payment_dts
@@ -274,6 +497,8 @@ class SwapFloatLeg:
         cash amounts, their present value and their cumulative PV using the
         last valuation performed."""
 
+        self._update_cashflows()
+
         print("START DATE:", self.effective_dt)
         print("MATURITY DATE:", self.maturity_dt)
         print("SPREAD (bp):", self.spread * 10000)
@@ -318,6 +543,8 @@ class SwapFloatLeg:
         cash amounts, their present value and their cumulative PV using the
         last valuation performed."""
 
+        self._update_cashflows()
+
         print("START DATE:", self.effective_dt)
         print("MATURITY DATE:", self.maturity_dt)
         print("SPREAD (BPS):", self.spread * 10000)
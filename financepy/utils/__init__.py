@@ -1,15 +1,20 @@
-from .calendar import *
-from .currency import *
-from .date import *
-from .day_count import *
-from .frequency import *
-from .global_vars import *
-from .global_types import *
-from .helpers import *
-from .math import *
-from .stats import *
-from .schedule import *
-from .error import *
-from .currency import *
-from .amount import *
-from .distribution import *
+from .lazy_import import lazy_package
+
+# Each module is only imported when one of its names is first used
+__getattr__, __dir__ = lazy_package(__name__, __file__, [
+    "calendar",
+    "currency",
+    "date",
+    "day_count",
+    "frequency",
+    "global_vars",
+    "global_types",
+    "helpers",
+    "math",
+    "stats",
+    "schedule",
+    "error",
+    "currency",
+    "amount",
+    "distribution",
+])
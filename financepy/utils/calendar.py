@@ -9,7 +9,10 @@
 
 import datetime
 from enum import Enum
-from .date import Date
+
+import numpy as np
+
+from .date import Date, DateArray, excel_dts_to_dmy
 from .error import FinError
 
 # from numba import njit, jit, int64, boolean
@@ -79,6 +82,348 @@ class DateGenRuleTypes(Enum):
 ###############################################################################
 
 
+class JointCalendarTypes(Enum):
+    UNION = 1  # Holiday if it is a holiday in any of the calendars
+    INTERSECTION = 2  # Holiday only if it is a holiday in all calendars
+
+###############################################################################
+# Business day bitmaps are shared by all Calendar objects of a calendar type.
+# Each one covers blocks of years within this range and is extended a block at
+# a time when a date outside it is used, so only the years that are needed are
+# evaluated. Dates outside the range fall back to evaluating the holiday rules
+# one day at a time.
+###############################################################################
+
+
+g_bus_day_start_year = 1950
+g_bus_day_end_year = 2100
+g_bus_day_bitmaps = {}
+
+BUS_DAY_BLOCK_YEARS = 5
+
+# Days either side of a date that an adjustment may need to look at
+BUS_DAY_MARGIN = 31
+
+
+def set_business_day_year_range(start_year: int,
+                                end_year: int):
+    """ Set the range of years (inclusive) which can be covered by the
+    business day bitmaps. Any bitmaps already built are discarded. The
+    holiday rules are only defined for years 1901 to 2199. """
+
+    global g_bus_day_start_year
+    global g_bus_day_end_year
+
+    if start_year < 1901 or end_year > 2199 or start_year > end_year:
+        raise FinError("Business day years must be in range 1901 to 2199")
+
+    g_bus_day_start_year = start_year
+    g_bus_day_end_year = end_year
+    g_bus_day_bitmaps.clear()
+
+###############################################################################
+
+
+def _day_in_year(dt: Date):
+    """ Day number of a date within its year with 1 January as day 1. This
+    is computed from the date rather than held on the calendar so that one
+    calendar can be shared between threads. """
+
+    return dt.excel_dt - Date(1, 1, dt.y).excel_dt + 1
+
+###############################################################################
+
+
+def _bitmap_excel_range(first_excel_dt: int,
+                        last_excel_dt: int):
+    """ First Excel date and the Excel date after the last of the blocks of
+    years which hold two Excel dates. These are limited to the business day
+    year range. """
+
+    start_excel_dt = int(Date(1, 1, g_bus_day_start_year).excel_dt)
+    end_excel_dt = int(Date(1, 1, g_bus_day_end_year + 1).excel_dt)
+
+    first_excel_dt = min(max(first_excel_dt, start_excel_dt), end_excel_dt - 1)
+    last_excel_dt = min(max(last_excel_dt, start_excel_dt), end_excel_dt - 1)
+
+    first_year = Date.from_excel_serial(first_excel_dt).y
+    last_year = Date.from_excel_serial(last_excel_dt).y
+
+    first_block = (first_year - g_bus_day_start_year) // BUS_DAY_BLOCK_YEARS
+    last_block = (last_year - g_bus_day_start_year) // BUS_DAY_BLOCK_YEARS
+
+    first_year = g_bus_day_start_year + first_block * BUS_DAY_BLOCK_YEARS
+    last_year = g_bus_day_start_year + (last_block + 1) * BUS_DAY_BLOCK_YEARS
+    last_year = min(last_year, g_bus_day_end_year + 1)
+
+    return int(Date(1, 1, first_year).excel_dt), \
+        int(Date(1, 1, last_year).excel_dt)
+
+###############################################################################
+
+
+def _excel_dts(dts: (np.ndarray, DateArray)):
+    """ Excel dates of an array of Excel dates or of a DateArray. """
+
+    if isinstance(dts, DateArray):
+        return dts.excel_dts.astype(np.int64)
+
+    return np.array(dts, dtype=np.int64, ndmin=1)
+
+###############################################################################
+
+
+def _same_type(dts: (np.ndarray, DateArray),
+               excel_dts: np.ndarray):
+    """ Return Excel dates as a DateArray if dts was a DateArray. """
+
+    if isinstance(dts, DateArray):
+        return DateArray(excel_dts)
+
+    return excel_dts
+
+###############################################################################
+
+
+class BusinessDayBitmap:
+    """ Map of which days are business days over a contiguous range of Excel
+    dates together with the cumulative number of business days. Business day
+    tests, adjustments and business day offsets then become array lookups
+    instead of day by day searches. All indices are days since the start of
+    the bitmap. Lookups that fall outside the bitmap are flagged as invalid so
+    that the caller can use the holiday rules instead. """
+
+    def __init__(self,
+                 start_excel_dt: int,
+                 is_bus_day: np.ndarray):
+        """ Create the bitmap from the Excel date of its first day and a
+        boolean array that is True for each day that is a business day. """
+
+        self.start_excel_dt = int(start_excel_dt)
+        self.is_bus_day = np.array(is_bus_day, dtype=bool)
+        self.num_days = len(self.is_bus_day)
+        self.end_excel_dt = self.start_excel_dt + self.num_days
+
+        # Number of business days up to and including each day
+        self.cum_bus_days = np.cumsum(self.is_bus_day, dtype=np.int64)
+        # Index of the n-th business day
+        self.bus_day_idx = np.flatnonzero(self.is_bus_day)
+        self.num_bus_days = len(self.bus_day_idx)
+
+        excel_dts = np.arange(self.start_excel_dt, self.end_excel_dt)
+        self.months = excel_dts_to_dmy(excel_dts)[1].astype(np.int8)
+
+        for x in (self.is_bus_day, self.cum_bus_days, self.bus_day_idx):
+            x.flags.writeable = False
+
+    ###########################################################################
+
+    def index(self,
+              excel_dts: np.ndarray):
+        """ Index of each date in the bitmap and a mask of dates in range. """
+
+        idx = np.asarray(excel_dts, dtype=np.int64) - self.start_excel_dt
+        valid = (idx >= 0) & (idx < self.num_days)
+        return np.where(valid, idx, 0), valid
+
+    ###########################################################################
+
+    def _following(self, idx, valid):
+        """ Index of first business day on or after each index. """
+
+        n = self.cum_bus_days[idx]
+        valid = valid & (self.is_bus_day[idx] | (n < self.num_bus_days))
+        n = np.minimum(n, self.num_bus_days - 1)
+        return np.where(self.is_bus_day[idx], idx, self.bus_day_idx[n]), valid
+
+    ###########################################################################
+
+    def _preceding(self, idx, valid):
+        """ Index of last business day on or before each index. """
+
+        n = self.cum_bus_days[idx] - 1
+        valid = valid & (n >= 0)
+        n = np.maximum(n, 0)
+        return self.bus_day_idx[n], valid
+
+    ###########################################################################
+
+    def adjust(self,
+               excel_dts: np.ndarray,
+               bd_type: BusDayAdjustTypes):
+        """ Adjust an array of Excel dates according to the business day
+        convention. Returns the adjusted dates and a mask of valid results. """
+
+        idx, valid = self.index(excel_dts)
+
+        if bd_type == BusDayAdjustTypes.NONE:
+            new_idx = idx
+        elif bd_type == BusDayAdjustTypes.FOLLOWING:
+            new_idx, valid = self._following(idx, valid)
+        elif bd_type == BusDayAdjustTypes.PRECEDING:
+            new_idx, valid = self._preceding(idx, valid)
+        elif bd_type == BusDayAdjustTypes.MODIFIED_FOLLOWING:
+            fol_idx, fol_valid = self._following(idx, valid)
+            pre_idx, pre_valid = self._preceding(idx, valid)
+            roll_back = self.months[fol_idx] != self.months[idx]
+            new_idx = np.where(roll_back, pre_idx, fol_idx)
+            valid = np.where(roll_back, fol_valid & pre_valid, fol_valid)
+        elif bd_type == BusDayAdjustTypes.MODIFIED_PRECEDING:
+            fol_idx, fol_valid = self._following(idx, valid)
+            pre_idx, pre_valid = self._preceding(idx, valid)
+            roll_fwd = self.months[pre_idx] != self.months[idx]
+            new_idx = np.where(roll_fwd, fol_idx, pre_idx)
+            valid = np.where(roll_fwd, fol_valid & pre_valid, pre_valid)
+        else:
+            raise FinError("Unknown adjustment convention" + str(bd_type))
+
+        return new_idx + self.start_excel_dt, valid
+
+    ###########################################################################
+
+    def add_business_days(self,
+                          excel_dts: np.ndarray,
+                          num_days: (int, np.ndarray)):
+        """ Move each Excel date by a number of business days, forward if
+        positive and backward if negative. A date that is not a business day
+        does not count. Returns new dates and a mask of valid results. """
+
+        idx, valid = self.index(excel_dts)
+        num_days = np.asarray(num_days, dtype=np.int64)
+
+        # Number of business days strictly before each date
+        num_before = self.cum_bus_days[idx] - self.is_bus_day[idx]
+        n = np.where(num_days > 0, self.cum_bus_days[idx] + num_days - 1,
+                     num_before + num_days)
+        valid = valid & ((num_days == 0) |
+                         ((n >= 0) & (n < self.num_bus_days)))
+        n = np.clip(n, 0, self.num_bus_days - 1)
+
+        new_idx = np.where(num_days == 0, idx, self.bus_day_idx[n])
+        return new_idx + self.start_excel_dt, valid
+
+    ###########################################################################
+
+    def adjust_excel_dt(self,
+                        excel_dt: int,
+                        bd_type: BusDayAdjustTypes):
+        """ Scalar version of adjust which avoids array overheads. Returns
+        None if the adjusted date cannot be found in the bitmap. """
+
+        i = excel_dt - self.start_excel_dt
+
+        if i < 0 or i >= self.num_days:
+            return None
+
+        if self.is_bus_day[i]:
+            return excel_dt
+
+        n = self.cum_bus_days[i]
+        fol_i = self.bus_day_idx[n] if n < self.num_bus_days else None
+        pre_i = self.bus_day_idx[n - 1] if n > 0 else None
+
+        if bd_type == BusDayAdjustTypes.FOLLOWING:
+            new_i = fol_i
+        elif bd_type == BusDayAdjustTypes.PRECEDING:
+            new_i = pre_i
+        elif bd_type == BusDayAdjustTypes.MODIFIED_FOLLOWING:
+            new_i = fol_i
+            if fol_i is not None and self.months[fol_i] != self.months[i]:
+                new_i = pre_i
+        elif bd_type == BusDayAdjustTypes.MODIFIED_PRECEDING:
+            new_i = pre_i
+            if pre_i is not None and self.months[pre_i] != self.months[i]:
+                new_i = fol_i
+        else:
+            new_i = i
+
+        if new_i is None:
+            return None
+
+        return int(new_i) + self.start_excel_dt
+
+    ###########################################################################
+
+    def add_business_days_excel_dt(self,
+                                   excel_dt: int,
+                                   num_days: int):
+        """ Scalar version of add_business_days. Returns None if the new date
+        cannot be found in the bitmap. """
+
+        i = excel_dt - self.start_excel_dt
+
+        if i < 0 or i >= self.num_days:
+            return None
+
+        if num_days == 0:
+            return excel_dt
+
+        if num_days > 0:
+            n = self.cum_bus_days[i] + num_days - 1
+        else:
+            n = self.cum_bus_days[i] - self.is_bus_day[i] + num_days
+
+        if n < 0 or n >= self.num_bus_days:
+            return None
+
+        return int(self.bus_day_idx[n]) + self.start_excel_dt
+
+###############################################################################
+
+
+class JointCalendar:
+    """ A combination of calendar types which can be used anywhere that a
+    CalendarTypes is accepted. For a UNION a date is a holiday if it is a
+    holiday in any of the calendars, as is usual for a cross-currency swap
+    which settles in two financial centres. For an INTERSECTION a date is a
+    holiday only if it is a holiday in all of the calendars. """
+
+    def __init__(self,
+                 cal_types: list,
+                 joint_type: JointCalendarTypes = JointCalendarTypes.UNION):
+        """ Create a joint calendar from a list of calendar types. """
+
+        if len(cal_types) == 0:
+            raise FinError("Joint calendar needs at least one calendar type")
+
+        for cal_type in cal_types:
+            if isinstance(cal_type, CalendarTypes) is False:
+                raise FinError("Need to pass CalendarTypes and not " +
+                               str(cal_type))
+
+        if isinstance(joint_type, JointCalendarTypes) is False:
+            raise FinError("Need to pass JointCalendarTypes and not " +
+                           str(joint_type))
+
+        # The order of the calendars does not matter so we sort them to
+        # ensure equal joint calendars share the same cached bitmap
+        self.cal_types = tuple(sorted(set(cal_types), key=lambda t: t.value))
+        self.joint_type = joint_type
+        self.name = joint_type.name + "(" + \
+            ",".join([t.name for t in self.cal_types]) + ")"
+
+    ###########################################################################
+
+    def __eq__(self, other):
+        if isinstance(other, JointCalendar) is False:
+            return False
+
+        return self.cal_types == other.cal_types and \
+            self.joint_type == other.joint_type
+
+    ###########################################################################
+
+    def __hash__(self):
+        return hash((self.cal_types, self.joint_type))
+
+    ###########################################################################
+
+    def __repr__(self):
+        return self.name
+
+###############################################################################
+
+
 class Calendar:
     """ Class to manage designation of payment dates as holidays according to
     a regional or country-specific calendar convention specified by the user.
@@ -87,17 +432,109 @@ class Calendar:
     specified calendar. """
 
     def __init__(self,
-                 cal_type: CalendarTypes):
-        """ Create a calendar based on a specified calendar type. """
+                 cal_type: (CalendarTypes, JointCalendar)):
+        """ Create a calendar based on a specified calendar type or on a
+        joint calendar which combines several calendar types. """
 
-        if cal_type not in CalendarTypes:
+        if isinstance(cal_type, (CalendarTypes, JointCalendar)) is False:
             raise FinError(
                 "Need to pass FinCalendarType and not " +
                 str(cal_type))
 
         self.cal_type = cal_type
-        self.day_in_year = None
-        self.weekday = None
+
+        # The calendars of a joint calendar are created once here rather than
+        # on every holiday test
+        self._member_calendars = None
+        if isinstance(cal_type, JointCalendar):
+            self._member_calendars = [Calendar(member_type)
+                                      for member_type in cal_type.cal_types]
+
+    ###########################################################################
+
+    def bus_day_bitmap(self,
+                       first_excel_dt: int = None,
+                       last_excel_dt: int = None):
+        """ Returns the business day bitmap for this calendar type covering
+        the blocks of years which hold the Excel dates from first_excel_dt to
+        last_excel_dt. If no dates are given it covers the whole business day
+        year range. Only the years which are not already in the cached bitmap
+        are built from the holiday rules. """
+
+        bitmap = g_bus_day_bitmaps.get(self.cal_type)
+
+        if first_excel_dt is None:
+            start_excel_dt = int(Date(1, 1, g_bus_day_start_year).excel_dt)
+            end_excel_dt = int(Date(1, 1, g_bus_day_end_year + 1).excel_dt)
+        elif bitmap is not None and first_excel_dt >= bitmap.start_excel_dt \
+                and last_excel_dt < bitmap.end_excel_dt:
+            return bitmap
+        else:
+            start_excel_dt, end_excel_dt = \
+                _bitmap_excel_range(first_excel_dt, last_excel_dt)
+
+        if bitmap is not None:
+
+            if start_excel_dt >= bitmap.start_excel_dt and \
+                    end_excel_dt <= bitmap.end_excel_dt:
+                return bitmap
+
+            start_excel_dt = min(start_excel_dt, bitmap.start_excel_dt)
+            end_excel_dt = max(end_excel_dt, bitmap.end_excel_dt)
+
+        if isinstance(self.cal_type, JointCalendar):
+            # Weekends are never business days so a union of holidays is a
+            # business day in all calendars and an intersection in any one
+            is_bus_days = []
+            for member_calendar in self._member_calendars:
+                member_bitmap = member_calendar.bus_day_bitmap(
+                    start_excel_dt, end_excel_dt - 1)
+                i = start_excel_dt - member_bitmap.start_excel_dt
+                n = end_excel_dt - start_excel_dt
+                is_bus_days.append(member_bitmap.is_bus_day[i:i + n])
+
+            if self.cal_type.joint_type == JointCalendarTypes.UNION:
+                is_bus_day = np.logical_and.reduce(is_bus_days)
+            else:
+                is_bus_day = np.logical_or.reduce(is_bus_days)
+
+        else:
+            excel_dts = np.arange(start_excel_dt, end_excel_dt)
+            is_bus_day = np.empty(len(excel_dts), dtype=bool)
+
+            # The days already in the bitmap are copied from it
+            (i_old, n_old) = (0, 0)
+            if bitmap is not None:
+                i_old = bitmap.start_excel_dt - start_excel_dt
+                n_old = bitmap.num_days
+                is_bus_day[i_old:i_old + n_old] = bitmap.is_bus_day
+
+            for i in range(0, len(excel_dts)):
+                if i_old <= i < i_old + n_old:
+                    continue
+
+                dt = Date.from_excel_serial(excel_dts[i])
+                is_bus_day[i] = self._is_business_day_by_rules(dt)
+
+        bitmap = BusinessDayBitmap(start_excel_dt, is_bus_day)
+        g_bus_day_bitmaps[self.cal_type] = bitmap
+
+        return bitmap
+
+    ###########################################################################
+
+    def _bus_day_bitmap_for(self,
+                            excel_dts: np.ndarray,
+                            margin: int):
+        """ Returns the business day bitmap covering an array of Excel dates
+        and a margin of days either side of them. """
+
+        if len(excel_dts) == 0:
+            excel_dt = int(Date(1, 1, g_bus_day_start_year).excel_dt)
+            return self.bus_day_bitmap(excel_dt, excel_dt)
+
+        return self.bus_day_bitmap(int(np.min(excel_dts)) - margin,
+                                   int(np.max(excel_dts)) + margin)
 
     ###########################################################################
 
@@ -114,13 +551,60 @@ class Calendar:
         if self.cal_type == CalendarTypes.NONE:
             return dt
 
+        if bd_type == BusDayAdjustTypes.NONE:
+            return dt
+
+        excel_dt = int(dt.excel_dt)
+        bitmap = self.bus_day_bitmap(excel_dt - BUS_DAY_MARGIN,
+                                     excel_dt + BUS_DAY_MARGIN)
+        new_excel_dt = bitmap.adjust_excel_dt(excel_dt, bd_type)
+
+        if new_excel_dt is None:
+            return self._adjust_by_rules(dt, bd_type)
+        elif new_excel_dt == excel_dt:
+            return dt
+        else:
+            return dt.add_days(new_excel_dt - excel_dt)
+
+###############################################################################
+
+    def adjust_array(self,
+                     dts: (np.ndarray, DateArray),
+                     bd_type: BusDayAdjustTypes):
+        """ Vectorised version of adjust which takes an array of Excel dates
+        or a DateArray and returns the adjusted dates in the same form. """
+
+        if isinstance(bd_type, BusDayAdjustTypes) is False:
+            raise FinError("Invalid type passed. Need Finbd_type")
+
+        excel_dts = _excel_dts(dts)
+
+        if self.cal_type == CalendarTypes.NONE:
+            new_excel_dts = excel_dts.copy()
+        else:
+            bitmap = self._bus_day_bitmap_for(excel_dts, BUS_DAY_MARGIN)
+            new_excel_dts, valid = bitmap.adjust(excel_dts, bd_type)
+            for i in np.flatnonzero(~valid):
+                dt = Date.from_excel_serial(excel_dts[i])
+                new_excel_dts[i] = self._adjust_by_rules(dt, bd_type).excel_dt
+
+        return _same_type(dts, new_excel_dts)
+
+###############################################################################
+
+    def _adjust_by_rules(self,
+                         dt: Date,
+                         bd_type: BusDayAdjustTypes):
+        """ Adjust a date by stepping through days one at a time and testing
+        them against the holiday rules. Only used outside the bitmap. """
+
         if bd_type == BusDayAdjustTypes.NONE:
             return dt
 
         elif bd_type == BusDayAdjustTypes.FOLLOWING:
 
             # step forward until we find a business day
-            while self.is_business_day(dt) is False:
+            while self._is_business_day_by_rules(dt) is False:
                 dt = dt.add_days(1)
 
             return dt
@@ -132,7 +616,7 @@ class Calendar:
             y_start = dt.y
 
             # step forward until we find a business day
-            while self.is_business_day(dt) is False:
+            while self._is_business_day_by_rules(dt) is False:
                 dt = dt.add_days(1)
 
             # if the business day is in a different month look back
@@ -140,7 +624,7 @@ class Calendar:
             # TODO: I could speed this up by starting it at initial date
             if dt.m != m_start:
                 dt = Date(d_start, m_start, y_start)
-                while self.is_business_day(dt) is False:
+                while self._is_business_day_by_rules(dt) is False:
                     dt = dt.add_days(-1)
 
             return dt
@@ -149,7 +633,7 @@ class Calendar:
 
             # if the business day is in the next month look back
             # for previous first business day one day at a time
-            while self.is_business_day(dt) is False:
+            while self._is_business_day_by_rules(dt) is False:
                 dt = dt.add_days(-1)
 
             return dt
@@ -161,7 +645,7 @@ class Calendar:
             y_start = dt.y
 
             # step backward until we find a business day
-            while self.is_business_day(dt) is False:
+            while self._is_business_day_by_rules(dt) is False:
                 dt = dt.add_days(-1)
 
             # if the business day is in a different month look forward
@@ -169,7 +653,7 @@ class Calendar:
             # I could speed this up by starting it at initial date
             if dt.m != m_start:
                 dt = Date(d_start, m_start, y_start)
-                while self.is_business_day(dt) is False:
+                while self._is_business_day_by_rules(dt) is False:
                     dt = dt.add_days(+1)
 
             return dt
@@ -189,11 +673,56 @@ class Calendar:
         """ Returns a new date that is num_days business days after Date.
         All holidays in the chosen calendar are assumed not business days. """
 
-        # TODO: REMOVE DATETIME DEPENDENCE HERE ???
-
         if isinstance(num_days, int) is False:
             raise FinError("Num days must be an integer")
 
+        excel_dt = int(start_dt.excel_dt)
+        margin = BUS_DAY_MARGIN + 2 * abs(num_days)
+        bitmap = self.bus_day_bitmap(excel_dt - margin, excel_dt + margin)
+        new_excel_dt = bitmap.add_business_days_excel_dt(excel_dt, num_days)
+
+        if new_excel_dt is None:
+            return self._add_business_days_by_rules(start_dt, num_days)
+
+        return Date.from_excel_serial(new_excel_dt)
+
+###############################################################################
+
+    def add_business_days_array(self,
+                                dts: (np.ndarray, DateArray),
+                                num_days: (int, np.ndarray)):
+        """ Vectorised version of add_business_days which takes an array of
+        Excel dates or a DateArray and an integer or array of integers. The
+        new dates are returned in the same form as the input dates. """
+
+        num_days = np.asarray(num_days)
+
+        if np.any(num_days.astype(np.int64) != num_days):
+            raise FinError("Num days must be an integer")
+
+        excel_dts = _excel_dts(dts)
+        margin = BUS_DAY_MARGIN + 2 * int(np.max(np.abs(num_days), initial=0))
+        bitmap = self._bus_day_bitmap_for(excel_dts, margin)
+        new_excel_dts, valid = bitmap.add_business_days(excel_dts, num_days)
+
+        num_days = np.broadcast_to(num_days, excel_dts.shape)
+        for i in np.flatnonzero(~valid):
+            dt = Date.from_excel_serial(excel_dts[i])
+            new_dt = self._add_business_days_by_rules(dt, int(num_days[i]))
+            new_excel_dts[i] = new_dt.excel_dt
+
+        return _same_type(dts, new_excel_dts)
+
+###############################################################################
+
+    def _add_business_days_by_rules(self,
+                                    start_dt: Date,
+                                    num_days: int):
+        """ Move num_days business days by stepping through days one at a
+        time and testing them against the holiday rules. """
+
+        # TODO: REMOVE DATETIME DEPENDENCE HERE ???
+
         dt = datetime.date(start_dt.y, start_dt.m, start_dt.d)
         d = dt.day
         m = dt.month
@@ -212,7 +741,7 @@ class Calendar:
             y = dt.year
             new_dt = Date(d, m, y)
 
-            if self.is_business_day(new_dt) is True:
+            if self._is_business_day_by_rules(new_dt) is True:
                 num_days -= 1
 
         return new_dt
@@ -224,6 +753,40 @@ class Calendar:
         """ Determines if a date is a business day according to the specified
         calendar. If it is it returns True, otherwise False. """
 
+        excel_dt = int(dt.excel_dt)
+        bitmap = self.bus_day_bitmap(excel_dt, excel_dt)
+        i = excel_dt - bitmap.start_excel_dt
+
+        if i >= 0 and i < bitmap.num_days:
+            return bool(bitmap.is_bus_day[i])
+
+        return self._is_business_day_by_rules(dt)
+
+###############################################################################
+
+    def is_business_day_array(self,
+                              dts: (np.ndarray, DateArray)):
+        """ Vectorised version of is_business_day which takes an array of
+        Excel dates or a DateArray and returns a boolean array. """
+
+        excel_dts = _excel_dts(dts)
+        bitmap = self._bus_day_bitmap_for(excel_dts, 0)
+        idx, valid = bitmap.index(excel_dts)
+        is_bus_day = bitmap.is_bus_day[idx]
+
+        for i in np.flatnonzero(~valid):
+            dt = Date.from_excel_serial(excel_dts[i])
+            is_bus_day[i] = self._is_business_day_by_rules(dt)
+
+        return is_bus_day
+
+###############################################################################
+
+    def _is_business_day_by_rules(self,
+                                  dt: Date):
+        """ Determines if a date is a business day by applying the weekend
+        and holiday rules of the calendar directly. """
+
         # For all calendars so far, SAT and SUN are not business days
         # If this ever changes I will need to add a filter here.
         if dt.is_weekend():
@@ -242,11 +805,14 @@ class Calendar:
         calendar. Weekends are not holidays unless the holiday falls on a
         weekend date. """
 
-        start_dt = Date(1, 1, dt.y)
-        self.day_in_year = dt.excel_dt - start_dt.excel_dt + 1
-        self.weekday = dt.weekday
-
-        if self.cal_type == CalendarTypes.NONE:
+        if isinstance(self.cal_type, JointCalendar):
+            holidays = [member_calendar.is_holiday(dt)
+                        for member_calendar in self._member_calendars]
+            if self.cal_type.joint_type == JointCalendarTypes.UNION:
+                return any(holidays)
+            else:
+                return all(holidays)
+        elif self.cal_type == CalendarTypes.NONE:
             return self.holiday_none(dt)
         elif self.cal_type == CalendarTypes.WEEKEND:
             return self.holiday_weekend(dt)
@@ -298,8 +864,8 @@ class Calendar:
         m = dt.m
         d = dt.d
         y = dt.y
-        day_in_year = self.day_in_year
-        weekday = self.weekday
+        day_in_year = _day_in_year(dt)
+        weekday = dt.weekday
 
         if m == 1 and d == 1:  # new years day
             return True
@@ -364,7 +930,8 @@ class Calendar:
         m = dt.m
         d = dt.d
         y = dt.y
-        weekday = self.weekday
+        day_in_year = _day_in_year(dt)
+        weekday = dt.weekday
 
         if m == 1 and d == 1:  # new years day
             return True
@@ -377,10 +944,10 @@ class Calendar:
 
         em = easterMondayDay[y - 1901]
 
-        if self.day_in_year == em:  # Easter Monday
+        if day_in_year == em:  # Easter Monday
             return True
 
-        if self.day_in_year == em - 3:  # good friday
+        if day_in_year == em - 3:  # good friday
             return True
 
         if m == 5 and d <= 7 and weekday == Date.MON:
@@ -426,7 +993,7 @@ class Calendar:
         m = dt.m
         d = dt.d
         y = dt.y
-        day_in_year = self.day_in_year
+        day_in_year = _day_in_year(dt)
 
         if m == 1 and d == 1:  # new years day
             return True
@@ -479,8 +1046,8 @@ class Calendar:
         m = dt.m
         d = dt.d
         y = dt.y
-        day_in_year = self.day_in_year
-        weekday = self.weekday
+        day_in_year = _day_in_year(dt)
+        weekday = dt.weekday
 
         if m == 1 and d == 1:  # new years day
             return True
@@ -530,7 +1097,7 @@ class Calendar:
         m = dt.m
         d = dt.d
         y = dt.y
-        day_in_year = self.day_in_year
+        day_in_year = _day_in_year(dt)
 
         if m == 1 and d == 1:  # new years day
             return True
@@ -574,8 +1141,8 @@ class Calendar:
         m = dt.m
         d = dt.d
         y = dt.y
-        day_in_year = self.day_in_year
-        weekday = self.weekday
+        day_in_year = _day_in_year(dt)
+        weekday = dt.weekday
 
         if m == 1 and d == 1:  # new years day
             return True
@@ -619,8 +1186,8 @@ class Calendar:
         m = dt.m
         d = dt.d
         y = dt.y
-        day_in_year = self.day_in_year
-        weekday = self.weekday
+        day_in_year = _day_in_year(dt)
+        weekday = dt.weekday
 
         if m == 1 and d == 1:  # new years day
             return True
@@ -722,8 +1289,8 @@ class Calendar:
         m = dt.m
         d = dt.d
         y = dt.y
-        day_in_year = self.day_in_year
-        weekday = self.weekday
+        day_in_year = _day_in_year(dt)
+        weekday = dt.weekday
 
         if m == 1 and d == 1:  # new years day
             return True
@@ -785,8 +1352,8 @@ class Calendar:
         m = dt.m
         d = dt.d
         y = dt.y
-        day_in_year = self.day_in_year
-        weekday = self.weekday
+        day_in_year = _day_in_year(dt)
+        weekday = dt.weekday
 
         if m == 1 and d == 1:  # new years day
             return True
@@ -832,7 +1399,7 @@ class Calendar:
 
         m = dt.m
         d = dt.d
-        weekday = self.weekday
+        weekday = dt.weekday
 
         if m == 1 and d == 1:  # NYD
             return True
@@ -901,8 +1468,8 @@ class Calendar:
         m = dt.m
         d = dt.d
         y = dt.y
-        day_in_year = self.day_in_year
-        weekday = self.weekday
+        day_in_year = _day_in_year(dt)
+        weekday = dt.weekday
 
         if m == 1 and d == 1:  # NYD
             return True
@@ -979,7 +1546,7 @@ class Calendar:
         m = dt.m
         d = dt.d
         y = dt.y
-        day_in_year = self.day_in_year
+        day_in_year = _day_in_year(dt)
 
         if m == 1 and d == 1:  # new years day
             return True
@@ -1029,7 +1596,7 @@ class Calendar:
         m = dt.m
         d = dt.d
         y = dt.y
-        day_in_year = self.day_in_year
+        day_in_year = _day_in_year(dt)
 
         if m == 1 and d == 1:  # new year's day
             return True
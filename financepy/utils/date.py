@@ -119,6 +119,9 @@ g_dt_counter_list = None
 g_start_year = 1900
 g_end_year = 2100
 
+# Ordinal of the day before the first Excel serial date 1 Jan 1900 = 1
+g_excel_base_ordinal = datetime.date(1899, 12, 30).toordinal()
+
 
 def calculate_list():
     """Calculate list of dates so that we can do quick lookup to get the
@@ -210,6 +213,9 @@ def weekday(day_count):
 
 def vectorisation_helper(func):
     def wrapper(self_, other):
+        if isinstance(other, DateArray):
+            # Let the DateArray reflected operator do this without a loop
+            return NotImplemented
         if isinstance(other, Iterable):
             # Store the type of other, then cast the output to be the same type
             output_type = type(other)
@@ -235,6 +241,8 @@ class Date:
     SAT = 5
     SUN = 6
 
+    __slots__ = ("d", "m", "y", "hh", "mm", "ss", "excel_dt", "weekday")
+
     ###########################################################################
 
     def __init__(self, d, m, y, hh=0, mm=0, ss=0):
@@ -326,6 +334,60 @@ class Date:
 
     ###########################################################################
 
+    @classmethod
+    def from_excel_serial(cls, excel_dt: int):
+        """Fast constructor of a Date from an Excel serial date which skips
+        the validation done when a Date is created from a day, month and
+        year. It is meant for internal use where the serial date is known to
+        be a valid date on or after 1 Jan 1900. Any intraday time is dropped.
+
+        Example Input:
+        start_dt = Date.from_excel_serial(43831)"""
+
+        excel_dt = int(excel_dt)
+
+        # Excel has a 29 Feb 1900 so earlier serials are one day ahead
+        if excel_dt < 61:
+            ordinal = g_excel_base_ordinal + excel_dt + 1
+        else:
+            ordinal = g_excel_base_ordinal + excel_dt
+
+        dt = datetime.date.fromordinal(ordinal)
+        return cls._from_trusted(dt.day, dt.month, dt.year, excel_dt)
+
+    ###########################################################################
+
+    @classmethod
+    def _from_valid_dmy(cls, d: int, m: int, y: int):
+        """Create a Date from a day, month and year that are known to be a
+        valid date on or after 1 Jan 1900 without any validation."""
+
+        excel_dt = datetime.date(y, m, d).toordinal() - g_excel_base_ordinal
+
+        if excel_dt < 61:
+            excel_dt -= 1
+
+        return cls._from_trusted(d, m, y, excel_dt)
+
+    ###########################################################################
+
+    @classmethod
+    def _from_trusted(cls, d: int, m: int, y: int, excel_dt: int):
+        """Set the attributes of a new Date directly, bypassing __init__."""
+
+        new_dt = object.__new__(cls)
+        new_dt.d = d
+        new_dt.m = m
+        new_dt.y = y
+        new_dt.hh = 0
+        new_dt.mm = 0
+        new_dt.ss = 0
+        new_dt.excel_dt = float(excel_dt)
+        new_dt.weekday = (excel_dt + 5) % 7
+        return new_dt
+
+    ###########################################################################
+
     @classmethod
     def from_string(cls, date_string, format_string):
         """Create a Date from a date and format string.
@@ -457,10 +519,10 @@ class Date:
 
         if leap_year:
             last_day = month_days_leap_year[m - 1]
-            return Date(last_day, m, y)
+            return Date._from_valid_dmy(last_day, m, y)
         else:
             last_day = month_days_not_leap_year[m - 1]
-            return Date(last_day, m, y)
+            return Date._from_valid_dmy(last_day, m, y)
 
         return False
 
@@ -490,20 +552,13 @@ class Date:
         """Returns a new date that is num_days after the Date. I also make
         it possible to go backwards a number of days."""
 
-        idx = date_index(self.d, self.m, self.y)
-
-        step = +1
-        if num_days < 0:
-            step = -1
+        # Excel serial dates are consecutive so this is a simple addition
+        excel_dt = int(self.excel_dt) + int(num_days)
 
-        while num_days != 0:
-            idx += step
-            if g_dt_counter_list[idx] > 0:
-                num_days -= step
+        if excel_dt < 1:
+            raise FinError("Date cannot be before 1 Jan 1900")
 
-        (d, m, y) = date_from_index(idx)
-        new_dt = Date(d, m, y)
-        return new_dt
+        return Date.from_excel_serial(excel_dt)
 
     ###########################################################################
 
@@ -614,6 +669,9 @@ class Date:
                 m = m + 12
                 y -= 1
 
+            if y < 1900:
+                raise FinError("Year cannot be before 1900")
+
             leap_year = is_leap_year(y)
 
             if leap_year:
@@ -623,7 +681,7 @@ class Date:
                 if d > month_days_not_leap_year[m - 1]:
                     d = month_days_not_leap_year[m - 1]
 
-            new_dt = Date(d, m, y)
+            new_dt = Date._from_valid_dmy(d, m, y)
             date_list.append(new_dt)
 
         if scalar_flag is True:
@@ -998,6 +1056,359 @@ class Date:
         print(self)
 
 
+###############################################################################
+# Vectorised conversion between Excel serial dates and day, month and year.
+# Excel counts 29 Feb 1900 as a date so serials before 1 Mar 1900 (serial 61)
+# are one day ahead of the true day count from 30 Dec 1899.
+###############################################################################
+
+
+g_excel_base_dt = np.datetime64("1899-12-30", "D")
+g_month_days_not_leap_year = np.array(month_days_not_leap_year)
+
+
+def excel_dts_to_dmy(excel_dts: np.ndarray):
+    """Convert an array of Excel serial dates into arrays of the day of the
+    month, the month and the year."""
+
+    excel_dts = np.asarray(excel_dts, dtype=np.int64)
+    days = np.where(excel_dts < 61, excel_dts + 1, excel_dts)
+    dts = g_excel_base_dt + days
+    months = dts.astype("datetime64[M]")
+    y = dts.astype("datetime64[Y]").astype(np.int64) + 1970
+    m = months.astype(np.int64) % 12 + 1
+    d = (dts - months.astype("datetime64[D]")).astype(np.int64) + 1
+    return d, m, y
+
+
+###############################################################################
+
+
+def dmy_to_excel_dts(d: np.ndarray, m: np.ndarray, y: np.ndarray):
+    """Convert arrays of day of month, month and year into an array of Excel
+    serial dates. The inputs are assumed to be valid dates."""
+
+    d = np.asarray(d, dtype=np.int64)
+    m = np.asarray(m, dtype=np.int64)
+    y = np.asarray(y, dtype=np.int64)
+    months = ((y - 1970) * 12 + m - 1).astype("datetime64[M]")
+    days = (months.astype("datetime64[D]") - g_excel_base_dt).astype(np.int64)
+    days = days + d - 1
+    return np.where(days < 61, days - 1, days)
+
+
+###############################################################################
+
+
+def days_in_months(m: np.ndarray, y: np.ndarray):
+    """Vectorised number of days in the months (1-12) of the years y."""
+
+    m = np.asarray(m, dtype=np.int64)
+    y = np.asarray(y, dtype=np.int64)
+    leap_year = ((y % 4 == 0) & (y % 100 != 0)) | (y % 400 == 0)
+    num_days = g_month_days_not_leap_year[m - 1]
+    return num_days + ((m == 2) & leap_year)
+
+
+###############################################################################
+
+
+class DateArray:
+    """A vector of dates held as a NumPy array of Excel serial dates. This is
+    a lightweight alternative to a list of Date objects when many dates must
+    be shifted, compared or differenced at once. Only whole days are stored
+    so any intraday time on the input dates is dropped. The array is read
+    only, so operations always return a new DateArray."""
+
+    ###########################################################################
+
+    def __init__(self, excel_dts: (list, np.ndarray)):
+        """Create a DateArray from a list or array of Excel serial dates.
+
+        Example Input:
+        dts = DateArray([43101, 43132, 43160])
+        """
+
+        excel_dts = np.array(excel_dts, dtype=np.int32, ndmin=1)
+
+        if excel_dts.ndim != 1:
+            raise FinError("DateArray must be one dimensional")
+
+        if np.any(excel_dts < 1):
+            raise FinError("DateArray: dates cannot be before 1 Jan 1900")
+
+        excel_dts.flags.writeable = False
+        self.excel_dts = excel_dts
+        self._dmy = None
+
+    ###########################################################################
+
+    @classmethod
+    def from_dates(cls, dts: list):
+        """Create a DateArray from a list of Date objects."""
+
+        if isinstance(dts, DateArray):
+            return cls(dts.excel_dts)
+
+        if isinstance(dts, Date):
+            dts = [dts]
+
+        excel_dts = np.empty(len(dts), dtype=np.int32)
+        for i, dt in enumerate(dts):
+            if isinstance(dt, Date) is False:
+                raise FinError("DateArray can only be created from Dates")
+            excel_dts[i] = int(dt.excel_dt)
+
+        return cls(excel_dts)
+
+    ###########################################################################
+
+    @classmethod
+    def from_dmy(cls, d: np.ndarray, m: np.ndarray, y: np.ndarray):
+        """Create a DateArray from arrays of the day of month, the month and
+        the year which are validated in the same way as Date."""
+
+        d, m, y = np.broadcast_arrays(np.asarray(d, dtype=np.int64),
+                                      np.asarray(m, dtype=np.int64),
+                                      np.asarray(y, dtype=np.int64))
+
+        if np.any(y < 1900):
+            raise FinError("Year cannot be before 1900")
+
+        if np.any(m < 1) or np.any(m > 12):
+            raise FinError("Month must be 1-12")
+
+        if np.any(d < 1) or np.any(d > days_in_months(m, y)):
+            raise FinError("DateArray: Day not valid.")
+
+        return cls(dmy_to_excel_dts(d, m, y))
+
+    ###########################################################################
+
+    def _dmy_arrays(self):
+        """The day, month and year arrays are only calculated if needed."""
+
+        if self._dmy is None:
+            self._dmy = excel_dts_to_dmy(self.excel_dts)
+
+        return self._dmy
+
+    ###########################################################################
+
+    @property
+    def d(self):
+        """Day of the month of each date."""
+        return self._dmy_arrays()[0]
+
+    @property
+    def m(self):
+        """Month of each date."""
+        return self._dmy_arrays()[1]
+
+    @property
+    def y(self):
+        """Year of each date."""
+        return self._dmy_arrays()[2]
+
+    @property
+    def weekday(self):
+        """Day of the week of each date with Monday as 0 as in Date."""
+        return (self.excel_dts + 5) % 7
+
+    ###########################################################################
+
+    def __len__(self):
+        return len(self.excel_dts)
+
+    ###########################################################################
+
+    def __getitem__(self, key):
+        """An integer index returns a Date, a slice or index array returns a
+        DateArray."""
+
+        if isinstance(key, (int, np.integer)):
+            return Date.from_excel_serial(self.excel_dts[key])
+
+        return DateArray(self.excel_dts[key])
+
+    ###########################################################################
+
+    def __iter__(self):
+        for excel_dt in self.excel_dts.tolist():
+            yield Date.from_excel_serial(excel_dt)
+
+    ###########################################################################
+
+    def to_dates(self):
+        """Returns the dates as a list of Date objects."""
+        return list(self)
+
+    ###########################################################################
+
+    def _other_excel_dts(self, other):
+        """Excel dates of the other operand of a comparison or difference."""
+
+        if isinstance(other, Date):
+            return other.excel_dt
+        elif isinstance(other, DateArray):
+            return other.excel_dts
+        elif isinstance(other, (list, tuple)):
+            return DateArray.from_dates(other).excel_dts
+
+        return None
+
+    ###########################################################################
+
+    def __gt__(self, other):
+        other_dts = self._other_excel_dts(other)
+        if other_dts is None:
+            return NotImplemented
+        return self.excel_dts > other_dts
+
+    def __lt__(self, other):
+        other_dts = self._other_excel_dts(other)
+        if other_dts is None:
+            return NotImplemented
+        return self.excel_dts < other_dts
+
+    def __ge__(self, other):
+        other_dts = self._other_excel_dts(other)
+        if other_dts is None:
+            return NotImplemented
+        return self.excel_dts >= other_dts
+
+    def __le__(self, other):
+        other_dts = self._other_excel_dts(other)
+        if other_dts is None:
+            return NotImplemented
+        return self.excel_dts <= other_dts
+
+    def __eq__(self, other):
+        other_dts = self._other_excel_dts(other)
+        if other_dts is None:
+            return NotImplemented
+        return self.excel_dts == other_dts
+
+    def __ne__(self, other):
+        other_dts = self._other_excel_dts(other)
+        if other_dts is None:
+            return NotImplemented
+        return self.excel_dts != other_dts
+
+    __hash__ = None
+
+    ###########################################################################
+
+    def __sub__(self, other):
+        """Number of days from the other date(s) to each date."""
+        other_dts = self._other_excel_dts(other)
+        if other_dts is None:
+            return NotImplemented
+        return self.excel_dts - np.asarray(other_dts, dtype=np.float64)
+
+    def __rsub__(self, other):
+        """Number of days from each date to the other date(s)."""
+        other_dts = self._other_excel_dts(other)
+        if other_dts is None:
+            return NotImplemented
+        return np.asarray(other_dts, dtype=np.float64) - self.excel_dts
+
+    ###########################################################################
+
+    def is_weekend(self):
+        """Returns a boolean array which is True for a weekend date."""
+
+        wd = self.weekday
+        return (wd == Date.SAT) | (wd == Date.SUN)
+
+    ###########################################################################
+
+    def is_eom(self):
+        """Returns a boolean array which is True for a month end date."""
+
+        d, m, y = self._dmy_arrays()
+        return d == days_in_months(m, y)
+
+    ###########################################################################
+
+    def eom(self):
+        """Returns the last date of the month of each date."""
+
+        d, m, y = self._dmy_arrays()
+        last_day = days_in_months(m, y)
+        return DateArray(self.excel_dts + (last_day - d))
+
+    ###########################################################################
+
+    def add_days(self, num_days: (int, np.ndarray) = 1):
+        """Returns the dates that are num_days after each date. The number of
+        days can be an integer or an array of integers, one per date, or a
+        broadcastable array if this is a single date."""
+
+        num_days = np.asarray(num_days)
+
+        if np.any(num_days.astype(np.int64) != num_days):
+            raise FinError("Must only pass integers or float integers.")
+
+        return DateArray(self.excel_dts + num_days.astype(np.int64))
+
+    ###########################################################################
+
+    def add_months(self, mm: (int, np.ndarray)):
+        """Returns the dates that are mm months after each date. The day of
+        month is capped at the month end as in Date.add_months. The number of
+        months can be a scalar or an array that is broadcast against dates."""
+
+        mm = np.asarray(mm)
+
+        if np.any(mm.astype(np.int64) != mm):
+            raise FinError("Must only pass integers or float integers.")
+
+        d, m, y = self._dmy_arrays()
+        tot_months = y * 12 + (m - 1) + mm.astype(np.int64)
+        new_y = tot_months // 12
+        new_m = tot_months % 12 + 1
+        new_d = np.minimum(d, days_in_months(new_m, new_y))
+        return DateArray(dmy_to_excel_dts(new_d, new_m, new_y))
+
+    ###########################################################################
+
+    def add_tenor(self, tenor: Union[str, Tenor]):
+        """Returns the dates that follow each date by a period given by the
+        tenor string or Tenor object. This gives the same dates as calling
+        Date.add_tenor on each date. Dates are not holiday adjusted."""
+
+        if isinstance(tenor, (str, Tenor)) is False:
+            raise FinError("Tenor must be a string e.g. '5Y' or a Tenor object")
+
+        tenor_obj = Tenor.as_tenor(str_or_tenor=tenor)
+        num_periods = tenor_obj._num_periods
+
+        if tenor_obj._units == TenorUnit.DAYS:
+            return self.add_days(num_periods)
+        elif tenor_obj._units == TenorUnit.WEEKS:
+            return self.add_days(7 * num_periods)
+        elif tenor_obj._units == TenorUnit.MONTHS:
+            return self.add_months(num_periods)
+        elif tenor_obj._units == TenorUnit.YEARS:
+            new_dts = self.add_months(12 * num_periods)
+            # Date steps a year at a time so a 29 Feb always passes through
+            # a non-leap year and is then left on the 28th
+            if num_periods != 0:
+                d, m, _ = self._dmy_arrays()
+                feb29 = (d == 29) & (m == 2) & (new_dts.d == 29)
+                return DateArray(new_dts.excel_dts - feb29)
+            return new_dts
+
+        return DateArray(self.excel_dts)
+
+    ###########################################################################
+
+    def __repr__(self):
+        """returns a formatted string of the dates"""
+        return "DateArray([" + ", ".join(str(dt) for dt in self) + "])"
+
+
 ###############################################################################
 # Date functions that are not class members but are useful
 ###############################################################################
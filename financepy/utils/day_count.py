@@ -2,8 +2,11 @@
 # Copyright (C) 2018, 2019, 2020 Dominic O'Kane
 ##############################################################################
 
-from .date import Date
+import numpy as np
+
+from .date import Date, DateArray
 from .date import datediff
+from .date import excel_dts_to_dmy, dmy_to_excel_dts
 from .date import is_leap_year
 from .error import FinError
 from .frequency import FrequencyTypes, annual_frequency
@@ -33,6 +36,31 @@ def is_last_day_of_feb(dt: Date):
         return False
 
 ###############################################################################
+
+
+def _is_leap_years(y: np.ndarray):
+    ''' Returns a boolean array which is True for each leap year in y '''
+
+    return ((y % 4 == 0) & (y % 100 != 0)) | (y % 400 == 0)
+
+###############################################################################
+
+
+def _to_excel_dts(dts):
+    ''' Convert a Date, a list of Dates, a DateArray or an array of Excel
+    serial dates into a float array of Excel serial dates. '''
+
+    if isinstance(dts, Date):
+        return np.float64(dts.excel_dt)
+    elif isinstance(dts, DateArray):
+        return dts.excel_dts.astype(np.float64)
+    elif isinstance(dts, (list, tuple)):
+        return np.array([dt.excel_dt if isinstance(dt, Date) else dt
+                         for dt in dts], dtype=np.float64)
+    else:
+        return np.asarray(dts, dtype=np.float64)
+
+###############################################################################
 #    THIRTY_360_BOND = 1  # 30E/360 ISDA 2006 4.16f, German, Eurobond(ISDA2000)
 #    THIRTY_E_360 = 2  # ISDA 2006 4.16(g) 30/360 ISMA, ICMA
 #    THIRTY_E_360_ISDA = 3  # ISDA 2006 4.16(h)
@@ -286,6 +314,146 @@ class DayCount:
             raise FinError(str(self._type) +
                            " is not one of DayCountTypes")
 
+###############################################################################
+
+    def year_frac_array(self,
+                        dts1,  # Start of coupon periods
+                        dts2,  # Settlement dates or period ends
+                        dts3=None,  # End of coupon periods for accrued
+                        freq_type: FrequencyTypes = FrequencyTypes.ANNUAL,
+                        is_termination_date=False):  # Are dts2 term dates
+        """ Vectorised version of year_frac which calculates the year
+        fractions between many pairs of dates in one call. The dates can be
+        passed as arrays of Excel serial dates, DateArrays, lists of Dates or
+        single Dates which are broadcast against the other inputs. The flag
+        is_termination_date can be a boolean or an array of booleans.
+
+        Returns a tuple of NumPy arrays of the accrual factors and of the
+        numerators and denominators of the day count, which are the same as
+        those given by year_frac for each set of dates. For ACT_365L with no
+        dts3 the end of the coupon period is taken to be dts2. """
+
+        x1 = _to_excel_dts(dts1)
+        x2 = _to_excel_dts(dts2)
+
+        if dts3 is None:
+            x1, x2 = np.broadcast_arrays(x1, x2)
+            x3 = None
+        else:
+            x3 = _to_excel_dts(dts3)
+            x1, x2, x3 = np.broadcast_arrays(x1, x2, x3)
+
+        is_term_dt = np.broadcast_to(np.asarray(is_termination_date,
+                                                dtype=bool), x1.shape)
+
+        # The day, month and year ignore any intraday part of the date
+        d1, m1, y1 = excel_dts_to_dmy(np.floor(x1))
+        d2, m2, y2 = excel_dts_to_dmy(np.floor(x2))
+
+        act = x2 - x1
+
+        if self._type == DayCountTypes.THIRTY_360_BOND:
+
+            d1 = np.where(d1 == 31, 30, d1)
+            d2 = np.where((d2 == 31) & (d1 == 30), 30, d2)
+
+        elif self._type == DayCountTypes.THIRTY_E_360:
+
+            d1 = np.where(d1 == 31, 30, d1)
+            d2 = np.where(d2 == 31, 30, d2)
+
+        elif self._type == DayCountTypes.THIRTY_E_360_ISDA:
+
+            last_day_of_feb1 = (m1 == 2) & \
+                (d1 == np.where(_is_leap_years(y1), 29, 28))
+            last_day_of_feb2 = (m2 == 2) & \
+                (d2 == np.where(_is_leap_years(y2), 29, 28))
+
+            d1 = np.where((d1 == 31) | last_day_of_feb1, 30, d1)
+            d2 = np.where(d2 == 31, 30, d2)
+            d2 = np.where(last_day_of_feb2 & ~is_term_dt, 30, d2)
+
+        elif self._type == DayCountTypes.THIRTY_E_PLUS_360:
+
+            d1 = np.where(d1 == 31, 30, d1)
+            m2 = np.where(d2 == 31, m2 + 1, m2)
+            d2 = np.where(d2 == 31, 1, d2)
+
+        elif self._type in [DayCountTypes.ACT_ACT_ISDA, DayCountTypes.ZERO]:
+
+            denom1 = np.where(_is_leap_years(y1), 366.0, 365.0)
+            denom2 = np.where(_is_leap_years(y2), 366.0, 365.0)
+
+            day_years_1 = np.trunc(dmy_to_excel_dts(1, 1, y1 + 1) - x1)
+            day_years_2 = np.trunc(x2 - dmy_to_excel_dts(1, 1, y2))
+            year_diff = y2 - y1 - 1.0
+
+            same_year = y1 == y2
+            acc_factor = np.where(same_year, act / denom1,
+                                  day_years_1 / denom1 +
+                                  day_years_2 / denom2 + year_diff)
+            num = np.where(same_year, act, day_years_1 + day_years_2)
+            den = np.where(same_year, denom1, denom1 + denom2)
+            return acc_factor, num, den
+
+        elif self._type == DayCountTypes.ACT_ACT_ICMA:
+
+            freq = annual_frequency(freq_type)
+
+            if x3 is None or freq is None:
+                raise FinError("ACT_ACT_ICMA requires three dates and a freq")
+
+            num = act
+            den = freq * (x3 - x1)
+            return num / den, num, den
+
+        elif self._type in [DayCountTypes.ACT_365F, DayCountTypes.ACT_360,
+                            DayCountTypes.SIMPLE]:
+
+            if self._type == DayCountTypes.ACT_365F:
+                den = np.full(act.shape, 365.0)
+            elif self._type == DayCountTypes.ACT_360:
+                den = np.full(act.shape, 360.0)
+            else:
+                den = np.full(act.shape, g_days_in_year)
+
+            return act / den, act, den
+
+        elif self._type == DayCountTypes.ACT_365L:
+
+            frequency = annual_frequency(freq_type)
+
+            if x3 is None:
+                x3 = x2
+                y3 = y2
+            else:
+                y3 = excel_dts_to_dmy(np.floor(x3))[2]
+
+            is_leap1 = _is_leap_years(y1)
+            is_leap3 = _is_leap_years(y3)
+
+            # Where neither year is a leap year feb29 is 1 Jan 1900
+            feb29 = np.where(is_leap1, dmy_to_excel_dts(29, 2, y1),
+                             np.where(is_leap3, dmy_to_excel_dts(29, 2, y3),
+                                      1))
+
+            if frequency == 1:
+                den = np.where((feb29 > x1) & (feb29 <= x3), 366.0, 365.0)
+            else:
+                den = np.where(is_leap3, 366.0, 365.0)
+
+            return act / den, act, den
+
+        else:
+
+            raise FinError(str(self._type) +
+                           " is not one of DayCountTypes")
+
+        # All of the 30/360 conventions end up here
+        num = (360 * (y2 - y1) + 30 * (m2 - m1) + (d2 - d1)).astype(float)
+        den = np.full(num.shape, 360.0)
+        return num / den, num, den
+
 ###############################################################################
 
     def __repr__(self):
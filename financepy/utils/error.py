@@ -9,16 +9,19 @@
 import traceback
 import sys
 
-# iPython dependency is only loaded if required.
+# iPython dependency is only loaded if required. If we are running inside
+# iPython it has already been imported so there is no cost in using it.
 
 IPYTHON = None
+ipython = None
 
-try:
-    from IPython import get_ipython
+if "IPython" in sys.modules:
+    try:
+        from IPython import get_ipython
 
-    ipython = get_ipython()
-except Exception:
-    pass
+        ipython = get_ipython()
+    except Exception:
+        pass
 
 
 def _hide_traceback(
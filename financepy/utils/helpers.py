@@ -7,9 +7,8 @@ from typing import Union
 
 import numpy as np
 from numba import njit, float64
-from prettytable import PrettyTable
 
-from .date import Date
+from .date import Date, DateArray
 from .global_vars import g_days_in_year, g_small
 from .error import FinError
 from .day_count import DayCountTypes, DayCount
@@ -79,13 +78,14 @@ def pv01_times(t: float,
 ###############################################################################
 
 
-def times_from_dates(dt: (Date, list),
+def times_from_dates(dt: (Date, list, DateArray),
                      value_dt: Date,
                      day_count_type: DayCountTypes = None):
     """ If a single date is passed in then return the year from valuation date
     but if a whole vector of dates is passed in then convert to a vector of
     times from the valuation date. The output is always a numpy vector of times
-    which has only one element if the input is only one date. """
+    which has only one element if the input is only one date. A DateArray is
+    converted without creating any Date objects if no day count is given. """
 
     if isinstance(value_dt, Date) is False:
         raise FinError("Valuation date is not a Date")
@@ -106,16 +106,17 @@ def times_from_dates(dt: (Date, list),
         return times[0]
 
     elif isinstance(dt, list) and isinstance(dt[0], Date):
-        num_dts = len(dt)
-        times = []
-        for i in range(0, num_dts):
-            if dc_counter is None:
-                t = (dt[i] - value_dt) / g_days_in_year
-            else:
-                t = dc_counter.year_frac(value_dt, dt[i])[0]
-            times.append(t)
+        if dc_counter is None:
+            excel_dts = np.array([d.excel_dt for d in dt])
+            return (excel_dts - value_dt.excel_dt) / g_days_in_year
+
+        return dc_counter.year_frac_array(value_dt, dt)[0]
+
+    elif isinstance(dt, DateArray):
+        if dc_counter is None:
+            return (dt - value_dt) / g_days_in_year
 
-        return np.array(times)
+        return dc_counter.year_frac_array(value_dt, dt)[0]
 
     elif isinstance(dt, np.ndarray):
 
@@ -213,12 +214,13 @@ def print_tree(array: np.ndarray,
 ###############################################################################
 
 
-def input_time(dt: Date,
+def input_time(dt: (float, Date, list, DateArray, np.ndarray),
                curve):
     """ Validates a time input in relation to a curve. If it is a float then
     it returns a float as long as it is positive. If it is a Date then it
-    converts it to a float. If it is a Numpy array then it returns the array
-    as long as it is all positive. """
+    converts it to a float. A list of dates or a DateArray is converted to an
+    array of times. If it is a Numpy array then it returns the array as long
+    as it is all positive. """
 
     small = 1e-8
 
@@ -236,6 +238,12 @@ def input_time(dt: Date,
     elif isinstance(dt, Date):
         t = (dt - curve.value_dt) / g_days_in_year
         return check(t)
+    elif isinstance(dt, (list, DateArray)):
+        t = times_from_dates(dt, curve.value_dt)
+        if np.any(t < 0.0):
+            raise FinError("Date is before curve value date.")
+        t = np.maximum(small, t)
+        return t
     elif isinstance(dt, np.ndarray):
         t = dt
         if np.any(t) < 0:
@@ -371,6 +379,9 @@ def format_table(header: (list, tuple),
     Similar to "table_to_string", but using a wrapper
     around PrettyTable to get a nice formatting. """
 
+    # Only imported when a table is printed as it is slow to import
+    from prettytable import PrettyTable
+
     t = PrettyTable(header)
     num_rows = len(header)
 
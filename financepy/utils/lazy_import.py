@@ -0,0 +1,166 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+import ast
+import importlib
+import sys
+from os.path import dirname, exists, join
+
+###############################################################################
+# A package that used to wildcard import all of its modules in its __init__
+# can instead use lazy_package so that a module is only imported when one of
+# its names is first used. This avoids paying for numba, scipy and other
+# imports of modules that are never used.
+###############################################################################
+
+
+def _add_names(stmts: list, defined: list, imported: list):
+    """ Add the names bound by a list of top level statements to the list of
+    names defined by the module or imported into it. """
+
+    for stmt in stmts:
+
+        if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef,
+                             ast.ClassDef)):
+            defined.append(stmt.name)
+
+        elif isinstance(stmt, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = stmt.targets if isinstance(stmt, ast.Assign) \
+                else [stmt.target]
+            for target in targets:
+                for node in ast.walk(target):
+                    if isinstance(node, ast.Name):
+                        defined.append(node.id)
+
+        elif isinstance(stmt, (ast.Import, ast.ImportFrom)):
+            for alias in stmt.names:
+                if alias.asname is not None:
+                    imported.append(alias.asname)
+                else:
+                    imported.append(alias.name.split(".")[0])
+
+        elif isinstance(stmt, (ast.If, ast.For, ast.While, ast.With,
+                               ast.Try)):
+            _add_names(stmt.body, defined, imported)
+            _add_names(getattr(stmt, "orelse", []), defined, imported)
+            _add_names(getattr(stmt, "finalbody", []), defined, imported)
+            for handler in getattr(stmt, "handlers", []):
+                _add_names(handler.body, defined, imported)
+
+###############################################################################
+
+
+def _module_names(file_name: str):
+    """ Parse a module file without importing it and return the public
+    names which it defines and those which it imports. """
+
+    with open(file_name, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), file_name)
+
+    defined = []
+    imported = []
+    _add_names(tree.body, defined, imported)
+
+    defined = [name for name in defined if name.startswith("_") is False]
+    imported = [name for name in imported if name.startswith("_") is False]
+    return defined, imported
+
+###############################################################################
+
+
+def lazy_package(package_name: str,
+                 package_file: str,
+                 module_names: list):
+    """ Returns the module level __getattr__ and __dir__ functions for a
+    package which exposes the public names of the listed modules in the same
+    way as a wildcard import of each of them in turn. A module is imported
+    when one of its names is first accessed. Names defined in a module are
+    preferred to names it imports so that, for example, Date is loaded from
+    the date module alone. A wildcard import of the package imports all of
+    the modules as before. """
+
+    package_dir = dirname(package_file)
+    index = {}
+
+    def _build_index():
+        """ Map each name to the last module that defines it or, if no module
+        defines it, to the last module that imports it. """
+
+        defined_in = {}
+        imported_in = {}
+
+        for module_name in module_names:
+            file_name = join(package_dir, module_name + ".py")
+
+            if exists(file_name) is False:
+                continue
+
+            defined, imported = _module_names(file_name)
+
+            for name in defined:
+                defined_in[name] = module_name
+
+            for name in imported:
+                imported_in[name] = module_name
+
+        index.update(imported_in)
+        index.update(defined_in)
+
+        # Module names always refer to the module and not to a name in it
+        for module_name in module_names:
+            index.pop(module_name, None)
+
+    def _import_all():
+        """ Import every module and copy its public names into the package
+        in order, exactly as the wildcard imports used to do. """
+
+        package = sys.modules[package_name]
+        all_names = {}
+
+        for module_name in module_names:
+            module = importlib.import_module("." + module_name, package_name)
+            for name, value in module.__dict__.items():
+                if name.startswith("_") is False and \
+                        name not in module_names:
+                    all_names[name] = value
+
+        package.__dict__.update(all_names)
+        return list(all_names) + list(module_names)
+
+    def __getattr__(name: str):
+
+        if name == "__all__":
+            all_names = _import_all()
+            sys.modules[package_name].__all__ = all_names
+            return all_names
+
+        if name in module_names:
+            return importlib.import_module("." + name, package_name)
+
+        if len(index) == 0:
+            _build_index()
+
+        module_name = index.get(name)
+
+        if module_name is not None:
+            module = importlib.import_module("." + module_name, package_name)
+            if hasattr(module, name):
+                value = getattr(module, name)
+                setattr(sys.modules[package_name], name, value)
+                return value
+
+        raise AttributeError("module " + package_name +
+                             " has no attribute " + name)
+
+    def __dir__():
+
+        if len(index) == 0:
+            _build_index()
+
+        package = sys.modules[package_name]
+        return sorted(set(package.__dict__) | set(index) | set(module_names))
+
+    return __getattr__, __dir__
+
+###############################################################################
@@ -15,7 +15,7 @@ import numba
 ###############################################################################
 
 
-@numba.njit("f8[:,:](f8[:], i8)")
+@numba.njit("f8[:,:](f8[:], i8)", cache=True)
 def _coeff_mat(x, deg):
     mat = np.zeros(shape=(x.shape[0], deg + 1))
     c = np.ones_like(x)
@@ -30,7 +30,7 @@ def _coeff_mat(x, deg):
 ###############################################################################
 
 
-@numba.njit("f8[:](f8[:,:], f8[:])")
+@numba.njit("f8[:](f8[:,:], f8[:])", cache=True)
 def _fit_x(a, b):
     # linalg solves ax = b
     det = np.linalg.lstsq(a, b)[0]
@@ -40,7 +40,7 @@ def _fit_x(a, b):
 ###############################################################################
 
 
-@numba.njit("f8[:](f8[:], f8[:], i8)")
+@numba.njit("f8[:](f8[:], f8[:], i8)", cache=True)
 def fit_poly(x, y, deg):
     a = _coeff_mat(x, deg)
     p = _fit_x(a, y)
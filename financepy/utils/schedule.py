@@ -2,10 +2,13 @@
 # Copyright (C) 2018, 2019, 2020 Dominic O'Kane
 ##############################################################################
 
+from collections import OrderedDict
+
+import numpy as np
 
 from .error import FinError
-from .date import Date
-from .calendar import Calendar, CalendarTypes
+from .date import Date, DateArray
+from .calendar import Calendar, CalendarTypes, JointCalendar
 from .calendar import BusDayAdjustTypes, DateGenRuleTypes
 from .frequency import annual_frequency, FrequencyTypes
 from .helpers import label_to_string
@@ -17,6 +20,121 @@ from .helpers import check_argument_types
 ###############################################################################
 
 
+class ScheduleCache:
+    """A bounded least-recently-used cache of schedules keyed on the inputs
+    that determine the adjusted dates. Each entry is a read-only array of the
+    Excel serial dates of the schedule. It records the number of hits and
+    misses so that its effectiveness can be monitored."""
+
+    def __init__(self, max_size: int):
+        """Create an empty cache holding at most max_size schedules."""
+
+        if max_size < 1:
+            raise FinError("Schedule cache size must be at least 1")
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    ###########################################################################
+
+    def get(self, key: tuple):
+        """Returns the Excel serial dates for this key or None if they are
+        not in the cache."""
+
+        excel_dts = self._entries.get(key)
+
+        if excel_dts is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+        return excel_dts
+
+    ###########################################################################
+
+    def put(self, key: tuple, excel_dts: np.ndarray):
+        """Store the Excel serial dates for a key, evicting the least recently
+        used schedule if the cache is full."""
+
+        excel_dts = np.array(excel_dts, dtype=np.int32)
+        excel_dts.flags.writeable = False
+
+        self._entries[key] = excel_dts
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+        return excel_dts
+
+    ###########################################################################
+
+    def clear(self):
+        """Remove all schedules and reset the hit and miss counts."""
+
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    ###########################################################################
+
+    def __len__(self):
+        return len(self._entries)
+
+    ###########################################################################
+
+    def __repr__(self):
+        s = label_to_string("OBJECT TYPE", type(self).__name__)
+        s += label_to_string("MAX SIZE", self.max_size)
+        s += label_to_string("SIZE", len(self))
+        s += label_to_string("HITS", self.hits)
+        s += label_to_string("MISSES", self.misses, "")
+        return s
+
+
+###############################################################################
+# The schedule cache is switched off unless it is enabled by the user
+###############################################################################
+
+g_schedule_cache = None
+
+
+def enable_schedule_cache(max_size: int = 10000):
+    """Cache the adjusted dates of up to max_size schedules so that trades
+    with the same schedule inputs do not regenerate them. Any existing cache
+    and its statistics are discarded."""
+
+    global g_schedule_cache
+    g_schedule_cache = ScheduleCache(max_size)
+    return g_schedule_cache
+
+
+def disable_schedule_cache():
+    """Switch off and discard the schedule cache."""
+
+    global g_schedule_cache
+    g_schedule_cache = None
+
+
+def schedule_cache_info():
+    """Returns a dictionary with the hits, misses, size and maximum size of
+    the schedule cache or None if it is not enabled."""
+
+    if g_schedule_cache is None:
+        return None
+
+    return {"hits": g_schedule_cache.hits,
+            "misses": g_schedule_cache.misses,
+            "size": len(g_schedule_cache),
+            "max_size": g_schedule_cache.max_size}
+
+
+###############################################################################
+
+
 class Schedule:
     """A schedule is a set of dates generated according to ISDA standard
     rules which starts on the next date after the effective date and runs up to
@@ -30,7 +148,7 @@ class Schedule:
         # This is UNADJUSTED (set flag to adjust it)
         termination_dt: Date,
         freq_type: FrequencyTypes = FrequencyTypes.ANNUAL,
-        cal_type: CalendarTypes = CalendarTypes.WEEKEND,
+        cal_type: (CalendarTypes, JointCalendar) = CalendarTypes.WEEKEND,
         bd_type: BusDayAdjustTypes = BusDayAdjustTypes.FOLLOWING,
         dg_type: DateGenRuleTypes = DateGenRuleTypes.BACKWARD,
         adjust_termination_dt: bool = True,  # Default is to adjust
@@ -121,6 +239,7 @@ class Schedule:
             self.end_of_month = False
 
         self.adjusted_dts = None
+        self.adjusted_excel_dts = None
 
         self.generate()
 
@@ -136,74 +255,126 @@ class Schedule:
 
     ###########################################################################
 
+    def schedule_excel_dts(self):
+        """Returns a read-only array of the Excel serial dates of the
+        schedule."""
+
+        if self.adjusted_dts is None:
+            self.generate()
+
+        if self.adjusted_excel_dts is None:
+            dts = DateArray.from_dates(self.adjusted_dts)
+            self.adjusted_excel_dts = dts.excel_dts
+
+        return self.adjusted_excel_dts
+
+    ###########################################################################
+
     def generate(self):
         """Generate schedule of dates according to specified date generation
         rules and also adjust these dates for holidays according to the
-        specified business day convention and the specified calendar."""
+        specified business day convention and the specified calendar. If the
+        schedule cache is enabled the dates are taken from it when possible.
+        """
+
+        key = self._cache_key()
+
+        if key is None:
+            self.adjusted_excel_dts = None
+            return self._generate()
+
+        excel_dts = g_schedule_cache.get(key)
+
+        if excel_dts is None:
+            self._generate()
+            excel_dts = DateArray.from_dates(self.adjusted_dts).excel_dts
+            excel_dts = g_schedule_cache.put(key, excel_dts)
+        else:
+            self.adjusted_dts = DateArray(excel_dts).to_dates()
+            if self.adjust_termination_dt is True:
+                self.termination_dt = self.adjusted_dts[-1]
+
+        self.adjusted_excel_dts = excel_dts
+        return self.adjusted_dts
+
+    ###########################################################################
+
+    def _cache_key(self):
+        """Key of the schedule in the schedule cache. This is None if the
+        cache is not enabled or if the dates have a time of day as these
+        would not survive the conversion to Excel serial dates."""
+
+        if g_schedule_cache is None:
+            return None
+
+        eff_excel_dt = self.effective_dt.excel_dt
+        term_excel_dt = self.termination_dt.excel_dt
+
+        if eff_excel_dt % 1 != 0 or term_excel_dt % 1 != 0:
+            return None
+
+        return (int(eff_excel_dt), int(term_excel_dt), self.freq_type,
+                self.cal_type, self.bd_type, self.dg_type,
+                self.adjust_termination_dt, self.end_of_month)
+
+    ###########################################################################
+
+    def _generate(self):
+        """Generate the adjusted schedule dates from the schedule inputs."""
 
         calendar = Calendar(self.cal_type)
         frequency = annual_frequency(self.freq_type)
         num_months = int(12 / frequency)
 
-        unadjusted_schedule_dts = []
         self.adjusted_dts = []
 
-        if self.dg_type == DateGenRuleTypes.BACKWARD:
-
-            next_dt = self.termination_dt
-            flow_num = 0
+        # The unadjusted dates are all generated in one vectorised step from
+        # the number of periods needed to span the effective date
+        num_periods = self._num_periods_spanned(num_months)
+        period_months = num_months * np.arange(0, num_periods + 1)
 
-            while next_dt > self.effective_dt:
-
-                unadjusted_schedule_dts.append(next_dt)
-                tot_num_months = num_months * (1 + flow_num)
-                next_dt = self.termination_dt.add_months(-tot_num_months)
+        if self.dg_type == DateGenRuleTypes.BACKWARD:
 
-                if self.end_of_month is True:
-                    next_dt = next_dt.eom()
+            grid_dts = DateArray.from_dates(self.termination_dt)
+            grid_dts = grid_dts.add_months(-period_months)
 
-                flow_num += 1
+            if self.end_of_month is True:
+                eom_dts = grid_dts.eom().excel_dts
+                grid_dts = DateArray(np.concatenate(([grid_dts.excel_dts[0]],
+                                                     eom_dts[1:])))
 
-            # Add on the Previous Coupon Date
-            unadjusted_schedule_dts.append(next_dt)
-            flow_num += 1
+            # Keep dates after the effective date and the Previous Coupon Date
+            flow_num = int(np.argmax(grid_dts <= self.effective_dt)) + 1
 
             # reverse order and holiday adjust dates
             # the first date is not adjusted as this was provided
-            dt = unadjusted_schedule_dts[flow_num - 1]
+            dt = grid_dts[flow_num - 1]
             self.adjusted_dts.append(dt)
 
             # We adjust all flows after the effective date and before the
             # termination date to fall on business days according to their cal
-            for i in range(1, flow_num - 1):
-                dt = calendar.adjust(
-                    unadjusted_schedule_dts[flow_num - i - 1], self.bd_type
-                )
-
-                self.adjusted_dts.append(dt)
+            flow_dts = grid_dts[flow_num - 2:0:-1]
+            flow_dts = calendar.adjust_array(flow_dts, self.bd_type)
+            self.adjusted_dts += flow_dts.to_dates()
 
             self.adjusted_dts.append(self.termination_dt)
 
         elif self.dg_type == DateGenRuleTypes.FORWARD:
 
             # This needs checking
-            next_dt = self.effective_dt
-            flow_num = 0
-
-            unadjusted_schedule_dts.append(next_dt)
-            flow_num = 1
+            grid_dts = DateArray.from_dates(self.effective_dt)
+            grid_dts = grid_dts.add_months(period_months)
 
-            while next_dt < self.termination_dt:
-                unadjusted_schedule_dts.append(next_dt)
-                tot_num_months = num_months * (flow_num)
-                next_dt = self.effective_dt.add_months(tot_num_months)
-                flow_num = flow_num + 1
+            # Keep the dates before the termination date. The effective date
+            # is held twice, the first as the schedule start date.
+            num_flows = int(np.argmax(grid_dts >= self.termination_dt))
 
-            # The effective date is not adjusted as it is given
-            for i in range(1, flow_num):
-                dt = calendar.adjust(unadjusted_schedule_dts[i], self.bd_type)
+            dt = calendar.adjust(self.effective_dt, self.bd_type)
+            self.adjusted_dts.append(dt)
 
-                self.adjusted_dts.append(dt)
+            flow_dts = calendar.adjust_array(grid_dts[1:num_flows],
+                                             self.bd_type)
+            self.adjusted_dts += flow_dts.to_dates()
 
             self.adjusted_dts.append(self.termination_dt)
 
@@ -248,6 +419,24 @@ class Schedule:
 
     ###########################################################################
 
+    def _num_periods_spanned(self, num_months: int):
+        """Number of periods of num_months needed to step from one end of the
+        schedule past the other, plus one to allow for month end rolls."""
+
+        eff_dt = self.effective_dt
+        term_dt = self.termination_dt
+        months = (term_dt.y - eff_dt.y) * 12 + (term_dt.m - eff_dt.m)
+        return months // num_months + 2
+
+    ###########################################################################
+
+    def schedule_dts_array(self):
+        """Returns the schedule of Dates as a DateArray."""
+
+        return DateArray(self.schedule_excel_dts())
+
+    ###########################################################################
+
     def __repr__(self):
         """Print out the details of the schedule and the actual dates. This
         can be used for providing transparency on schedule calculations."""
@@ -0,0 +1,275 @@
+##############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+##############################################################################
+
+import importlib
+import os
+import pkgutil
+import time
+
+import numpy as np
+
+###############################################################################
+# Numba compiles a kernel when its module is imported if the kernel has an
+# explicit signature, or otherwise the first time that it is called with new
+# argument types. Kernels marked cache=True are written to an on-disk cache so
+# that later processes load them instead of compiling them again. The warmup
+# function does all of this work up front, for example when a service starts,
+# and reports the time spent compiling each kernel.
+###############################################################################
+
+
+def set_numba_cache_dir(cache_dir: str):
+    """ Set the folder in which numba stores the compiled kernels. This only
+    applies to modules imported after the call. To use the same folder for
+    every module, set the environment variable FINANCEPY_NUMBA_CACHE_DIR
+    before financepy is first imported. """
+
+    import numba
+
+    os.makedirs(cache_dir, exist_ok=True)
+    os.environ["NUMBA_CACHE_DIR"] = cache_dir
+    numba.config.CACHE_DIR = cache_dir
+
+###############################################################################
+
+
+def _import_all_modules():
+    """ Import every public financepy module. This compiles, or loads from the
+    cache, every kernel that has an explicit signature. Some legacy modules
+    cannot be imported and these are skipped. """
+
+    import financepy
+
+    modules = []
+
+    for module_info in pkgutil.walk_packages(financepy.__path__,
+                                             "financepy."):
+
+        if module_info.name.split(".")[-1].startswith("_"):
+            continue
+
+        try:
+            modules.append(importlib.import_module(module_info.name))
+        except ImportError:
+            continue
+
+    return modules
+
+###############################################################################
+
+
+def _warmup_equity_kernels():
+    """ Call the equity kernels that are compiled for the argument types of
+    their first call. """
+
+    from ..models.black_scholes_analytic import baw_value
+    from ..models.black_scholes_analytic import bjerksund_stensland_value
+    from ..models.gbm_process_simulator import get_paths_times
+    from ..models.gbm_process_simulator import get_assets_paths
+    from ..models.gbm_process_simulator import get_assets_paths_times
+    from ..models.sobol import get_gaussian_sobol
+    from .global_types import OptionTypes
+
+    for phi in [+1, -1]:
+        baw_value(100.0, 1.0, 100.0, 0.05, 0.02, 0.20, phi)
+
+    for option_type in [OptionTypes.AMERICAN_CALL, OptionTypes.AMERICAN_PUT]:
+        bjerksund_stensland_value(100.0, 1.0, 100.0, 0.05, 0.02, 0.20,
+                                  option_type.value)
+
+    get_paths_times(10, 4, 1.0, 0.03, 100.0, 0.20, 42)
+
+    mus = np.array([0.03, 0.03])
+    stock_prices = np.array([100.0, 100.0])
+    volatilities = np.array([0.20, 0.30])
+    corr_matrix = np.array([[1.0, 0.5], [0.5, 1.0]])
+
+    get_assets_paths(2, 10, 1.0, mus, stock_prices, volatilities,
+                     corr_matrix, 42)
+
+    get_assets_paths_times(2, 10, 4, 1.0, mus, stock_prices, volatilities,
+                           corr_matrix, 42)
+
+    get_gaussian_sobol(10, 1)
+
+###############################################################################
+
+
+def _warmup_sabr_kernels():
+    """ Call the SABR kernels that are compiled for the argument types of
+    their first call. """
+
+    from ..models.sabr import _x as sabr_x
+    from ..models.sabr_shifted import _x as sabr_shifted_x
+    from ..models.sabr_shifted import vol_function_shifted_sabr
+
+    sabr_x(-0.3, 0.1)
+    sabr_shifted_x(-0.3, 0.1)
+
+    params = np.array([0.03, 0.5, -0.3, 0.40, 0.01])
+    vol_function_shifted_sabr(params, 0.03, 0.035, 1.0)
+
+###############################################################################
+
+
+def _warmup_tree_kernels():
+    """ Build a small Hull-White, Black-Karasinski and Black-Derman-Toy tree
+    and value a bond option, a Bermudan swaption and a callable bond on them
+    so that the tree kernels are compiled. """
+
+    from ..models.hw_tree import HWTree
+    from ..models.bk_tree import BKTree
+    from ..models.bdt_tree import BDTTree
+    from .global_types import FinExerciseTypes
+
+    df_times = np.array([0.0, 1.0, 2.0, 3.0])
+    df_values = np.exp(-0.03 * df_times)
+
+    cpn_times = np.array([1.0, 2.0, 3.0])
+    cpn_flows = np.array([0.05, 0.05, 1.05])
+
+    call_times = np.array([1.0, 2.0])
+    call_prices = np.array([100.0, 100.0])
+    put_times = np.array([2.0])
+    put_prices = np.array([98.0])
+
+    models = [HWTree(0.01, 0.05, 10),
+              BKTree(0.20, 0.05, 10),
+              BDTTree(0.20, 10)]
+
+    for model in models:
+
+        model.build_tree(3.0, df_times, df_values)
+
+        model.bond_option(1.0, 100.0, 100.0, cpn_times, cpn_flows,
+                          FinExerciseTypes.AMERICAN)
+
+        model.bermudan_swaption(1.0, 3.0, 100.0, 100.0, cpn_times,
+                                cpn_flows, FinExerciseTypes.BERMUDAN)
+
+    # A piecewise constant volatility builds a Hull-White tree with steps
+    # that land on the coupon times
+    model = HWTree(np.array([0.01, 0.012]), 0.05, 10,
+                   sigma_times=np.array([1.0, 3.0]))
+    model.build_tree(3.0, df_times, df_values, cpn_times)
+
+    # The Black-Derman-Toy tree does not yet value callable bonds
+    for model in models[0:2]:
+
+        model.callable_puttable_bond_tree(cpn_times, cpn_flows,
+                                          call_times, call_prices,
+                                          put_times, put_prices, 100.0)
+
+###############################################################################
+
+# Kernels without a signature are compiled the first time they are called so
+# these functions call the hot ones with representative argument types
+_warmup_calls = [_warmup_equity_kernels,
+                 _warmup_sabr_kernels,
+                 _warmup_tree_kernels]
+
+###############################################################################
+
+
+def _kernel_dispatchers(modules: list):
+    """ Return the numba dispatcher of every kernel defined in the modules. A
+    vectorized kernel is found through the dispatcher that it wraps. """
+
+    from numba.core.dispatcher import Dispatcher
+    from numba.np.ufunc.dufunc import DUFunc
+
+    dispatchers = {}
+
+    for module in modules:
+        for value in module.__dict__.values():
+
+            if isinstance(value, DUFunc):
+                value = value._dispatcher
+
+            if isinstance(value, Dispatcher) is False:
+                continue
+
+            py_func = value.py_func
+
+            if py_func.__module__ != module.__name__:
+                continue
+
+            name = py_func.__module__ + "." + py_func.__qualname__
+            dispatchers[name[len("financepy."):]] = value
+
+    return dispatchers
+
+###############################################################################
+
+
+def _compile_report(dispatchers: dict):
+    """ Return a dictionary with the status and compile time in seconds of
+    each kernel that has been compiled or loaded from the cache. The time
+    for a kernel includes the time taken to compile the kernels it calls. """
+
+    report = {}
+
+    for name, dispatcher in sorted(dispatchers.items()):
+
+        overloads = list(dispatcher.overloads.values())
+
+        if len(overloads) == 0:
+            continue
+
+        seconds = 0.0
+        status = "CACHED"
+
+        for overload in overloads:
+            # The metadata of an overload loaded from the cache is empty
+            if overload.metadata is not None:
+                seconds += overload.metadata["timers"]["compiler_lock"]
+                status = "COMPILED"
+
+        report[name] = (status, seconds)
+
+    return report
+
+###############################################################################
+
+
+def warmup(cache_dir: str = None,
+           verbose: bool = True):
+    """ Compile, or load from the numba cache, all of the financepy kernels
+    so that later calls do not pay for compilation. All of the modules are
+    imported and the hot kernels which are compiled on their first call are
+    called with representative arguments. If a cache folder is given then it
+    is used for all of the modules not already imported. Returns a dictionary
+    which maps each kernel name to its status, COMPILED or CACHED, and its
+    compile time in seconds. This is also printed if verbose is True. """
+
+    if cache_dir is not None:
+        set_numba_cache_dir(cache_dir)
+
+    start = time.perf_counter()
+
+    modules = _import_all_modules()
+
+    for warmup_call in _warmup_calls:
+        warmup_call()
+
+    report = _compile_report(_kernel_dispatchers(modules))
+
+    elapsed = time.perf_counter() - start
+
+    if verbose:
+
+        num_compiled = 0
+
+        for name, (status, seconds) in report.items():
+            print("%-70s %-8s %9.4f" % (name, status, seconds))
+            if status == "COMPILED":
+                num_compiled += 1
+
+        print("Kernels: %d  Compiled: %d  Cached: %d  Warmup time: %.2fs" %
+              (len(report), num_compiled, len(report) - num_compiled,
+               elapsed))
+
+    return report
+
+###############################################################################
@@ -0,0 +1,63 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+import os
+import subprocess
+import sys
+
+sys.path.append("..")
+
+from FinTestCases import FinTestCases, globalTestCaseMode
+
+test_cases = FinTestCases(__file__, globalTestCaseMode)
+
+###############################################################################
+# Each import is timed in a new Python process so that nothing is already
+# loaded. The numba cache is warmed by a first untimed import.
+###############################################################################
+
+import_statements = [
+    "import financepy",
+    "import financepy.utils",
+    "from financepy.utils import Date",
+    "from financepy.utils.schedule import Schedule",
+    "from financepy.market.curves import DiscountCurveFlat",
+    "from financepy.products.rates import IborSwap",
+    "from financepy.products.credit import CDS",
+    "from financepy.utils import *",
+]
+
+
+def time_import(statement):
+
+    code = "import time\n"
+    code += "start = time.perf_counter()\n"
+    code += statement + "\n"
+    code += "print(time.perf_counter() - start)\n"
+
+    env = dict(os.environ, FINANCEPY_QUIET="1")
+    root_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "..")
+
+    output = subprocess.run([sys.executable, "-c", code], env=env,
+                            cwd=root_folder, capture_output=True, text=True,
+                            check=True)
+
+    return float(output.stdout.split()[-1])
+
+
+def test_import_time():
+
+    test_cases.header("IMPORT", "TIME")
+
+    for statement in import_statements:
+        time_import(statement)
+        period = time_import(statement)
+        test_cases.print(statement, period)
+
+###############################################################################
+
+
+test_import_time()
+test_cases.compareTestCases()
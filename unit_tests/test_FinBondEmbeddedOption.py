@@ -2,6 +2,8 @@
 # Copyright (C) 2018, 2019, 2020 Dominic O'Kane
 ###############################################################################
 
+import numpy as np
+
 from financepy.utils.date import Date
 from financepy.utils.frequency import FrequencyTypes
 from financepy.utils.day_count import DayCountTypes
@@ -12,6 +14,7 @@ from financepy.products.rates.ibor_single_curve import IborSingleCurve
 from financepy.market.curves.discount_curve_flat import DiscountCurveFlat
 from financepy.products.bonds.bond import Bond
 from financepy.products.bonds.bond_callable import BondEmbeddedOption
+from financepy.products.bonds.bond_callable_book import BondEmbeddedOptionBook
 from financepy.utils.global_types import SwapTypes
 
 from financepy.models.bk_tree import BKTree
@@ -178,3 +181,58 @@ def test_quantlib_hw():
 
     assert round(v["bondwithoption"], 4) == 68.8665
     assert round(v["bondpure"], 4) == 95.0619
+
+
+def test_book_rolled_back_together():
+
+    bonds = []
+    for years in [3, 4, 5, 6]:
+        bond_maturity_dt = issue_dt.add_years(years + 6)
+        bond_call_dts = [settle_dt_quantlib.add_months(3 * i + years)
+                         for i in range(1, 8)]
+        bond_put_dts = [settle_dt_quantlib.add_years(2)] if years % 2 else []
+        bonds.append(BondEmbeddedOption(issue_dt,
+                                        bond_maturity_dt,
+                                        coupon + 0.0025 * years,
+                                        freq_type,
+                                        dc_type,
+                                        bond_call_dts,
+                                        [100.0] * len(bond_call_dts),
+                                        bond_put_dts,
+                                        [99.0] * len(bond_put_dts)))
+
+    df_times = discount_curve_quantlib._times
+    df_values = discount_curve_quantlib._dfs
+
+    book = BondEmbeddedOptionBook(bonds)
+
+    for model in [HWTree(0.01, 0.03, num_time_steps),
+                  BKTree(0.25, 0.03, num_time_steps)]:
+
+        values = book.value(settle_dt_quantlib, discount_curve_quantlib,
+                            model)
+        assert values["bondwithoption"].shape == (len(bonds),)
+
+        # The batch matches the single trade rollback on the same tree
+        flows = [bond._tree_cashflows(settle_dt_quantlib) for bond in bonds]
+        t_mat = max(cpn_times[-1] for cpn_times, *_ in flows)
+        model.build_tree(t_mat, df_times, df_values)
+
+        v = model.callable_puttable_bond_batch(
+            *[[f[i] for f in flows] for i in range(0, 6)],
+            [100.0] * len(bonds))
+
+        for i, f in enumerate(flows):
+            v_single = model.callable_puttable_bond_tree(*f, 100.0)
+            assert abs(v["bondwithoption"][i]
+                       - v_single["bondwithoption"]) < 1e-10
+            assert abs(v["bondpure"][i] - v_single["bondpure"]) < 1e-10
+
+        # A book of one bond is valued on the same trees as the bond itself
+        single_book = BondEmbeddedOptionBook([bonds[-1]])
+        v_book = single_book.value(settle_dt_quantlib,
+                                   discount_curve_quantlib, model)
+        v_bond = bonds[-1].value(settle_dt_quantlib,
+                                 discount_curve_quantlib, model)
+        assert np.allclose(v_book["bondwithoption"], v_bond["bondwithoption"])
+        assert np.allclose(v_book["bondpure"], v_bond["bondpure"])
@@ -462,7 +462,7 @@ def test_premium_leg_pv():
     premPV = cds_contract2.premium_leg_pv(
         value_dt2, issuer_curve2, cdsRecovery
     )
-    assert round(premPV, 4) == 247472.5265
+    assert round(premPV, 4) == 247472.5263
 
 
 def test_value_approx():
@@ -172,4 +172,4 @@ def test_heterogeneous():
         corr2,
         num_points,
         method)
-    assert round(v[3] * 10000, 4) == 0.3386
+    assert round(v[3] * 10000, 4) == 0.3385
@@ -3,8 +3,12 @@
 ###############################################################################
 
 from financepy.utils.calendar import Calendar, CalendarTypes
+from financepy.utils.calendar import BusDayAdjustTypes
+from financepy.utils.calendar import JointCalendar, JointCalendarTypes
+from financepy.utils.calendar import set_business_day_year_range
 from financepy.utils.date import set_date_format, DateFormatTypes
-from financepy.utils.date import Date
+from financepy.utils.date import Date, DateArray
+from concurrent.futures import ThreadPoolExecutor
 import sys
 
 # Between 3rd of January 2020 and 3rd of January 2030
@@ -36,3 +40,112 @@ def test_add_business_day():
 
         assert cal.add_business_days(start, num_days) == end, \
             f"Landed on incorrect business day using {cal_type}"
+
+
+def test_business_day_bitmap():
+    start = Date(20, 12, 2023)
+    dts = [start.add_days(i) for i in range(0, 30)]
+    dt_array = DateArray.from_dates(dts)
+
+    for cal_type in [CalendarTypes.UNITED_KINGDOM, CalendarTypes.TARGET,
+                     CalendarTypes.JAPAN]:
+        cal = Calendar(cal_type)
+
+        for dt in dts:
+            assert cal.is_business_day(dt) == \
+                cal._is_business_day_by_rules(dt)
+
+        assert list(cal.is_business_day_array(dt_array)) == \
+            [cal._is_business_day_by_rules(dt) for dt in dts]
+
+        for bd_type in BusDayAdjustTypes:
+            adjusted_dts = [cal._adjust_by_rules(dt, bd_type) for dt in dts]
+            assert [cal.adjust(dt, bd_type) for dt in dts] == adjusted_dts
+            assert cal.adjust_array(dt_array, bd_type).to_dates() == \
+                adjusted_dts
+
+        for num_days in [-3, 0, 1, 5]:
+            new_dts = [cal._add_business_days_by_rules(dt, num_days)
+                       for dt in dts]
+            assert cal.add_business_days_array(dt_array, num_days).to_dates() \
+                == new_dts
+
+
+def test_business_day_bitmap_built_by_block():
+    # Discard the cached bitmaps so that they are built from scratch
+    set_business_day_year_range(1950, 2100)
+
+    cal = Calendar(CalendarTypes.UNITED_KINGDOM)
+    joint_cal = Calendar(JointCalendar([CalendarTypes.UNITED_KINGDOM,
+                                        CalendarTypes.TARGET]))
+    dt = Date(25, 12, 2023)
+
+    assert cal.adjust(dt, BusDayAdjustTypes.FOLLOWING) == Date(27, 12, 2023)
+    excel_dt = int(dt.excel_dt)
+    assert cal.bus_day_bitmap(excel_dt, excel_dt).num_days <= 5 * 366
+
+    # Dates in later years extend the bitmap and keep the earlier years
+    for years in [0, 7, 31]:
+        dts = [dt.add_years(years).add_days(i) for i in range(-10, 10)]
+        for cal_x in [cal, joint_cal]:
+            for bd_type in BusDayAdjustTypes:
+                assert [cal_x.adjust(d, bd_type) for d in dts] == \
+                    [cal_x._adjust_by_rules(d, bd_type) for d in dts]
+
+    assert cal.is_business_day(Date(27, 12, 2023))
+    assert cal.add_business_days(dt, 260 * 3) == \
+        cal._add_business_days_by_rules(dt, 260 * 3)
+
+
+def test_business_day_outside_bitmap():
+    cal = Calendar(CalendarTypes.UNITED_KINGDOM)
+    dt = Date(25, 12, 2150)
+    assert cal.is_business_day(dt) is False
+    assert cal.adjust(dt, BusDayAdjustTypes.FOLLOWING) == Date(29, 12, 2150)
+
+
+def test_joint_calendar():
+    cal_types = [CalendarTypes.UNITED_STATES, CalendarTypes.TARGET]
+    union_cal = Calendar(JointCalendar(cal_types))
+    inter_cal = Calendar(JointCalendar(cal_types,
+                                       JointCalendarTypes.INTERSECTION))
+    us_cal = Calendar(CalendarTypes.UNITED_STATES)
+    target_cal = Calendar(CalendarTypes.TARGET)
+
+    assert JointCalendar(cal_types) == JointCalendar(cal_types[::-1])
+
+    start = Date(1, 1, 2023)
+    for i in range(0, 400):
+        dt = start.add_days(i)
+        is_us = us_cal.is_business_day(dt)
+        is_target = target_cal.is_business_day(dt)
+        assert union_cal.is_business_day(dt) == (is_us and is_target)
+        assert inter_cal.is_business_day(dt) == (is_us or is_target)
+        assert union_cal.is_business_day(dt) == \
+            union_cal._is_business_day_by_rules(dt)
+
+    # 4th July is only a US holiday and Good Friday only a TARGET holiday
+    assert union_cal.adjust(Date(3, 7, 2023),
+                            BusDayAdjustTypes.FOLLOWING) == Date(3, 7, 2023)
+    assert union_cal.adjust(Date(4, 7, 2023),
+                            BusDayAdjustTypes.FOLLOWING) == Date(5, 7, 2023)
+    assert union_cal.adjust(Date(7, 4, 2023),
+                            BusDayAdjustTypes.PRECEDING) == Date(6, 4, 2023)
+    assert inter_cal.adjust(Date(7, 4, 2023),
+                            BusDayAdjustTypes.PRECEDING) == Date(7, 4, 2023)
+    assert len(union_cal.get_holiday_list(2023)) > \
+        len(us_cal.get_holiday_list(2023))
+
+
+def test_calendar_shared_between_threads():
+    cal = Calendar(CalendarTypes.UNITED_KINGDOM)
+    start_dt = Date(1, 1, 2020)
+    dts = [start_dt.add_days(i) for i in range(0, 3 * 365)]
+
+    serial = [cal.is_holiday(dt) for dt in dts]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        threaded = list(executor.map(cal.is_holiday, dts))
+
+    assert threaded == serial
+    assert sum(serial) == 31
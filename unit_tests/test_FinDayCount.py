@@ -90,3 +90,29 @@ def test_year_frace_SIMPLE():
     answer = day_count.year_frac(start, end, end, finFreq)
 
     assert round(answer[0], 4) == 0.3836
+
+
+def test_year_frac_array():
+    dt1s = [Date(1, 1, 2019), Date(31, 1, 2020), Date(28, 2, 2019),
+            Date(29, 2, 2020), Date(15, 6, 2021), Date(31, 12, 2019)]
+    dt2s = [Date(21, 5, 2019), Date(29, 2, 2020), Date(31, 8, 2020),
+            Date(31, 3, 2021), Date(15, 6, 2021), Date(1, 3, 2024)]
+    dt3s = [dt.add_months(6) for dt in dt2s]
+
+    for dc_type in DayCountTypes:
+        day_count = DayCount(dc_type)
+
+        for freq_type in [FrequencyTypes.ANNUAL, FrequencyTypes.QUARTERLY]:
+            answer = day_count.year_frac_array(dt1s, dt2s, dt3s, freq_type)
+
+            for i in range(0, len(dt1s)):
+                expected = day_count.year_frac(dt1s[i], dt2s[i], dt3s[i],
+                                               freq_type)
+                assert answer[0][i] == expected[0]
+                assert answer[1][i] == expected[1]
+                assert answer[2][i] == expected[2]
+
+    # A single start date is broadcast against the end dates
+    day_count = DayCount(DayCountTypes.ACT_360)
+    answer = day_count.year_frac_array(start, dt2s)[0]
+    assert round(answer[0], 4) == 0.3889
@@ -0,0 +1,50 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+import numpy as np
+
+from financepy.utils.date import Date, DateArray
+from financepy.utils.day_count import DayCountTypes
+from financepy.utils.frequency import FrequencyTypes
+from financepy.market.curves.discount_curve import DiscountCurve
+
+
+value_dt = Date(15, 3, 2023)
+years = np.array([0.5, 1.0, 2.0, 5.0, 10.0, 30.0])
+df_dts = [value_dt.add_years(y) for y in years]
+df_values = np.exp(-np.linspace(0.030, 0.045, 6) * years)
+curve = DiscountCurve(value_dt, df_dts, df_values)
+
+dts = [value_dt.add_days(d) for d in range(7, 10000, 97)]
+date_array = DateArray.from_dates(dts)
+
+
+def test_discount_curve_date_array():
+
+    dfs = curve.df(date_array)
+    assert np.array_equal(dfs, curve.df(dts))
+    assert np.array_equal(dfs, [curve.df(dt) for dt in dts])
+
+    for freq_type in [FrequencyTypes.CONTINUOUS, FrequencyTypes.ANNUAL,
+                      FrequencyTypes.SIMPLE]:
+        zero_rates = curve.zero_rate(date_array, freq_type,
+                                     DayCountTypes.THIRTY_E_360)
+        expected = [curve.zero_rate(dt, freq_type, DayCountTypes.THIRTY_E_360)
+                    for dt in dts]
+        assert np.array_equal(zero_rates, expected)
+
+    fwd_rates = curve.fwd_rate(date_array, "3M")
+    expected = [curve.fwd_rate(dt, "3M") for dt in dts]
+    assert np.array_equal(fwd_rates, expected)
+
+    end_dts = date_array.add_days(30)
+    fwd_rates = curve.fwd_rate(date_array, end_dts, DayCountTypes.ACT_365F)
+    expected = [curve.fwd_rate(dt, end_dt, DayCountTypes.ACT_365F)
+                for dt, end_dt in zip(dts, end_dts)]
+    assert np.array_equal(fwd_rates, expected)
+
+    effective_dt = value_dt.add_days(2)
+    swap_rates = curve.swap_rate(effective_dt, date_array[10:20])
+    expected = [curve.swap_rate(effective_dt, dt) for dt in dts[10:20]]
+    assert np.array_equal(swap_rates, np.array(expected).flatten())
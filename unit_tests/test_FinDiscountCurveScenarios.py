@@ -0,0 +1,166 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+import numpy as np
+import pytest
+
+from financepy.utils.date import Date
+from financepy.utils.error import FinError
+from financepy.utils.global_types import SwapTypes
+from financepy.utils.day_count import DayCountTypes
+from financepy.utils.frequency import FrequencyTypes
+from financepy.market.curves.interpolator import InterpTypes
+from financepy.market.curves.discount_curve_scenarios import (
+    DiscountCurveScenarios,
+)
+from financepy.products.rates.ibor_swap import IborSwap
+from financepy.products.rates.ibor_swaption import IborSwaption
+from financepy.models.black import Black
+from financepy.products.rates.swap_book import SwapBook
+
+
+value_dt = Date(6, 10, 2022)
+years = np.array([0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0])
+df_dts = [value_dt.add_years(y) for y in years]
+num_scenarios = 25
+
+# Historical style scenarios of the zero rates around a base curve
+np.random.seed(1972)
+base_rates = np.linspace(0.030, 0.040, len(years))
+shocks = 0.0020 * np.random.standard_normal((num_scenarios, len(years)))
+df_values = np.exp(-(base_rates + shocks) * years)
+
+dts = [value_dt.add_days(d) for d in range(0, 9000, 211)]
+
+
+def test_scenarios_match_curves():
+
+    for interp_type in [InterpTypes.FLAT_FWD_RATES,
+                        InterpTypes.LINEAR_ZERO_RATES,
+                        InterpTypes.LINEAR_FWD_RATES,
+                        InterpTypes.NATCUBIC_LOG_DISCOUNT]:
+
+        curves = DiscountCurveScenarios(value_dt, df_dts, df_values,
+                                        interp_type)
+
+        dfs = curves.df(dts)
+        fwd_rates = curves.fwd_rate(dts, "6M")
+
+        assert dfs.shape == (num_scenarios, len(dts))
+        assert fwd_rates.shape == (num_scenarios, len(dts))
+        assert curves.df(dts[3]).shape == (num_scenarios,)
+
+        for i in range(0, num_scenarios):
+            curve = curves.scenario(i)
+            assert np.allclose(dfs[i], curve.df(dts), rtol=0.0, atol=1e-14)
+            assert np.allclose(fwd_rates[i], curve.fwd_rate(dts, "6M"),
+                               rtol=0.0, atol=1e-12)
+
+
+def test_swaps_value_over_scenarios():
+
+    curves = DiscountCurveScenarios(value_dt, df_dts, df_values)
+    index_curves = curves.bump(0.0010)
+    settle_dt = value_dt.add_days(2)
+
+    swaps = []
+    fixings = []
+    for i in range(0, 10):
+        start_dt = Date(1, 3, 2020).add_days(131 * i)
+        leg_type = SwapTypes.PAY if i % 2 == 0 else SwapTypes.RECEIVE
+        swap = IborSwap(start_dt, f"{2 + i % 5}Y", leg_type,
+                        0.02 + 0.001 * i, FrequencyTypes.ANNUAL,
+                        DayCountTypes.THIRTY_E_360,
+                        notional=1e6 * (i + 1))
+        swaps.append(swap)
+        fixings.append(0.025 if start_dt < settle_dt else np.nan)
+
+    book = SwapBook(swaps)
+
+    for index_curve in [None, index_curves]:
+
+        book_values = book.value(settle_dt, curves, index_curve, fixings)
+        assert book_values.shape == (num_scenarios, len(swaps))
+
+        for k, (swap, fixing) in enumerate(zip(swaps, fixings)):
+            fixing = None if np.isnan(fixing) else fixing
+            # A matured swap has a value of zero for every scenario
+            values = swap.value(settle_dt, curves, index_curve, fixing)
+            values = np.broadcast_to(values, (num_scenarios,))
+            assert np.max(np.abs(values - book_values[:, k])) < 1e-6
+
+            for i in (0, num_scenarios - 1):
+                curve = curves.scenario(i)
+                if index_curve is None:
+                    scenario_index_curve = None
+                else:
+                    scenario_index_curve = curve.bump(0.0010)
+                value = swap.value(settle_dt, curve, scenario_index_curve,
+                                   fixing)
+                assert abs(values[i] - value) < 1e-6
+
+
+def test_rates_over_scenarios():
+
+    curves = DiscountCurveScenarios(value_dt, df_dts, df_values)
+    mat_dts = [value_dt.add_years(y) for y in (2, 5, 10)]
+    start_dt = value_dt.add_days(2)
+
+    zero_rates = curves.zero_rate(dts[1:], FrequencyTypes.SEMI_ANNUAL)
+    cc_rates = curves.cc_rate(dts[1:])
+    fwds = curves.fwd(dts)
+    swap_rates = curves.swap_rate(start_dt, mat_dts)
+
+    assert zero_rates.shape == (num_scenarios, len(dts) - 1)
+    assert swap_rates.shape == (num_scenarios, len(mat_dts))
+    assert curves.zero_rate(dts[5]).shape == (num_scenarios,)
+    assert curves.fwd(dts[5]).shape == (num_scenarios,)
+    assert curves.swap_rate(start_dt, mat_dts[1]).shape == (num_scenarios,)
+
+    for i in (0, 7, num_scenarios - 1):
+        curve = curves.scenario(i)
+        diff = zero_rates[i] - curve.zero_rate(dts[1:],
+                                               FrequencyTypes.SEMI_ANNUAL)
+        assert np.max(np.abs(diff)) < 1e-12
+        assert np.max(np.abs(cc_rates[i] - curve.cc_rate(dts[1:]))) < 1e-12
+        assert np.max(np.abs(fwds[i] - curve.fwd(dts))) < 1e-10
+        diff = swap_rates[i] - curve.swap_rate(start_dt, mat_dts)
+        assert np.max(np.abs(diff)) < 1e-12
+        assert abs(curves.zero_rate(dts[5])[i] - curve.zero_rate(dts[5])) \
+            < 1e-12
+
+
+def test_swap_rate_and_reports_over_scenarios():
+
+    curves = DiscountCurveScenarios(value_dt, df_dts, df_values)
+    settle_dt = value_dt.add_days(2)
+
+    swap = IborSwap(settle_dt, "5Y", SwapTypes.PAY, 0.035,
+                    FrequencyTypes.ANNUAL, DayCountTypes.THIRTY_E_360)
+
+    swap_rates = swap.swap_rate(settle_dt, curves)
+    assert swap_rates.shape == (num_scenarios,)
+
+    for i in (0, num_scenarios - 1):
+        swap_rate = swap.swap_rate(settle_dt, curves.scenario(i))
+        assert abs(swap_rates[i] - swap_rate) < 1e-12
+
+    # Cashflow reports are only for a single curve
+    with pytest.raises(FinError):
+        swap.value(settle_dt, curves, pv_only=False)
+
+    swap.value(settle_dt, curves)
+
+    with pytest.raises(FinError):
+        swap.print_fixed_leg_pv()
+
+    with pytest.raises(FinError):
+        swap.print_float_leg_pv()
+
+    swaption = IborSwaption(settle_dt, settle_dt.add_years(1),
+                            settle_dt.add_years(6), SwapTypes.PAY, 0.035,
+                            FrequencyTypes.ANNUAL, DayCountTypes.THIRTY_E_360)
+
+    with pytest.raises(FinError):
+        swaption.value(settle_dt, curves, Black(0.20))
@@ -0,0 +1,99 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+import numpy as np
+
+from helpers import buildIborSingleCurve
+from financepy.utils.date import Date
+from financepy.utils.global_types import SwapTypes
+from financepy.utils.day_count import DayCountTypes
+from financepy.utils.frequency import FrequencyTypes
+from financepy.market.curves.interpolator import InterpTypes
+from financepy.market.curves.discount_curve import DiscountCurve
+from financepy.market.curves.discount_curve_flat import DiscountCurveFlat
+from financepy.market.curves.discount_curve_shifted import (
+    DiscountCurveShifted,
+)
+from financepy.market.curves.composite_discount_curve import (
+    CompositeDiscountCurve,
+)
+from financepy.products.rates.ibor_swap import IborSwap
+
+
+value_dt = Date(15, 3, 2023)
+years = np.array([0.5, 1.0, 2.0, 5.0, 10.0, 30.0])
+df_dts = [value_dt.add_years(y) for y in years]
+df_values = np.exp(-np.linspace(0.030, 0.045, 6) * years)
+dts = [value_dt.add_days(d) for d in range(7, 10000, 97)]
+
+
+def test_bump_matches_bumped_knots():
+
+    bump = 0.0001
+
+    for interp_type in [InterpTypes.FLAT_FWD_RATES,
+                        InterpTypes.LINEAR_ZERO_RATES]:
+
+        curve = DiscountCurve(value_dt, df_dts, df_values, interp_type)
+        bumped_curve = curve.bump(bump)
+
+        knot_times = curve._times[1:]
+        rebuilt_curve = DiscountCurve(value_dt, df_dts,
+                                      df_values * np.exp(-bump * knot_times),
+                                      interp_type)
+
+        assert isinstance(bumped_curve, DiscountCurveShifted)
+        assert bumped_curve._times is curve._times
+        assert np.allclose(bumped_curve.df(dts), rebuilt_curve.df(dts),
+                           rtol=0.0, atol=1e-14)
+
+        # Bumping a shifted curve adds to its shift and is not nested
+        twice_bumped = bumped_curve.bump(bump)
+        assert twice_bumped._base_curve is curve
+        assert np.allclose(twice_bumped.df(dts), curve.bump(2 * bump).df(dts),
+                           rtol=0.0, atol=1e-14)
+
+
+def test_term_structure_of_shifts():
+
+    curve = DiscountCurve(value_dt, df_dts, df_values)
+    shift_times = np.array([1.0, 5.0, 10.0])
+    shifts = np.array([0.0010, 0.0020, 0.0005])
+    shifted_curve = DiscountCurveShifted(curve, shifts, shift_times)
+
+    t = np.array([0.25, 1.0, 3.0, 5.0, 7.5, 10.0, 20.0])
+    expected_shifts = np.array([0.0010, 0.0010, 0.0015, 0.0020, 0.00125,
+                                0.0005, 0.0005])
+    expected_dfs = curve.df_t(t) * np.exp(-expected_shifts * t)
+    assert np.allclose(shifted_curve.df_t(t), expected_dfs,
+                       rtol=0.0, atol=1e-15)
+
+    assert np.allclose(shifted_curve._dfs,
+                       curve.df_t(curve._times)
+                       * np.exp(-np.interp(curve._times, shift_times, shifts)
+                                * curve._times))
+
+
+def test_shifted_curve_values_trades():
+
+    libor_curve = buildIborSingleCurve(value_dt)
+
+    swap = IborSwap(value_dt.add_weekdays(2), "10Y", SwapTypes.PAY, 0.04,
+                    FrequencyTypes.SEMI_ANNUAL, DayCountTypes.THIRTY_E_360)
+
+    bump = 0.0001
+    shifted_curve = DiscountCurveShifted(libor_curve, bump)
+    composite_curve = CompositeDiscountCurve(
+        [libor_curve, DiscountCurveFlat(value_dt, bump)])
+
+    v_shifted = swap.value(value_dt, shifted_curve)
+    v_composite = swap.value(value_dt, composite_curve)
+    assert abs(v_shifted - v_composite) < 1e-6
+
+    v_base = swap.value(value_dt, libor_curve)
+    assert v_shifted > v_base
+
+    fwd_rates = shifted_curve.fwd_rate(dts, "3M")
+    assert np.allclose(fwd_rates, composite_curve.fwd_rate(dts, "3M"),
+                       rtol=0.0, atol=1e-12)
@@ -2,12 +2,17 @@
 # Copyright (C) 2018, 2019, 2020 Dominic O'Kane
 ###############################################################################
 
+import numpy as np
+
 from financepy.market.curves.discount_curve_flat import DiscountCurveFlat
 from financepy.models.bdt_tree import BDTTree
 from financepy.models.hw_tree import HWTree
 from financepy.models.bk_tree import BKTree
 from financepy.models.black import Black
 from financepy.products.rates.ibor_bermudan_swaption import IborBermudanSwaption
+from financepy.products.rates.bermudan_swaption_book import (
+    BermudanSwaptionBook,
+)
 from financepy.products.rates.ibor_swap import IborSwap
 from financepy.products.rates.ibor_swaption import IborSwaption
 from financepy.utils.global_types import FinExerciseTypes
@@ -248,7 +253,7 @@ def test_hw_european_exercise():
     model = HWTree(sigma, a, num_time_steps)
 
     valuePay = bermudan_swaption_pay.value(value_dt, libor_curve, model)
-    assert round(valuePay, 4) == 6353.3815
+    assert round(valuePay, 4) == 6314.5033
 
     valueRec = bermudan_swaption_rec.value(value_dt, libor_curve, model)
     assert valueRec == 0.0
@@ -258,10 +263,10 @@ def test_hw_european_exercise():
     model = HWTree(sigma, a, num_time_steps)
 
     valuePay = bermudan_swaption_pay.value(value_dt, libor_curve, model)
-    assert round(valuePay, 4) == 13698.0155
+    assert round(valuePay, 4) == 13670.7485
 
     valueRec = bermudan_swaption_rec.value(value_dt, libor_curve, model)
-    assert round(valueRec, 4) == 7344.6339
+    assert round(valueRec, 4) == 7356.2452
 
 
 def test_hw_bermudan_exercise():
@@ -294,7 +299,7 @@ def test_hw_bermudan_exercise():
     model = HWTree(sigma, a, num_time_steps)
 
     valuePay = bermudan_swaption_pay.value(value_dt, libor_curve, model)
-    assert round(valuePay, 4) == 6353.3815
+    assert round(valuePay, 4) == 6314.5033
 
     valueRec = bermudan_swaption_rec.value(value_dt, libor_curve, model)
     assert valueRec == 0.0
@@ -304,7 +309,150 @@ def test_hw_bermudan_exercise():
     model = HWTree(sigma, a, num_time_steps)
 
     valuePay = bermudan_swaption_pay.value(value_dt, libor_curve, model)
-    assert round(valuePay, 4) == 16609.3646
+    assert round(valuePay, 4) == 16594.0322
 
     valueRec = bermudan_swaption_rec.value(value_dt, libor_curve, model)
-    assert round(valueRec, 4) == 10406.4558
+    assert round(valueRec, 4) == 10412.984
+
+
+def test_hw_tree_shared_between_trades():
+
+    exercise_type = FinExerciseTypes.BERMUDAN
+
+    swaptions = []
+    for years in [2, 3, 4]:
+        swaptions.append(IborBermudanSwaption(settle_dt,
+                                              exercise_dt,
+                                              settle_dt.add_years(years),
+                                              SwapTypes.PAY,
+                                              exercise_type,
+                                              swap_fixed_cpn,
+                                              swap_fixed_freq_type,
+                                              swapFixedDayCountType))
+
+    sigma = 0.01
+    a = 0.01
+
+    values = []
+    for swaption in swaptions:
+        model = HWTree(sigma, a, num_time_steps)
+        values.append(swaption.value(value_dt, libor_curve, model))
+
+    # A second valuation on the same curve does not rebuild the tree
+    model = HWTree(sigma, a, num_time_steps)
+    value = swaptions[2].value(value_dt, libor_curve, model)
+    Q = model.Q
+    assert swaptions[2].value(value_dt, libor_curve, model) == value
+    assert model.Q is Q
+    assert value == values[2]
+
+    # Changing the model parameters rebuilds the tree
+    model.sigma = 0.02
+    swaptions[2].value(value_dt, libor_curve, model)
+    assert model.Q is not Q
+
+    # A tree built out to a longer maturity is not reused by a shorter trade
+    model = HWTree(sigma, a, num_time_steps)
+    t_mat = (swap_maturity_dt - value_dt) / 365.0
+    model.build_tree(t_mat, libor_curve._times, libor_curve._dfs)
+
+    for swaption, value in zip(swaptions, values):
+        assert swaption.value(value_dt, libor_curve, model) == value
+
+
+def test_book_rolled_back_together():
+
+    swaptions = []
+    for years in [2, 3, 4, 5]:
+        for exercise_type in [FinExerciseTypes.EUROPEAN,
+                              FinExerciseTypes.BERMUDAN]:
+            for fixed_leg_type in [SwapTypes.PAY, SwapTypes.RECEIVE]:
+                swaptions.append(
+                    IborBermudanSwaption(settle_dt,
+                                         exercise_dt,
+                                         settle_dt.add_years(years),
+                                         fixed_leg_type,
+                                         exercise_type,
+                                         swap_fixed_cpn + 0.0025 * years,
+                                         swap_fixed_freq_type,
+                                         swapFixedDayCountType))
+
+    book = BermudanSwaptionBook(swaptions)
+
+    for model in [HWTree(0.01, 0.01, num_time_steps),
+                  BKTree(0.2, 0.01, num_time_steps),
+                  BDTTree(0.2, num_time_steps)]:
+
+        values = book.value(value_dt, libor_curve, model)
+        assert values.shape == (len(swaptions),)
+        assert values.max() > 0.0
+
+        if isinstance(model, BDTTree):
+            for swaption, value in zip(swaptions, values):
+                assert swaption.value(value_dt, libor_curve, model) == value
+            continue
+
+        # The batch matches each swaption rolled back on its own on the tree
+        # that the book was valued on
+        for swaption, value in zip(swaptions, values):
+            t_exp, t_mat, cpn_times, cpn_flows = \
+                swaption._tree_cashflows(value_dt)
+            v = model.bermudan_swaption(t_exp, t_mat, 1.0, 1.0, cpn_times,
+                                        cpn_flows, swaption.exercise_type)
+            if swaption.fixed_leg_type == SwapTypes.PAY:
+                v = swaption.notional * v["pay"]
+            else:
+                v = swaption.notional * v["rec"]
+            assert abs(v - value) < 1e-8
+
+
+def test_book_does_not_change_trade_values():
+
+    swaptions = [IborBermudanSwaption(settle_dt,
+                                      exercise_dt,
+                                      settle_dt.add_years(years),
+                                      SwapTypes.PAY,
+                                      FinExerciseTypes.BERMUDAN,
+                                      swap_fixed_cpn,
+                                      swap_fixed_freq_type,
+                                      swapFixedDayCountType)
+                 for years in [2, 10]]
+
+    book = BermudanSwaptionBook(swaptions)
+
+    for model in [HWTree(0.01, 0.01, 50),
+                  BKTree(0.2, 0.01, 50),
+                  BDTTree(0.2, 50)]:
+
+        value = swaptions[0].value(value_dt, libor_curve, model)
+        book.value(value_dt, libor_curve, model)
+        assert swaptions[0].value(value_dt, libor_curve, model) == value
+
+
+def test_hw_tree_steps_on_exercise_dates():
+
+    bermudan_swaption = IborBermudanSwaption(settle_dt,
+                                             exercise_dt,
+                                             swap_maturity_dt,
+                                             SwapTypes.PAY,
+                                             FinExerciseTypes.BERMUDAN,
+                                             swap_fixed_cpn,
+                                             swap_fixed_freq_type,
+                                             swapFixedDayCountType)
+
+    value = bermudan_swaption.value(value_dt, libor_curve,
+                                    HWTree(0.01, 0.01, 2000))
+
+    details = bermudan_swaption.valuation_details(value_dt, libor_curve,
+                                                  HWTree(0.01, 0.01, 20))
+
+    # The expiry and every coupon time are time steps of the tree so a
+    # small number of steps is enough
+    for num_steps in [20, 30, 40, 50]:
+        model = HWTree(0.01, 0.01, num_steps)
+        v = bermudan_swaption.value(value_dt, libor_curve, model)
+        assert abs(v - value) < 0.0075 * value
+        assert len(model.tree_times) == num_steps + 2
+
+        for t in details["call_times"]:
+            assert np.min(np.abs(model.tree_times - t)) < 1e-12
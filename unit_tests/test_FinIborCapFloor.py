@@ -17,6 +17,7 @@ from financepy.products.rates.ibor_deposit import IborDeposit
 from financepy.products.rates.ibor_swap import IborSwap
 from financepy.products.rates.ibor_cap_floor import IborCapFloor
 from financepy.utils.global_types import FinCapFloorTypes
+from concurrent.futures import ThreadPoolExecutor
 
 
 def build_curve(value_dt):
@@ -93,7 +94,7 @@ def test_cap():
     assert round(cvalue3, 4) == 28889.2445
     assert round(cvalue4, 4) == 28889.2445
     assert round(cvalue5, 4) == 82406.6040
-    assert round(cvalue6, 4) == 28889.3760
+    assert round(cvalue6, 4) == 28889.3761
 
     k = 0.05
     capfloor = IborCapFloor(start_dt, maturity_dt, capFloorType, k)
@@ -153,7 +154,7 @@ def test_floor():
     cvalue5 = capfloor.value(value_dt, libor_curve, model5)
     cvalue6 = capfloor.value(value_dt, libor_curve, model6)
     assert round(cvalue1, 4) == 2089.3995
-    assert round(cvalue2, 4) == 2583.5715
+    assert round(cvalue2, 4) == 2583.5714
     assert round(cvalue3, 4) == 701.3705
     assert round(cvalue4, 4) == 754.2243
     assert round(cvalue5, 4) == 62244.0904
@@ -167,9 +168,28 @@ def test_floor():
     cvalue4 = capfloor.value(value_dt, libor_curve, model4)
     cvalue5 = capfloor.value(value_dt, libor_curve, model5)
     cvalue6 = capfloor.value(value_dt, libor_curve, model6)
-    assert round(cvalue1, 4) == 29261.2132
-    assert round(cvalue2, 4) == 29279.3794
+    assert round(cvalue1, 4) == 29261.2131
+    assert round(cvalue2, 4) == 29279.3793
     assert round(cvalue3, 4) == 29258.1231
     assert round(cvalue4, 4) == 29258.1395
     assert round(cvalue5, 4) == 81255.1368
     assert round(cvalue6, 4) == 29258.2786
+
+
+def test_cap_shared_between_threads():
+    capfloor = IborCapFloor(start_dt, maturity_dt, FinCapFloorTypes.CAP, 0.03)
+    models = [model1, model2, model3, model4, model6] * 4
+
+    serial = [capfloor.value(value_dt, libor_curve, m) for m in models]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        threaded = list(executor.map(
+            lambda m: capfloor.value(value_dt, libor_curve, m), models))
+
+    assert threaded == serial
+
+    details = capfloor.valuation_details(value_dt, libor_curve, model1)
+    assert details["value"] == serial[0]
+    assert round(sum(details["values"]), 8) == round(serial[0], 8)
+    assert details["cum_pvs"][-1] == serial[0]
+    assert "value_dt" not in vars(capfloor)
@@ -1,5 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
 
 from helpers import *
 from financepy.utils.date import Date
@@ -143,6 +144,36 @@ def test_par_rate_risk_report_flat_forward():
     assert max(np.abs(actual_totals - expected_totals)) <= 1e-4
 
 
+def test_par_rate_risk_report_jacobian():
+    valuation_date = Date(6, 10, 2022)
+    base_curve = buildIborSingleCurve(valuation_date, "10Y")
+    settlement_date = base_curve.used_swaps[0].effective_dt
+    cal = base_curve.used_swaps[0].fixed_leg.cal_type
+    fixed_day_count = base_curve.used_swaps[0].fixed_leg.dc_type
+    fixed_freq_type = base_curve.used_swaps[0].fixed_leg.freq_type
+
+    trades = _generate_trades(
+        valuation_date,
+        cal,
+        SwapTypes.PAY,
+        fixed_day_count,
+        fixed_freq_type,
+        settlement_date,
+        base_curve,
+    )
+
+    _, bumped_report = re.par_rate_risk_report(base_curve, trades)
+    _, risk_report = re.par_rate_risk_report(
+        base_curve, trades, use_jacobian=True
+    )
+
+    # The analytic deltas differ from the bumped ones by the convexity
+    trade_labels = [c for c in risk_report.columns if c.startswith("trade")]
+    bumped_deltas = bumped_report[trade_labels].values.astype(float)
+    assert np.max(np.abs(risk_report[trade_labels].values -
+                         bumped_deltas)) <= 1e-3
+
+
 def test_forward_rate_risk_report():
     valuation_date = Date(6, 10, 2001)
     cal = CalendarTypes.UNITED_KINGDOM
@@ -443,6 +474,50 @@ def test_parallel_shift_ladder_report():
     assert max(np.abs(actual_totals - expected_totals)) <= 1e-4
 
 
+def test_risk_reports_with_executor():
+    valuation_date = Date(6, 10, 2022)
+    base_curve = buildIborSingleCurve(valuation_date, "10Y")
+    settlement_date = base_curve.used_swaps[0].effective_dt
+    cal = base_curve.used_swaps[0].fixed_leg.cal_type
+    fixed_day_count = base_curve.used_swaps[0].fixed_leg.dc_type
+    fixed_freq_type = base_curve.used_swaps[0].fixed_leg.freq_type
+
+    trades = _generate_trades(
+        valuation_date,
+        cal,
+        SwapTypes.PAY,
+        fixed_day_count,
+        fixed_freq_type,
+        settlement_date,
+        base_curve,
+    )
+
+    grid_last_date = valuation_date.add_years(5)
+    curve_shifts = np.linspace(-100 * g_basis_point, 100 * g_basis_point, 5)
+
+    serial_reports = [
+        re.par_rate_risk_report(base_curve, trades)[1],
+        re.carry_rolldown_report(base_curve, grid_last_date, "1Y", trades)[1],
+        re.parallel_shift_ladder_report(base_curve, curve_shifts, trades)[1],
+    ]
+
+    # The bumped curves are spread over two worker processes
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel_reports = [
+            re.par_rate_risk_report(base_curve, trades,
+                                    executor=executor)[1],
+            re.carry_rolldown_report(base_curve, grid_last_date, "1Y", trades,
+                                     executor=executor)[1],
+            re.parallel_shift_ladder_report(base_curve, curve_shifts, trades,
+                                            executor=executor)[1],
+        ]
+
+    for serial_report, parallel_report in zip(serial_reports,
+                                              parallel_reports):
+        assert list(serial_report.columns) == list(parallel_report.columns)
+        assert serial_report.equals(parallel_report)
+
+
 def _generate_trades(
     valuation_date,
     cal,
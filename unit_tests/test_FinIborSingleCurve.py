@@ -411,3 +411,37 @@ def test_RepriceInputsForAllInterpChoices(interp_type):
 
     # If no exception, we are good
     assert True
+
+
+@pytest.mark.parametrize(
+    "interp_type",
+    [InterpTypes.FLAT_FWD_RATES, InterpTypes.LINEAR_ONFWD_RATES],
+)
+def test_BootstrapSixtySwaps(interp_type):
+    value_dt = Date(6, 10, 2018)
+    settle_dt = value_dt.add_days(2)
+
+    depos = [IborDeposit(value_dt, settle_dt.add_months(3), 0.02,
+                         DayCountTypes.ACT_360)]
+
+    swaps = []
+    for years in range(1, 61):
+        swap = IborSwap(
+            settle_dt,
+            str(years) + "Y",
+            SwapTypes.PAY,
+            0.025 + 0.0005 * years ** 0.5,
+            FrequencyTypes.SEMI_ANNUAL,
+            DayCountTypes.THIRTY_E_360,
+            float_dc_type=DayCountTypes.ACT_360,
+        )
+        swaps.append(swap)
+
+    libor_curve = IborSingleCurve(value_dt, depos, [], swaps, interp_type)
+
+    assert len(libor_curve._times) == 62
+
+    # Each swap is repriced by the full leg valuation
+    for swap in swaps:
+        v = swap.value(value_dt, libor_curve) / swap.fixed_leg.notional
+        assert abs(v) < 1e-9
@@ -93,6 +93,32 @@ def test_dp_example():
     assert round(v * 1000, 4) == 785300.0566
 
 
+def test_LiborSwapValueGradient():
+    start_date = Date(27, 12, 2017)
+    end_date = Date(27, 12, 2067)
+
+    first_fixing, swap, settlement_date, libor_curve = _load_test_swap_and_curve(start_date, end_date)
+    v = swap.value(settlement_date, libor_curve, libor_curve, first_fixing)
+
+    (v_ad, disc_grad, index_grad) = swap.value_gradient(settlement_date, libor_curve, libor_curve, first_fixing)
+    grad = disc_grad + index_grad
+
+    assert abs(v_ad - v) < 1e-6
+
+    # Compare with bumping each knot discount factor and refitting
+    bump = 1e-7
+    dfs = libor_curve._dfs.copy()
+    for j in range(1, len(dfs)):
+        libor_curve._dfs = dfs.copy()
+        libor_curve._dfs[j] += bump
+        libor_curve._interpolator.fit(libor_curve._times, libor_curve._dfs)
+        v_bump = swap.value(settlement_date, libor_curve, libor_curve, first_fixing)
+        assert abs((v_bump - v) / bump - grad[j]) < 1e-5 * np.max(np.abs(grad))
+
+    libor_curve._dfs = dfs
+    libor_curve._interpolator.fit(libor_curve._times, libor_curve._dfs)
+
+
 def _load_test_swap_and_curve(start_date, end_date):
     fixed_coupon = 0.015
     fixedFreqType = FrequencyTypes.ANNUAL
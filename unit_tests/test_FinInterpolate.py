@@ -311,6 +311,106 @@ def test_LINEAR_ONFWD_RATES():
     assert round(y_int, 4) == 0.5537
 
 
+def test_FinInterpolate_Compiled_Matches_Scipy():
+    x_values = np.linspace(0.1, 12.0, 50)
+
+    for interp_type in InterpTypes:
+
+        interpolator = Interpolator(interp_type)
+        interpolator.fit(xValues, yValues)
+
+        y_array = interpolator.interpolate(x_values)
+        y_scalar = [interpolator.interpolate(x) for x in x_values]
+        assert np.allclose(y_array, y_scalar, rtol=0.0, atol=1e-14)
+
+        if interp_type in [InterpTypes.PCHIP_LOG_DISCOUNT,
+                           InterpTypes.NATCUBIC_LOG_DISCOUNT]:
+            y_scipy = np.exp(interpolator._interp_fn(x_values))
+        elif interp_type in [InterpTypes.PCHIP_ZERO_RATES,
+                             InterpTypes.FINCUBIC_ZERO_RATES,
+                             InterpTypes.NATCUBIC_ZERO_RATES,
+                             InterpTypes.TENSION_ZERO_RATES]:
+            y_scipy = np.exp(-x_values * interpolator._interp_fn(x_values))
+        else:
+            continue
+
+        assert np.allclose(y_array, y_scipy, rtol=0.0, atol=1e-12)
+
+
+def test_LINEAR_ONFWD_RATES_incremental_fit():
+    interp_type = InterpTypes.LINEAR_ONFWD_RATES
+    times = np.concatenate(([0.0], xValues))
+    dfs = np.concatenate(([1.0], yValues))
+
+    # Refit as a bootstrap does by appending knots and changing the last one
+    interpolator = Interpolator(interp_type)
+    for i in range(1, len(times)):
+        interpolator.fit(times[0:i + 1], dfs[0:i + 1] * 0.99)
+        interpolator.fit(times[0:i + 1], dfs[0:i + 1])
+
+    fresh = Interpolator(interp_type)
+    fresh.fit(times, dfs)
+
+    assert np.array_equal(interpolator._breaks, fresh._breaks)
+    assert np.array_equal(interpolator._coeffs, fresh._coeffs)
+
+    # Changing an earlier knot refits from that knot
+    dfs[3] *= 1.01
+    interpolator.fit(times, dfs)
+    fresh = Interpolator(interp_type)
+    fresh.fit(times, dfs)
+
+    assert np.array_equal(interpolator._coeffs, fresh._coeffs)
+
+
+def test_last_knot_log_sensitivity():
+    times = np.concatenate(([0.0], xValues))
+    dfs = np.concatenate(([1.0], yValues))
+    t = np.linspace(0.0, 12.0, 49)
+    bump = 1e-7
+
+    for interp_type in InterpTypes:
+
+        if Interpolator.suitable_for_bootstrap(interp_type) is False:
+            continue
+
+        for num_knots in [2, 3, len(times)]:
+            interpolator = Interpolator(interp_type)
+            interpolator.fit(times[0:num_knots], dfs[0:num_knots])
+            sens = interpolator.last_knot_log_sensitivity(t)
+            jac = interpolator.log_df_jacobian(t, bump)
+
+            assert np.allclose(sens, jac[:, -1], rtol=0.0, atol=1e-5)
+
+
+def test_df_knot_adjoint():
+    times = np.concatenate(([0.0], xValues))
+    dfs = np.concatenate(([1.0], yValues))
+    t = np.linspace(0.0, 12.0, 49)
+    df_bars = np.cos(t)
+    bump = 1e-7
+
+    # The schemes without an analytic adjoint use a bumped Jacobian
+    analytic = [InterpTypes.FLAT_FWD_RATES,
+                InterpTypes.LINEAR_ZERO_RATES,
+                InterpTypes.LINEAR_FWD_RATES]
+
+    for interp_type in InterpTypes:
+
+        tol = 1e-6 if interp_type in analytic else 1e-3
+        interpolator = Interpolator(interp_type)
+        interpolator.fit(times, dfs)
+        grad = interpolator.df_knot_adjoint(t, df_bars)
+        pv = df_bars @ interpolator.interpolate(t)
+
+        for j in range(1, len(times)):
+            bumped_dfs = dfs.copy()
+            bumped_dfs[j] += bump
+            interpolator.fit(times, bumped_dfs)
+            fd = (df_bars @ interpolator.interpolate(t) - pv) / bump
+            assert abs(fd - grad[j]) < tol
+
+
 if __name__ == '__main__':
     # test_LINEAR_ONFWD_RATES_empty_fit()
     # test_LINEAR_ONFWD_RATES_single_value_at_origin()
@@ -61,3 +61,49 @@ def test_HullWhiteExampleTwo():
     assert round(vAnal['call'], 4) == 1.0448
     assert round(vTreePut, 4) == 1.8237
     assert round(vAnal['put'], 4) == 1.8239
+
+
+def test_piecewise_constant_sigma():
+
+    times = np.linspace(0.0, 12.0, 49)
+    dfs = np.exp(-0.05 * times - 0.002 * times**1.5)
+
+    t_exp = 3.0
+    t_mat = 9.0
+    strike = 63.0
+    face = 100.0
+    a = 0.1
+
+    # Equal sigmas in every bucket give the constant volatility prices
+    model = HWTree(0.01, a, 200)
+    v = model.option_on_zcb(t_exp, t_mat, strike, face, times, dfs)
+
+    model = HWTree([0.01, 0.01, 0.01], a, 200, sigma_times=[1.0, 2.0, 4.0])
+    v_pw = model.option_on_zcb(t_exp, t_mat, strike, face, times, dfs)
+
+    assert abs(v_pw['call'] - v['call']) < 1e-10
+    assert abs(v_pw['put'] - v['put']) < 1e-10
+    assert "Sigma Times" in repr(model)
+
+    # The tree agrees with the analytical price for a stepped volatility
+    # with a uniform grid and with time steps that land on event times
+    model = HWTree([0.005, 0.02, 0.01], a, 200, sigma_times=[1.0, 2.0, 4.0])
+    v = model.option_on_zcb(t_exp, t_mat, strike, face, times, dfs)
+
+    model.build_tree(t_exp, times, dfs)
+    v_tree = model.option_on_zero_cpn_bond_tree(t_exp, t_mat, strike, face)
+    assert abs(v_tree['call'] - v['call']) < 0.005
+    assert abs(v_tree['put'] - v['put']) < 0.005
+
+    event_times = np.array([0.37, 1.0, 2.0])
+    model.build_tree(t_exp, times, dfs, event_times)
+    for t in event_times:
+        assert np.min(np.abs(model.tree_times - t)) < 1e-12
+
+    v_tree = model.option_on_zero_cpn_bond_tree(t_exp, t_mat, strike, face)
+    assert abs(v_tree['call'] - v['call']) < 0.005
+    assert abs(v_tree['put'] - v['put']) < 0.005
+
+    # The tree still reprices the discount curve
+    assert abs(np.sum(model.Q[-1]) - np.interp(model.tree_times[-1],
+                                               times, dfs)) < 1e-4
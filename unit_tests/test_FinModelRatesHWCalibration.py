@@ -0,0 +1,119 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+import numpy as np
+
+from financepy.utils.date import Date
+from financepy.utils.global_types import SwapTypes
+from financepy.utils.day_count import DayCountTypes
+from financepy.utils.frequency import FrequencyTypes
+from financepy.market.curves.discount_curve import DiscountCurve
+from financepy.products.rates.ibor_swaption import IborSwaption
+from financepy.models.hw_tree import HWTree
+from financepy.models.hw_calibration import HWSwaptionCalibrator
+
+
+value_dt = Date(1, 1, 2020)
+years = np.array([0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0])
+zero_rates = np.linspace(0.02, 0.04, len(years))
+discount_curve = DiscountCurve(value_dt,
+                               [value_dt.add_years(y) for y in years],
+                               np.exp(-zero_rates * years))
+
+
+def make_swaption(exercise_dt, maturity_dt, fixed_leg_type, strike_shift):
+
+    swaption = IborSwaption(value_dt, exercise_dt, maturity_dt,
+                            fixed_leg_type, 0.03,
+                            FrequencyTypes.SEMI_ANNUAL,
+                            DayCountTypes.THIRTY_E_360)
+
+    fwd = swaption.underlying_swap.swap_rate(value_dt, discount_curve)
+
+    return IborSwaption(value_dt, exercise_dt, maturity_dt,
+                        fixed_leg_type, fwd + strike_shift,
+                        FrequencyTypes.SEMI_ANNUAL,
+                        DayCountTypes.THIRTY_E_360)
+
+
+def test_values_match_jamshidian():
+
+    swaptions = []
+    for expiry in [1, 3, 5]:
+        for tenor in [2, 10]:
+            for fixed_leg_type in [SwapTypes.PAY, SwapTypes.RECEIVE]:
+                exercise_dt = value_dt.add_years(expiry)
+                swaptions.append(make_swaption(exercise_dt,
+                                               exercise_dt.add_years(tenor),
+                                               fixed_leg_type, 0.0025))
+
+    calibrator = HWSwaptionCalibrator(value_dt, discount_curve, swaptions,
+                                      np.full(len(swaptions), 0.2))
+
+    sigma = 0.01
+    a = 0.05
+    values, _ = calibrator.values(np.array([sigma]), a, np.array([1.0]))
+
+    model = HWTree(sigma, a)
+    for swaption, value in zip(swaptions, values):
+        jamshidian_value = swaption.value(value_dt, discount_curve, model)
+        assert abs(value - jamshidian_value) < 1e-4 * jamshidian_value
+
+    # The analytic gradients agree with finite differences
+    sigma_times = np.array([1.0, 3.0, 5.0])
+    x = np.array([0.008, 0.011, 0.009, 0.04])
+    values, jac = calibrator.values(x[:3], x[3], sigma_times)
+
+    for i in range(0, len(x)):
+        bumped_x = x.copy()
+        bumped_x[i] += 1e-7
+        bumped_values, _ = calibrator.values(bumped_x[:3], bumped_x[3],
+                                             sigma_times)
+        fd_jac = (bumped_values - values) / 1e-7
+        scale = np.max(np.abs(jac[:, i]))
+        assert np.max(np.abs(fd_jac - jac[:, i])) < 1e-5 * scale
+
+
+def test_calibrate_to_coterminal_swaptions():
+
+    maturity_dt = value_dt.add_years(10)
+
+    swaptions = []
+    for expiry in range(1, 10):
+        swaptions.append(make_swaption(value_dt.add_years(expiry),
+                                       maturity_dt, SwapTypes.PAY, 0.0))
+
+    black_vols = np.linspace(0.25, 0.18, len(swaptions))
+    calibrator = HWSwaptionCalibrator(value_dt, discount_curve, swaptions,
+                                      black_vols)
+
+    # With one volatility per expiry the co-terminals are fitted exactly
+    result = calibrator.calibrate(a=0.05)
+    assert len(result["sigmas"]) == len(swaptions)
+    assert result["a"] == 0.05
+    assert np.max(np.abs(result["vol_errors"])) < 1e-6
+    assert np.allclose(result["values"], calibrator.market_values,
+                       rtol=1e-6)
+
+    # The piecewise constant volatility reprices through the swaption
+    model = HWTree(result["sigmas"], result["a"],
+                   sigma_times=result["sigma_times"])
+    for swaption, value in zip(swaptions, result["values"]):
+        assert abs(swaption.value(value_dt, discount_curve, model)
+                   - value) < 1e-4 * value
+
+    # A single volatility and the mean reversion are fitted together and
+    # the calibrated model reprices through the swaption valuation
+    sigma_times = np.array([10.0])
+    fixed_a_result = calibrator.calibrate(sigma_times=sigma_times, a=0.0)
+    result = calibrator.calibrate(sigma_times=sigma_times)
+    sigma = result["sigmas"][0]
+    a = result["a"]
+    assert np.sum(result["vol_errors"]**2) \
+        < np.sum(fixed_a_result["vol_errors"]**2)
+
+    model = HWTree(sigma, a)
+    for swaption, value in zip(swaptions, result["values"]):
+        assert abs(swaption.value(value_dt, discount_curve, model)
+                   - value) < 1e-4 * value
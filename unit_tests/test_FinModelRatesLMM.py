@@ -2,11 +2,18 @@
 # Copyright (C) 2018, 2019, 2020 Dominic O'Kane
 ##############################################################################
 
+import os
+import subprocess
+import sys
+
 from financepy.models.lmm_mc import lmm_sticky_caplet_pricer
 from financepy.models.lmm_mc import lmm_ratchet_caplet_pricer
 from financepy.models.lmm_mc import lmm_simulate_fwds_mf
 from financepy.models.lmm_mc import lmm_simulate_fwds_1f
+from financepy.models.lmm_mc import lmm_simulate_fwds_mf_parallel
+from financepy.models.lmm_mc import USE_PARALLEL
 from financepy.utils.helpers import check_vector_differences
+from numba.np.ufunc import parallel
 import numpy as np
 
 
@@ -126,3 +133,97 @@ def test_HullBookExamples(capsys):
 
     assert captured.out == ""
     assert captured.err == ""
+
+
+def test_parallel_engine():
+
+    numFwds = 11
+    taus = np.ones(numFwds)
+    fwd0 = np.full(numFwds, 0.05127)
+    seed = 438
+    num_paths = 100000
+    spread = 0.0025
+    numeraire_index = 0
+
+    num_factors = 3
+    lambdas3F = np.array([[0.00, 0.1365, 0.1928, 0.1672, 0.1698, 0.1485,
+                           0.1395, 0.1261, 0.1290, 0.1197, 0.1097],
+                          [0.0, -0.0662, -0.0702, -0.0406, -0.0206, 0.00,
+                           0.0169, 0.0306, 0.0470, 0.0581, 0.0666],
+                          [0.0, 0.0319, 0.0225, 0.000, -0.0198, -0.0347,
+                           -0.0163, 0.000, 0.0151, 0.0280, 0.0384]])
+
+    # Without the Brownian bridge the Sobol paths are those of the serial
+    # simulation
+    fwds = lmm_simulate_fwds_mf(numFwds, num_factors, num_paths,
+                                numeraire_index, fwd0, lambdas3F, taus, 1,
+                                seed)
+
+    fwds_parallel = lmm_simulate_fwds_mf_parallel(numFwds, num_factors,
+                                                  num_paths, numeraire_index,
+                                                  fwd0, lambdas3F, taus, 1,
+                                                  seed, 0)
+
+    assert np.max(np.abs(fwds_parallel - fwds)) < 1e-12
+
+    if USE_PARALLEL is False:
+        # The serial build must not start a threading layer that would stop
+        # the process from being forked safely
+        assert parallel._is_initialized is False
+
+    hullRatchetCaplets3F = [0.00, 0.194, 0.207, 0.205, 0.198, 0.193,
+                            0.189, 0.180, 0.174, 0.168, 0.162]
+
+    for use_sobol in [0, 1]:
+        for use_bridge in [0, 1]:
+            fwds = lmm_simulate_fwds_mf_parallel(numFwds, num_factors,
+                                                 num_paths, numeraire_index,
+                                                 fwd0, lambdas3F, taus,
+                                                 use_sobol, seed, use_bridge)
+
+            vRatchetCaplets = lmm_ratchet_caplet_pricer(spread, numFwds,
+                                                        num_paths, fwd0,
+                                                        fwds, taus) * 100.0
+
+            assert np.max(np.abs(vRatchetCaplets
+                                 - hullRatchetCaplets3F)) < 1e-2
+
+
+def test_parallel_engine_all_cores():
+
+    # The kernels are only compiled to run on all cores if the environment
+    # variable is set before import so this is checked in a new process. It
+    # has several threads even on a machine with a single core
+    code = """
+import numba
+import numpy as np
+from numba.np.ufunc import parallel
+from financepy.models.lmm_mc import USE_PARALLEL
+from financepy.models.lmm_mc import lmm_simulate_fwds_mf
+from financepy.models.lmm_mc import lmm_simulate_fwds_mf_parallel
+
+num_fwds = 11
+taus = np.ones(num_fwds)
+fwd0 = np.full(num_fwds, 0.05127)
+lambdas = np.array([np.linspace(0.0, 0.15, num_fwds),
+                    np.linspace(0.0, -0.05, num_fwds)])
+args = (num_fwds, 2, 10000, 0, fwd0, lambdas, taus)
+
+fwds = lmm_simulate_fwds_mf(*args, 1, 438)
+fwds_parallel = lmm_simulate_fwds_mf_parallel(*args, 1, 438, 0)
+print(USE_PARALLEL, parallel._is_initialized)
+print(np.max(np.abs(fwds_parallel - fwds)) < 1e-12)
+
+# The counter-based random numbers do not depend on the thread count
+fwds_threads = []
+for n in [1, numba.config.NUMBA_NUM_THREADS]:
+    numba.set_num_threads(n)
+    fwds_threads.append(lmm_simulate_fwds_mf_parallel(*args, 0, 438, 1))
+print(np.array_equal(fwds_threads[0], fwds_threads[1]))
+"""
+
+    env = dict(os.environ, FINANCEPY_QUIET="1", FINANCEPY_PARALLEL="1",
+               NUMBA_NUM_THREADS="4")
+    output = subprocess.run([sys.executable, "-c", code], env=env,
+                            capture_output=True, text=True, check=True)
+    assert output.stdout.split() == ["True", "True", "True", "True"]
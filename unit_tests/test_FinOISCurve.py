@@ -129,3 +129,62 @@ def test_bloombergPricingExample():
                                             oisCurve), 4) == 53714.3020
     assert round(swaps[0].float_leg.value(
         settle_dt, oisCurve, None), 4) == 53714.3020
+
+
+def test_OISCurveRepricesForAllInterpChoices():
+    value_dt = Date(6, 10, 2018)
+    settle_dt = value_dt.add_days(2)
+
+    depos = [IborDeposit(value_dt, settle_dt, 0.02, DayCountTypes.ACT_360)]
+
+    swaps = []
+    for years in [1, 2, 3, 5, 7, 10, 15, 20, 30]:
+        swap = OIS(settle_dt, str(years) + "Y", SwapTypes.PAY,
+                   0.02 + 0.0004 * years ** 0.5, FrequencyTypes.ANNUAL,
+                   DayCountTypes.ACT_360)
+        swaps.append(swap)
+
+    # Local schemes are bootstrapped and the others solved globally
+    for interp_type in InterpTypes:
+        ois_curve = OISCurve(value_dt, depos, [], swaps, interp_type)
+
+        for swap in swaps:
+            v = swap.value(value_dt, ois_curve) / swap.fixed_leg.notional
+            assert abs(v) < 1e-10
+
+
+def test_OISCurveQuoteJacobian():
+    value_dt = Date(6, 10, 2018)
+    settle_dt = value_dt.add_days(2)
+
+    depos = [IborDeposit(value_dt, settle_dt, 0.02, DayCountTypes.ACT_360)]
+
+    swaps = []
+    for years in [1, 2, 3, 5, 10]:
+        swap = OIS(settle_dt, str(years) + "Y", SwapTypes.PAY,
+                   0.02 + 0.0004 * years ** 0.5, FrequencyTypes.ANNUAL,
+                   DayCountTypes.ACT_360)
+        swaps.append(swap)
+
+    ois_curve = OISCurve(value_dt, depos, [], swaps)
+    jac = ois_curve.df_quote_jacobian()
+
+    # Rebuild the curve with the 3Y swap rate bumped
+    bump = 1e-6
+    bumped_swaps = []
+    for years, swap in zip([1, 2, 3, 5, 10], swaps):
+        rate = swap.fixed_leg.cpn + (bump if years == 3 else 0.0)
+        bumped_swaps.append(OIS(settle_dt, str(years) + "Y", SwapTypes.PAY,
+                                rate, FrequencyTypes.ANNUAL,
+                                DayCountTypes.ACT_360))
+
+    bumped_curve = OISCurve(value_dt, depos, [], bumped_swaps)
+    fd = (bumped_curve._dfs[1:] - ois_curve._dfs[1:]) / bump
+
+    assert np.allclose(jac[:, 3], fd, rtol=0.0, atol=1e-5)
+
+    # A payer swap gains its annuity when its own par rate rises
+    grads = ois_curve.trade_df_gradients(swaps)
+    par_deltas = grads @ jac
+    annuity = swaps[2].pv01(value_dt, ois_curve) * swaps[2].fixed_leg.notional
+    assert abs(par_deltas[2, 3] - annuity) < 1e-6 * annuity
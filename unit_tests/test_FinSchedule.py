@@ -6,6 +6,9 @@ from financepy.utils.date import Date, set_date_format, DateFormatTypes
 from financepy.utils.calendar import CalendarTypes, Calendar
 from financepy.utils.frequency import FrequencyTypes
 from financepy.utils.schedule import Schedule
+from financepy.utils.schedule import enable_schedule_cache
+from financepy.utils.schedule import disable_schedule_cache
+from financepy.utils.schedule import schedule_cache_info
 from financepy.utils.calendar import DateGenRuleTypes
 from financepy.utils.calendar import BusDayAdjustTypes
 
@@ -215,3 +218,37 @@ def test_forward_end_stub():
     adjusted_dts = schedule.adjusted_dts
     assert len(adjusted_dts) == 5
     check_frequency(schedule)
+
+
+def test_schedule_cache():
+    d1 = Date(20, 6, 2018)
+    d2 = Date(20, 6, 2028)
+    freq_type = FrequencyTypes.QUARTERLY
+    cal_type = CalendarTypes.TARGET
+    bd_type = BusDayAdjustTypes.MODIFIED_FOLLOWING
+    dg_type = DateGenRuleTypes.BACKWARD
+
+    uncached = Schedule(d1, d2, freq_type, cal_type, bd_type, dg_type)
+
+    enable_schedule_cache(max_size=2)
+
+    try:
+        schedule1 = Schedule(d1, d2, freq_type, cal_type, bd_type, dg_type)
+        schedule2 = Schedule(d1, d2, freq_type, cal_type, bd_type, dg_type)
+
+        assert schedule1.schedule_dts() == uncached.schedule_dts()
+        assert schedule2.schedule_dts() == uncached.schedule_dts()
+        assert schedule2.termination_dt == uncached.termination_dt
+        assert schedule2.schedule_excel_dts().flags.writeable is False
+        assert schedule_cache_info() == {"hits": 1, "misses": 1,
+                                         "size": 1, "max_size": 2}
+
+        # The least recently used schedule is evicted when the cache is full
+        Schedule(d1, Date(20, 6, 2025), freq_type, cal_type, bd_type)
+        Schedule(d1, Date(20, 6, 2026), freq_type, cal_type, bd_type)
+        Schedule(d1, d2, freq_type, cal_type, bd_type, dg_type)
+        assert schedule_cache_info()["misses"] == 4
+    finally:
+        disable_schedule_cache()
+
+    assert schedule_cache_info() is None
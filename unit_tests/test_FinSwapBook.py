@@ -0,0 +1,46 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+from helpers import buildIborSingleCurve
+from financepy.utils.global_types import SwapTypes
+from financepy.utils.date import Date
+from financepy.utils.day_count import DayCountTypes
+from financepy.utils.frequency import FrequencyTypes
+from financepy.products.rates.ibor_swap import IborSwap
+from financepy.products.rates.swap_book import SwapBook
+import numpy as np
+
+
+def test_SwapBookMatchesSwapValues():
+    value_dt = Date(6, 10, 2022)
+    discount_curve = buildIborSingleCurve(value_dt, "10Y")
+    index_curve = buildIborSingleCurve(value_dt, "5Y")
+    settle_dt = value_dt.add_days(2)
+
+    # Seasoned, matured and forward starting swaps of both directions
+    swaps = []
+    fixings = []
+    for i in range(0, 40):
+        start_dt = Date(1, 3, 2017).add_days(97 * i)
+        leg_type = SwapTypes.PAY if i % 2 == 0 else SwapTypes.RECEIVE
+        swap = IborSwap(start_dt,
+                        f"{1 + i % 7}Y",
+                        leg_type,
+                        0.01 + 0.0005 * i,
+                        FrequencyTypes.ANNUAL,
+                        DayCountTypes.THIRTY_E_360,
+                        notional=1e6 * (i + 1),
+                        float_spread=0.0001 * (i % 3),
+                        float_freq_type=FrequencyTypes.QUARTERLY)
+        swaps.append(swap)
+        fixings.append(0.02 if start_dt < value_dt else np.nan)
+
+    book = SwapBook(swaps)
+
+    for curve in [None, index_curve]:
+        values = [swap.value(settle_dt, discount_curve, curve,
+                             None if np.isnan(fixing) else fixing)
+                  for swap, fixing in zip(swaps, fixings)]
+        book_values = book.value(settle_dt, discount_curve, curve, fixings)
+        assert np.max(np.abs(book_values - np.array(values))) < 1e-6
@@ -2,6 +2,15 @@
 # Copyright (C) 2018, 2019, 2020 Dominic O'Kane
 ###############################################################################
 
+import gc
+import pickle
+import weakref
+
+import numpy as np
+
+import pytest
+
+from financepy.market.curves.discount_curve import DiscountCurve
 from financepy.market.curves.discount_curve_flat import DiscountCurveFlat
 from financepy.products.rates.swap_float_leg import SwapFloatLeg
 from financepy.products.rates.swap_fixed_leg import SwapFixedLeg
@@ -13,6 +22,7 @@ from financepy.utils.calendar import DateGenRuleTypes
 from financepy.utils.calendar import BusDayAdjustTypes
 from financepy.utils.global_types import SwapTypes
 from financepy.utils.math import ONE_MILLION
+from financepy.utils.error import FinError
 
 
 def test_FinFixedIborSwapLeg():
@@ -159,3 +169,72 @@ def test_FinFloatOISLeg():
     v = swapFloatLeg.value(effective_dt, libor_curve, libor_curve,
                            firstFixing)
     assert round(v, 4) == -2038364.5665
+
+
+def test_SwapLegsPvOnlyMatchesCashflows():
+
+    effective_dt = Date(28, 10, 2020)
+    value_dt = Date(3, 2, 2022)
+    curve = DiscountCurveFlat(effective_dt, 0.03)
+
+    fixed_leg = SwapFixedLeg(effective_dt, "10Y", SwapTypes.PAY, 0.02,
+                             FrequencyTypes.SEMI_ANNUAL,
+                             DayCountTypes.THIRTY_E_360, principal=1.0)
+
+    float_leg = SwapFloatLeg(effective_dt, "10Y", SwapTypes.RECEIVE, 0.001,
+                             FrequencyTypes.QUARTERLY, DayCountTypes.ACT_360)
+
+    v_fixed = fixed_leg.value(value_dt, curve)
+    v_float = float_leg.value(value_dt, curve, curve, 0.015)
+
+    # The lean valuation stores no cashflows until a report asks for them
+    assert not hasattr(fixed_leg, "payment_pvs")
+    assert len(float_leg.payments) == 0
+
+    report = float_leg._cashflow_report_from_cached_values()
+    assert abs(report["payment_pv"].sum() - v_float) < 1e-6
+
+    (v, report) = fixed_leg.value(value_dt, curve, pv_only=False)
+    assert abs(v - v_fixed) < 1e-6
+    assert abs(float_leg.value(value_dt, curve, curve, 0.015,
+                               pv_only=False)[0] - v_float) < 1e-6
+
+
+def test_SwapLegsReportAfterPvOnlyWithChangedCurve():
+
+    effective_dt = Date(28, 10, 2020)
+    value_dt = Date(3, 2, 2022)
+
+    fixed_leg = SwapFixedLeg(effective_dt, "5Y", SwapTypes.PAY, 0.02,
+                             FrequencyTypes.ANNUAL,
+                             DayCountTypes.THIRTY_E_360)
+
+    float_leg = SwapFloatLeg(effective_dt, "5Y", SwapTypes.RECEIVE, 0.0,
+                             FrequencyTypes.QUARTERLY, DayCountTypes.ACT_360)
+
+    df_dts = [value_dt.add_years(years) for years in [1, 2, 5]]
+    curve = DiscountCurve(value_dt, df_dts, np.array([0.98, 0.95, 0.88]))
+
+    v_fixed = fixed_leg.value(value_dt, curve)
+    v_float = float_leg.value(value_dt, curve, None, 0.015)
+
+    # The report is of the valuation done and not of the curve as it is now
+    curve._dfs = curve._dfs * np.array([1.0, 0.99, 0.98, 0.95])
+    curve._interpolator.fit(curve._times, curve._dfs)
+    report = fixed_leg._cashflow_report_from_cached_values()
+    assert abs(report["payment_pv"].sum() - v_fixed) < 1e-6
+    report = float_leg._cashflow_report_from_cached_values()
+    assert abs(report["payment_pv"].sum() - v_float) < 1e-6
+
+    # The leg does not keep the curve after it has been valued
+    ref = weakref.ref(curve)
+    del curve
+    gc.collect()
+    assert ref() is None
+
+    # A copy of a leg that has not been valued has nothing to report
+    fresh_leg = pickle.loads(pickle.dumps(SwapFixedLeg(
+        effective_dt, "5Y", SwapTypes.PAY, 0.02, FrequencyTypes.ANNUAL,
+        DayCountTypes.THIRTY_E_360)))
+    with pytest.raises(FinError):
+        fresh_leg.print_valuation()
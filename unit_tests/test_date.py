@@ -6,7 +6,7 @@ import datetime
 import numpy as np
 import time
 
-from financepy.utils.date import Date, date_range
+from financepy.utils.date import Date, DateArray, date_range
 
 # Not under test
 
@@ -370,3 +370,45 @@ def test_list_of_date():
     # Test finding date difference
     assert (Date(1, 1, 2019) - dates) == [Date(1, 1, 2019) - d for d in dates]
     assert (dates - Date(1, 1, 2019)) == [Date(1, 1, 2019) - d for d in dates]
+
+
+def test_date_array():
+
+    dts = [Date(31, 1, 2020), Date(29, 2, 2020), Date(15, 6, 2021),
+           Date(28, 2, 1900), Date(1, 3, 1900)]
+    dt_array = DateArray.from_dates(dts)
+
+    assert len(dt_array) == 5
+    assert dt_array.to_dates() == dts
+    assert dt_array[2] == Date(15, 6, 2021)
+    assert list(dt_array.weekday) == [dt.weekday for dt in dts]
+    assert list(dt_array.is_weekend()) == [dt.is_weekend() for dt in dts]
+
+    for mm in [-13, -1, 1, 6, 25]:
+        assert dt_array[0:3].add_months(mm).to_dates() == \
+            [dt.add_months(mm) for dt in dts[0:3]]
+
+    for tenor in ["3D", "2W", "1M", "18M", "1Y", "4Y", "-1Y"]:
+        assert dt_array[0:3].add_tenor(tenor).to_dates() == \
+            [dt.add_tenor(tenor) for dt in dts[0:3]]
+
+    value_dt = Date(1, 1, 2020)
+    assert list(dt_array[0:3] - value_dt) == [dt - value_dt for dt in dts[0:3]]
+    assert list(value_dt < dt_array) == [value_dt < dt for dt in dts]
+    assert list(dt_array.add_days(np.arange(5)) - dt_array) == [0, 1, 2, 3, 4]
+
+
+def test_date_from_excel_serial():
+    for dt in [Date(1, 1, 1900), Date(28, 2, 1900), Date(1, 3, 1900),
+               Date(29, 2, 2024), Date(31, 12, 2099)]:
+        new_dt = Date.from_excel_serial(dt.excel_dt)
+        assert new_dt == dt
+        assert (new_dt.d, new_dt.m, new_dt.y) == (dt.d, dt.m, dt.y)
+        assert new_dt.weekday == dt.weekday
+
+    dt = Date(15, 6, 2020)
+    assert dt.add_days(10000) == Date(1, 11, 2047)
+    assert dt.add_days(-10000) == Date(28, 1, 1993)
+
+    # Dates have slots so no attribute dictionary is created
+    assert hasattr(dt, "__dict__") is False
@@ -0,0 +1,49 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+import os
+import subprocess
+import sys
+
+
+def run_python(code):
+    env = dict(os.environ, FINANCEPY_QUIET="1")
+    output = subprocess.run([sys.executable, "-c", code], env=env,
+                            capture_output=True, text=True, check=True)
+    return output.stdout
+
+
+def test_lazy_import():
+    code = "import sys\n"
+    code += "from financepy.utils import Date\n"
+    code += "print(Date(1, 1, 2020))\n"
+    code += "print('financepy.utils.helpers' in sys.modules)\n"
+    code += "print('prettytable' in sys.modules)\n"
+    code += "print('IPython' in sys.modules)\n"
+    output = run_python(code)
+    assert output.split() == ["01-JAN-2020", "False", "False", "False"]
+
+
+def test_lazy_import_wildcard():
+    code = "from financepy.utils import *\n"
+    code += "from financepy.market.curves import *\n"
+    code += "from financepy.products.rates import *\n"
+    code += "print(Date.__name__, DayCountTypes.ACT_360.name)\n"
+    code += "print(DiscountCurveFlat.__name__, IborSwap.__name__)\n"
+    output = run_python(code)
+    assert output.split() == ["Date", "ACT_360", "DiscountCurveFlat",
+                              "IborSwap"]
+
+
+def test_lazy_import_missing_name():
+    code = "import sys\n"
+    code += "import financepy.utils as utils\n"
+    code += "print(hasattr(utils, 'NotAName'))\n"
+    code += "print('financepy.utils.helpers' in sys.modules)\n"
+    output = run_python(code)
+    assert output.split() == ["False", "False"]
+
+
+def test_quiet_import():
+    assert run_python("import financepy") == ""
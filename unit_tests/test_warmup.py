@@ -0,0 +1,32 @@
+###############################################################################
+# Copyright (C) 2018, 2019, 2020 Dominic O'Kane
+###############################################################################
+
+import financepy
+import financepy.models.sabr as sabr
+import financepy.models.sabr_shifted as sabr_shifted
+from financepy.utils.warmup import warmup, _warmup_sabr_kernels
+from financepy.utils.warmup import _kernel_dispatchers, _compile_report
+
+
+def test_warmup_report():
+
+    _warmup_sabr_kernels()
+
+    dispatchers = _kernel_dispatchers([sabr, sabr_shifted])
+    assert "models.sabr._x" in dispatchers
+    assert "models.sabr_shifted.vol_function_shifted_sabr" in dispatchers
+
+    report = _compile_report(dispatchers)
+
+    for name in ["models.sabr._x", "models.sabr.vol_function_sabr",
+                 "models.sabr_shifted._x",
+                 "models.sabr_shifted.vol_function_shifted_sabr"]:
+        status, seconds = report[name]
+        assert status in ["COMPILED", "CACHED"]
+        assert seconds >= 0.0
+
+
+def test_top_level_warmup():
+
+    assert financepy.warmup is warmup